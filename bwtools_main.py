@@ -22,7 +22,8 @@ class BWToolsPipeline:
     def run_full_pipeline(self, 
                          input_excel: Optional[str] = None,
                          use_test_data: bool = False,
-                         output_format: str = 'xlsx') -> bool:
+                         output_format: str = 'xlsx',
+                         workers: int = 1) -> bool:
         """
         전체 파이프라인을 실행합니다.
         
@@ -30,6 +31,7 @@ class BWToolsPipeline:
             input_excel: 입력 Excel 파일 경로 (None이면 테스트 데이터 사용)
             use_test_data: 테스트 데이터 사용 여부
             output_format: 출력 형식 ('xlsx' 또는 'csv')
+            workers: YAML 생성 시 동시에 처리할 프로세스 수
             
         Returns:
             성공 여부
@@ -62,7 +64,7 @@ class BWToolsPipeline:
             # 3단계: YAML 생성
             print("\n[3단계] YAML 파일 생성")
             yaml_output = "bwtools_rules.yaml"
-            if not self.yaml_processor.generate_yaml_from_excel(excel_output, yaml_output):
+            if not self.yaml_processor.generate_yaml_from_excel(excel_output, yaml_output, workers):
                 print("YAML 생성 실패")
                 return False
             
@@ -116,7 +118,8 @@ class BWToolsPipeline:
                 if not input_excel:
                     print("입력 Excel 파일을 지정하세요 (--input)")
                     return False
-                return self.yaml_processor.generate_yaml_from_excel(input_excel, output_yaml)
+                workers = kwargs.get('jobs') or 1
+                return self.yaml_processor.generate_yaml_from_excel(input_excel, output_yaml, workers)
                 
             elif mode == 'execute':
                 # 치환 실행
@@ -171,6 +174,8 @@ def main():
     parser.add_argument('--yaml', help='YAML 파일 경로 (execute 모드)')
     parser.add_argument('--log', help='로그 파일 경로 (execute 모드)')
     parser.add_argument('--result', help='결과 Excel 파일 경로 (execute 모드)')
+    parser.add_argument('--jobs', type=int, default=1,
+                       help='YAML 생성 시 병렬로 처리할 프로세스 수 (기본값: 1)')
     
     args = parser.parse_args()
     
@@ -187,14 +192,16 @@ def main():
             format=args.format,
             yaml=args.yaml,
             log=args.log,
-            result=args.result
+            result=args.result,
+            jobs=max(1, args.jobs)
         )
     else:
         # 전체 파이프라인 실행
         success = pipeline.run_full_pipeline(
             input_excel=args.input,
             use_test_data=args.test,
-            output_format=args.format
+            output_format=args.format,
+            workers=max(1, args.jobs)
         )
     
     # 종료 코드 반환
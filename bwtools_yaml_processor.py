@@ -5,15 +5,20 @@ Excel 파일에서 YAML 파일을 생성하고, YAML 규칙에 따라 파일 복
 """
 
 import os
-import yaml
+import yaml_cache
 import shutil
 import re
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from bwtools_config import (
     COLUMN_NAMES, ADDITIONAL_COLUMNS, REPLACEMENT_RULES, TEST_CONFIG
 )
+from excel_cache import read_excel_cached
+from yaml_cache import iter_yaml_rows
+from string_replacer_engine import RULE_SET_REF, RULE_SETS_KEY, compile_plan, expand_rule_sets
+from string_replacer_io import atomic_write, write_file
 
 class YAMLProcessor:
     def __init__(self):
@@ -22,13 +27,15 @@ class YAMLProcessor:
         self.log_entries = []
         self.copied_files = []
         
-    def generate_yaml_from_excel(self, excel_path: str, yaml_path: Optional[str] = None) -> bool:
+    def generate_yaml_from_excel(self, excel_path: str, yaml_path: Optional[str] = None,
+                                 workers: int = 1) -> bool:
         """
         Excel 파일에서 YAML 파일을 생성합니다. (모드 1)
         
         Args:
             excel_path: 입력 Excel/CSV 파일 경로
             yaml_path: 출력 YAML 파일 경로 (기본값: 자동 생성)
+            workers: 행 쌍별 규칙을 동시에 만들 프로세스 수 (기본값: 1 = 순차 생성)
             
         Returns:
             성공 여부
@@ -38,19 +45,24 @@ class YAMLProcessor:
             df = self._read_input_file(excel_path)
             
             # YAML 구조 생성
-            self.yaml_data = self._create_yaml_structure(df)
+            self.yaml_data = self._create_yaml_structure(df, workers)
             
             # YAML 파일 경로 설정
             if not yaml_path:
                 base_name = os.path.splitext(os.path.basename(excel_path))[0]
                 yaml_path = f"{base_name}_replacement_rules.yaml"
             
-            # YAML 파일 저장
+            # YAML 파일 저장 (행을 스트리밍으로 읽을 때 참조를 바로 펼치도록 rule_sets를 먼저 기록)
+            rows = {key: value for key, value in self.yaml_data.items() if key != RULE_SETS_KEY}
             with open(yaml_path, 'w', encoding='utf-8') as f:
-                yaml.dump(self.yaml_data, f, allow_unicode=True, default_flow_style=False)
+                if RULE_SETS_KEY in self.yaml_data:
+                    yaml_cache.dump({RULE_SETS_KEY: self.yaml_data[RULE_SETS_KEY]}, f,
+                                    allow_unicode=True, default_flow_style=False)
+                if rows:
+                    yaml_cache.dump(rows, f, allow_unicode=True, default_flow_style=False)
             
             print(f"YAML 파일 생성 완료: {yaml_path}")
-            print(f"총 {len(self.yaml_data)}개 행의 치환 규칙 생성")
+            print(f"총 {len(rows)}개 행의 치환 규칙 생성")
             return True
             
         except Exception as e:
@@ -72,11 +84,8 @@ class YAMLProcessor:
             성공 여부
         """
         try:
-            # YAML 파일 읽기
-            with open(yaml_path, 'r', encoding='utf-8') as f:
-                self.yaml_data = yaml.safe_load(f)
-            
-            if not self.yaml_data:
+            # YAML은 행 단위로 읽으면서 바로 실행 (전체를 메모리에 올리지 않음)
+            if not self._execute_all_replacements(iter_yaml_rows(yaml_path)):
                 print("실행할 작업이 없습니다.")
                 return False
             
@@ -85,9 +94,6 @@ class YAMLProcessor:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 log_path = f"bwtools_replacement_log_{timestamp}.txt"
             
-            # 치환 작업 실행
-            self._execute_all_replacements()
-            
             # 로그 파일 저장
             self._save_log_file(log_path)
             
@@ -117,7 +123,7 @@ class YAMLProcessor:
         ext = os.path.splitext(file_path)[1].lower()
         
         if ext in ['.xlsx', '.xls']:
-            return pd.read_excel(file_path)
+            return read_excel_cached(file_path)
         elif ext == '.csv':
             # 인코딩 자동 감지
             for encoding in ['utf-8', 'cp949', 'euc-kr']:
@@ -129,65 +135,114 @@ class YAMLProcessor:
         else:
             raise ValueError(f"지원하지 않는 파일 형식: {ext}")
     
-    def _create_yaml_structure(self, df: pd.DataFrame) -> Dict:
-        """DataFrame에서 YAML 구조를 생성합니다."""
-        yaml_data = {}
+    def _create_yaml_structure(self, df: pd.DataFrame, workers: int = 1) -> Dict:
+        """
+        DataFrame에서 YAML 구조를 생성합니다.
         
-        # 2줄씩 처리 (기준행, 매칭행)
-        for i in range(0, len(df), 2):
-            if i + 1 >= len(df):
-                break
-            
-            base_row = df.iloc[i]
-            matched_row = df.iloc[i + 1]
-            
-            row_key = f"row_{i//2 + 1}"
-            row_data = {}
-            
-            # 파일 타입별 처리
-            file_types = [
-                ('send_file', ADDITIONAL_COLUMNS['send_file_path']),
-                ('recv_file', ADDITIONAL_COLUMNS['recv_file_path']),
-                ('send_schema', ADDITIONAL_COLUMNS['send_schema_file']),
-                ('recv_schema', ADDITIONAL_COLUMNS['recv_schema_file'])
-            ]
-            
-            for file_type, path_col in file_types:
-                if path_col in base_row and path_col in matched_row:
-                    source_path = str(matched_row[path_col])
-                    dest_path = str(base_row[path_col])
-                    
-                    if pd.notna(source_path) and pd.notna(dest_path):
-                        # 치환 규칙 생성
-                        replacements = self._generate_replacement_rules(
-                            base_row, matched_row, file_type
-                        )
-                        
-                        row_data[file_type] = {
-                            '원본파일': source_path,
-                            '복사파일': dest_path,
-                            '치환목록': replacements
-                        }
+        Args:
+            df: 기준행/매칭행이 번갈아 있는 DataFrame
+            workers: 2 이상이면 행 쌍별 규칙을 프로세스 풀에서 동시에 만들고 원래 행 순서로 합침
             
+        Returns:
+            YAML 구조 (rule_sets + row_N)
+        """
+        # 파일 타입별 시스템 치환 규칙은 rule_sets에 한 번만 정의
+        rule_sets = {}
+        yaml_data = {RULE_SETS_KEY: rule_sets}
+        
+        # 2줄씩 처리 (기준행, 매칭행) - 마지막 행이 홀수이면 제외
+        pair_count = len(df) // 2
+        pairs = ((i//2 + 1, df.iloc[i], df.iloc[i + 1]) for i in range(0, len(df) - 1, 2))
+        if workers > 1 and pair_count > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._build_pair, pairs,
+                                            chunksize=max(1, pair_count // (workers * 8))))
+        else:
+            results = map(self._build_pair, pairs)
+        
+        for row_key, row_data, pair_rule_sets in results:
+            # 규칙집합 ID는 파일 타입별로 정해지므로 먼저 나온 정의를 유지 (순차 생성과 같은 순서)
+            for set_id, rules in pair_rule_sets.items():
+                rule_sets.setdefault(set_id, rules)
             if row_data:
                 yaml_data[row_key] = row_data
         
+        if not rule_sets:
+            del yaml_data[RULE_SETS_KEY]
         return yaml_data
     
+    def _build_pair(self, pair: Tuple[int, pd.Series, pd.Series]) -> Tuple[str, Dict, Dict]:
+        """
+        행 쌍 하나의 치환 정보를 만듭니다. (프로세스 풀 작업자에서도 호출)
+        
+        Args:
+            pair: (행 쌍 번호, 기준행, 매칭행)
+            
+        Returns:
+            (행 키, 파일 타입별 항목, 이 행 쌍에서 등록한 rule_sets)
+        """
+        row_number, base_row, matched_row = pair
+        rule_sets = {}
+        row_data = {}
+        
+        # 파일 타입별 처리
+        file_types = [
+            ('send_file', ADDITIONAL_COLUMNS['send_file_path']),
+            ('recv_file', ADDITIONAL_COLUMNS['recv_file_path']),
+            ('send_schema', ADDITIONAL_COLUMNS['send_schema_file']),
+            ('recv_schema', ADDITIONAL_COLUMNS['recv_schema_file'])
+        ]
+        
+        for file_type, path_col in file_types:
+            if path_col in base_row and path_col in matched_row:
+                source_path = str(matched_row[path_col])
+                dest_path = str(base_row[path_col])
+                
+                if pd.notna(source_path) and pd.notna(dest_path):
+                    # 치환 규칙 생성
+                    replacements = self._generate_replacement_rules(
+                        base_row, matched_row, file_type, rule_sets
+                    )
+                    
+                    row_data[file_type] = {
+                        '원본파일': source_path,
+                        '복사파일': dest_path,
+                        '치환목록': replacements
+                    }
+        
+        return f"row_{row_number}", row_data, rule_sets
+    
     def _generate_replacement_rules(self, base_row: pd.Series, 
                                   matched_row: pd.Series, 
-                                  file_type: str) -> List[Dict]:
-        """치환 규칙을 생성합니다."""
-        rules = []
+                                  file_type: str,
+                                  rule_sets: Optional[Dict] = None) -> List[Dict]:
+        """
+        치환 규칙을 생성합니다.
         
+        Args:
+            base_row: 기본행
+            matched_row: 매칭행
+            file_type: 파일 타입
+            rule_sets: 지정하면 시스템 치환 규칙을 여기에 파일 타입별로 한 번만 등록하고
+                       치환목록에는 {규칙집합: ID} 참조만 넣음
+            
+        Returns:
+            치환 규칙 목록
+        """
         # 기본 시스템 치환 규칙
-        for old, new in REPLACEMENT_RULES['system'].items():
-            rules.append({
-                '설명': f'{old} → {new} 치환',
-                '조건': {'파일타입': file_type},
-                '찾기': {'정규식': old},
-                '교체': {'값': new}
-            })
+        system_rules = [{
+            '설명': f'{old} → {new} 치환',
+            '조건': {'파일타입': file_type},
+            '찾기': {'정규식': old},
+            '교체': {'값': new}
+        } for old, new in REPLACEMENT_RULES['system'].items()]
+        
+        if rule_sets is None:
+            rules = system_rules
+        else:
+            set_id = f'system_{file_type}'
+            rule_sets.setdefault(set_id, system_rules)
+            rules = [{RULE_SET_REF: set_id}]
         
         # 동적 치환 규칙 (컬럼 값 기반)
         dynamic_mappings = [
@@ -215,13 +270,38 @@ class YAMLProcessor:
         
         return rules
     
-    def _execute_all_replacements(self):
-        """모든 치환 작업을 실행합니다."""
-        for row_key, row_data in self.yaml_data.items():
+    def _execute_all_replacements(self, rows=None) -> int:
+        """
+        모든 치환 작업을 실행합니다.
+        
+        Args:
+            rows: (행 키, 행 데이터) 반복자 (기본값: self.yaml_data)
+                  스트리밍으로 읽는 경우 rule_sets가 참조하는 작업 행보다 먼저 있어야 합니다.
+            
+        Returns:
+            처리한 행 수
+
+        Raises:
+            ValueError: 정의되지 않은(스트리밍에서는 아직 나오지 않은) 규칙집합을 참조한 경우
+        """
+        streaming = rows is not None
+        rule_sets = {}
+        if not streaming:
+            # 전체를 읽은 경우 위치와 관계없이 rule_sets 사용
+            rows = self.yaml_data.items()
+            rule_sets = self.yaml_data.get(RULE_SETS_KEY) or {}
+        row_count = 0
+        for row_key, row_data in rows:
+            # 공통 규칙 정의 (이후 행의 {규칙집합: ID} 참조를 펼칠 때 사용)
+            if row_key == RULE_SETS_KEY:
+                if streaming:
+                    rule_sets.update(row_data or {})
+                continue
+            row_count += 1
             for file_type, file_info in row_data.items():
                 source = file_info.get('원본파일')
                 dest = file_info.get('복사파일')
-                replacements = file_info.get('치환목록', [])
+                replacements = expand_rule_sets(file_info.get('치환목록', []), rule_sets, streaming)
                 
                 if not source or not dest:
                     continue
@@ -242,6 +322,7 @@ class YAMLProcessor:
                 
                 if success:
                     self.copied_files.append(dest)
+        return row_count
     
     def _copy_and_replace(self, source: str, dest: str, replacements: List[Dict]) -> bool:
         """파일을 복사하고 치환을 수행합니다."""
@@ -251,17 +332,14 @@ class YAMLProcessor:
                 print(f"원본 파일이 존재하지 않음: {source}")
                 return False
             
-            # 대상 디렉토리 생성
-            dest_dir = os.path.dirname(dest)
-            if dest_dir and not os.path.exists(dest_dir):
-                os.makedirs(dest_dir, exist_ok=True)
-            
-            # 파일 복사
-            shutil.copy2(source, dest)
-            
-            # 치환 수행
+            # 원본을 한 번만 읽어 메모리에서 치환
+            with open(source, 'rb') as f:
+                data = f.read()
             if replacements:
-                self._apply_replacements(dest, replacements)
+                data = self._replace_bytes(data, replacements)[0]
+            
+            # 임시 파일에 쓴 뒤 교체 (copy2와 같이 권한/수정시각 유지)
+            write_file(dest, data, source)
             
             return True
             
@@ -270,27 +348,33 @@ class YAMLProcessor:
             print(f"오류 내용: {str(e)}")
             return False
     
-    def _apply_replacements(self, file_path: str, replacements: List[Dict]):
-        """파일에 치환 규칙을 적용합니다."""
-        # 파일 읽기
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _apply_replacements(self, file_path: str, replacements: List[Dict]) -> List[int]:
+        """파일에 치환 규칙을 적용하고 규칙별 치환 수를 반환합니다."""
+        with open(file_path, 'rb') as f:
+            data = f.read()
         
-        # 치환 수행
-        modified = False
-        for rule in replacements:
-            pattern = rule['찾기']['정규식']
-            replacement = rule['교체']['값']
-            
-            new_content = re.sub(pattern, replacement, content)
-            if new_content != content:
-                content = new_content
-                modified = True
+        new_data, counts = self._replace_bytes(data, replacements)
         
         # 변경사항이 있으면 저장
-        if modified:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if new_data is not data:
+            atomic_write(file_path, new_data, file_path, keep_times=False)
+        
+        return counts
+    
+    def _replace_bytes(self, data: bytes, replacements: List[Dict]) -> Tuple[bytes, List[int]]:
+        """
+        UTF-8 파일 내용에 치환 규칙을 적용합니다.
+        
+        텍스트 모드로 읽고 쓰던 기존 동작과 같이 줄바꿈을 정규화하여 치환하고,
+        저장 시 플랫폼 줄바꿈으로 되돌립니다. 변경이 없으면 원본 바이트를 그대로 반환합니다.
+        """
+        content = data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        
+        # 치환 수행 (컴파일된 계획 재사용)
+        new_content, counts = compile_plan(replacements).apply(content)
+        if new_content == content:
+            return data, counts
+        return new_content.replace('\n', os.linesep).encode('utf-8'), counts
     
     def _save_log_file(self, log_path: str):
         """로그 파일을 저장합니다."""
@@ -0,0 +1,254 @@
+"""
+Excel 읽기 캐시
+
+string_replacer, iflist04, test_iflist, bwtools_yaml_processor가 같은 엑셀 파일을
+반복해서 읽을 때 openpyxl 파싱 비용이 대부분을 차지합니다.
+한 번 파싱한 DataFrame을 캐시 디렉토리에 바이너리 형식으로 저장해 두고
+(pyarrow가 있으면 Parquet, 없으면 pickle) 다음 읽기부터는 캐시에서 바로 로드합니다.
+
+캐시 키는 파일 경로 + 크기 + 수정시각 + 내용 해시 + read_excel 인자로 구성되며,
+캐시 디렉토리 전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+"""
+
+import os
+import hashlib
+import pickle
+import tempfile
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+# pyarrow 모듈 가져오기 시도 (설치되지 않았을 경우 pickle 사용)
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# 캐시 디렉토리 및 크기 상한 (환경변수로 변경 가능)
+CACHE_DIR = os.environ.get(
+    'EXCEL_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.excel_cache')
+)
+CACHE_MAX_BYTES = int(os.environ.get('EXCEL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# 캐시 파일 확장자
+PARQUET_SUFFIX = '.parquet'
+PICKLE_SUFFIX = '.pkl'
+CACHE_SUFFIXES = (PARQUET_SUFFIX, PICKLE_SUFFIX)
+
+# 내용 해시 계산 시 읽기 단위
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(file_path: str) -> str:
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExcelCache:
+    """파싱된 엑셀 DataFrame을 디스크에 캐시하는 클래스"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = CACHE_MAX_BYTES):
+        """
+        ExcelCache 초기화
+
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: CACHE_DIR)
+            max_bytes: 캐시 디렉토리 최대 크기 (바이트)
+        """
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def cache_key(self, file_path: str, read_kwargs: Dict[str, Any]) -> str:
+        """
+        캐시 키를 생성합니다.
+
+        Args:
+            file_path: 엑셀 파일 경로
+            read_kwargs: pd.read_excel에 전달되는 인자
+
+        Returns:
+            경로 + 크기 + 수정시각 + 내용 해시 + 인자로 만든 키
+        """
+        abs_path = os.path.abspath(file_path)
+        stat = os.stat(abs_path)
+        key_source = '|'.join([
+            abs_path,
+            str(stat.st_size),
+            str(stat.st_mtime_ns),
+            file_content_hash(abs_path),
+            repr(sorted(read_kwargs.items())),
+            pd.__version__
+        ])
+        return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+    def read_excel(self, file_path: str, **read_kwargs) -> pd.DataFrame:
+        """
+        엑셀 파일을 읽습니다. 캐시가 있으면 캐시에서 로드합니다.
+
+        Args:
+            file_path: 엑셀 파일 경로
+            **read_kwargs: pd.read_excel에 그대로 전달되는 인자
+
+        Returns:
+            읽어온 DataFrame
+        """
+        try:
+            key = self.cache_key(file_path, read_kwargs)
+        except OSError:
+            # 파일이 없거나 접근 불가 - pandas가 원래 오류를 내도록 위임
+            return pd.read_excel(file_path, **read_kwargs)
+
+        cached = self._load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        df = pd.read_excel(file_path, **read_kwargs)
+        self._store(key, df)
+        return df
+
+    def clear(self):
+        """캐시 디렉토리의 모든 캐시 파일을 삭제합니다."""
+        for path, _, _ in self._list_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entry_path(self, key: str, suffix: str) -> str:
+        """캐시 항목 파일 경로를 반환합니다."""
+        return os.path.join(self.cache_dir, key + suffix)
+
+    def _load(self, key: str) -> Optional[pd.DataFrame]:
+        """캐시 항목을 로드합니다. 없거나 손상된 경우 None을 반환합니다."""
+        for suffix in CACHE_SUFFIXES:
+            path = self._entry_path(key, suffix)
+            if not os.path.exists(path):
+                continue
+            try:
+                if suffix == PARQUET_SUFFIX:
+                    df = _normalize_missing(pd.read_parquet(path))
+                else:
+                    with open(path, 'rb') as f:
+                        df = pickle.load(f)
+                # LRU 갱신을 위해 사용 시각 기록
+                os.utime(path, None)
+                return df
+            except Exception:
+                # 손상된 캐시는 삭제하고 다시 파싱
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+        return None
+
+    def _store(self, key: str, df: pd.DataFrame):
+        """DataFrame을 캐시에 저장합니다. 저장 실패는 무시합니다."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+        except OSError:
+            return
+
+        if HAS_PYARROW and self._write_atomic(key, PARQUET_SUFFIX,
+                                              lambda path: df.to_parquet(path, index=True)):
+            self._evict()
+            return
+
+        # pyarrow가 없거나 Parquet로 표현할 수 없는 DataFrame (혼합 타입 컬럼 등)
+        def write_pickle(path):
+            with open(path, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if self._write_atomic(key, PICKLE_SUFFIX, write_pickle):
+            self._evict()
+
+    def _write_atomic(self, key: str, suffix: str, writer) -> bool:
+        """임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓰인 캐시를 읽지 않도록 합니다."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, self._entry_path(key, suffix))
+            return True
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+
+    def _list_entries(self) -> List[Tuple[str, int, float]]:
+        """캐시 항목 목록 (경로, 크기, 마지막 사용 시각)을 반환합니다."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(CACHE_SUFFIXES):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """캐시 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        entries = self._list_entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.max_bytes:
+                break
+
+
+def _normalize_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """Parquet 왕복 시 None으로 바뀐 결측값을 read_excel과 같은 NaN으로 되돌립니다."""
+    for column in df.columns:
+        if df[column].dtype == object:
+            df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+
+# 모듈 기본 캐시 인스턴스
+_default_cache: Optional[ExcelCache] = None
+
+
+def get_default_cache() -> ExcelCache:
+    """모듈 기본 ExcelCache 인스턴스를 반환합니다."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ExcelCache()
+    return _default_cache
+
+
+def read_excel_cached(file_path: str, **read_kwargs) -> pd.DataFrame:
+    """
+    pd.read_excel과 같은 인터페이스로 캐시를 거쳐 엑셀 파일을 읽습니다.
+
+    Args:
+        file_path: 엑셀 파일 경로
+        **read_kwargs: pd.read_excel 인자
+
+    Returns:
+        읽어온 DataFrame
+    """
+    return get_default_cache().read_excel(file_path, **read_kwargs)
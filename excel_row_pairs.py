@@ -0,0 +1,137 @@
+"""
+2행 구조(기본행/매칭행) 엑셀 행 쌍 읽기
+
+iflist03a가 만든 엑셀은 기본행(생성할 인터페이스)과 매칭행(복사할 원본 인터페이스)이
+번갈아 나오는 2행 구조입니다. 지금까지는 도구마다 df.iloc[i], df.iloc[i+1]로 행마다
+pandas Series를 만들고 컬럼 이름으로 값을 찾았는데, 시트를 itertuples로 한 번만 읽어
+__slots__ 레코드(RowPair)로 바꿔 두고 컬럼 위치는 시트당 한 번만 계산해 모든 행이 공유합니다.
+
+행 값은 Series와 같은 방식(row['컬럼'], row.get('컬럼'), '컬럼' in row)으로 읽을 수 있고,
+행 쌍은 일련번호(N번째 행 쌍, 1부터)로 바로 찾을 수 있습니다.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from excel_cache import read_excel_cached
+
+
+class SheetRow:
+    """엑셀 한 행의 값 (컬럼 위치 색인은 같은 시트의 모든 행이 공유)"""
+
+    __slots__ = ('_positions', '_values')
+
+    def __init__(self, positions: Dict[Any, int], values: Tuple):
+        """
+        Args:
+            positions: 컬럼 이름 -> 값 위치
+            values: 행 값 (컬럼 순서)
+        """
+        self._positions = positions
+        self._values = values
+
+    def __getitem__(self, column):
+        return self._values[self._positions[column]]
+
+    def __contains__(self, column) -> bool:
+        return column in self._positions
+
+    def get(self, column, default=None):
+        """컬럼 값을 반환합니다 (컬럼이 없으면 default)."""
+        position = self._positions.get(column)
+        return default if position is None else self._values[position]
+
+    def keys(self) -> List:
+        """컬럼 이름 목록"""
+        return list(self._positions)
+
+    def to_dict(self) -> Dict:
+        """{컬럼 이름: 값} 사전으로 변환합니다."""
+        return dict(zip(self._positions, self._values))
+
+    def __repr__(self):
+        return f"SheetRow({self.to_dict()!r})"
+
+
+class RowPair:
+    """기본행과 매칭행 한 쌍"""
+
+    __slots__ = ('serial', 'base', 'match')
+
+    def __init__(self, serial: int, base: SheetRow, match: SheetRow):
+        """
+        Args:
+            serial: 일련번호 (N번째 행 쌍, 1부터)
+            base: 기본행 (생성할 파일 정보)
+            match: 매칭행 (복사할 원본 파일 정보)
+        """
+        self.serial = serial
+        self.base = base
+        self.match = match
+
+    @property
+    def base_index(self) -> int:
+        """기본행의 DataFrame 행 위치 (매칭행은 base_index + 1)"""
+        return (self.serial - 1) * 2
+
+    def __repr__(self):
+        return f"RowPair({self.serial})"
+
+
+class RowPairs:
+    """2행 구조 시트 전체의 행 쌍 목록"""
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        DataFrame을 한 번 훑어 행 쌍 레코드로 변환합니다.
+
+        Args:
+            df: 기본행/매칭행이 번갈아 있는 DataFrame
+        """
+        self.columns = list(df.columns)
+        positions = {column: position for position, column in enumerate(self.columns)}
+        self.pairs: List[RowPair] = []
+        # 마지막 행이 홀수이면 매칭행이 없으므로 따로 보관
+        self.unmatched: Optional[SheetRow] = None
+
+        rows = df.itertuples(index=False, name=None)
+        for serial, base in enumerate(rows, 1):
+            match = next(rows, None)
+            if match is None:
+                self.unmatched = SheetRow(positions, base)
+                break
+            self.pairs.append(RowPair(serial, SheetRow(positions, base), SheetRow(positions, match)))
+
+    @classmethod
+    def read(cls, excel_path: str, **kwargs) -> 'RowPairs':
+        """
+        엑셀 파일을 읽어 행 쌍 목록을 만듭니다.
+
+        Args:
+            excel_path: 엑셀 파일 경로
+            **kwargs: read_excel_cached에 그대로 전달 (engine 등)
+        """
+        return cls(read_excel_cached(excel_path, **kwargs))
+
+    def __len__(self) -> int:
+        return len(self.pairs)
+
+    def __iter__(self) -> Iterator[RowPair]:
+        return iter(self.pairs)
+
+    def get(self, serial) -> Optional[RowPair]:
+        """
+        일련번호로 행 쌍을 찾습니다.
+
+        Args:
+            serial: 일련번호 (1부터, 숫자 문자열 가능)
+
+        Returns:
+            RowPair 또는 None (범위를 벗어난 경우)
+
+        Raises:
+            ValueError: 일련번호가 숫자가 아닌 경우
+        """
+        position = int(serial) - 1
+        if 0 <= position < len(self.pairs):
+            return self.pairs[position]
+        return None
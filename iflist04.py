@@ -18,6 +18,8 @@ from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 import sys
 import re
+from excel_cache import read_excel_cached
+from excel_row_pairs import RowPairs
 
 # 오류 표시를 위한 주황색 배경 정의
 ORANGE_FILL = PatternFill(start_color='FFC000', end_color='FFC000', fill_type='solid')
@@ -122,24 +124,22 @@ def validate_excel_file(input_file):
     try:
         # 엑셀 파일 로드
         print(f"파일 '{input_file}'을 로드 중...")
-        df = pd.read_excel(input_file, engine='openpyxl')
+        df = read_excel_cached(input_file, engine='openpyxl')
         print(f"파일 로드 완료. 총 {len(df)} 행을 분석합니다.")
         
         # 열 이름 확인
         column_names = df.columns.tolist()
         print(f"찾은 컬럼: {column_names}")
         
-        # '비교로그' 컬럼 추가
-        df['비교로그'] = ''
+        # '비교로그' 컬럼 값 (행마다 Series를 만들지 않도록 시트를 한 번에 행 쌍 레코드로 변환)
+        logs = [''] * len(df)
+        row_pairs = RowPairs(df)
         
         # 기본행과 매칭행 비교
-        for i in range(0, len(df), 2):
-            if i+1 >= len(df):
-                print(f"경고: 행 {i}의 매칭행이 없습니다. 건너뜁니다.")
-                continue
-                
-            base_row = df.iloc[i]
-            match_row = df.iloc[i+1]
+        for pair in row_pairs:
+            i = pair.base_index
+            base_row = pair.base
+            match_row = pair.match
             
             comparison_log = []
             
@@ -237,8 +237,12 @@ def validate_excel_file(input_file):
             
             # 비교로그 업데이트
             log_value = ', '.join(comparison_log) if comparison_log else 'OK'
-            df.at[i, '비교로그'] = log_value
-            df.at[i+1, '비교로그'] = log_value
+            logs[i] = log_value
+            logs[i+1] = log_value
+        
+        if row_pairs.unmatched is not None:
+            print(f"경고: 행 {len(df) - 1}의 매칭행이 없습니다. 건너뜁니다.")
+        df['비교로그'] = logs
         
         # 결과 저장
         output_file = input_file.replace('.xlsx', '_검증결과.xlsx')
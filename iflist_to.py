@@ -3,7 +3,9 @@ import openpyxl
 import yaml
 import os
 import datetime
+import itertools
 import shutil
+from yaml_cache import iter_yaml_sequence
 from openpyxl.styles import Font, PatternFill, Alignment
 
 # 디버그 모드 설정
@@ -288,15 +290,15 @@ def execute_file_copy(yaml_path, log_path):
         yaml_path: YAML 파일 경로
         log_path: 로그 파일 경로
     """
+    # files 목록은 항목 하나씩 읽으면서 바로 복사 (전체를 메모리에 올리지 않음)
+    files = iter_yaml_sequence(yaml_path, 'files')
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as yf:
-            data = yaml.safe_load(yf)
+        first_file = next(files, None)
     except FileNotFoundError:
         print(f"YAML 파일을 찾을 수 없습니다: {yaml_path}")
         return
     
-    files = data.get('files', [])
-    if not files:
+    if first_file is None:
         print("복사할 파일이 없습니다.")
         return
     
@@ -308,7 +310,7 @@ def execute_file_copy(yaml_path, log_path):
     skip_count = 0
     error_count = 0
     
-    for file_info in files:
+    for file_info in itertools.chain([first_file], files):
         source = file_info.get('source')
         destination = file_info.get('destination')
         
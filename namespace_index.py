@@ -0,0 +1,140 @@
+"""
+프로세스 파일 namespace 색인
+
+YAML 생성 시 스키마 치환 규칙을 만들 때마다 원본 .process 파일을 다시 열어 전체를 읽고
+정규식 두 개로 기존 namespace를 찾던 작업을, 참조되는 파일 전체를 한 번씩만 읽어 만든
+색인 조회로 바꿉니다.
+
+파일마다 namespace="..." 값과 xmlns:pfx3="..." 값을 파일 순서대로 저장해 두고,
+조회 시 스키마 기본 이름(XSD 파일명에서 확장자를 뺀 것)이 들어 있는 첫 번째 값을 돌려줍니다.
+결과는 (파일, 기본 이름) 단위로 기억하므로 송신/수신 스키마가 같은 파일을 여러 행에서
+참조해도 파일 읽기와 검색은 한 번뿐입니다.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 색인 생성 시 동시에 읽을 파일 수 (디스크 대기 위주이므로 CPU 수보다 많게)
+INDEX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# namespace 표시 문자열 (이 문자열이 들어 있으면 no_namespace 스키마)
+NO_NAMESPACE_MARK = 'no_namespace_schema'
+
+_NAMESPACE_VALUE = re.compile(r'namespace\s*=\s*"([^"]*)"')
+_PFX3_VALUE = re.compile(r'xmlns:pfx3\s*=\s*"([^"]*)"')
+
+
+def scan_file(path: str) -> Tuple[List[str], List[str]]:
+    """
+    파일에서 namespace 값과 xmlns:pfx3 값을 파일 순서대로 추출합니다.
+
+    Args:
+        path: .process 또는 .xsd 파일 경로
+
+    Returns:
+        (namespace 값 목록, xmlns:pfx3 값 목록)
+
+    Raises:
+        OSError, UnicodeDecodeError: 파일을 읽을 수 없는 경우
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    return _NAMESPACE_VALUE.findall(content), _PFX3_VALUE.findall(content)
+
+
+class NamespaceIndex:
+    """파일별 namespace 값 색인"""
+
+    def __init__(self):
+        """NamespaceIndex 초기화"""
+        # 정규화 경로 -> (namespace 값 목록, xmlns:pfx3 값 목록), 읽을 수 없는 파일은 None
+        self.files: Dict[str, Optional[Tuple[List[str], List[str]]]] = {}
+        # 정규화 경로 -> 읽기 오류 메시지
+        self.errors: Dict[str, str] = {}
+        self._lookups: Dict[Tuple[str, str], Optional[str]] = {}
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _scan(self, key: str) -> Tuple[str, Optional[Tuple[List[str], List[str]]], Optional[str]]:
+        try:
+            return key, scan_file(key), None
+        except (OSError, UnicodeDecodeError) as e:
+            return key, None, str(e)
+
+    def build(self, paths: Iterable, workers: int = INDEX_WORKERS) -> 'NamespaceIndex':
+        """
+        참조되는 파일을 한 번씩 읽어 색인에 추가합니다. 없는 파일과 경로가 아닌 값은 무시합니다.
+
+        Args:
+            paths: 파일 경로 목록 (중복, NaN 등 포함 가능)
+            workers: 동시에 읽을 파일 수
+
+        Returns:
+            self
+        """
+        keys = {self._key(path) for path in paths
+                if isinstance(path, str) and path and os.path.isfile(path)}
+        keys.difference_update(self.files)
+        if not keys:
+            return self
+        if workers > 1 and len(keys) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._scan, keys))
+        else:
+            results = [self._scan(key) for key in keys]
+        for key, values, error in results:
+            self.files[key] = values
+            if error is not None:
+                self.errors[key] = error
+        return self
+
+    def lookup(self, path, base_name: str) -> Optional[str]:
+        """
+        파일에서 스키마 기본 이름이 들어 있는 기존 namespace 값을 찾습니다.
+
+        namespace="..." 값을 먼저 찾고, 없으면 xmlns:pfx3="..." 값을 찾습니다.
+        색인에 없는 파일은 이때 읽어서 추가합니다.
+
+        Args:
+            path: 원본 파일 경로
+            base_name: 스키마 기본 이름 (정규식으로 검색 - 기존 동작과 같음)
+
+        Returns:
+            기존 namespace 값 또는 None
+        """
+        if not isinstance(path, str) or not path or not os.path.exists(path):
+            return None
+        key = self._key(path)
+        if (key, base_name) in self._lookups:
+            return self._lookups[(key, base_name)]
+
+        if key not in self.files:
+            self.build([path], workers=1)
+        result = None
+        values = self.files.get(key)
+        if values is not None:
+            try:
+                pattern = re.compile(base_name)
+            except re.error as e:
+                self.errors[key] = str(e)
+                pattern = None
+            if pattern is not None:
+                result = next((value for group in values for value in group
+                               if pattern.search(value)), None)
+        self._lookups[(key, base_name)] = result
+        return result
+
+    def error(self, path) -> Optional[str]:
+        """파일을 읽거나 검색할 때 난 오류 메시지를 반환합니다 (없으면 None)."""
+        if not isinstance(path, str) or not path:
+            return None
+        return self.errors.get(self._key(path))
+
+    def has_no_namespace(self, path, base_name: str) -> bool:
+        """기존 namespace가 no_namespace 스키마 위치인지 확인합니다."""
+        namespace = self.lookup(path, base_name)
+        return bool(namespace) and NO_NAMESPACE_MARK in namespace
@@ -0,0 +1,208 @@
+"""
+프로세스 파일 템플릿 (같은 원본에서 여러 신규 파일 생성)
+
+신규 인터페이스는 매칭된 .process 파일을 복사한 뒤 15개 이상의 정규식으로 바꿔 만듭니다.
+같은 원본(archetype)에서 여러 인터페이스를 만들면 찾는 정규식은 원본 행 값으로 정해지므로
+모두 같고, 교체 값(기본행 값)만 다릅니다. 그래서 원본 + 정규식 목록 단위로 한 번만
+"어디가 어떤 규칙의 교체 값으로 바뀌는지"를 계산해 템플릿으로 저장해 두고,
+이후 파일은 고정 조각 사이에 해당 작업의 교체 값을 끼워 넣기만 해서 만듭니다.
+(인코딩 감지, 디코딩, 정규식 검색을 모두 생략)
+
+템플릿은 규칙마다 고유한 자리표시 문자(사설 영역 문자)로 교체하면서 만들고, 뒤 규칙의 매칭이
+자리표시를 포함하면 템플릿을 만들지 않습니다. 작업의 교체 값으로 채울 때는 치환 엔진의
+output_conflicts로 교체 값이 뒤 규칙의 매칭을 새로 만들거나 바꿀 수 없는지 확인하고,
+그럴 수 있으면 평소처럼 정규식으로 치환합니다. 따라서 결과와 규칙별 치환 수는 항상
+정규식 치환과 같습니다.
+
+처음 보는 원본은 템플릿을 만들지 않고, 같은 원본과 정규식 목록이 두 번째로 나올 때 만듭니다.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from string_replacer_engine import ReplacementPlan, is_ascii_safe_encoding, output_conflicts
+
+# 메모리에 유지할 템플릿 수 (원본 + 정규식 목록 단위)
+TEMPLATE_CACHE_SIZE = 64
+
+# 규칙 순번별 자리표시 문자 (보조 사설 영역 A)
+_SLOT_BASE = 0xF0000
+_SLOT_CHARS = re.compile('[\U000F0000-\U000FFFFD]')
+_SLOT_SPLIT = re.compile('([\U000F0000-\U000FFFFD])')
+
+
+class _NotTemplatable(Exception):
+    """뒤 규칙이 앞 규칙의 교체 자리에 걸려 템플릿으로 만들 수 없음"""
+
+
+class ProcessTemplate:
+    """원본 파일 하나와 정규식 목록 하나로 만든 템플릿"""
+
+    __slots__ = ('source', 'encoding', 'segments', 'slots', 'counts', '_usable')
+
+    def __init__(self, source: bytes, encoding: str, segments: List[bytes], slots: List[int],
+                 counts: List[int]):
+        """
+        Args:
+            source: 원본 파일 내용
+            encoding: 원본 인코딩
+            segments: 고정 조각 (인코딩된 bytes, 자리 수 + 1개)
+            slots: 자리마다 교체 값을 넣을 규칙 위치 (치환목록 순번 - 1)
+            counts: 규칙별 치환 수
+        """
+        self.source = source
+        self.encoding = encoding
+        self.segments = segments
+        self.slots = slots
+        self.counts = counts
+        # 계획 지문 -> 이 템플릿을 채울 수 있는지 여부
+        self._usable: Dict[str, bool] = {}
+
+    def usable(self, plan: ReplacementPlan) -> bool:
+        """
+        계획의 교체 값으로 템플릿을 채운 결과가 정규식 치환과 같은지 확인합니다.
+
+        자리를 만든 규칙의 교체 값이 고정이고, 그 값이 뒤 규칙의 매칭을 새로 만들거나
+        바꿀 수 없어야 합니다. 원본에서의 매칭 위치는 템플릿을 만들 때 정해졌으므로
+        단계 구성의 겹침 조건은 보지 않습니다.
+        """
+        usable = self._usable.get(plan.fingerprint)
+        if usable is None:
+            usable = True
+            for position in sorted(set(self.slots)):
+                rule = plan.rules[position]
+                if not rule.combinable or rule.output is None:
+                    usable = False
+                    break
+                if any(later.pattern is not None and output_conflicts(rule, later)
+                       for later in plan.rules[position + 1:]):
+                    usable = False
+                    break
+            self._usable[plan.fingerprint] = usable
+        return usable
+
+    def render(self, plan: ReplacementPlan) -> bytes:
+        """
+        계획의 교체 값을 자리에 채워 결과 파일 내용을 만듭니다 (usable이 True일 때만 사용).
+
+        Raises:
+            UnicodeEncodeError: 교체 값을 원본 인코딩으로 쓸 수 없는 경우 (정규식 치환과 같음)
+        """
+        if not self.slots:
+            return self.source
+        outputs = {position: plan.rules[position].output.encode(self.encoding)
+                   for position in set(self.slots)}
+        pieces = [self.segments[0]]
+        for position, segment in zip(self.slots, self.segments[1:]):
+            pieces.append(outputs[position])
+            pieces.append(segment)
+        return b''.join(pieces)
+
+
+def compile_template(source: bytes, content: str, encoding: str,
+                     plan: ReplacementPlan) -> Optional[ProcessTemplate]:
+    """
+    원본 내용과 계획의 정규식으로 템플릿을 만듭니다.
+
+    Args:
+        source: 원본 파일 내용
+        content: 디코딩된 원본 내용
+        encoding: content를 만든 인코딩
+        plan: 컴파일된 치환 계획 (정규식 목록만 사용)
+
+    Returns:
+        ProcessTemplate 또는 None (템플릿으로 만들 수 없는 경우)
+    """
+    # 조각을 따로 인코딩해 이어 붙여도 전체를 인코딩한 것과 같아야 함
+    if not (content.isascii() or is_ascii_safe_encoding(encoding)):
+        return None
+    # 범위 규칙은 구조를 따라 적용하고, 역추적 위험 규칙은 시간 제한 작업자에서만 실행
+    if any(rule.scope is not None or rule.risk for rule in plan.rules) or _SLOT_CHARS.search(content):
+        return None
+
+    counts = [0] * len(plan)
+    text = content
+    try:
+        for rule in plan.rules:
+            if rule.pattern is None:
+                continue
+            slot = chr(_SLOT_BASE + rule.index - 1)
+
+            def mark(match, slot=slot):
+                if _SLOT_CHARS.search(match.group(0)):
+                    raise _NotTemplatable()
+                return slot
+
+            text, counts[rule.index - 1] = rule.pattern.subn(mark, text)
+    except _NotTemplatable:
+        return None
+
+    parts = _SLOT_SPLIT.split(text)
+    segments = [part.encode(encoding) for part in parts[0::2]]
+    slots = [ord(part) - _SLOT_BASE for part in parts[1::2]]
+    return ProcessTemplate(source, encoding, segments, slots, counts)
+
+
+def _plan_key(plan: ReplacementPlan) -> Tuple[str, ...]:
+    """템플릿을 공유할 수 있는 계획의 키 (정규식 목록 - 교체 값은 제외)"""
+    return tuple(rule.pattern_text for rule in plan.rules)
+
+
+class TemplateCache:
+    """(원본 경로, 정규식 목록) -> 템플릿 (LRU)"""
+
+    def __init__(self, size: int = TEMPLATE_CACHE_SIZE):
+        """
+        Args:
+            size: 유지할 템플릿 수
+        """
+        self.size = size
+        self._templates: 'OrderedDict[Tuple, Optional[ProcessTemplate]]' = OrderedDict()
+        self._seen: 'OrderedDict[Tuple, bytes]' = OrderedDict()
+
+    def _remember(self, table: OrderedDict, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        if len(table) > self.size:
+            table.popitem(last=False)
+
+    def lookup(self, source_path: str, source: bytes, plan: ReplacementPlan) -> Optional[ProcessTemplate]:
+        """
+        쓸 수 있는 템플릿을 찾습니다. 처음 보는 원본이면 기록만 하고 None을 반환합니다.
+
+        Args:
+            source_path: 원본 파일 경로
+            source: 원본 파일 내용
+            plan: 이 작업의 치환 계획
+
+        Returns:
+            ProcessTemplate 또는 None (템플릿을 만들어야 하거나 쓸 수 없는 경우)
+        """
+        key = (source_path, _plan_key(plan))
+        if key in self._templates:
+            template = self._templates[key]
+            self._templates.move_to_end(key)
+            if template is not None and template.source is not source and template.source != source:
+                # 원본이 바뀜 - 처음 보는 원본과 같이 처리
+                del self._templates[key]
+                return None
+            if template is None or not template.usable(plan):
+                return None
+            return template
+        return None
+
+    def should_compile(self, source_path: str, source: bytes, plan: ReplacementPlan) -> bool:
+        """같은 원본과 정규식 목록이 두 번째로 나왔으면 True (처음이면 기록만 함)"""
+        key = (source_path, _plan_key(plan))
+        if key in self._templates:
+            return False
+        seen = self._seen.get(key)
+        if seen is not None and (seen is source or seen == source):
+            del self._seen[key]
+            return True
+        self._remember(self._seen, key, source)
+        return False
+
+    def store(self, source_path: str, plan: ReplacementPlan, template: Optional[ProcessTemplate]):
+        """만든 템플릿을 저장합니다 (만들 수 없었으면 None을 저장해 다시 시도하지 않음)."""
+        self._remember(self._templates, (source_path, _plan_key(plan)), template)
@@ -6,11 +6,51 @@ Excel 파일을 읽어 YAML 파일을 생성하고, 생성된 YAML을 기반으
 
 import os
 import re
+import contextlib
 import datetime
+import io
+import itertools
 import pandas as pd
 import yaml
 import shutil
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def iter_yaml_rows(yaml_path: str) -> Iterator[Tuple[Any, Any]]:
+    """
+    YAML 최상위 매핑의 (키, 값)을 파일 순서대로 하나씩 읽습니다.
+    
+    파서 이벤트에서 항목 하나의 노드만 만들어 변환하므로 전체 구조를 메모리에 올리지 않고,
+    파일을 다 읽기 전에 첫 행부터 처리할 수 있습니다.
+    
+    Args:
+        yaml_path: YAML 파일 경로
+        
+    Yields:
+        (최상위 키, 값)
+    """
+    with open(yaml_path, 'rb') as stream:
+        loader = yaml.SafeLoader(stream)
+        try:
+            loader.get_event()  # StreamStart
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()  # DocumentStart
+            if not loader.check_event(yaml.MappingStartEvent):
+                # 빈 문서(null)는 항목 없음
+                if loader.construct_object(loader.compose_node(None, None), deep=True) is None:
+                    return
+                raise yaml.YAMLError("YAML 최상위가 매핑이 아닙니다.")
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = loader.construct_object(loader.compose_node(None, None), deep=True)
+                value = loader.construct_object(loader.compose_node(None, None), deep=True)
+                # 행마다 생성 기록을 비워 메모리 해제
+                loader.constructed_objects = {}
+                yield key, value
+        finally:
+            loader.dispose()
 
 
 class YAMLProcessor:
@@ -24,19 +64,25 @@ class YAMLProcessor:
             debug_mode: 디버그 모드 활성화 여부
         """
         self.debug_mode = debug_mode
+        # 정규식 문자열 -> 컴파일된 패턴 (같은 규칙을 쓰는 파일끼리 재사용)
+        self._pattern_cache: Dict[str, Any] = {}
         
     def debug_print(self, *args, **kwargs):
         """디버그 모드일 때만 메시지를 출력"""
         if self.debug_mode:
             print("[DEBUG]", *args, **kwargs)
     
-    def generate_yaml_from_excel(self, excel_path: str, yaml_path: str) -> bool:
+    def generate_yaml_from_excel(self, excel_path: str, yaml_path: str, workers: int = 1) -> bool:
         """
         Excel 파일을 읽어 YAML 파일을 생성
         
+        workers가 2 이상이면 행 쌍 블록을 프로세스 풀에서 동시에 생성하고
+        원래 "N번째 행" 순서대로 합칩니다 (결과는 순차 생성과 같음).
+        
         Args:
             excel_path: 입력 Excel 파일 경로
             yaml_path: 출력 YAML 파일 경로
+            workers: 동시에 행 쌍을 처리할 프로세스 수 (기본값: 1 = 순차 생성)
             
         Returns:
             생성 성공 여부
@@ -60,247 +106,21 @@ class YAMLProcessor:
             # 전체 YAML 구조를 저장할 딕셔너리
             full_yaml_structure = {}
             
-            # 2행씩 처리 (일반행, 매칭행)
-            for i in range(0, len(df), 2):
-                if i + 1 >= len(df):
-                    break
-                
-                normal_row = df.iloc[i]
-                match_row = df.iloc[i+1]
-                
-                print(f"\n=== {i//2 + 1}번째 행 쌍 처리 ===")
-                
-                yaml_structure = {
-                    f"{i//2 + 1}번째 행": {}
-                }
-                
-                # 파일 경로 처리 함수들
-                def modify_path(path):
-                    """파일 경로를 수정하는 함수"""
-                    if isinstance(path, str) and path.startswith("C:\\BwProject"):
-                        return path.replace("C:\\BwProject", "C:\\TBwProject")
-                    return path
-                
-                def extract_filename(path):
-                    """파일 경로에서 파일명만 추출"""
-                    if not isinstance(path, str):
-                        return ""
-                    return os.path.basename(path)
-                
-                def process_schema_path(schema_path):
-                    """스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성"""
-                    if not isinstance(schema_path, str):
-                        return None, None
-                    
-                    normalized_path = schema_path.replace('\\', '/')
-                    shared_idx = normalized_path.find('/SharedResources')
-                    if shared_idx == -1:
-                        return None, None
-                    
-                    bb_start = normalized_path.rfind('/', 0, shared_idx)
-                    if bb_start == -1:
-                        return None, None
-                    
-                    relative_path = normalized_path[bb_start:]
-                    schema_location = relative_path[relative_path.find('/SharedResources'):]
-                    namespace = f"http://www.tibco.com/schemas{relative_path}"
-                    
-                    return namespace, schema_location
-                
-                def create_schema_replacements(filename, schema_path):
-                    """스키마 파일 치환 목록 생성"""
-                    if not filename.endswith('.xsd'):
-                        return []
-                    
-                    namespace, schema_location = process_schema_path(schema_path)
-                    if not namespace or not schema_location:
-                        return []
-                    
-                    base_name = os.path.splitext(filename)[0]
-                    return [{
-                        "설명": "스키마 namespace 치환",
-                        "찾기": {
-                            "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'namespace="{namespace}"'
-                        }
-                    },
-                    {
-                        "설명": "스키마 schemaLocation 치환",
-                        "찾기": {
-                            "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'schemaLocation="{schema_location}"'
-                        }
-                    }]
-                
-                def extract_process_path(file_path):
-                    """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출"""
-                    if not isinstance(file_path, str):
-                        return ""
-                    
-                    normalized_path = file_path.replace('\\', '/')
-                    processes_idx = normalized_path.find('Processes/')
-                    if processes_idx == -1:
-                        return ""
-                    
-                    return normalized_path[processes_idx + len('Processes/'):]
-                
-                def create_process_replacements(source_path, target_path, match_row, normal_row):
-                    """프로세스 파일의 치환 목록 생성"""
-                    if not isinstance(source_path, str) or not isinstance(target_path, str):
-                        return []
-                    
-                    source_filename = extract_filename(source_path)
-                    target_process_path = extract_process_path(target_path)
-                    
-                    if not source_filename or not target_process_path:
-                        return []
-                    
-                    replacements = [{
-                        "설명": "프로세스 이름 치환",
-                        "찾기": {
-                            "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
-                        },
-                        "교체": {
-                            "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
-                        }
-                    }]
-                    
-                    # 고정 문자열 치환 규칙들
-                    fixed_replacements = [
-                        {
-                            "설명": "LHMES_MGR 치환",
-                            "찾기": {"정규식": "LHMES_MGR"},
-                            "교체": {"값": "LYMES_MGR"}
-                        },
-                        {
-                            "설명": "VOMES_MGR 치환",
-                            "찾기": {"정규식": "VOMES_MGR"},
-                            "교체": {"값": "LZMES_MGR"}
-                        },
-                        {
-                            "설명": "LH 문자열 치환",
-                            "찾기": {"정규식": "'LH'"},
-                            "교체": {"값": "'LY'"}
-                        },
-                        {
-                            "설명": "VO 문자열 치환",
-                            "찾기": {"정규식": "'VO'"},
-                            "교체": {"값": "'LZ'"}
-                        }
-                    ]
-                    replacements.extend(fixed_replacements)
-                    
-                    # 동적 치환 규칙들
-                    try:
-                        if 'Group ID' in match_row.index and 'Event_ID' in match_row.index:
-                            origin_ifid = f"{match_row['Group ID']}.{match_row['Event_ID']}"
-                            dest_ifid = f"{normal_row['Group ID']}.{match_row['Event_ID']}"
-                            
-                            if origin_ifid != dest_ifid:
-                                replacements.append({
-                                    "설명": "IFID 치환",
-                                    "찾기": {"정규식": origin_ifid.replace(".", "\\.")},
-                                    "교체": {"값": dest_ifid}
-                                })
-                    except:
-                        pass
-                    
-                    return replacements
-                
-                # 1. 송신파일경로 처리
-                if (pd.notna(normal_row.get('송신파일생성여부')) and 
-                    str(normal_row.get('송신파일생성여부')).strip() == '1'):
-                    
-                    yaml_structure[f"{i//2 + 1}번째 행"]["송신파일경로"] = {
-                        "원본파일": match_row.get('송신파일경로', ''),
-                        "복사파일": modify_path(normal_row.get('송신파일경로', '')),
-                        "치환목록": create_schema_replacements(
-                            extract_filename(normal_row.get('송신스키마파일명', '')),
-                            normal_row.get('송신스키마파일명', '')
-                        ) + create_process_replacements(
-                            match_row.get('송신파일경로', ''),
-                            normal_row.get('송신파일경로', ''),
-                            match_row,
-                            normal_row
-                        )
-                    }
-                    print(f"  송신파일경로 생성: {match_row.get('송신파일경로', '')} -> {modify_path(normal_row.get('송신파일경로', ''))}")
-                
-                # 2. 수신파일경로 처리
-                if (pd.notna(normal_row.get('수신파일생성여부')) and 
-                    str(normal_row.get('수신파일생성여부')).strip() == '1'):
-                    
-                    yaml_structure[f"{i//2 + 1}번째 행"]["수신파일경로"] = {
-                        "원본파일": match_row.get('수신파일경로', ''),
-                        "복사파일": modify_path(normal_row.get('수신파일경로', '')),
-                        "치환목록": create_schema_replacements(
-                            extract_filename(normal_row.get('수신스키마파일명', '')),
-                            normal_row.get('수신스키마파일명', '')
-                        ) + create_process_replacements(
-                            match_row.get('수신파일경로', ''),
-                            normal_row.get('수신파일경로', ''),
-                            match_row,
-                            normal_row
-                        )
-                    }
-                    print(f"  수신파일경로 생성: {match_row.get('수신파일경로', '')} -> {modify_path(normal_row.get('수신파일경로', ''))}")
-                
-                # 3. 송신스키마파일명 처리
-                if (pd.notna(normal_row.get('송신스키마파일생성여부')) and 
-                    str(normal_row.get('송신스키마파일생성여부')).strip() == '1'):
-                    
-                    base_name = os.path.splitext(os.path.basename(normal_row.get('송신스키마파일명', '')))[0]
-                    namespace, _ = process_schema_path(normal_row.get('송신스키마파일명', ''))
-                    
-                    if namespace:
-                        yaml_structure[f"{i//2 + 1}번째 행"]["송신스키마파일명"] = {
-                            "원본파일": match_row.get('송신스키마파일명', ''),
-                            "복사파일": modify_path(normal_row.get('송신스키마파일명', '')),
-                            "치환목록": [{
-                                "설명": "xs:schema xmlns 치환",
-                                "찾기": {"정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'},
-                                "교체": {"값": f'xmlns="{namespace}"'}
-                            },
-                            {
-                                "설명": "xs:schema targetNamespace 치환",
-                                "찾기": {"정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'},
-                                "교체": {"값": f'targetNamespace="{namespace}"'}
-                            }]
-                        }
-                        print(f"  송신스키마파일명 생성: {match_row.get('송신스키마파일명', '')} -> {modify_path(normal_row.get('송신스키마파일명', ''))}")
-                
-                # 4. 수신스키마파일명 처리
-                if (pd.notna(normal_row.get('수신스키마파일생성여부')) and 
-                    str(normal_row.get('수신스키마파일생성여부')).strip() == '1'):
-                    
-                    base_name = os.path.splitext(os.path.basename(normal_row.get('수신스키마파일명', '')))[0]
-                    namespace, _ = process_schema_path(normal_row.get('수신스키마파일명', ''))
-                    
-                    if namespace:
-                        yaml_structure[f"{i//2 + 1}번째 행"]["수신스키마파일명"] = {
-                            "원본파일": match_row.get('수신스키마파일명', ''),
-                            "복사파일": modify_path(normal_row.get('수신스키마파일명', '')),
-                            "치환목록": [{
-                                "설명": "xs:schema xmlns 치환",
-                                "찾기": {"정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'},
-                                "교체": {"값": f'xmlns="{namespace}"'}
-                            },
-                            {
-                                "설명": "xs:schema targetNamespace 치환",
-                                "찾기": {"정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'},
-                                "교체": {"값": f'targetNamespace="{namespace}"'}
-                            }]
-                        }
-                        print(f"  수신스키마파일명 생성: {match_row.get('수신스키마파일명', '')} -> {modify_path(normal_row.get('수신스키마파일명', ''))}")
-                
-                # YAML 구조 출력 (디버그 모드일 때)
-                if self.debug_mode and yaml_structure[f"{i//2 + 1}번째 행"]:
-                    self.debug_print("\nYAML 구조:")
-                    self.debug_print(yaml.dump(yaml_structure, allow_unicode=True, sort_keys=False))
+            # 2행씩 처리 (일반행, 매칭행) - 마지막 행이 홀수이면 제외
+            pair_count = len(df) // 2
+            pairs = ((i//2 + 1, df.iloc[i], df.iloc[i+1]) for i in range(0, len(df) - 1, 2))
+            if workers > 1 and pair_count > 1:
+                print(f"병렬 생성: {workers}개 프로세스")
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._build_row_block_captured, pairs,
+                                                chunksize=max(1, pair_count // (workers * 8))))
+            else:
+                results = (('', self._build_row_block(row_number, normal_row, match_row))
+                           for row_number, normal_row, match_row in pairs)
+            
+            for output, yaml_structure in results:
+                # 작업자에서 모아 둔 출력은 행 순서대로 출력
+                print(output, end='')
                 
                 # 전체 YAML 구조에 추가
                 full_yaml_structure.update(yaml_structure)
@@ -320,6 +140,265 @@ class YAMLProcessor:
             print(f"Excel to YAML 변환 중 오류 발생: {str(e)}")
             return False
     
+    def _build_row_block(self, row_number: int, normal_row: pd.Series, match_row: pd.Series) -> Dict:
+        """
+        행 쌍(일반행, 매칭행) 하나의 YAML 블록을 생성
+        
+        Args:
+            row_number: 행 쌍 번호 (1부터)
+            normal_row: 일반행
+            match_row: 매칭행
+            
+        Returns:
+            {"N번째 행": {파일 타입: 항목}}
+        """
+        print(f"\n=== {row_number}번째 행 쌍 처리 ===")
+        
+        yaml_structure = {
+            f"{row_number}번째 행": {}
+        }
+
+        # 파일 경로 처리 함수들
+        def modify_path(path):
+            """파일 경로를 수정하는 함수"""
+            if isinstance(path, str) and path.startswith("C:\\BwProject"):
+                return path.replace("C:\\BwProject", "C:\\TBwProject")
+            return path
+
+        def extract_filename(path):
+            """파일 경로에서 파일명만 추출"""
+            if not isinstance(path, str):
+                return ""
+            return os.path.basename(path)
+
+        def process_schema_path(schema_path):
+            """스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성"""
+            if not isinstance(schema_path, str):
+                return None, None
+
+            normalized_path = schema_path.replace('\\', '/')
+            shared_idx = normalized_path.find('/SharedResources')
+            if shared_idx == -1:
+                return None, None
+
+            bb_start = normalized_path.rfind('/', 0, shared_idx)
+            if bb_start == -1:
+                return None, None
+
+            relative_path = normalized_path[bb_start:]
+            schema_location = relative_path[relative_path.find('/SharedResources'):]
+            namespace = f"http://www.tibco.com/schemas{relative_path}"
+
+            return namespace, schema_location
+
+        def create_schema_replacements(filename, schema_path):
+            """스키마 파일 치환 목록 생성"""
+            if not filename.endswith('.xsd'):
+                return []
+
+            namespace, schema_location = process_schema_path(schema_path)
+            if not namespace or not schema_location:
+                return []
+
+            base_name = os.path.splitext(filename)[0]
+            return [{
+                "설명": "스키마 namespace 치환",
+                "찾기": {
+                    "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                },
+                "교체": {
+                    "값": f'namespace="{namespace}"'
+                }
+            },
+            {
+                "설명": "스키마 schemaLocation 치환",
+                "찾기": {
+                    "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                },
+                "교체": {
+                    "값": f'schemaLocation="{schema_location}"'
+                }
+            }]
+
+        def extract_process_path(file_path):
+            """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출"""
+            if not isinstance(file_path, str):
+                return ""
+
+            normalized_path = file_path.replace('\\', '/')
+            processes_idx = normalized_path.find('Processes/')
+            if processes_idx == -1:
+                return ""
+
+            return normalized_path[processes_idx + len('Processes/'):]
+
+        def create_process_replacements(source_path, target_path, match_row, normal_row):
+            """프로세스 파일의 치환 목록 생성"""
+            if not isinstance(source_path, str) or not isinstance(target_path, str):
+                return []
+
+            source_filename = extract_filename(source_path)
+            target_process_path = extract_process_path(target_path)
+
+            if not source_filename or not target_process_path:
+                return []
+
+            replacements = [{
+                "설명": "프로세스 이름 치환",
+                "찾기": {
+                    "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
+                },
+                "교체": {
+                    "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
+                }
+            }]
+
+            # 고정 문자열 치환 규칙들
+            fixed_replacements = [
+                {
+                    "설명": "LHMES_MGR 치환",
+                    "찾기": {"정규식": "LHMES_MGR"},
+                    "교체": {"값": "LYMES_MGR"}
+                },
+                {
+                    "설명": "VOMES_MGR 치환",
+                    "찾기": {"정규식": "VOMES_MGR"},
+                    "교체": {"값": "LZMES_MGR"}
+                },
+                {
+                    "설명": "LH 문자열 치환",
+                    "찾기": {"정규식": "'LH'"},
+                    "교체": {"값": "'LY'"}
+                },
+                {
+                    "설명": "VO 문자열 치환",
+                    "찾기": {"정규식": "'VO'"},
+                    "교체": {"값": "'LZ'"}
+                }
+            ]
+            replacements.extend(fixed_replacements)
+
+            # 동적 치환 규칙들
+            try:
+                if 'Group ID' in match_row.index and 'Event_ID' in match_row.index:
+                    origin_ifid = f"{match_row['Group ID']}.{match_row['Event_ID']}"
+                    dest_ifid = f"{normal_row['Group ID']}.{match_row['Event_ID']}"
+
+                    if origin_ifid != dest_ifid:
+                        replacements.append({
+                            "설명": "IFID 치환",
+                            "찾기": {"정규식": origin_ifid.replace(".", "\\.")},
+                            "교체": {"값": dest_ifid}
+                        })
+            except:
+                pass
+
+            return replacements
+
+        # 1. 송신파일경로 처리
+        if (pd.notna(normal_row.get('송신파일생성여부')) and 
+            str(normal_row.get('송신파일생성여부')).strip() == '1'):
+
+            yaml_structure[f"{row_number}번째 행"]["송신파일경로"] = {
+                "원본파일": match_row.get('송신파일경로', ''),
+                "복사파일": modify_path(normal_row.get('송신파일경로', '')),
+                "치환목록": create_schema_replacements(
+                    extract_filename(normal_row.get('송신스키마파일명', '')),
+                    normal_row.get('송신스키마파일명', '')
+                ) + create_process_replacements(
+                    match_row.get('송신파일경로', ''),
+                    normal_row.get('송신파일경로', ''),
+                    match_row,
+                    normal_row
+                )
+            }
+            print(f"  송신파일경로 생성: {match_row.get('송신파일경로', '')} -> {modify_path(normal_row.get('송신파일경로', ''))}")
+
+        # 2. 수신파일경로 처리
+        if (pd.notna(normal_row.get('수신파일생성여부')) and 
+            str(normal_row.get('수신파일생성여부')).strip() == '1'):
+
+            yaml_structure[f"{row_number}번째 행"]["수신파일경로"] = {
+                "원본파일": match_row.get('수신파일경로', ''),
+                "복사파일": modify_path(normal_row.get('수신파일경로', '')),
+                "치환목록": create_schema_replacements(
+                    extract_filename(normal_row.get('수신스키마파일명', '')),
+                    normal_row.get('수신스키마파일명', '')
+                ) + create_process_replacements(
+                    match_row.get('수신파일경로', ''),
+                    normal_row.get('수신파일경로', ''),
+                    match_row,
+                    normal_row
+                )
+            }
+            print(f"  수신파일경로 생성: {match_row.get('수신파일경로', '')} -> {modify_path(normal_row.get('수신파일경로', ''))}")
+
+        # 3. 송신스키마파일명 처리
+        if (pd.notna(normal_row.get('송신스키마파일생성여부')) and 
+            str(normal_row.get('송신스키마파일생성여부')).strip() == '1'):
+
+            base_name = os.path.splitext(os.path.basename(normal_row.get('송신스키마파일명', '')))[0]
+            namespace, _ = process_schema_path(normal_row.get('송신스키마파일명', ''))
+
+            if namespace:
+                yaml_structure[f"{row_number}번째 행"]["송신스키마파일명"] = {
+                    "원본파일": match_row.get('송신스키마파일명', ''),
+                    "복사파일": modify_path(normal_row.get('송신스키마파일명', '')),
+                    "치환목록": [{
+                        "설명": "xs:schema xmlns 치환",
+                        "찾기": {"정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'},
+                        "교체": {"값": f'xmlns="{namespace}"'}
+                    },
+                    {
+                        "설명": "xs:schema targetNamespace 치환",
+                        "찾기": {"정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'},
+                        "교체": {"값": f'targetNamespace="{namespace}"'}
+                    }]
+                }
+                print(f"  송신스키마파일명 생성: {match_row.get('송신스키마파일명', '')} -> {modify_path(normal_row.get('송신스키마파일명', ''))}")
+
+        # 4. 수신스키마파일명 처리
+        if (pd.notna(normal_row.get('수신스키마파일생성여부')) and 
+            str(normal_row.get('수신스키마파일생성여부')).strip() == '1'):
+
+            base_name = os.path.splitext(os.path.basename(normal_row.get('수신스키마파일명', '')))[0]
+            namespace, _ = process_schema_path(normal_row.get('수신스키마파일명', ''))
+
+            if namespace:
+                yaml_structure[f"{row_number}번째 행"]["수신스키마파일명"] = {
+                    "원본파일": match_row.get('수신스키마파일명', ''),
+                    "복사파일": modify_path(normal_row.get('수신스키마파일명', '')),
+                    "치환목록": [{
+                        "설명": "xs:schema xmlns 치환",
+                        "찾기": {"정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'},
+                        "교체": {"값": f'xmlns="{namespace}"'}
+                    },
+                    {
+                        "설명": "xs:schema targetNamespace 치환",
+                        "찾기": {"정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'},
+                        "교체": {"값": f'targetNamespace="{namespace}"'}
+                    }]
+                }
+                print(f"  수신스키마파일명 생성: {match_row.get('수신스키마파일명', '')} -> {modify_path(normal_row.get('수신스키마파일명', ''))}")
+
+        # YAML 구조 출력 (디버그 모드일 때)
+        if self.debug_mode and yaml_structure[f"{row_number}번째 행"]:
+            self.debug_print("\nYAML 구조:")
+            self.debug_print(yaml.dump(yaml_structure, allow_unicode=True, sort_keys=False))
+        
+        return yaml_structure
+    
+    def _build_row_block_captured(self, pair: Tuple[int, pd.Series, pd.Series]) -> Tuple[str, Dict]:
+        """
+        프로세스 풀 작업자에서 행 쌍 블록을 생성하고, 그 사이의 화면 출력을 모아 함께 반환
+        (출력 순서가 섞이지 않도록 부모 프로세스가 행 순서대로 출력)
+        """
+        row_number, normal_row, match_row = pair
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            yaml_structure = self._build_row_block(row_number, normal_row, match_row)
+        return output.getvalue(), yaml_structure
+    
     def apply_schema_replacements(self, file_path: str, replacements: List[Dict]) -> bool:
         """
         파일에 치환 목록을 적용
@@ -351,17 +430,14 @@ class YAMLProcessor:
                 self.debug_print(f"정규식 패턴: {pattern}")
                 self.debug_print(f"교체할 값: {replacement}")
                 
-                # 패턴 매칭 확인
-                matches = list(re.finditer(pattern, content))
-                if not matches:
-                    self.debug_print("패턴이 파일에서 발견되지 않음")
-                    continue
-                
-                self.debug_print(f"패턴 매칭 수: {len(matches)}")
-                
                 try:
-                    # 정규식 치환 수행
-                    new_content = re.sub(pattern, replacement, content)
+                    # 정규식 치환 수행 (치환과 매칭 수 계산을 subn 한 번으로 처리)
+                    new_content, match_count = self._compile_pattern(pattern).subn(replacement, content)
+                    if not match_count:
+                        self.debug_print("패턴이 파일에서 발견되지 않음")
+                        continue
+                    
+                    self.debug_print(f"패턴 매칭 수: {match_count}")
                     if new_content != content:
                         content = new_content
                         modified = True
@@ -387,6 +463,22 @@ class YAMLProcessor:
             self.debug_print(f"치환 작업 중 예외 발생: {str(e)}")
             return False
     
+    def _compile_pattern(self, pattern: str):
+        """
+        정규식을 컴파일하고 캐시합니다.
+        
+        Args:
+            pattern: 정규식 문자열
+            
+        Returns:
+            컴파일된 정규식 객체
+        """
+        compiled = self._pattern_cache.get(pattern)
+        if compiled is None:
+            compiled = re.compile(pattern)
+            self._pattern_cache[pattern] = compiled
+        return compiled
+    
     def copy_file_with_check(self, source: str, dest: str) -> bool:
         """
         파일을 복사하되, 대상 파일이 이미 존재하면 경고 출력
@@ -430,11 +522,11 @@ class YAMLProcessor:
         try:
             self.debug_print(f"YAML 파일 읽기 시작: {yaml_path}")
             
-            # YAML 파일 읽기
-            with open(yaml_path, 'r', encoding='utf-8') as yf:
-                data = yaml.safe_load(yf)
+            # YAML은 행 단위로 읽으면서 바로 실행 (전체를 메모리에 올리지 않음)
+            rows = iter_yaml_rows(yaml_path)
+            first_row = next(rows, None)
             
-            if not data:
+            if first_row is None:
                 print("실행할 작업이 없습니다.")
                 return False
             
@@ -451,7 +543,7 @@ class YAMLProcessor:
             total_replacements = 0
             
             # 각 행 처리
-            for row_key, row_data in data.items():
+            for row_key, row_data in itertools.chain([first_row], rows):
                 self.debug_print(f"\n=== {row_key} 처리 시작 ===")
                 
                 # 각 파일 타입 처리
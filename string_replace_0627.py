@@ -6,6 +6,10 @@ import datetime
 import pandas as pd
 import shutil
 import re
+import io
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from string_replacer_engine import compile_plan
 
 # 디버그 모드 설정
 DEBUG_MODE = True  # 디버그 정보 출력 여부를 제어하는 플래그
@@ -24,399 +28,427 @@ except ImportError:
     print("pip install chardet 명령어로 설치할 수 있습니다.")
     HAS_CHARDET = False
 
-def generate_yaml_from_excel(excel_path, yaml_path):
-    """엑셀 파일을 읽어 YAML 파일을 생성한다."""
-    # pandas로 엑셀 파일 읽기
-    df = pd.read_excel(excel_path, engine='openpyxl')
-    
-    # 전체 YAML 구조를 저장할 딕셔너리
-    full_yaml_structure = {}
-    
-    # 2행씩 처리 (일반행, 매칭행)
-    for i in range(0, len(df), 2):
-        if i + 1 >= len(df):  # 마지막 행이 홀수인 경우 처리
-            break
-            
-        normal_row = df.iloc[i]  # 일반행
-        match_row = df.iloc[i+1]  # 매칭행
-        
-        print(f"\n=== {i//2 + 1}번째 행 쌍 ===")
-        
-        # 파일 생성 여부 확인 및 YAML 구조 생성
-        yaml_structure = {
-            f"{i//2 + 1}번째 행": {}
-        }
-        
-        # 파일경로에서 계산된 namespace 저장 변수
-        송신_namespace_from_path = None
-        수신_namespace_from_path = None
-        
-        # Group ID 읽기
-        group_id = normal_row.get('Group ID', '')
-        debug_print(f"Group ID: {group_id}")
-        
-        def modify_path(path):
-            """파일 경로를 수정하는 함수 (테스트용)"""
-            if isinstance(path, str) and path.startswith("C:\\BwProject"):
-                return path.replace("C:\\BwProject", "C:\\TBwProject")
-            return path
-
-        def extract_filename(path):
-            """파일 경로에서 파일명만 추출"""
-            if not isinstance(path, str):
-                return ""
-            return os.path.basename(path)
-
-        def extract_process_filename(path):
-            """프로세스 파일 경로에서 파일명만 추출"""
-            if not isinstance(path, str):
-                return ""
-            return os.path.basename(path)
-
-        def extract_existing_namespace(source_file_path, base_name):
-            """
-            소스 파일에서 기존 namespace를 추출
-            
-            Args:
-                source_file_path: 소스 파일 경로
-                base_name: 스키마 파일의 기본 이름
-                
-            Returns:
-                기존 namespace 또는 None
-            """
-            if not source_file_path or not os.path.exists(source_file_path):
-                return None
-                
-            try:
-                with open(source_file_path, 'r', encoding='utf-8') as f:
-                    source_content = f.read()
-                    
-                # namespace 패턴 찾기
-                namespace_pattern = f'namespace\\s*=\\s*"([^"]*{base_name}[^"]*)"'
-                match = re.search(namespace_pattern, source_content)
-                
-                if match:
-                    return match.group(1)
-                
-                # xmlns:pfx3 패턴도 확인
-                xmlns_pattern = f'xmlns:pfx3\\s*=\\s*"([^"]*{base_name}[^"]*)"'
-                match = re.search(xmlns_pattern, source_content)
-                
-                if match:
-                    return match.group(1)
-                    
-            except Exception as e:
-                debug_print(f"기존 namespace 추출 중 오류: {e}")
-                
+def build_row_block(row_number, normal_row, match_row):
+    """행 쌍(일반행, 매칭행) 하나의 YAML 구조를 만든다. (프로세스 풀 작업자에서도 호출)"""
+    print(f"\n=== {row_number}번째 행 쌍 ===")
+
+    # 파일 생성 여부 확인 및 YAML 구조 생성
+    yaml_structure = {
+        f"{row_number}번째 행": {}
+    }
+
+    # 파일경로에서 계산된 namespace 저장 변수
+    송신_namespace_from_path = None
+    수신_namespace_from_path = None
+
+    # Group ID 읽기
+    group_id = normal_row.get('Group ID', '')
+    debug_print(f"Group ID: {group_id}")
+
+    def modify_path(path):
+        """파일 경로를 수정하는 함수 (테스트용)"""
+        if isinstance(path, str) and path.startswith("C:\\BwProject"):
+            return path.replace("C:\\BwProject", "C:\\TBwProject")
+        return path
+
+    def extract_filename(path):
+        """파일 경로에서 파일명만 추출"""
+        if not isinstance(path, str):
+            return ""
+        return os.path.basename(path)
+
+    def extract_process_filename(path):
+        """프로세스 파일 경로에서 파일명만 추출"""
+        if not isinstance(path, str):
+            return ""
+        return os.path.basename(path)
+
+    def extract_existing_namespace(source_file_path, base_name):
+        """
+        소스 파일에서 기존 namespace를 추출
+
+        Args:
+            source_file_path: 소스 파일 경로
+            base_name: 스키마 파일의 기본 이름
+
+        Returns:
+            기존 namespace 또는 None
+        """
+        if not source_file_path or not os.path.exists(source_file_path):
             return None
 
-        def process_schema_path(schema_path, preserve_no_namespace=False, group_id=None):
-            """
-            스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성
-            
-            Args:
-                schema_path: 스키마 파일 경로
-                preserve_no_namespace: no_namespace_schema 경로 보존 여부
-                group_id: Group ID 값 (엑셀에서 읽어온 값)
-            """
-            if not isinstance(schema_path, str):
-                return None, None
-            
-            # 1. 경로 구분자 변경
-            normalized_path = schema_path.replace('\\', '/')
-            
-            # 2. '/SharedResources' 이후 부분 추출
-            shared_idx = normalized_path.find('/SharedResources')
-            if shared_idx == -1:
-                return None, None
-                
-            # BB 부분을 포함한 경로 추출 (Group ID가 없을 때 사용)
-            bb_start = normalized_path.rfind('/', 0, shared_idx)
-            if bb_start == -1:
-                return None, None
-                
-            relative_path = normalized_path[bb_start:]  # /BB/SharedResources/...
-            schema_location = relative_path[relative_path.find('/SharedResources'):]  # /SharedResources/...
-            
-            # no_namespace_schema 처리 로직
-            if preserve_no_namespace:
-                # SharedResources 이전 부분은 상수로 대체하고 SharedResources 이후만 새로운 로직 적용
-                namespace = f"http://www.tibco.com/ns/no_namespace_schema_location{schema_location}"
+        try:
+            with open(source_file_path, 'r', encoding='utf-8') as f:
+                source_content = f.read()
+
+            # namespace 패턴 찾기
+            namespace_pattern = f'namespace\\s*=\\s*"([^"]*{base_name}[^"]*)"'
+            match = re.search(namespace_pattern, source_content)
+
+            if match:
+                return match.group(1)
+
+            # xmlns:pfx3 패턴도 확인
+            xmlns_pattern = f'xmlns:pfx3\\s*=\\s*"([^"]*{base_name}[^"]*)"'
+            match = re.search(xmlns_pattern, source_content)
+
+            if match:
+                return match.group(1)
+
+        except Exception as e:
+            debug_print(f"기존 namespace 추출 중 오류: {e}")
+
+        return None
+
+    def process_schema_path(schema_path, preserve_no_namespace=False, group_id=None):
+        """
+        스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성
+
+        Args:
+            schema_path: 스키마 파일 경로
+            preserve_no_namespace: no_namespace_schema 경로 보존 여부
+            group_id: Group ID 값 (엑셀에서 읽어온 값)
+        """
+        if not isinstance(schema_path, str):
+            return None, None
+
+        # 1. 경로 구분자 변경
+        normalized_path = schema_path.replace('\\', '/')
+
+        # 2. '/SharedResources' 이후 부분 추출
+        shared_idx = normalized_path.find('/SharedResources')
+        if shared_idx == -1:
+            return None, None
+
+        # BB 부분을 포함한 경로 추출 (Group ID가 없을 때 사용)
+        bb_start = normalized_path.rfind('/', 0, shared_idx)
+        if bb_start == -1:
+            return None, None
+
+        relative_path = normalized_path[bb_start:]  # /BB/SharedResources/...
+        schema_location = relative_path[relative_path.find('/SharedResources'):]  # /SharedResources/...
+
+        # no_namespace_schema 처리 로직
+        if preserve_no_namespace:
+            # SharedResources 이전 부분은 상수로 대체하고 SharedResources 이후만 새로운 로직 적용
+            namespace = f"http://www.tibco.com/ns/no_namespace_schema_location{schema_location}"
+        else:
+            # Group ID가 있으면 사용, 없으면 기존 로직
+            if group_id and str(group_id).strip():
+                namespace = f"http://www.tibco.com/schemas/{group_id}{schema_location}"
+                debug_print(f"Group ID를 사용한 namespace 생성: {namespace}")
             else:
-                # Group ID가 있으면 사용, 없으면 기존 로직
-                if group_id and str(group_id).strip():
-                    namespace = f"http://www.tibco.com/schemas/{group_id}{schema_location}"
-                    debug_print(f"Group ID를 사용한 namespace 생성: {namespace}")
-                else:
-                    # 기존 로직 그대로 적용
-                    namespace = f"http://www.tibco.com/schemas{relative_path}"
-                    debug_print(f"기존 로직을 사용한 namespace 생성: {namespace}")
-            
-            return namespace, schema_location
+                # 기존 로직 그대로 적용
+                namespace = f"http://www.tibco.com/schemas{relative_path}"
+                debug_print(f"기존 로직을 사용한 namespace 생성: {namespace}")
+
+        return namespace, schema_location
+
+    def create_schema_replacements(filename, schema_path, source_file_path=None, group_id=None):
+        """스키마 파일 치환 목록 생성"""
+        if not filename.endswith('.xsd'):
+            return []
+
+        base_name = os.path.splitext(filename)[0]
+
+        # 소스 파일에서 기존 namespace 확인
+        has_no_namespace = False
+        if source_file_path:
+            existing_namespace = extract_existing_namespace(source_file_path, base_name)
+            if existing_namespace and 'no_namespace_schema' in existing_namespace:
+                has_no_namespace = True
+                debug_print(f"no_namespace_schema 감지됨: {existing_namespace}")
+
+        # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
+        namespace, schema_location = process_schema_path(schema_path, preserve_no_namespace=has_no_namespace, group_id=group_id)
+        if not namespace or not schema_location:
+            return []
+        return [{
+            "설명": "스키마 namespace 치환",
+            "찾기": {
+                "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
+            },
+            "교체": {
+                "값": f'namespace="{namespace}"'
+            }
+        },
+        {
+            "설명": "스키마 schemaLocation 치환",
+            "찾기": {
+                "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
+            },
+            "교체": {
+                "값": f'schemaLocation="{schema_location}"'
+            }
+        },
+        {
+            "설명": "ProcessDefinition namespace 치환",
+            "찾기": {
+                "정규식": f'xmlns:pfx3\\s*=\\s*"[^"]*{base_name}[^"]*"'
+            },
+            "교체": {
+                "값": f'xmlns:pfx3="{namespace}"'
+            }
+        }]
 
-        def create_schema_replacements(filename, schema_path, source_file_path=None, group_id=None):
-            """스키마 파일 치환 목록 생성"""
-            if not filename.endswith('.xsd'):
-                return []
-            
-            base_name = os.path.splitext(filename)[0]
-            
-            # 소스 파일에서 기존 namespace 확인
-            has_no_namespace = False
-            if source_file_path:
-                existing_namespace = extract_existing_namespace(source_file_path, base_name)
-                if existing_namespace and 'no_namespace_schema' in existing_namespace:
-                    has_no_namespace = True
-                    debug_print(f"no_namespace_schema 감지됨: {existing_namespace}")
-            
-            # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
-            namespace, schema_location = process_schema_path(schema_path, preserve_no_namespace=has_no_namespace, group_id=group_id)
-            if not namespace or not schema_location:
-                return []
-            return [{
-                "설명": "스키마 namespace 치환",
-                "찾기": {
-                    "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                },
-                "교체": {
-                    "값": f'namespace="{namespace}"'
-                }
+    def extract_process_path(file_path):
+        """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출하고 디렉토리 구분자를 변경"""
+        if not isinstance(file_path, str):
+            return ""
+
+        # 디렉토리 구분자를 '/'로 통일
+        normalized_path = file_path.replace('\\', '/')
+
+        # 'Processes' 위치 찾기
+        processes_idx = normalized_path.find('Processes/')
+        if processes_idx == -1:
+            return ""
+
+        # 'Processes/' 이후의 경로 추출
+        relative_path = normalized_path[processes_idx + len('Processes/'):]
+
+        return relative_path
+
+    def create_process_replacements(source_path, target_path, match_row, normal_row):
+        """프로세스 파일의 치환 목록 생성"""
+        if not isinstance(source_path, str) or not isinstance(target_path, str):
+            return []
+
+        # 매칭행의 파일명으로 패턴 매칭 (찾을 패턴)
+        source_filename = extract_process_filename(source_path)
+        # 기본행의 경로에서 Processes 이후 경로 추출 (교체할 값)
+        target_process_path = extract_process_path(target_path)
+
+        if not source_filename or not target_process_path:
+            return []
+
+        replacements = []
+
+        # 추가 치환 규칙: "Check RTS_GM2" 또는 >Check RTS_GM2< → "Check RTS_GM 2" (프로세스 이름 보호)
+        replacements.append({
+            "설명": "Check RTS_GM2 → Check RTS_GM 2 치환 (따옴표/태그 대응)",
+            "찾기": {
+                "정규식": r'([">\s])([Cc]heck\s+)RTS_GM2(["<\s])'
             },
-            {
-                "설명": "스키마 schemaLocation 치환",
-                "찾기": {
-                    "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                },
-                "교체": {
-                    "값": f'schemaLocation="{schema_location}"'
-                }
+            "교체": {
+                "값": r'\1\2RTS_GM 2\3'
+            }
+        })
+
+        # 추가 치환 규칙: RTS_GM → RTS_GM2 (시스템 이름 변경)
+        replacements.append({
+            "설명": "RTS_GM → RTS_GM2 치환",
+            "찾기": {
+                "정규식": "RTS_GM"
             },
-            {
-                "설명": "ProcessDefinition namespace 치환",
-                "찾기": {
-                    "정규식": f'xmlns:pfx3\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                },
-                "교체": {
-                    "값": f'xmlns:pfx3="{namespace}"'
-                }
-            }]
-        
-        def extract_process_path(file_path):
-            """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출하고 디렉토리 구분자를 변경"""
-            if not isinstance(file_path, str):
-                return ""
-            
-            # 디렉토리 구분자를 '/'로 통일
-            normalized_path = file_path.replace('\\', '/')
-            
-            # 'Processes' 위치 찾기
-            processes_idx = normalized_path.find('Processes/')
-            if processes_idx == -1:
-                return ""
-            
-            # 'Processes/' 이후의 경로 추출
-            relative_path = normalized_path[processes_idx + len('Processes/'):]
-            
-            return relative_path
+            "교체": {
+                "값": "RTS_GM2"
+            }
+        })
 
-        def create_process_replacements(source_path, target_path, match_row, normal_row):
-            """프로세스 파일의 치환 목록 생성"""
-            if not isinstance(source_path, str) or not isinstance(target_path, str):
-                return []
-            
-            # 매칭행의 파일명으로 패턴 매칭 (찾을 패턴)
-            source_filename = extract_process_filename(source_path)
-            # 기본행의 경로에서 Processes 이후 경로 추출 (교체할 값)
-            target_process_path = extract_process_path(target_path)
-            
-            if not source_filename or not target_process_path:
-                return []
-            
-            replacements = []
-            
-            # 추가 치환 규칙: "Check RTS_GM2" 또는 >Check RTS_GM2< → "Check RTS_GM 2" (프로세스 이름 보호)
-            replacements.append({
-                "설명": "Check RTS_GM2 → Check RTS_GM 2 치환 (따옴표/태그 대응)",
-                "찾기": {
-                    "정규식": r'([">\s])([Cc]heck\s+)RTS_GM2(["<\s])'
-                },
-                "교체": {
-                    "값": r'\1\2RTS_GM 2\3'
-                }
-            })
-            
-            # 추가 치환 규칙: RTS_GM → RTS_GM2 (시스템 이름 변경)
-            replacements.append({
-                "설명": "RTS_GM → RTS_GM2 치환",
-                "찾기": {
-                    "정규식": "RTS_GM"
-                },
-                "교체": {
-                    "값": "RTS_GM2"
-                }
-            })
-            
-            # 프로세스 이름 치환 (RTS_GM 관련 치환 이후에 실행)
-            replacements.append({
-                "설명": "프로세스 이름 치환",
-                "찾기": {
-                    "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
+        # 프로세스 이름 치환 (RTS_GM 관련 치환 이후에 실행)
+        replacements.append({
+            "설명": "프로세스 이름 치환",
+            "찾기": {
+                "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
+            },
+            "교체": {
+                "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
+            }
+        })
+
+        return replacements
+
+    # 1. 송신파일경로 처리
+    if pd.notna(normal_row.get('송신파일생성여부')) and float(normal_row['송신파일생성여부']) == 1.0:
+        # 치환목록 계산
+        송신_치환목록 = create_schema_replacements(
+            extract_filename(normal_row['송신스키마파일명']),
+            normal_row['송신스키마파일명'],
+            match_row['송신파일경로'],  # 소스 파일 경로 전달
+            group_id  # Group ID 전달
+        ) + create_process_replacements(
+            match_row['송신파일경로'],    # 매칭행의 경로로 패턴 매칭
+            normal_row['송신파일경로'],    # 기본행의 경로로 교체
+            match_row,
+            normal_row
+        )
+
+        # "스키마 namespace 치환"에서 namespace 값 추출
+        for 치환 in 송신_치환목록:
+            if 치환.get("설명") == "스키마 namespace 치환":
+                # namespace="..." 형태에서 값 추출
+                namespace_value = 치환["교체"]["값"]
+                if 'namespace="' in namespace_value:
+                    송신_namespace_from_path = namespace_value.split('namespace="')[1].split('"')[0]
+                break
+
+        yaml_structure[f"{row_number}번째 행"]["송신파일경로"] = {
+            "원본파일": match_row['송신파일경로'],
+            "복사파일": modify_path(normal_row['송신파일경로']),  # 경로 수정
+            "치환목록": 송신_치환목록
+        }
+        print("\n[송신파일경로 생성]")
+        print(f"  원본파일: {match_row['송신파일경로']}")
+        print(f"  복사파일: {modify_path(normal_row['송신파일경로'])}")
+
+    # 2. 수신파일경로 처리
+    if pd.notna(normal_row.get('수신파일생성여부')) and float(normal_row['수신파일생성여부']) == 1.0:
+        # 치환목록 계산
+        수신_치환목록 = create_schema_replacements(
+            extract_filename(normal_row['수신스키마파일명']),
+            normal_row['수신스키마파일명'],
+            match_row['수신파일경로'],  # 소스 파일 경로 전달
+            group_id  # Group ID 전달
+        ) + create_process_replacements(
+            match_row['수신파일경로'],    # 매칭행의 경로로 패턴 매칭
+            normal_row['수신파일경로'],    # 기본행의 경로로 교체
+            match_row,
+            normal_row
+        )
+
+        # "스키마 namespace 치환"에서 namespace 값 추출
+        for 치환 in 수신_치환목록:
+            if 치환.get("설명") == "스키마 namespace 치환":
+                # namespace="..." 형태에서 값 추출
+                namespace_value = 치환["교체"]["값"]
+                if 'namespace="' in namespace_value:
+                    수신_namespace_from_path = namespace_value.split('namespace="')[1].split('"')[0]
+                break
+
+        yaml_structure[f"{row_number}번째 행"]["수신파일경로"] = {
+            "원본파일": match_row['수신파일경로'],
+            "복사파일": modify_path(normal_row['수신파일경로']),  # 경로 수정
+            "치환목록": 수신_치환목록
+        }
+        print("\n[수신파일경로 생성]")
+        print(f"  원본파일: {match_row['수신파일경로']}")
+        print(f"  복사파일: {modify_path(normal_row['수신파일경로'])}")
+
+    # 3. 송신스키마파일명 처리
+    if pd.notna(normal_row.get('송신스키마파일생성여부')) and float(normal_row['송신스키마파일생성여부']) == 1.0:
+        # 스키마 파일의 base_name 추출
+        base_name = os.path.splitext(os.path.basename(normal_row['송신스키마파일명']))[0]
+
+        schema_replacements = []
+
+        # 파일경로에서 추출한 namespace 사용
+        if 송신_namespace_from_path:
+            schema_replacements.extend([
+                {
+                    "설명": "xs:schema xmlns 치환",
+                    "찾기": {
+                        "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                    },
+                    "교체": {
+                        "값": f'xmlns="{송신_namespace_from_path}"'
+                    }
                 },
-                "교체": {
-                    "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
+                {
+                    "설명": "xs:schema targetNamespace 치환",
+                    "찾기": {
+                        "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                    },
+                    "교체": {
+                        "값": f'targetNamespace="{송신_namespace_from_path}"'
+                    }
                 }
-            })
-            
-            return replacements
-
-        # 1. 송신파일경로 처리
-        if pd.notna(normal_row.get('송신파일생성여부')) and float(normal_row['송신파일생성여부']) == 1.0:
-            # 치환목록 계산
-            송신_치환목록 = create_schema_replacements(
-                extract_filename(normal_row['송신스키마파일명']),
-                normal_row['송신스키마파일명'],
-                match_row['송신파일경로'],  # 소스 파일 경로 전달
-                group_id  # Group ID 전달
-            ) + create_process_replacements(
-                match_row['송신파일경로'],    # 매칭행의 경로로 패턴 매칭
-                normal_row['송신파일경로'],    # 기본행의 경로로 교체
-                match_row,
-                normal_row
-            )
-            
-            # "스키마 namespace 치환"에서 namespace 값 추출
-            for 치환 in 송신_치환목록:
-                if 치환.get("설명") == "스키마 namespace 치환":
-                    # namespace="..." 형태에서 값 추출
-                    namespace_value = 치환["교체"]["값"]
-                    if 'namespace="' in namespace_value:
-                        송신_namespace_from_path = namespace_value.split('namespace="')[1].split('"')[0]
-                    break
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["송신파일경로"] = {
-                "원본파일": match_row['송신파일경로'],
-                "복사파일": modify_path(normal_row['송신파일경로']),  # 경로 수정
-                "치환목록": 송신_치환목록
-            }
-            print("\n[송신파일경로 생성]")
-            print(f"  원본파일: {match_row['송신파일경로']}")
-            print(f"  복사파일: {modify_path(normal_row['송신파일경로'])}")
-        
-        # 2. 수신파일경로 처리
-        if pd.notna(normal_row.get('수신파일생성여부')) and float(normal_row['수신파일생성여부']) == 1.0:
-            # 치환목록 계산
-            수신_치환목록 = create_schema_replacements(
-                extract_filename(normal_row['수신스키마파일명']),
-                normal_row['수신스키마파일명'],
-                match_row['수신파일경로'],  # 소스 파일 경로 전달
-                group_id  # Group ID 전달
-            ) + create_process_replacements(
-                match_row['수신파일경로'],    # 매칭행의 경로로 패턴 매칭
-                normal_row['수신파일경로'],    # 기본행의 경로로 교체
-                match_row,
-                normal_row
-            )
-            
-            # "스키마 namespace 치환"에서 namespace 값 추출
-            for 치환 in 수신_치환목록:
-                if 치환.get("설명") == "스키마 namespace 치환":
-                    # namespace="..." 형태에서 값 추출
-                    namespace_value = 치환["교체"]["값"]
-                    if 'namespace="' in namespace_value:
-                        수신_namespace_from_path = namespace_value.split('namespace="')[1].split('"')[0]
-                    break
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["수신파일경로"] = {
-                "원본파일": match_row['수신파일경로'],
-                "복사파일": modify_path(normal_row['수신파일경로']),  # 경로 수정
-                "치환목록": 수신_치환목록
-            }
-            print("\n[수신파일경로 생성]")
-            print(f"  원본파일: {match_row['수신파일경로']}")
-            print(f"  복사파일: {modify_path(normal_row['수신파일경로'])}")
-        
-        # 3. 송신스키마파일명 처리
-        if pd.notna(normal_row.get('송신스키마파일생성여부')) and float(normal_row['송신스키마파일생성여부']) == 1.0:
-            # 스키마 파일의 base_name 추출
-            base_name = os.path.splitext(os.path.basename(normal_row['송신스키마파일명']))[0]
-            
-            schema_replacements = []
-            
-            # 파일경로에서 추출한 namespace 사용
-            if 송신_namespace_from_path:
-                schema_replacements.extend([
-                    {
-                        "설명": "xs:schema xmlns 치환",
-                        "찾기": {
-                            "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'xmlns="{송신_namespace_from_path}"'
-                        }
+            ])
+
+        yaml_structure[f"{row_number}번째 행"]["송신스키마파일명"] = {
+            "원본파일": match_row['송신스키마파일명'],
+            "복사파일": modify_path(normal_row['송신스키마파일명']),  # 경로 수정
+            "치환목록": schema_replacements
+        }
+        print("\n[송신스키마파일명 생성]")
+        print(f"  원본파일: {match_row['송신스키마파일명']}")
+        print(f"  복사파일: {modify_path(normal_row['송신스키마파일명'])}")
+
+    # 4. 수신스키마파일명 처리
+    if pd.notna(normal_row.get('수신스키마파일생성여부')) and float(normal_row['수신스키마파일생성여부']) == 1.0:
+        # 스키마 파일의 base_name 추출
+        base_name = os.path.splitext(os.path.basename(normal_row['수신스키마파일명']))[0]
+
+        schema_replacements = []
+
+        # 파일경로에서 추출한 namespace 사용
+        if 수신_namespace_from_path:
+            schema_replacements.extend([
+                {
+                    "설명": "xs:schema xmlns 치환",
+                    "찾기": {
+                        "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
                     },
-                    {
-                        "설명": "xs:schema targetNamespace 치환",
-                        "찾기": {
-                            "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'targetNamespace="{송신_namespace_from_path}"'
-                        }
+                    "교체": {
+                        "값": f'xmlns="{수신_namespace_from_path}"'
                     }
-                ])
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["송신스키마파일명"] = {
-                "원본파일": match_row['송신스키마파일명'],
-                "복사파일": modify_path(normal_row['송신스키마파일명']),  # 경로 수정
-                "치환목록": schema_replacements
-            }
-            print("\n[송신스키마파일명 생성]")
-            print(f"  원본파일: {match_row['송신스키마파일명']}")
-            print(f"  복사파일: {modify_path(normal_row['송신스키마파일명'])}")
-        
-        # 4. 수신스키마파일명 처리
-        if pd.notna(normal_row.get('수신스키마파일생성여부')) and float(normal_row['수신스키마파일생성여부']) == 1.0:
-            # 스키마 파일의 base_name 추출
-            base_name = os.path.splitext(os.path.basename(normal_row['수신스키마파일명']))[0]
-            
-            schema_replacements = []
-            
-            # 파일경로에서 추출한 namespace 사용
-            if 수신_namespace_from_path:
-                schema_replacements.extend([
-                    {
-                        "설명": "xs:schema xmlns 치환",
-                        "찾기": {
-                            "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'xmlns="{수신_namespace_from_path}"'
-                        }
+                },
+                {
+                    "설명": "xs:schema targetNamespace 치환",
+                    "찾기": {
+                        "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
                     },
-                    {
-                        "설명": "xs:schema targetNamespace 치환",
-                        "찾기": {
-                            "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'targetNamespace="{수신_namespace_from_path}"'
-                        }
+                    "교체": {
+                        "값": f'targetNamespace="{수신_namespace_from_path}"'
                     }
-                ])
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["수신스키마파일명"] = {
-                "원본파일": match_row['수신스키마파일명'],
-                "복사파일": modify_path(normal_row['수신스키마파일명']),  # 경로 수정
-                "치환목록": schema_replacements
-            }
-            print("\n[수신스키마파일명 생성]")
-            print(f"  원본파일: {match_row['수신스키마파일명']}")
-            print(f"  복사파일: {modify_path(normal_row['수신스키마파일명'])}")
-        
-        # YAML 구조 출력
-        print("\n[YAML 구조]")
-        print(yaml.dump(yaml_structure, allow_unicode=True, sort_keys=False))
-        print("=" * 50)
+                }
+            ])
+
+        yaml_structure[f"{row_number}번째 행"]["수신스키마파일명"] = {
+            "원본파일": match_row['수신스키마파일명'],
+            "복사파일": modify_path(normal_row['수신스키마파일명']),  # 경로 수정
+            "치환목록": schema_replacements
+        }
+        print("\n[수신스키마파일명 생성]")
+        print(f"  원본파일: {match_row['수신스키마파일명']}")
+        print(f"  복사파일: {modify_path(normal_row['수신스키마파일명'])}")
+
+    # YAML 구조 출력
+    print("\n[YAML 구조]")
+    print(yaml.dump(yaml_structure, allow_unicode=True, sort_keys=False))
+    print("=" * 50)
+    
+    return yaml_structure
+
+def _init_worker(debug_mode):
+    """프로세스 풀 작업자의 디버그 설정을 부모 프로세스와 맞춘다."""
+    global DEBUG_MODE
+    DEBUG_MODE = debug_mode
+
+def _build_row_block_captured(pair):
+    """작업자에서 행 쌍 구조를 만들고, 그 사이의 화면 출력을 모아 함께 반환한다."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        yaml_structure = build_row_block(*pair)
+    return output.getvalue(), yaml_structure
+
+def generate_yaml_from_excel(excel_path, yaml_path, workers=1):
+    """
+    엑셀 파일을 읽어 YAML 파일을 생성한다.
+
+    workers가 2 이상이면 행 쌍 구조를 프로세스 풀에서 동시에 만들고 원래 행 순서대로 합친다.
+    """
+    # pandas로 엑셀 파일 읽기
+    df = pd.read_excel(excel_path, engine='openpyxl')
+    
+    # 전체 YAML 구조를 저장할 딕셔너리
+    full_yaml_structure = {}
+    
+    # 2행씩 처리 (일반행, 매칭행) - 마지막 행이 홀수이면 제외
+    pair_count = len(df) // 2
+    pairs = ((i//2 + 1, df.iloc[i], df.iloc[i+1]) for i in range(0, len(df) - 1, 2))
+    if workers > 1 and pair_count > 1:
+        # 행 쌍을 동시에 만들고, 출력과 구조는 원래 행 순서대로 합침
+        print(f"병렬 생성: {workers}개 프로세스")
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(DEBUG_MODE,)) as executor:
+            results = list(executor.map(_build_row_block_captured, pairs,
+                                        chunksize=max(1, pair_count // (workers * 8))))
+    else:
+        results = (('', build_row_block(*pair)) for pair in pairs)
+    
+    for output, yaml_structure in results:
+        print(output, end='')
         
         # 전체 YAML 구조에 현재 구조 추가
         full_yaml_structure.update(yaml_structure)
@@ -514,8 +546,15 @@ def copy_file_with_check(source, dest):
         print(f"파일 복사 중 오류 발생: {str(e)}")
         return False
 
-def apply_schema_replacements(file_path, replacements):
-    """파일에 치환 목록을 적용합니다."""
+def apply_schema_replacements(file_path, replacements, rule_counts=None):
+    """
+    파일에 치환 목록을 적용합니다.
+    
+    Args:
+        file_path: 치환할 파일 경로
+        replacements: 치환 규칙 목록
+        rule_counts: 리스트를 전달하면 규칙별 치환 수가 추가됨 (로그용)
+    """
     try:
         debug_print(f"\n=== 파일 치환 시작: {file_path} ===")
         
@@ -545,44 +584,28 @@ def apply_schema_replacements(file_path, replacements):
                 content = content_bytes.decode('latin-1')
                 encoding = 'latin-1'
         
-        modified = False
-        # 각 치환 규칙 적용
-        for idx, repl in enumerate(replacements, 1):
-            debug_print(f"\n--- 치환 규칙 {idx}/{len(replacements)} 적용 시도 ---")
-            debug_print(f"설명: {repl.get('설명', '설명 없음')}")
-            
-            pattern = repl['찾기']['정규식']
-            replacement = repl['교체']['값']
-            
-            debug_print(f"정규식 패턴: {pattern}")
-            debug_print(f"교체할 값: {replacement}")
-            
-            # 패턴이 파일에 존재하는지 확인
-            matches = list(re.finditer(pattern, content))
-            if not matches:
+        # 치환목록은 한 번만 컴파일되어 같은 규칙을 쓰는 파일끼리 재사용됨
+        plan = compile_plan(replacements)
+        new_content, counts = plan.apply(content)
+        errors = plan.errors
+        if rule_counts is not None:
+            rule_counts.extend(counts)
+        
+        # 규칙별 결과 출력 (매칭 수는 subn 결과를 그대로 사용)
+        for rule, count in zip(plan.rules, counts):
+            debug_print(f"\n--- 치환 규칙 {rule.index}/{len(plan)} ---")
+            debug_print(f"설명: {rule.description}")
+            debug_print(f"정규식 패턴: {rule.pattern_text}")
+            debug_print(f"교체할 값: {rule.replacement}")
+            if rule.error or rule.index in errors:
+                debug_print(rule.error or errors[rule.index])
+            elif count:
+                debug_print(f"패턴 매칭 수: {count}")
+            else:
                 debug_print("패턴이 파일에서 발견되지 않음")
-                continue
-            debug_print(f"패턴 매칭 수: {len(matches)}")
-            
-            # 첫 번째 매칭 내용 출력
-            if matches:
-                first_match = matches[0]
-                debug_print("첫 번째 매칭:")
-                debug_print(f"  위치: {first_match.start()}-{first_match.end()}")
-                debug_print(f"  내용: {first_match.group()}")
-            
-            try:
-                # 정규식 치환 수행
-                new_content = re.sub(pattern, replacement, content)
-                if new_content == content:
-                    debug_print("치환 후 변경사항 없음")
-                else:
-                    content = new_content
-                    modified = True
-                    debug_print("치환 성공")
-            except Exception as e:
-                debug_print(f"치환 중 오류 발생: {str(e)}")
-                continue
+        
+        modified = new_content != content
+        content = new_content
         
         # 변경된 경우에만 파일 저장
         if modified:
@@ -779,6 +802,7 @@ def execute_replacements(yaml_path, log_path, summary_path):
                     debug_print(f"     교체: {repl.get('교체', {})}")
                 
             # 1. 파일 복사
+            rule_counts = []
             debug_print(f"\n파일 복사 시도: {source} -> {dest}")
             if copy_file_with_check(source, dest):
                 total_copies += 1
@@ -787,7 +811,7 @@ def execute_replacements(yaml_path, log_path, summary_path):
                 # 2. 치환 목록이 있는 경우 치환 수행
                 if replacements:
                     debug_print(f"치환 작업 시작: {dest}")
-                    if apply_schema_replacements(dest, replacements):
+                    if apply_schema_replacements(dest, replacements, rule_counts):
                         total_replacements += 1
                         debug_print("치환 작업 성공")
                     else:
@@ -798,13 +822,18 @@ def execute_replacements(yaml_path, log_path, summary_path):
             # 작업 결과 기록
             summary = f"{file_type}: {source} -> {dest}"
             if replacements:
-                summary += f" (치환: {len(replacements)}개 규칙)"
+                summary += f" (치환: {len(replacements)}개 규칙"
+                if rule_counts:
+                    summary += f", {sum(rule_counts)}건 치환"
+                summary += ")"
             summary_data.append(summary)
             debug_print(f"작업 결과: {summary}")
             
-            # 로그 기록
+            # 로그 기록 (규칙별 치환 건수 포함)
             with open(log_path, 'a', encoding='utf-8') as lf:
                 lf.write(f"[{datetime.datetime.now()}] {summary}\n")
+                for repl, count in zip(replacements, rule_counts):
+                    lf.write(f"    - {repl.get('설명', '설명 없음')}: {count}건\n")
 
     # 요약 파일 생성
     debug_print(f"\n요약 파일 생성: {summary_path}")
@@ -1,15 +1,47 @@
 import openpyxl
-import yaml
 import difflib
 import os
 import datetime
 import pandas as pd
-import shutil
-import re
+import argparse
+import contextlib
+import functools
+import hashlib
+import io
+from concurrent.futures import ProcessPoolExecutor
+from excel_row_pairs import RowPairs
+from namespace_index import NamespaceIndex
+from process_template import TemplateCache, compile_template
+import yaml_cache
+from yaml_cache import iter_yaml_rows, load_yaml_cached
+from string_replacer_engine import (
+    RULE_SET_REF, RULE_SETS_KEY, RULE_TIME_BUDGET, FILE_TIME_BUDGET, EditMap, compile_plan,
+    expand_rule_sets, rules_fingerprint, set_time_budget, time_budget
+)
+from string_replacer_journal import JOURNAL_DIR, IncrementalState, RunJournal, list_runs, rollback
+from string_replacer_plan import PlanWriter, close_plans, compress_output, job_key, load_plan, read_output
+from string_replacer_io import (
+    IOScheduler, BoundedCache, atomic_write, write_file, detect_file_encoding, sniff_encoding,
+    STREAM_THRESHOLD, bytes_mode_encoding, mmap_chunks, open_mmap, read_source, stream_write
+)
 
 # 디버그 모드 설정
 DEBUG_MODE = True  # 디버그 정보 출력 여부를 제어하는 플래그
 
+# 미리보기 diff에서 변경 줄 앞뒤에 보여 줄 줄 수 (--context)
+PREVIEW_CONTEXT = 3
+
+# 실행(메뉴 3)에서 YAML을 읽으며 한 번에 실행할 작업 수
+JOB_BATCH_SIZE = 500
+
+# 같은 원본 프로세스 파일에서 여러 파일을 만들 때 쓰는 템플릿 (원본 + 정규식 목록 단위)
+_process_templates = TemplateCache()
+
+# 실행(메뉴 3)에서 (원본 해시, 치환목록 지문) -> 치환 결과를 보관할 최대 크기
+# 같은 원본과 같은 치환목록을 쓰는 작업은 한 번만 치환하고 결과를 여러 대상에 씀
+OUTPUT_MEMO_BYTES = 64 * 1024 * 1024
+_output_memo = BoundedCache(OUTPUT_MEMO_BYTES)
+
 def debug_print(*args, **kwargs):
     """디버그 모드일 때만 메시지를 출력하는 함수"""
     if DEBUG_MODE:
@@ -24,594 +56,594 @@ except ImportError:
     print("pip install chardet 명령어로 설치할 수 있습니다.")
     HAS_CHARDET = False
 
-def generate_yaml_from_excel(excel_path, yaml_path):
-    """엑셀 파일을 읽어 YAML 파일을 생성한다."""
-    # pandas로 엑셀 파일 읽기
-    df = pd.read_excel(excel_path, engine='openpyxl')
-    
-    # 전체 YAML 구조를 저장할 딕셔너리
-    full_yaml_structure = {}
-    
-    # 2행씩 처리 (일반행, 매칭행)
-    for i in range(0, len(df), 2):
-        if i + 1 >= len(df):  # 마지막 행이 홀수인 경우 처리
-            break
-            
-        normal_row = df.iloc[i]  # 일반행
-        match_row = df.iloc[i+1]  # 매칭행
-        
-        print(f"\n=== {i//2 + 1}번째 행 쌍 ===")
-        
-        # 파일 생성 여부 확인 및 YAML 구조 생성
-        yaml_structure = {
-            f"{i//2 + 1}번째 행": {}
+# 모든 프로세스 파일에 공통으로 적용하는 고정 문자열 치환 규칙 (YAML rule_sets에 한 번만 기록)
+FIXED_RULE_SET_ID = '고정문자열치환'
+FIXED_REPLACEMENTS = [
+    {
+        "설명": "LHMES_MGR 치환",
+        "찾기": {
+            "정규식": "LHMES_MGR"
+        },
+        "교체": {
+            "값": "LYMES_MGR"
         }
-        
-        def modify_path(path):
-            """파일 경로를 수정하는 함수 (테스트용)"""
-            if isinstance(path, str) and path.startswith("C:\\BwProject"):
-                return path.replace("C:\\BwProject", "C:\\TBwProject")
-            return path
-
-        def extract_filename(path):
-            """파일 경로에서 파일명만 추출"""
-            if not isinstance(path, str):
-                return ""
-            return os.path.basename(path)
-
-        def extract_process_filename(path):
-            """프로세스 파일 경로에서 파일명만 추출"""
-            if not isinstance(path, str):
-                return ""
-            return os.path.basename(path)
-
-        def extract_existing_namespace(source_file_path, base_name):
-            """
-            소스 파일에서 기존 namespace를 추출
-            
-            Args:
-                source_file_path: 소스 파일 경로
-                base_name: 스키마 파일의 기본 이름
-                
-            Returns:
-                기존 namespace 또는 None
-            """
-            if not source_file_path or not os.path.exists(source_file_path):
-                return None
-                
-            try:
-                with open(source_file_path, 'r', encoding='utf-8') as f:
-                    source_content = f.read()
-                    
-                # namespace 패턴 찾기
-                namespace_pattern = f'namespace\\s*=\\s*"([^"]*{base_name}[^"]*)"'
-                match = re.search(namespace_pattern, source_content)
-                
-                if match:
-                    return match.group(1)
-                
-                # xmlns:pfx3 패턴도 확인
-                xmlns_pattern = f'xmlns:pfx3\\s*=\\s*"([^"]*{base_name}[^"]*)"'
-                match = re.search(xmlns_pattern, source_content)
-                
-                if match:
-                    return match.group(1)
-                    
-            except Exception as e:
-                debug_print(f"기존 namespace 추출 중 오류: {e}")
-                
-            return None
+    },
+    {
+        "설명": "VOMES_MGR 치환",
+        "찾기": {
+            "정규식": "VOMES_MGR"
+        },
+        "교체": {
+            "값": "LZMES_MGR"
+        }
+    },
+    {
+        "설명": "LH 문자열 치환",
+        "찾기": {
+            "정규식": "'LH'"
+        },
+        "교체": {
+            "값": "'LY'"
+        }
+    },
+    {
+        "설명": "VO 문자열 치환",
+        "찾기": {
+            "정규식": "'VO'"
+        },
+        "교체": {
+            "값": "'LZ'"
+        }
+    },
+    {
+        "설명": "LH 따옴표 문자열 치환",
+        "찾기": {
+            "정규식": "&quot;LH&quot;"
+        },
+        "교체": {
+            "값": "&quot;LY&quot;"
+        }
+    },
+    {
+        "설명": "VO 따옴표 문자열 치환",
+        "찾기": {
+            "정규식": "&quot;VO&quot;"
+        },
+        "교체": {
+            "값": "&quot;LZ&quot;"
+        }
+    }
+]
 
-        def process_schema_path(schema_path, preserve_no_namespace=False):
-            """
-            스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성
-            
-            Args:
-                schema_path: 스키마 파일 경로
-                preserve_no_namespace: no_namespace_schema 경로 보존 여부
-            """
-            if not isinstance(schema_path, str):
-                return None, None
-            
-            # 1. 경로 구분자 변경
-            normalized_path = schema_path.replace('\\', '/')
-            
-            # 2. '/SharedResources' 이후 부분 추출
-            shared_idx = normalized_path.find('/SharedResources')
-            if shared_idx == -1:
-                return None, None
-                
-            # BB 부분을 포함한 경로 추출
-            bb_start = normalized_path.rfind('/', 0, shared_idx)
-            if bb_start == -1:
-                return None, None
-                
-            relative_path = normalized_path[bb_start:]  # /BB/SharedResources/...
-            schema_location = relative_path[relative_path.find('/SharedResources'):]  # /SharedResources/...
-            
-            # no_namespace_schema 처리 로직
-            if preserve_no_namespace:
-                # SharedResources 이전 부분은 상수로 대체하고 SharedResources 이후만 새로운 로직 적용
-                namespace = f"http://www.tibco.com/ns/no_namespace_schema_location{schema_location}"
-            else:
-                # 기존 로직 그대로 적용
-                namespace = f"http://www.tibco.com/schemas{relative_path}"
-            
-            return namespace, schema_location
+# 기존 namespace를 확인하는 매칭행 원본 파일 컬럼
+NAMESPACE_SOURCE_COLUMNS = ['송신파일경로', '수신파일경로', '송신스키마파일명', '수신스키마파일명']
 
-        def create_schema_replacements(filename, schema_path, source_file_path=None):
-            """스키마 파일 치환 목록 생성"""
-            if not filename.endswith('.xsd'):
-                return []
-            
-            base_name = os.path.splitext(filename)[0]
-            
-            # 소스 파일에서 기존 namespace 확인
-            has_no_namespace = False
-            if source_file_path:
-                existing_namespace = extract_existing_namespace(source_file_path, base_name)
-                if existing_namespace and 'no_namespace_schema' in existing_namespace:
-                    has_no_namespace = True
-                    debug_print(f"no_namespace_schema 감지됨: {existing_namespace}")
-            
-            # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
-            namespace, schema_location = process_schema_path(schema_path, preserve_no_namespace=has_no_namespace)
-            if not namespace or not schema_location:
-                return []
-            return [{
-                "설명": "스키마 namespace 치환",
-                "찾기": {
-                    "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                },
-                "교체": {
-                    "값": f'namespace="{namespace}"'
-                }
+def _modify_path(path):
+    """파일 경로를 수정하는 함수 (테스트용)"""
+    if isinstance(path, str) and path.startswith("C:\\BwProject"):
+        return path.replace("C:\\BwProject", "C:\\TBwProject")
+    return path
+
+def _extract_filename(path):
+    """파일 경로에서 파일명만 추출"""
+    if not isinstance(path, str):
+        return ""
+    return os.path.basename(path)
+
+def _extract_existing_namespace(source_file_path, base_name, index=None):
+    """
+    소스 파일에서 기존 namespace를 추출
+
+    Args:
+        source_file_path: 소스 파일 경로
+        base_name: 스키마 파일의 기본 이름
+        index: 미리 만든 NamespaceIndex (없으면 파일을 바로 읽음)
+
+    Returns:
+        기존 namespace 또는 None
+    """
+    if index is None:
+        index = NamespaceIndex()
+    namespace = index.lookup(source_file_path, base_name)
+    error = index.error(source_file_path)
+    if namespace is None and error:
+        debug_print(f"기존 namespace 추출 중 오류: {error}")
+    return namespace
+
+def _process_schema_path(schema_path, preserve_no_namespace=False):
+    """
+    스키마 파일 경로를 처리하여 namespace와 schemaLocation 생성
+
+    Args:
+        schema_path: 스키마 파일 경로
+        preserve_no_namespace: no_namespace_schema 경로 보존 여부
+    """
+    if not isinstance(schema_path, str):
+        return None, None
+
+    # 1. 경로 구분자 변경
+    normalized_path = schema_path.replace('\\', '/')
+
+    # 2. '/SharedResources' 이후 부분 추출
+    shared_idx = normalized_path.find('/SharedResources')
+    if shared_idx == -1:
+        return None, None
+
+    # BB 부분을 포함한 경로 추출
+    bb_start = normalized_path.rfind('/', 0, shared_idx)
+    if bb_start == -1:
+        return None, None
+
+    relative_path = normalized_path[bb_start:]  # /BB/SharedResources/...
+    schema_location = relative_path[relative_path.find('/SharedResources'):]  # /SharedResources/...
+
+    # no_namespace_schema 처리 로직
+    if preserve_no_namespace:
+        # SharedResources 이전 부분은 상수로 대체하고 SharedResources 이후만 새로운 로직 적용
+        namespace = f"http://www.tibco.com/ns/no_namespace_schema_location{schema_location}"
+    else:
+        # 기존 로직 그대로 적용
+        namespace = f"http://www.tibco.com/schemas{relative_path}"
+
+    return namespace, schema_location
+
+def _create_schema_replacements(filename, schema_path, source_file_path=None, index=None):
+    """스키마 파일 치환 목록 생성"""
+    if not filename.endswith('.xsd'):
+        return []
+
+    base_name = os.path.splitext(filename)[0]
+
+    # 소스 파일에서 기존 namespace 확인
+    has_no_namespace = False
+    if source_file_path:
+        existing_namespace = _extract_existing_namespace(source_file_path, base_name, index)
+        if existing_namespace and 'no_namespace_schema' in existing_namespace:
+            has_no_namespace = True
+            debug_print(f"no_namespace_schema 감지됨: {existing_namespace}")
+
+    # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
+    namespace, schema_location = _process_schema_path(schema_path, preserve_no_namespace=has_no_namespace)
+    if not namespace or not schema_location:
+        return []
+    return [{
+        "설명": "스키마 namespace 치환",
+        "찾기": {
+            "정규식": f'namespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
+        },
+        "교체": {
+            "값": f'namespace="{namespace}"'
+        }
+    },
+    {
+        "설명": "스키마 schemaLocation 치환",
+        "찾기": {
+            "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
+        },
+        "교체": {
+            "값": f'schemaLocation="{schema_location}"'
+        }
+    },
+    {
+        "설명": "ProcessDefinition namespace 치환",
+        "찾기": {
+            "정규식": f'xmlns:pfx3\\s*=\\s*"[^"]*{base_name}[^"]*"'
+        },
+        "교체": {
+            "값": f'xmlns:pfx3="{namespace}"'
+        }
+    }]
+
+def _extract_process_path(file_path):
+    """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출하고 디렉토리 구분자를 변경"""
+    if not isinstance(file_path, str):
+        return ""
+
+    # 디렉토리 구분자를 '/'로 통일
+    normalized_path = file_path.replace('\\', '/')
+
+    # 'Processes' 위치 찾기
+    processes_idx = normalized_path.find('Processes/')
+    if processes_idx == -1:
+        return ""
+
+    # 'Processes/' 이후의 경로 추출
+    relative_path = normalized_path[processes_idx + len('Processes/'):]
+
+    return relative_path
+
+def _create_process_replacements(source_path, target_path, match_row, normal_row):
+    """프로세스 파일의 치환 목록 생성"""
+    if not isinstance(source_path, str) or not isinstance(target_path, str):
+        return []
+
+    # 매칭행의 파일명으로 패턴 매칭 (찾을 패턴)
+    source_filename = _extract_filename(source_path)
+    # 기본행의 경로에서 Processes 이후 경로 추출 (교체할 값)
+    target_process_path = _extract_process_path(target_path)
+
+    if not source_filename or not target_process_path:
+        return []
+
+    replacements = [{
+        "설명": "프로세스 이름 치환",
+        "찾기": {
+            "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
+        },
+        "교체": {
+            "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
+        }
+    }]
+
+    # 고정 문자열 치환 규칙은 rule_sets에 한 번만 정의하고 참조
+    replacements.append({RULE_SET_REF: FIXED_RULE_SET_ID})
+
+    # IFID와 수신업무명 조합 치환 규칙 추가
+    origin_ifid_with_susin = f"{match_row['Group ID']}.{match_row['Event_ID']}.{match_row['수신' + chr(10) + '업무명']}"
+    dest_ifid_with_susin = f"{normal_row['Group ID']}.{match_row['Event_ID']}.{normal_row['수신' + chr(10) + '업무명']}"
+
+    # IFID와 수신업무명 조합이 다른 경우에만 치환 규칙 추가
+    if origin_ifid_with_susin != dest_ifid_with_susin:
+        replacements.append({
+            "설명": "IFID와 수신업무명 조합 치환",
+            "찾기": {
+                "정규식": origin_ifid_with_susin.replace(".", "\\.")
             },
+            "교체": {
+                "값": dest_ifid_with_susin
+            }
+        })
+
+    # IFID 치환 규칙 추가
+    origin_ifid = f"{match_row['Group ID']}.{match_row['Event_ID']}"
+    dest_ifid = f"{normal_row['Group ID']}.{match_row['Event_ID']}"
+
+    # IFID가 다른 경우에만 치환 규칙 추가
+    if origin_ifid != dest_ifid:
+        replacements.append({
+            "설명": "IFID 치환",
+            "찾기": {
+                "정규식": origin_ifid.replace(".", "\\.")
+            },
+            "교체": {
+                "값": dest_ifid
+            }
+        })
+
+    # Event_ID 치환 규칙 추가
+    if match_row['Event_ID'] != normal_row['Event_ID']:
+        replacements.append({
+            "설명": "Event_ID 치환",
+            "찾기": {
+                "정규식": match_row['Event_ID']
+            },
+            "교체": {
+                "값": normal_row['Event_ID']
+            }
+        })
+
+    # Group ID &quot; 형식 치환 규칙 추가
+    if match_row['Group ID'] != normal_row['Group ID']:
+        replacements.append({
+            "설명": "Group ID &quot; 형식 치환",
+            "찾기": {
+                "정규식": f'&quot;{match_row["Group ID"]}&quot;'
+            },
+            "교체": {
+                "값": f'&quot;{normal_row["Group ID"]}&quot;'
+            }
+        })
+
+    # 송신업무명 &quot; 형식 치환 규칙 추가
+    send_task_col = '송신' + chr(10) + '업무명'
+    if match_row[send_task_col] != normal_row[send_task_col]:
+        replacements.append({
+            "설명": "송신업무명 &quot; 형식 치환",
+            "찾기": {
+                "정규식": f'&quot;{match_row[send_task_col]}&quot;'
+            },
+            "교체": {
+                "값": f'&quot;{normal_row[send_task_col]}&quot;'
+            }
+        })
+
+    # 수신업무명 &quot; 형식 치환 규칙 추가
+    recv_task_col = '수신' + chr(10) + '업무명'
+    if match_row[recv_task_col] != normal_row[recv_task_col]:
+        replacements.append({
+            "설명": "수신업무명 &quot; 형식 치환",
+            "찾기": {
+                "정규식": f'&quot;{match_row[recv_task_col]}&quot;'
+            },
+            "교체": {
+                "값": f'&quot;{normal_row[recv_task_col]}&quot;'
+            }
+        })
+
+    # 송신업무명 치환 규칙 추가 (pd:from/to Check 형식)
+    if match_row[send_task_col] != normal_row[send_task_col]:
+        # pd:from 태그 치환
+        replacements.append({
+            "설명": "송신업무명 from 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:from>Check {match_row[send_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:from>Check {normal_row[send_task_col]}'
+            }
+        })
+        # pd:to 태그 치환
+        replacements.append({
+            "설명": "송신업무명 to 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:to>Check {match_row[send_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:to>Check {normal_row[send_task_col]}'
+            }
+        })
+        # pd:activity name 태그 치환
+        replacements.append({
+            "설명": "송신업무명 activity name 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:activity\\s+name="Check {match_row[send_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:activity name="Check {normal_row[send_task_col]}'
+            }
+        })
+        # sharedjdbc 치환
+        replacements.append({
+            "설명": "송신업무명 sharedjdbc 치환",
+            "찾기": {
+                "정규식": f'{match_row[send_task_col]}\\.sharedjdbc'
+            },
+            "교체": {
+                "값": f'{normal_row[send_task_col]}.sharedjdbc'
+            }
+        })
+
+    # 수신업무명 치환 규칙 추가 (pd:from/to Check 형식)
+    if match_row[recv_task_col] != normal_row[recv_task_col]:
+        # pd:from 태그 치환
+        replacements.append({
+            "설명": "수신업무명 from 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:from>Check {match_row[recv_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:from>Check {normal_row[recv_task_col]}'
+            }
+        })
+        # pd:to 태그 치환
+        replacements.append({
+            "설명": "수신업무명 to 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:to>Check {match_row[recv_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:to>Check {normal_row[recv_task_col]}'
+            }
+        })
+        # pd:activity name 태그 치환
+        replacements.append({
+            "설명": "수신업무명 activity name 태그 치환",
+            "찾기": {
+                "정규식": f'(<pd:activity\\s+name="Check {match_row[recv_task_col]})'
+            },
+            "교체": {
+                "값": f'<pd:activity name="Check {normal_row[recv_task_col]}'
+            }
+        })
+        # sharedjdbc 치환
+        replacements.append({
+            "설명": "수신업무명 sharedjdbc 치환",
+            "찾기": {
+                "정규식": f'{match_row[recv_task_col]}\\.sharedjdbc'
+            },
+            "교체": {
+                "값": f'{normal_row[recv_task_col]}.sharedjdbc'
+            }
+        })
+
+    return replacements
+
+def _is_flagged(row, column):
+    """생성여부 컬럼 값이 1인지 확인"""
+    return pd.notna(row.get(column)) and float(row[column]) == 1.0
+
+def _file_entry(normal_row, match_row, column, schema_column, index=None):
+    """송신/수신 프로세스 파일 항목 생성 (스키마 치환 + 프로세스 치환)"""
+    return {
+        "원본파일": match_row[column],
+        "복사파일": _modify_path(normal_row[column]),  # 경로 수정
+        "치환목록": _create_schema_replacements(
+            _extract_filename(normal_row[schema_column]),
+            normal_row['송신스키마파일명'],
+            match_row[column],  # 소스 파일 경로 전달
+            index
+        ) + _create_process_replacements(
+            match_row[column],    # 매칭행의 경로로 패턴 매칭
+            normal_row[column],    # 기본행의 경로로 교체
+            match_row,
+            normal_row
+        )
+    }
+
+def _schema_file_entry(normal_row, match_row, column, index=None):
+    """송신/수신 스키마 파일 항목 생성 (xmlns, targetNamespace 치환)"""
+    # 스키마 파일의 base_name과 namespace 추출
+    base_name = os.path.splitext(os.path.basename(normal_row[column]))[0]
+
+    # 소스 파일에서 기존 namespace 확인
+    has_no_namespace = False
+    existing_namespace = _extract_existing_namespace(match_row[column], base_name, index)
+    if existing_namespace and 'no_namespace_schema' in existing_namespace:
+        has_no_namespace = True
+        debug_print(f"{column}에서 no_namespace_schema 감지됨: {existing_namespace}")
+
+    # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
+    namespace, _ = _process_schema_path(normal_row['송신스키마파일명'], preserve_no_namespace=has_no_namespace)
+
+    schema_replacements = []
+
+    # no_namespace가 아닌 경우에만 namespace 치환 적용
+    if not has_no_namespace:
+        schema_replacements.extend([
             {
-                "설명": "스키마 schemaLocation 치환",
+                "설명": "xs:schema xmlns 치환",
                 "찾기": {
-                    "정규식": f'schemaLocation\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                    "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
                 },
                 "교체": {
-                    "값": f'schemaLocation="{schema_location}"'
+                    "값": f'xmlns="{namespace}"'
                 }
             },
             {
-                "설명": "ProcessDefinition namespace 치환",
+                "설명": "xs:schema targetNamespace 치환",
                 "찾기": {
-                    "정규식": f'xmlns:pfx3\\s*=\\s*"[^"]*{base_name}[^"]*"'
+                    "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
                 },
                 "교체": {
-                    "값": f'xmlns:pfx3="{namespace}"'
+                    "값": f'targetNamespace="{namespace}"'
                 }
-            }]
-        
-        def extract_process_path(file_path):
-            """프로세스 파일 경로에서 'Processes' 이후의 경로를 추출하고 디렉토리 구분자를 변경"""
-            if not isinstance(file_path, str):
-                return ""
-            
-            # 디렉토리 구분자를 '/'로 통일
-            normalized_path = file_path.replace('\\', '/')
-            
-            # 'Processes' 위치 찾기
-            processes_idx = normalized_path.find('Processes/')
-            if processes_idx == -1:
-                return ""
-            
-            # 'Processes/' 이후의 경로 추출
-            relative_path = normalized_path[processes_idx + len('Processes/'):]
-            
-            return relative_path
+            }
+        ])
 
-        def create_process_replacements(source_path, target_path, match_row, normal_row):
-            """프로세스 파일의 치환 목록 생성"""
-            if not isinstance(source_path, str) or not isinstance(target_path, str):
-                return []
-            
-            # 매칭행의 파일명으로 패턴 매칭 (찾을 패턴)
-            source_filename = extract_process_filename(source_path)
-            # 기본행의 경로에서 Processes 이후 경로 추출 (교체할 값)
-            target_process_path = extract_process_path(target_path)
-            
-            if not source_filename or not target_process_path:
-                return []
-            
-            replacements = [{
-                "설명": "프로세스 이름 치환",
-                "찾기": {
-                    "정규식": f'<pd:name>Processes/[^<]*</pd:name>'
-                },
-                "교체": {
-                    "값": f'<pd:name>Processes/{target_process_path}</pd:name>'
-                }
-            }]
-
-            # 고정 문자열 치환 규칙 추가
-            fixed_replacements = [
-                {
-                    "설명": "LHMES_MGR 치환",
-                    "찾기": {
-                        "정규식": "LHMES_MGR"
-                    },
-                    "교체": {
-                        "값": "LYMES_MGR"
-                    }
-                },
-                {
-                    "설명": "VOMES_MGR 치환",
-                    "찾기": {
-                        "정규식": "VOMES_MGR"
-                    },
-                    "교체": {
-                        "값": "LZMES_MGR"
-                    }
-                },
-                {
-                    "설명": "LH 문자열 치환",
-                    "찾기": {
-                        "정규식": "'LH'"
-                    },
-                    "교체": {
-                        "값": "'LY'"
-                    }
-                },
-                {
-                    "설명": "VO 문자열 치환",
-                    "찾기": {
-                        "정규식": "'VO'"
-                    },
-                    "교체": {
-                        "값": "'LZ'"
-                    }
-                },
-                {
-                    "설명": "LH 따옴표 문자열 치환",
-                    "찾기": {
-                        "정규식": "&quot;LH&quot;"
-                    },
-                    "교체": {
-                        "값": "&quot;LY&quot;"
-                    }
-                },
-                {
-                    "설명": "VO 따옴표 문자열 치환",
-                    "찾기": {
-                        "정규식": "&quot;VO&quot;"
-                    },
-                    "교체": {
-                        "값": "&quot;LZ&quot;"
-                    }
-                }
-            ]
-            replacements.extend(fixed_replacements)
+    return {
+        "원본파일": match_row[column],
+        "복사파일": _modify_path(normal_row[column]),  # 경로 수정
+        "치환목록": schema_replacements
+    }
+
+def build_row_block(row_number, normal_row, match_row, index=None):
+    """
+    행 쌍(일반행, 매칭행) 하나의 YAML 블록을 만듭니다.
+
+    Args:
+        row_number: 행 쌍 번호 (1부터)
+        normal_row: 일반행 (생성할 파일 정보, SheetRow 또는 Series)
+        match_row: 매칭행 (복사할 원본 파일 정보, SheetRow 또는 Series)
+        index: 기존 namespace 조회용 NamespaceIndex (없으면 파일을 바로 읽음)
+
+    Returns:
+        {"N번째 행": {파일 타입: 항목}}
+    """
+    row_data = {}
+
+    # 1. 송신파일경로 / 2. 수신파일경로 처리
+    for column, schema_column in (('송신파일경로', '송신스키마파일명'), ('수신파일경로', '수신스키마파일명')):
+        if _is_flagged(normal_row, column.replace('경로', '생성여부')):
+            row_data[column] = _file_entry(normal_row, match_row, column, schema_column, index)
+            print(f"\n[{column} 생성]")
+            print(f"  원본파일: {match_row[column]}")
+            print(f"  복사파일: {_modify_path(normal_row[column])}")
+
+    # 3. 송신스키마파일명 / 4. 수신스키마파일명 처리
+    for column in ('송신스키마파일명', '수신스키마파일명'):
+        if _is_flagged(normal_row, column.replace('파일명', '파일생성여부')):
+            row_data[column] = _schema_file_entry(normal_row, match_row, column, index)
+            print(f"\n[{column} 생성]")
+            print(f"  원본파일: {match_row[column]}")
+            print(f"  복사파일: {_modify_path(normal_row[column])}")
+
+    return {f"{row_number}번째 행": row_data}
+
+def _render_row_block(row_number, normal_row, match_row, index=None):
+    """행 쌍 하나의 YAML 블록 문자열을 만듭니다."""
+    return yaml_cache.dump(build_row_block(row_number, normal_row, match_row, index),
+                           allow_unicode=True, sort_keys=False)
+
+# YAML 생성 작업자가 사용할 namespace 색인 (작업자 초기화 시 부모에서 한 번 전달)
+_generate_index = None
+
+def _init_generate_worker(debug_mode, index):
+    """YAML 생성 작업자의 디버그 설정과 namespace 색인을 부모 프로세스와 맞춥니다."""
+    global _generate_index
+    _init_worker(debug_mode)
+    _generate_index = index
+
+def _render_row_block_captured(pair):
+    """
+    작업자에서 행 쌍 블록을 만들고, 그 사이의 화면 출력을 모아 함께 반환합니다.
+    (출력 순서가 섞이지 않도록 부모 프로세스가 행 순서대로 출력)
+    """
+    row_number, normal_row, match_row = pair
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        block = _render_row_block(row_number, normal_row, match_row, _generate_index)
+    return row_number, output.getvalue(), block
+
+def _iter_row_blocks(pairs, index):
+    """행 쌍 블록을 현재 프로세스에서 차례로 만듭니다."""
+    for row_number, normal_row, match_row in pairs:
+        print(f"\n=== {row_number}번째 행 쌍 ===")
+        yield _render_row_block(row_number, normal_row, match_row, index)
+
+def _iter_row_blocks_parallel(pairs, pair_count, index, workers):
+    """행 쌍 블록을 프로세스 풀에서 동시에 만들고 원래 행 순서대로 돌려줍니다."""
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_generate_worker,
+                             initargs=(DEBUG_MODE, index)) as executor:
+        results = executor.map(_render_row_block_captured, pairs,
+                               chunksize=max(1, pair_count // (workers * 8)))
+        for row_number, output, block in results:
+            print(f"\n=== {row_number}번째 행 쌍 ===")
+            print(output, end='')
+            yield block
+
+def generate_yaml_from_excel(excel_path, yaml_path, workers=1):
+    """
+    엑셀 파일을 읽어 YAML 파일을 생성한다.
+
+    행 쌍마다 "N번째 행" 블록을 만들자마자 파일에 이어 쓰므로 메모리 사용량이 행 수와
+    관계없이 일정하고, 중간에 중단되어도 그때까지 쓴 블록은 올바른 YAML로 남는다.
+    workers가 2 이상이면 행 쌍 블록(경로 변환, namespace 조회, 규칙 생성)을 프로세스 풀에서
+    동시에 만들고, 파일과 화면에는 원래 행 순서대로 쓴다 (결과는 순차 생성과 같음).
+
+    Args:
+        excel_path: 엑셀 파일 경로
+        yaml_path: 생성할 YAML 파일 경로
+        workers: 동시에 블록을 만들 프로세스 수 (--jobs N, 기본값 1 = 순차 생성)
+    """
+    # 엑셀 파일을 한 번 읽어 행 쌍(일반행, 매칭행) 레코드로 변환 - 마지막 행이 홀수이면 제외
+    row_pairs = RowPairs.read(excel_path, engine='openpyxl')
+
+    # 매칭행이 참조하는 원본 파일을 한 번씩만 읽어 기존 namespace 색인 생성
+    index = NamespaceIndex().build(
+        pair.match.get(column) for column in NAMESPACE_SOURCE_COLUMNS for pair in row_pairs)
 
-            # IFID와 수신업무명 조합 치환 규칙 추가
-            origin_ifid_with_susin = f"{match_row['Group ID']}.{match_row['Event_ID']}.{match_row['수신' + chr(10) + '업무명']}"
-            dest_ifid_with_susin = f"{normal_row['Group ID']}.{match_row['Event_ID']}.{normal_row['수신' + chr(10) + '업무명']}"
-            
-            # IFID와 수신업무명 조합이 다른 경우에만 치환 규칙 추가
-            if origin_ifid_with_susin != dest_ifid_with_susin:
-                replacements.append({
-                    "설명": "IFID와 수신업무명 조합 치환",
-                    "찾기": {
-                        "정규식": origin_ifid_with_susin.replace(".", "\\.")
-                    },
-                    "교체": {
-                        "값": dest_ifid_with_susin
-                    }
-                })
-
-            # IFID 치환 규칙 추가
-            origin_ifid = f"{match_row['Group ID']}.{match_row['Event_ID']}"
-            dest_ifid = f"{normal_row['Group ID']}.{match_row['Event_ID']}"
-            
-            # IFID가 다른 경우에만 치환 규칙 추가
-            if origin_ifid != dest_ifid:
-                replacements.append({
-                    "설명": "IFID 치환",
-                    "찾기": {
-                        "정규식": origin_ifid.replace(".", "\\.")
-                    },
-                    "교체": {
-                        "값": dest_ifid
-                    }
-                })
-
-            # Event_ID 치환 규칙 추가
-            if match_row['Event_ID'] != normal_row['Event_ID']:
-                replacements.append({
-                    "설명": "Event_ID 치환",
-                    "찾기": {
-                        "정규식": match_row['Event_ID']
-                    },
-                    "교체": {
-                        "값": normal_row['Event_ID']
-                    }
-                })
-
-            # Group ID &quot; 형식 치환 규칙 추가
-            if match_row['Group ID'] != normal_row['Group ID']:
-                replacements.append({
-                    "설명": "Group ID &quot; 형식 치환",
-                    "찾기": {
-                        "정규식": f'&quot;{match_row["Group ID"]}&quot;'
-                    },
-                    "교체": {
-                        "값": f'&quot;{normal_row["Group ID"]}&quot;'
-                    }
-                })
-
-            # 송신업무명 &quot; 형식 치환 규칙 추가
-            send_task_col = '송신' + chr(10) + '업무명'
-            if match_row[send_task_col] != normal_row[send_task_col]:
-                replacements.append({
-                    "설명": "송신업무명 &quot; 형식 치환",
-                    "찾기": {
-                        "정규식": f'&quot;{match_row[send_task_col]}&quot;'
-                    },
-                    "교체": {
-                        "값": f'&quot;{normal_row[send_task_col]}&quot;'
-                    }
-                })
-
-            # 수신업무명 &quot; 형식 치환 규칙 추가
-            recv_task_col = '수신' + chr(10) + '업무명'
-            if match_row[recv_task_col] != normal_row[recv_task_col]:
-                replacements.append({
-                    "설명": "수신업무명 &quot; 형식 치환",
-                    "찾기": {
-                        "정규식": f'&quot;{match_row[recv_task_col]}&quot;'
-                    },
-                    "교체": {
-                        "값": f'&quot;{normal_row[recv_task_col]}&quot;'
-                    }
-                })
-
-            # 송신업무명 치환 규칙 추가 (pd:from/to Check 형식)
-            if match_row[send_task_col] != normal_row[send_task_col]:
-                # pd:from 태그 치환
-                replacements.append({
-                    "설명": "송신업무명 from 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:from>Check {match_row[send_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:from>Check {normal_row[send_task_col]}'
-                    }
-                })
-                # pd:to 태그 치환
-                replacements.append({
-                    "설명": "송신업무명 to 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:to>Check {match_row[send_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:to>Check {normal_row[send_task_col]}'
-                    }
-                })
-                # pd:activity name 태그 치환
-                replacements.append({
-                    "설명": "송신업무명 activity name 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:activity\\s+name="Check {match_row[send_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:activity name="Check {normal_row[send_task_col]}'
-                    }
-                })
-                # sharedjdbc 치환
-                replacements.append({
-                    "설명": "송신업무명 sharedjdbc 치환",
-                    "찾기": {
-                        "정규식": f'{match_row[send_task_col]}\\.sharedjdbc'
-                    },
-                    "교체": {
-                        "값": f'{normal_row[send_task_col]}.sharedjdbc'
-                    }
-                })
-
-            # 수신업무명 치환 규칙 추가 (pd:from/to Check 형식)
-            if match_row[recv_task_col] != normal_row[recv_task_col]:
-                # pd:from 태그 치환
-                replacements.append({
-                    "설명": "수신업무명 from 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:from>Check {match_row[recv_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:from>Check {normal_row[recv_task_col]}'
-                    }
-                })
-                # pd:to 태그 치환
-                replacements.append({
-                    "설명": "수신업무명 to 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:to>Check {match_row[recv_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:to>Check {normal_row[recv_task_col]}'
-                    }
-                })
-                # pd:activity name 태그 치환
-                replacements.append({
-                    "설명": "수신업무명 activity name 태그 치환",
-                    "찾기": {
-                        "정규식": f'(<pd:activity\\s+name="Check {match_row[recv_task_col]})'
-                    },
-                    "교체": {
-                        "값": f'<pd:activity name="Check {normal_row[recv_task_col]}'
-                    }
-                })
-                # sharedjdbc 치환
-                replacements.append({
-                    "설명": "수신업무명 sharedjdbc 치환",
-                    "찾기": {
-                        "정규식": f'{match_row[recv_task_col]}\\.sharedjdbc'
-                    },
-                    "교체": {
-                        "값": f'{normal_row[recv_task_col]}.sharedjdbc'
-                    }
-                })
-            
-            return replacements
-
-        # 1. 송신파일경로 처리
-        if pd.notna(normal_row.get('송신파일생성여부')) and float(normal_row['송신파일생성여부']) == 1.0:
-            yaml_structure[f"{i//2 + 1}번째 행"]["송신파일경로"] = {
-                "원본파일": match_row['송신파일경로'],
-                "복사파일": modify_path(normal_row['송신파일경로']),  # 경로 수정
-                "치환목록": create_schema_replacements(
-                    extract_filename(normal_row['송신스키마파일명']),
-                    normal_row['송신스키마파일명'],
-                    match_row['송신파일경로']  # 소스 파일 경로 전달
-                ) + create_process_replacements(
-                    match_row['송신파일경로'],    # 매칭행의 경로로 패턴 매칭
-                    normal_row['송신파일경로'],    # 기본행의 경로로 교체
-                    match_row,
-                    normal_row
-                )
-            }
-            print("\n[송신파일경로 생성]")
-            print(f"  원본파일: {match_row['송신파일경로']}")
-            print(f"  복사파일: {modify_path(normal_row['송신파일경로'])}")
-        
-        # 2. 수신파일경로 처리
-        if pd.notna(normal_row.get('수신파일생성여부')) and float(normal_row['수신파일생성여부']) == 1.0:
-            yaml_structure[f"{i//2 + 1}번째 행"]["수신파일경로"] = {
-                "원본파일": match_row['수신파일경로'],
-                "복사파일": modify_path(normal_row['수신파일경로']),  # 경로 수정
-                "치환목록": create_schema_replacements(
-                    extract_filename(normal_row['수신스키마파일명']),
-                    normal_row['송신스키마파일명'],
-                    match_row['수신파일경로']  # 소스 파일 경로 전달
-                ) + create_process_replacements(
-                    match_row['수신파일경로'],    # 매칭행의 경로로 패턴 매칭
-                    normal_row['수신파일경로'],    # 기본행의 경로로 교체
-                    match_row,
-                    normal_row
-                )
-            }
-            print("\n[수신파일경로 생성]")
-            print(f"  원본파일: {match_row['수신파일경로']}")
-            print(f"  복사파일: {modify_path(normal_row['수신파일경로'])}")
-        
-        # 3. 송신스키마파일명 처리
-        if pd.notna(normal_row.get('송신스키마파일생성여부')) and float(normal_row['송신스키마파일생성여부']) == 1.0:
-            # 스키마 파일의 base_name과 namespace 추출
-            base_name = os.path.splitext(os.path.basename(normal_row['송신스키마파일명']))[0]
-            
-            # 소스 파일에서 기존 namespace 확인
-            has_no_namespace = False
-            existing_namespace = extract_existing_namespace(match_row['송신스키마파일명'], base_name)
-            if existing_namespace and 'no_namespace_schema' in existing_namespace:
-                has_no_namespace = True
-                debug_print(f"송신스키마파일명에서 no_namespace_schema 감지됨: {existing_namespace}")
-            
-            # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
-            namespace, _ = process_schema_path(normal_row['송신스키마파일명'], preserve_no_namespace=has_no_namespace)
-            
-            schema_replacements = []
-            
-            # no_namespace가 아닌 경우에만 namespace 치환 적용
-            if not has_no_namespace:
-                schema_replacements.extend([
-                    {
-                        "설명": "xs:schema xmlns 치환",
-                        "찾기": {
-                            "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'xmlns="{namespace}"'
-                        }
-                    },
-                    {
-                        "설명": "xs:schema targetNamespace 치환",
-                        "찾기": {
-                            "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'targetNamespace="{namespace}"'
-                        }
-                    }
-                ])
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["송신스키마파일명"] = {
-                "원본파일": match_row['송신스키마파일명'],
-                "복사파일": modify_path(normal_row['송신스키마파일명']),  # 경로 수정
-                "치환목록": schema_replacements
-            }
-            print("\n[송신스키마파일명 생성]")
-            print(f"  원본파일: {match_row['송신스키마파일명']}")
-            print(f"  복사파일: {modify_path(normal_row['송신스키마파일명'])}")
-        
-        # 4. 수신스키마파일명 처리
-        if pd.notna(normal_row.get('수신스키마파일생성여부')) and float(normal_row['수신스키마파일생성여부']) == 1.0:
-            # 스키마 파일의 base_name과 namespace 추출
-            base_name = os.path.splitext(os.path.basename(normal_row['수신스키마파일명']))[0]
-            
-            # 소스 파일에서 기존 namespace 확인
-            has_no_namespace = False
-            existing_namespace = extract_existing_namespace(match_row['수신스키마파일명'], base_name)
-            if existing_namespace and 'no_namespace_schema' in existing_namespace:
-                has_no_namespace = True
-                debug_print(f"수신스키마파일명에서 no_namespace_schema 감지됨: {existing_namespace}")
-            
-            # namespace 생성 (no_namespace 여부에 따라 다르게 처리)
-            namespace, _ = process_schema_path(normal_row['송신스키마파일명'], preserve_no_namespace=has_no_namespace)
-            
-            schema_replacements = []
-            
-            # no_namespace가 아닌 경우에만 namespace 치환 적용
-            if not has_no_namespace:
-                schema_replacements.extend([
-                    {
-                        "설명": "xs:schema xmlns 치환",
-                        "찾기": {
-                            "정규식": f'xmlns\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'xmlns="{namespace}"'
-                        }
-                    },
-                    {
-                        "설명": "xs:schema targetNamespace 치환",
-                        "찾기": {
-                            "정규식": f'targetNamespace\\s*=\\s*"[^"]*{base_name}[^"]*"'
-                        },
-                        "교체": {
-                            "값": f'targetNamespace="{namespace}"'
-                        }
-                    }
-                ])
-            
-            yaml_structure[f"{i//2 + 1}번째 행"]["수신스키마파일명"] = {
-                "원본파일": match_row['수신스키마파일명'],
-                "복사파일": modify_path(normal_row['수신스키마파일명']),  # 경로 수정
-                "치환목록": schema_replacements
-            }
-            print("\n[수신스키마파일명 생성]")
-            print(f"  원본파일: {match_row['수신스키마파일명']}")
-            print(f"  복사파일: {modify_path(normal_row['수신스키마파일명'])}")
-        
-        # YAML 구조 출력
-        print("\n[YAML 구조]")
-        print(yaml.dump(yaml_structure, allow_unicode=True, sort_keys=False))
-        print("=" * 50)
-        
-        # 전체 YAML 구조에 현재 구조 추가
-        full_yaml_structure.update(yaml_structure)
-    
-    # YAML 파일 생성
     try:
-        with open(yaml_path, 'w', encoding='utf-8') as yf:
-            yaml.dump(full_yaml_structure, yf, allow_unicode=True, sort_keys=False)
-        print(f"\nYAML 파일이 생성되었습니다: {yaml_path}")
-        return len(full_yaml_structure)  # 생성된 작업 수 반환
+        yf = open(yaml_path, 'w', encoding='utf-8')
     except Exception as e:
         print(f"\nYAML 파일 생성 중 오류 발생: {str(e)}")
         return 0
 
+    pair_count = len(row_pairs)
+    pairs = ((pair.serial, pair.base, pair.match) for pair in row_pairs)
+    if workers > 1 and pair_count > 1:
+        print(f"병렬 생성: {workers}개 프로세스")
+        blocks = _iter_row_blocks_parallel(pairs, pair_count, index, workers)
+    else:
+        blocks = _iter_row_blocks(pairs, index)
+
+    block_count = 0
+    with yf:
+        # 공통 규칙을 먼저 써 두어 행을 스트리밍으로 읽을 때 참조를 바로 펼칠 수 있도록 함
+        yf.write(yaml_cache.dump({RULE_SETS_KEY: {FIXED_RULE_SET_ID: FIXED_REPLACEMENTS}},
+                                 allow_unicode=True, sort_keys=False))
+
+        for block in blocks:
+            # YAML 구조 출력 후 파일에 이어 쓰기
+            print("\n[YAML 구조]")
+            print(block)
+            print("=" * 50)
+            yf.write(block)
+            yf.flush()
+            block_count += 1
+
+    print(f"\nYAML 파일이 생성되었습니다: {yaml_path}")
+    return block_count  # 생성된 작업 수 반환
+
 def apply_replacements(text, replacements):
     """여러 치환 규칙을 순차적으로 적용하여 새로운 텍스트 반환."""
     new_text = text
@@ -623,57 +655,276 @@ def apply_replacements(text, replacements):
             new_text = new_text.replace(from_str, to_str)
     return new_text
 
-def compute_diff(original_text, modified_text, fromfile="[Before]", tofile="[After]"):
-    """두 텍스트 버전에 대한 unified diff를 생성하여 리스트로 반환."""
-    original_lines = original_text.splitlines(keepends=True)
-    modified_lines = modified_text.splitlines(keepends=True)
-    diff_lines = difflib.unified_diff(original_lines, modified_lines,
-                                    fromfile=fromfile, tofile=tofile, lineterm='')
-    return list(diff_lines)
+def _split_lines(text):
+    """줄바꿈 문자(\\n)만 기준으로 줄을 나눕니다 (줄 끝 문자 유지)."""
+    lines = text.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+        return [line + '\n' for line in lines]
+    return [line + '\n' for line in lines[:-1]] + [lines[-1]]
+
+def _at_line_start(text, pos):
+    return pos == 0 or pos == len(text) or text[pos - 1] == '\n'
+
+def _context_before(text, pos, count):
+    """pos(줄 시작) 앞의 최대 count줄"""
+    start = pos
+    for _ in range(count):
+        if start == 0:
+            break
+        start = text.rfind('\n', 0, start - 1) + 1
+    return _split_lines(text[start:pos]) if start < pos else []
+
+def _context_after(text, pos, count):
+    """pos(줄 시작)부터 최대 count줄"""
+    end = pos
+    for _ in range(count):
+        if end >= len(text):
+            break
+        newline = text.find('\n', end)
+        end = len(text) if newline < 0 else newline + 1
+    return _split_lines(text[pos:end]) if pos < end else []
+
+def _hunk_range(start, length):
+    """unified diff 헤더의 범위 표기 (difflib과 동일)"""
+    beginning = start + 1
+    if length == 1:
+        return f'{beginning}'
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+def _changed_line_blocks(original_text, modified_text, edit_map):
+    """
+    치환 위치를 줄 단위 변경 구간으로 넓힙니다.
+
+    Returns:
+        [(원본 시작 줄, 원본 줄 목록, 결과 시작 줄, 결과 줄 목록, 원본 끝 위치)]
+    """
+    ranges = [r for r in edit_map.ranges()
+              if original_text[r[0]:r[1]] != modified_text[r[2]:r[3]]]
+    blocks = []
+    orig_line = new_line = 0
+    orig_pos = new_pos = 0
+    i = 0
+    while i < len(ranges):
+        os_, oe, ns, ne = ranges[i]
+        prefix = os_ - (original_text.rfind('\n', 0, os_) + 1)
+        os_ -= prefix
+        ns -= prefix
+        while True:
+            if _at_line_start(original_text, oe) and _at_line_start(modified_text, ne):
+                suffix = 0
+            else:
+                newline = original_text.find('\n', oe)
+                suffix = (len(original_text) if newline < 0 else newline + 1) - oe
+            # 같은 줄에 걸친 다음 변경은 한 구간으로 합침
+            if i + 1 < len(ranges) and ranges[i + 1][0] < oe + suffix:
+                i += 1
+                oe, ne = ranges[i][1], ranges[i][3]
+                continue
+            break
+        oe += suffix
+        ne += suffix
+        # 줄 번호는 앞 구간 끝에서부터 줄바꿈 수를 세어 이어감
+        orig_line += original_text.count('\n', orig_pos, os_)
+        new_line += modified_text.count('\n', new_pos, ns)
+        orig_lines = _split_lines(original_text[os_:oe]) if os_ < oe else []
+        new_lines = _split_lines(modified_text[ns:ne]) if ns < ne else []
+        blocks.append((orig_line, orig_lines, new_line, new_lines, os_, oe))
+        orig_line += original_text.count('\n', os_, oe)
+        new_line += modified_text.count('\n', ns, ne)
+        orig_pos, new_pos = oe, ne
+        i += 1
+    return blocks
+
+def compute_diff(original_text, modified_text, fromfile="[Before]", tofile="[After]",
+                 edit_map=None, context=PREVIEW_CONTEXT):
+    """
+    두 텍스트 버전에 대한 unified diff를 생성하여 리스트로 반환.
+
+    edit_map(치환 엔진이 기록한 변경 구간)이 있으면 전체 파일에 difflib을 실행하지 않고
+    변경된 줄 주변만 잘라 hunk를 만듭니다. 이때 hunk는 치환된 줄 단위로 나오므로
+    붙어 있거나 겹친 변경에서 difflib.unified_diff와 줄 맞춤(hunk 경계, 삭제/추가 줄 배치)이
+    다를 수 있습니다. 어느 쪽이든 원본에 적용하면 같은 결과가 되는 올바른 패치입니다.
+
+    Args:
+        original_text: 원본 내용
+        modified_text: 치환된 내용
+        fromfile: 원본 표시 이름
+        tofile: 결과 표시 이름
+        edit_map: ReplacementPlan.apply가 기록한 EditMap (None이면 difflib 사용)
+        context: hunk 앞뒤에 보여 줄 줄 수
+
+    Returns:
+        줄바꿈으로 끝나는 diff 줄 목록
+    """
+    if edit_map is None:
+        original_lines = _split_lines(original_text)
+        modified_lines = _split_lines(modified_text)
+        diff_lines = difflib.unified_diff(original_lines, modified_lines,
+                                        fromfile=fromfile, tofile=tofile, n=context, lineterm='\n')
+        return [line if line.endswith('\n') else line + '\n' for line in diff_lines]
+
+    blocks = _changed_line_blocks(original_text, modified_text, edit_map)
+    if not blocks:
+        return []
+
+    # 사이의 줄 수가 context * 2 이하인 변경 구간은 한 hunk로 묶음
+    groups = [[blocks[0]]]
+    for block in blocks[1:]:
+        previous = groups[-1][-1]
+        if block[0] - (previous[0] + len(previous[1])) <= context * 2:
+            groups[-1].append(block)
+        else:
+            groups.append([block])
+
+    diff_lines = [f'--- {fromfile}\n', f'+++ {tofile}\n']
+    for group in groups:
+        before = _context_before(original_text, group[0][4], context)
+        after = _context_after(original_text, group[-1][5], context)
+        body = [' ' + line for line in before]
+        orig_count = new_count = len(before)
+        removed, added = [], []
+        for index, (_, orig_lines, _, new_lines, _, oe) in enumerate(group):
+            # 바로 이어지는 변경 구간은 difflib처럼 삭제 줄을 모두 쓴 뒤 추가 줄을 씀
+            removed.extend(orig_lines)
+            added.extend(new_lines)
+            between = _split_lines(original_text[oe:group[index + 1][4]]) if index + 1 < len(group) else []
+            if between or index + 1 == len(group):
+                body.extend('-' + line for line in removed)
+                body.extend('+' + line for line in added)
+                orig_count += len(removed)
+                new_count += len(added)
+                removed, added = [], []
+            body.extend(' ' + line for line in between)
+            orig_count += len(between)
+            new_count += len(between)
+        body.extend(' ' + line for line in after)
+        orig_count += len(after)
+        new_count += len(after)
+        orig_start = group[0][0] - len(before)
+        new_start = group[0][2] - len(before)
+        diff_lines.append(f'@@ -{_hunk_range(orig_start, orig_count)} '
+                          f'+{_hunk_range(new_start, new_count)} @@\n')
+        diff_lines.extend(line if line.endswith('\n') else line + '\n' for line in body)
+    return diff_lines
+
+def preview_job(job, context=PREVIEW_CONTEXT, keep_output=False):
+    """
+    작업 하나의 미리보기 diff를 만듭니다 (파일 저장 안 함). 프로세스 풀 작업자에서도 호출됩니다.
+
+    Args:
+        job: collect_jobs로 만든 작업
+        context: hunk 앞뒤에 보여 줄 줄 수
+        keep_output: True이면 계획 파일에 저장할 치환 결과를 함께 반환
+
+    Returns:
+        (출력할 줄 목록, 계획 항목) - 계획 항목은 keep_output일 때
+        {'source_sha256', 'output': 압축된 결과 또는 None, 'rule_counts'}, 아니면 None
+    """
+    source = job['source']
+    dest = job['dest'] or '(preview)'
+    if not source or not job['replacements']:
+        return [], None
+    try:
+        with open(source, 'rb') as f:
+            content_bytes = f.read()
+    except OSError:
+        return [f"\n[오류] 원본 파일을 찾을 수 없습니다: {source}\n"], None
+
+    encoding = detect_file_encoding(source, content_bytes) or detect_encoding_bytes(content_bytes)
+    original_text, encoding = decode_content(content_bytes, encoding)
+
+    # 치환 적용 (미리보기이므로 파일 저장 안 함) - 엔진이 변경 위치를 기록
+    edit_map = EditMap()
+    plan = compile_plan(job['replacements'])
+    modified_text, counts = plan.apply(original_text, edit_map)
+    timeouts = plan.timeouts
+
+    lines = [f"\n*** {source} vs {dest} 미리보기 diff ***\n"]
+    diff_lines = compute_diff(original_text, modified_text, fromfile=source,
+                              tofile=f"{dest} (preview)", edit_map=edit_map, context=context)
+    lines.extend(diff_lines or ["(변경 없음)\n"])
+    lines.append(f"(치환: {len(job['replacements'])}개 규칙, {sum(counts)}건 치환)\n")
+    for index in timeouts:
+        lines.append(f"[경고] 규칙 {index} ({plan.rules[index - 1].description}) 실행 시간 초과 - 건너뜀\n")
+
+    entry = None
+    # 시간 초과로 건너뛴 규칙이 있으면 실행 때 다시 치환하도록 결과를 저장하지 않음
+    if keep_output and not timeouts:
+        output = None
+        if modified_text != original_text:
+            output = compress_output(modified_text.encode(encoding))
+        entry = {'source_sha256': hashlib.sha256(content_bytes).hexdigest(),
+                 'output': output, 'rule_counts': counts}
+    return lines, entry
+
+def preview_diff(yaml_path, workers=1, context=PREVIEW_CONTEXT, plan_path=None):
+    """
+    YAML 파일에 정의된 각 작업에 대해 diff 미리보기를 콘솔에 출력.
+
+    workers가 2 이상이면 작업별 diff를 프로세스 풀에서 동시에 만들고,
+    출력은 완료되는 대로 작업 순서대로 내보냅니다.
+    plan_path를 지정하면 치환 결과를 계획 파일로 저장하여 실행 시 재사용할 수 있습니다.
+
+    Args:
+        yaml_path: 작업 YAML 파일 경로
+        workers: 동시에 diff를 만들 프로세스 수
+        context: hunk 앞뒤에 보여 줄 줄 수
+        plan_path: 계획 파일 저장 경로 (--plan)
 
-def preview_diff(yaml_path):
-    """YAML 파일에 정의된 각 작업에 대해 diff 미리보기를 콘솔에 출력."""
+    Returns:
+        변경이 있는 작업 수
+    """
     try:
-        with open(yaml_path, 'r', encoding='utf-8') as yf:
-            data = yaml.safe_load(yf)
+        data = load_yaml_cached(yaml_path)
     except FileNotFoundError:
         print(f"YAML 파일을 찾을 수 없습니다: {yaml_path}")
-        return
+        return 0
 
-    jobs = data.get("jobs", []) if data else []
-    for job in jobs:
-        source = job.get("source")
-        dest = job.get("destination", "(preview)")
-        replacements = job.get("replacements", [])
-        if not source or not replacements:
-            continue
-        try:
-            with open(source, 'r', encoding='utf-8') as sf:
-                original_text = sf.read()
-        except FileNotFoundError:
-            print(f"\n[오류] 원본 파일을 찾을 수 없습니다: {source}")
-            continue
+    try:
+        jobs = [job for job in collect_jobs(data or {}) if job['source'] and job['replacements']]
+    except ValueError as e:
+        print(f"YAML 작업 정의 오류: {str(e)}")
+        return 0
+    render = functools.partial(preview_job, context=context, keep_output=plan_path is not None)
+    writer = PlanWriter(plan_path, yaml_path) if plan_path else None
 
-        # 치환 적용 (미리보기이므로 파일 저장 안 함)
-        modified_text = apply_replacements(original_text, replacements)
+    changed = 0
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(DEBUG_MODE, time_budget())) as executor:
+            # map은 작업 순서대로 결과를 돌려주므로 앞 작업이 끝나는 대로 출력됨
+            results = executor.map(render, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+            changed = _print_preview(jobs, results, writer)
+    else:
+        changed = _print_preview(jobs, map(render, jobs), writer)
 
-        # diff 계산
-        diff_lines = compute_diff(original_text, modified_text, fromfile=source, tofile=f"{dest} (preview)")
+    if writer is not None:
+        writer.close()
+        print(f"\n계획 파일이 저장되었습니다: {plan_path} ({len(writer.entries)}개 작업)")
+    return changed
 
-        # diff 출력
-        print(f"\n*** {source} vs {dest} 미리보기 diff ***")
-        for line in diff_lines:
+def _print_preview(jobs, results, writer=None):
+    """미리보기 결과를 순서대로 출력(및 계획 파일에 저장)하고 변경이 있는 작업 수를 반환합니다."""
+    changed = 0
+    for job, (lines, entry) in zip(jobs, results):
+        if any(line.startswith('@@') for line in lines):
+            changed += 1
+        for line in lines:
             print(line, end='')
+        if writer is not None and entry is not None:
+            writer.add(job, entry['source_sha256'], entry['output'], entry['rule_counts'])
+    return changed
 
 def detect_encoding(file_path):
-    """파일의 인코딩을 감지합니다."""
-    if HAS_CHARDET:
-        with open(file_path, 'rb') as f:
-            raw = f.read()
-            result = chardet.detect(raw)
-            return result['encoding']
-    else:
-        return 'utf-8'  # 기본값으로 utf-8 사용
+    """파일의 인코딩을 감지합니다. (경로, 크기, 수정시각)이 같으면 캐시된 결과를 사용합니다."""
+    return detect_file_encoding(file_path) or 'utf-8'
+
+def detect_encoding_bytes(raw):
+    """메모리에 읽어 둔 파일 내용의 인코딩을 감지합니다 (BOM, XML 선언, UTF-8, chardet 표본 순)."""
+    return sniff_encoding(raw) or 'utf-8'
 
 def copy_file_with_check(source, dest):
     """파일을 복사하되, 대상 파일이 이미 존재하면 경고를 출력합니다."""
@@ -695,82 +946,139 @@ def copy_file_with_check(source, dest):
         print(f"파일 복사 중 오류 발생: {str(e)}")
         return False
 
-def apply_schema_replacements(file_path, replacements):
-    """파일에 치환 목록을 적용합니다."""
+def decode_content(content_bytes, encoding):
+    """
+    바이트 내용을 디코딩합니다. 실패하면 utf-8, latin-1 순으로 재시도합니다.
+
+    Returns:
+        (디코딩된 내용, 실제 사용한 인코딩)
+    """
+    try:
+        content = content_bytes.decode(encoding)
+        debug_print("디코딩 성공")
+        return content, encoding
+    except (UnicodeDecodeError, LookupError):
+        debug_print("utf-8로 재시도")
+        try:
+            return content_bytes.decode('utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            debug_print("latin-1로 시도")
+            return content_bytes.decode('latin-1'), 'latin-1'
+
+def transform_content(content_bytes, replacements, rule_counts=None, encoding=None, source_path=None):
+    """
+    메모리에 있는 파일 내용에 치환 목록을 적용합니다.
+
+    모든 규칙이 ASCII이고 파일이 ASCII이거나 ASCII 안전 인코딩(UTF-8 등)이면
+    디코딩/인코딩 없이 bytes 그대로 치환합니다. 파일이 ASCII이면 인코딩 감지도 생략합니다.
+
+    Args:
+        content_bytes: 원본 파일 내용
+        replacements: 치환 규칙 목록
+        rule_counts: 리스트를 전달하면 규칙별 치환 수가 추가됨 (로그용)
+        encoding: 파일 인코딩 (None이면 필요할 때 감지)
+        source_path: 원본 파일 경로 (인코딩 감지 캐시용)
+
+    Returns:
+        (치환된 내용, 변경 여부) - 변경이 없으면 원본 내용을 그대로 반환
+    """
+    debug_print(f"파일 크기: {len(content_bytes)} bytes")
+
+    # 치환목록은 한 번만 컴파일되어 같은 규칙을 쓰는 파일끼리 재사용됨
+    plan = compile_plan(replacements)
+
+    def resolve_encoding():
+        detected = encoding
+        if not detected and source_path:
+            detected = detect_file_encoding(source_path, content_bytes)
+        if not detected:
+            detected = detect_encoding_bytes(content_bytes)
+        if not detected:
+            debug_print("경고: 파일의 인코딩을 감지할 수 없습니다")
+            detected = 'utf-8'
+        debug_print(f"감지된 인코딩: {detected}")
+        return detected
+
+    template = None
+    if source_path and plan.rules:
+        template = _process_templates.lookup(source_path, content_bytes, plan)
+        if template is None and _process_templates.should_compile(source_path, content_bytes, plan):
+            # 같은 원본이 두 번째로 나오면 템플릿으로 만들어 이후 작업은 교체 값만 채움
+            content, template_encoding = decode_content(content_bytes, resolve_encoding())
+            _process_templates.store(source_path, plan,
+                                     compile_template(content_bytes, content, template_encoding, plan))
+            template = _process_templates.lookup(source_path, content_bytes, plan)
+
+    bytes_mode = False
+    if template is None and plan.ascii_rules:
+        if content_bytes.isascii():
+            bytes_mode = plan.can_apply_bytes(content_bytes)
+        elif plan.bytes_safe:
+            encoding = resolve_encoding()
+            bytes_mode = plan.can_apply_bytes(content_bytes, encoding)
+
+    errors = {}
+    if template is not None:
+        debug_print("템플릿에 교체 값을 채워 생성 (정규식 검색 생략)")
+        new_bytes, counts = template.render(plan), list(template.counts)
+    elif bytes_mode:
+        debug_print("bytes 모드로 치환 (디코딩 생략)")
+        new_bytes, counts = plan.apply_bytes(content_bytes)
+        errors = plan.errors
+    else:
+        encoding = resolve_encoding()
+        content, encoding = decode_content(content_bytes, encoding)
+        new_content, counts = plan.apply(content)
+        errors = plan.errors
+        new_bytes = content_bytes if new_content == content else new_content.encode(encoding)
+    if rule_counts is not None:
+        rule_counts.extend(counts)
+
+    # 규칙별 결과 출력 (매칭 수는 subn 결과를 그대로 사용)
+    for rule, count in zip(plan.rules, counts):
+        debug_print(f"\n--- 치환 규칙 {rule.index}/{len(plan)} ---")
+        debug_print(f"설명: {rule.description}")
+        debug_print(f"정규식 패턴: {rule.pattern_text}")
+        debug_print(f"교체할 값: {rule.replacement}")
+        if rule.warning:
+            debug_print(f"경고: {rule.warning}")
+        if rule.error or rule.index in errors:
+            debug_print(rule.error or errors[rule.index])
+        elif count:
+            debug_print(f"패턴 매칭 수: {count}")
+        else:
+            debug_print("패턴이 파일에서 발견되지 않음")
+    for index in plan.timeouts:
+        print(f"경고: 규칙 {index} ({plan.rules[index - 1].description}) 실행 시간 초과 - "
+              f"건너뜀 {source_path or ''}")
+
+    if new_bytes is content_bytes or new_bytes == content_bytes:
+        return content_bytes, False
+    return new_bytes, True
+
+def apply_schema_replacements(file_path, replacements, rule_counts=None):
+    """
+    파일에 치환 목록을 적용합니다.
+    
+    Args:
+        file_path: 치환할 파일 경로
+        replacements: 치환 규칙 목록
+        rule_counts: 리스트를 전달하면 규칙별 치환 수가 추가됨 (로그용)
+    """
     try:
         debug_print(f"\n=== 파일 치환 시작: {file_path} ===")
         
-        # 파일 인코딩 감지 및 읽기
-        encoding = detect_encoding(file_path)
-        if not encoding:
-            debug_print(f"경고: 파일의 인코딩을 감지할 수 없습니다 - {file_path}")
-            encoding = 'utf-8'
-        debug_print(f"감지된 인코딩: {encoding}")
-        
         # 파일 읽기
         with open(file_path, 'rb') as f:
             content_bytes = f.read()
-            debug_print(f"파일 크기: {len(content_bytes)} bytes")
-            
-        # 디코딩
-        try:
-            content = content_bytes.decode(encoding)
-            debug_print("디코딩 성공")
-        except UnicodeDecodeError:
-            debug_print("utf-8로 재시도")
-            try:
-                content = content_bytes.decode('utf-8')
-                encoding = 'utf-8'
-            except UnicodeDecodeError:
-                debug_print("latin-1로 시도")
-                content = content_bytes.decode('latin-1')
-                encoding = 'latin-1'
-        
-        modified = False
-        # 각 치환 규칙 적용
-        for idx, repl in enumerate(replacements, 1):
-            debug_print(f"\n--- 치환 규칙 {idx}/{len(replacements)} 적용 시도 ---")
-            debug_print(f"설명: {repl.get('설명', '설명 없음')}")
-            
-            pattern = repl['찾기']['정규식']
-            replacement = repl['교체']['값']
-            
-            debug_print(f"정규식 패턴: {pattern}")
-            debug_print(f"교체할 값: {replacement}")
-            
-            # 패턴이 파일에 존재하는지 확인
-            matches = list(re.finditer(pattern, content))
-            if not matches:
-                debug_print("패턴이 파일에서 발견되지 않음")
-                continue
-            debug_print(f"패턴 매칭 수: {len(matches)}")
-            
-            # 첫 번째 매칭 내용 출력
-            if matches:
-                first_match = matches[0]
-                debug_print("첫 번째 매칭:")
-                debug_print(f"  위치: {first_match.start()}-{first_match.end()}")
-                debug_print(f"  내용: {first_match.group()}")
-            
-            try:
-                # 정규식 치환 수행
-                new_content = re.sub(pattern, replacement, content)
-                if new_content == content:
-                    debug_print("치환 후 변경사항 없음")
-                else:
-                    content = new_content
-                    modified = True
-                    debug_print("치환 성공")
-            except Exception as e:
-                debug_print(f"치환 중 오류 발생: {str(e)}")
-                continue
+
+        content_bytes, modified = transform_content(content_bytes, replacements, rule_counts,
+                                                    source_path=file_path)
         
         # 변경된 경우에만 파일 저장
         if modified:
             debug_print("\n파일 저장 시작")
-            content_bytes = content.encode(encoding)
-            with open(file_path, 'wb') as f:
-                f.write(content_bytes)
+            atomic_write(file_path, content_bytes, file_path, keep_times=False)
             debug_print(f"파일 저장 완료 (크기: {len(content_bytes)} bytes)")
             return True
         else:
@@ -781,144 +1089,478 @@ def apply_schema_replacements(file_path, replacements):
         debug_print(f"치환 작업 중 예외 발생: {str(e)}")
         return False
 
-def check_file_locks(file_path):
-    """파일이 다른 프로세스에 의해 잠겨있는지 확인합니다."""
+def iter_jobs(rows, rule_sets=None):
+    """
+    (행 키, 행 데이터)를 하나씩 받아 실행할 (원본, 대상) 작업을 행 순서대로 만듭니다.
+
+    rule_sets 항목은 작업이 아니라 공통 규칙 정의이며, 행의 {규칙집합: ID} 참조를
+    규칙으로 펼칩니다 (같은 규칙 객체를 공유하므로 규칙집합별로 한 번만 컴파일됨).
+    rule_sets를 주지 않으면(스트리밍) rows에서 지금까지 나온 rule_sets 항목을 사용하므로, 참조하는
+    작업 행보다 뒤에 있으면 그 행에서 ValueError가 발생합니다 (작업을 만들기 전에).
+
+    Args:
+        rows: (행 키, 행 데이터) 반복자 - data.items() 또는 iter_yaml_rows(yaml_path)
+        rule_sets: 미리 읽은 rule_sets 항목 (전체를 읽은 경우 - 위치와 관계없이 사용)
+
+    Yields:
+        작업 딕셔너리 (순번, 행 키, 파일 타입, 원본, 대상, 치환목록)
+
+    Raises:
+        ValueError: 정의되지 않은(스트리밍에서는 아직 나오지 않은) 규칙집합을 참조한 경우
+    """
+    order = 0
+    streaming = rule_sets is None
+    rule_sets = rule_sets or {}
+    for row_key, row_data in rows:
+        if row_key == RULE_SETS_KEY:
+            if streaming:
+                rule_sets.update(row_data or {})
+            continue
+        for file_type, file_info in row_data.items():
+            yield {
+                'order': order,
+                'row_key': row_key,
+                'file_type': file_type,
+                'source': file_info.get('원본파일'),
+                'dest': file_info.get('복사파일'),
+                'replacements': expand_rule_sets(file_info.get('치환목록', []), rule_sets, streaming)
+            }
+            order += 1
+
+def collect_jobs(data):
+    """
+    YAML 데이터에서 실행할 (원본, 대상) 작업 목록을 행 순서대로 만듭니다.
+
+    Args:
+        data: YAML에서 읽은 작업 데이터
+
+    Returns:
+        작업 딕셔너리 목록 (순번, 행 키, 파일 타입, 원본, 대상, 치환목록)
+    """
+    return list(iter_jobs(data.items(), data.get(RULE_SETS_KEY) or {}))
+
+def iter_job_batches(jobs, size=None):
+    """작업을 size개(기본값 JOB_BATCH_SIZE)씩 묶어 넘깁니다 (스트리밍 실행 단위)."""
+    size = size or JOB_BATCH_SIZE
+    batch = []
+    for job in jobs:
+        batch.append(job)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def find_duplicate_destinations(jobs, first_by_dest=None):
+    """
+    같은 대상 파일에 쓰는 작업을 찾습니다.
+
+    병렬 실행 시 두 작업이 같은 파일을 쓰지 않도록, 대상이 같은 작업 중
+    첫 번째만 실행하고 나머지는 순차 실행과 마찬가지로 '이미 존재' 처리합니다.
+
+    Args:
+        jobs: collect_jobs로 만든 작업 목록
+        first_by_dest: 이전 묶음까지의 {대상 경로: 작업 순번} - 묶음 단위 실행 시 넘기면 갱신됨
+
+    Returns:
+        {중복 작업 순번: 먼저 실행되는 작업 순번}
+    """
+    if first_by_dest is None:
+        first_by_dest = {}
+    duplicates = {}
+    for job in jobs:
+        if not job['source'] or not job['dest']:
+            continue
+        key = os.path.normcase(os.path.abspath(job['dest']))
+        if key in first_by_dest:
+            duplicates[job['order']] = first_by_dest[key]
+        else:
+            first_by_dest[key] = job['order']
+    return duplicates
+
+def _hashed(chunks, digest):
+    """쓰는 내용을 그대로 넘기면서 해시를 갱신합니다."""
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+def stream_replace_file(source, dest, replacements, rule_counts=None, digest=None):
+    """
+    대용량 원본을 mmap으로 열어 창 단위로 치환하면서 대상 파일에 씁니다.
+
+    매칭 길이가 무제한인 규칙(예: [^"]*)이 있거나 bytes 모드에 안전한 인코딩이 아니면
+    스트리밍하지 않고 None을 반환하므로 호출자가 메모리 모드로 처리해야 합니다.
+
+    Args:
+        source: 원본 파일 경로
+        dest: 대상 파일 경로
+        replacements: 치환 규칙 목록
+        rule_counts: 리스트를 전달하면 규칙별 치환 수가 추가됨 (로그용)
+        digest: hashlib 객체를 전달하면 대상 파일 내용으로 갱신됨 (저널용)
+
+    Returns:
+        변경 여부 (스트리밍할 수 없으면 None)
+    """
+    plan = compile_plan(replacements)
+    if not plan.streamable:
+        debug_print("매칭 길이가 무제한인 규칙이 있어 메모리 모드로 처리")
+        return None
+
+    mapped = open_mmap(source)
     try:
-        # 파일을 독점 모드로 열어서 잠금 상태 확인
-        with open(file_path, 'r+b'):
-            return False  # 파일이 잠겨있지 않음
-    except (IOError, OSError):
-        return True  # 파일이 잠겨있음 또는 접근 불가
-
-def generate_delete_batch(data, batch_path):
-    """생성된 파일들을 삭제하는 배치 파일을 생성합니다."""
-    with open(batch_path, 'w', encoding='utf-8') as f:
-        f.write('@echo off\n')
-        f.write('chcp 65001 > nul\n')  # UTF-8 코드 페이지로 설정
-        f.write('cls\n')  # 화면 지우기
-        f.write('setlocal EnableDelayedExpansion\n\n')  # 지연 환경 변수 확장 활성화
-        
-        # 삭제 대상 파일 목록을 주석으로 먼저 작성
-        f.write('rem ===================================================================\n')
-        f.write('rem 삭제 대상 파일 목록\n')
-        f.write('rem ===================================================================\n')
-        
-        # 삭제 대상 파일을 저장할 리스트
-        delete_files = []
-        locked_files = []
-        
-        # 각 행 처리하여 삭제 대상 파일 수집
-        for row_key, row_data in data.items():
-            # 파일 타입별 처리
-            file_types = ['송신파일경로', '수신파일경로', '송신스키마파일명', '수신스키마파일명']
-            
-            for file_type in file_types:
-                if file_type in row_data:
-                    file_info = row_data[file_type]
-                    copy_file = file_info.get('복사파일', '')
-                    
-                    # 파일이 실제로 존재하는 경우에만 목록에 추가
-                    if copy_file and os.path.exists(copy_file):
-                        delete_files.append((file_type, copy_file))
-                        f.write(f'rem [{file_type}] {copy_file}\n')
-                        
-                        # 파일 잠금 상태 확인
-                        if check_file_locks(copy_file):
-                            locked_files.append((file_type, copy_file))
-                            f.write(f'rem     ^^ 경고: 이 파일은 다른 프로세스가 사용 중입니다\n')
-        
-        f.write(f'rem 총 삭제 대상 파일 수: {len(delete_files)}개\n')
-        if locked_files:
-            f.write(f'rem 잠긴 파일 수: {len(locked_files)}개 (삭제 시 주의 필요)\n')
-        f.write('rem ===================================================================\n\n')
-        
-        # 실제 삭제 명령어 작성
-        f.write('echo 파일 삭제를 시작합니다...\n')
-        f.write(f'echo 총 {len(delete_files)}개의 파일을 삭제합니다.\n')
-        if locked_files:
-            f.write(f'echo 경고: {len(locked_files)}개의 파일이 다른 프로세스에 의해 사용 중입니다.\n')
-            f.write('echo       Everything, 안티바이러스, 텍스트 에디터 등을 종료한 후 실행하세요.\n')
-        f.write('echo.\n\n')
-        
-        # 성공/실패 카운터 초기화
-        f.write('set success_count=0\n')
-        f.write('set fail_count=0\n\n')
-        
-        # 각 파일 삭제 명령어 작성
-        for file_type, copy_file in delete_files:
-            f.write(f'echo [{file_type}] 삭제 시도: {copy_file}\n')
-            
-            # 파일 존재 여부 확인
-            f.write(f'if exist "{copy_file}" (\n')
-            
-            # 파일 속성 제거 (읽기 전용, 숨김, 시스템 속성 제거)
-            f.write(f'    attrib -r -h -s "{copy_file}" 2>nul\n')
-            
-            # 파일이 사용 중인지 확인하고 강제 삭제 시도
-            f.write(f'    del /f /q "{copy_file}" 2>nul\n')
-            
-            # 삭제 성공 여부 확인
-            f.write(f'    if exist "{copy_file}" (\n')
-            f.write(f'        echo    [실패] 파일을 삭제할 수 없습니다. 다른 프로세스가 사용 중일 수 있습니다.\n')
-            f.write(f'        set /a fail_count+=1\n')
-            
-            # 파일이 잠겨있는 경우 추가 시도
-            f.write(f'        echo    [재시도] PowerShell로 삭제를 시도합니다...\n')
-            f.write(f'        powershell -Command "try {{ Remove-Item -Path \'{copy_file}\' -Force -ErrorAction Stop; Write-Host \'    [성공] PowerShell로 삭제 완료\' }} catch {{ Write-Host \'    [실패] PowerShell 삭제도 실패: $_\' }}"\n')
-            
-            f.write(f'    ) else (\n')
-            f.write(f'        echo    [성공] 파일 삭제 완료\n')
-            f.write(f'        set /a success_count+=1\n')
-            f.write(f'    )\n')
-            f.write(f') else (\n')
-            f.write(f'    echo    [정보] 파일이 이미 존재하지 않습니다.\n')
-            f.write(f'    set /a success_count+=1\n')
-            f.write(f')\n')
-            f.write('echo.\n')
-        
-        if not delete_files:
-            f.write('echo 삭제할 파일이 없습니다.\n')
+        if plan.rules and bytes_mode_encoding(mapped) is None:
+            debug_print("bytes 모드에 안전한 인코딩이 아니어서 메모리 모드로 처리")
+            return None
+        counts = [0] * len(plan)
+        changed = []
+        debug_print(f"스트리밍 치환 시작: {source}")
+        chunks = plan.iter_stream(mmap_chunks(mapped), counts, changed)
+        if digest is not None:
+            chunks = _hashed(chunks, digest)
+        stream_write(dest, chunks, source)
+    finally:
+        if not isinstance(mapped, bytes):
+            mapped.close()
+
+    if rule_counts is not None:
+        rule_counts.extend(counts)
+    return bool(changed and changed[0])
+
+def process_job(job, source_bytes, write):
+    """
+    미리 읽은 원본 내용으로 작업 하나(치환 + 대상 파일 쓰기)를 처리합니다.
+
+    원본을 한 번만 읽고 메모리에서 치환한 뒤 임시 파일에 써서 대상 파일로 교체하므로
+    반쯤 치환된 대상 파일이 남지 않습니다. 원본의 권한과 수정시각은 유지됩니다.
+
+    Args:
+        job: collect_jobs로 만든 작업
+        source_bytes: 원본 파일 내용 (None이면 대용량 파일 - 스트리밍 시도 후 필요하면 직접 읽음)
+        write: (대상 경로, 내용, 원본 경로)를 받아 파일을 원자적으로 쓰는 함수
+
+    Returns:
+        결과 딕셔너리 (순번, 복사 여부, 치환 여부, 규칙별 치환 수, 대상 파일 해시, 오류)
+    """
+    result = {'order': job['order'], 'copied': False, 'replaced': False,
+              'rule_counts': [], 'sha256': None, 'error': None}
+    source = job['source']
+    dest = job['dest']
+    replacements = job['replacements']
+    debug_print(f"\n--- {job['row_key']} / {job['file_type']} 처리 ---")
+    debug_print(f"원본파일: {source}")
+    debug_print(f"복사파일: {dest}")
+    debug_print(f"치환규칙 수: {len(replacements)}")
+
+    if DEBUG_MODE and replacements:
+        debug_print("\n치환 규칙 목록:")
+        for idx, repl in enumerate(replacements, 1):
+            debug_print(f"  {idx}. {repl.get('설명', '설명 없음')}")
+            debug_print(f"     조건: {repl.get('조건', {})}")
+            debug_print(f"     찾기: {repl.get('찾기', {})}")
+            debug_print(f"     교체: {repl.get('교체', {})}")
+
+    # 대상 파일이 이미 존재하면 덮어쓰지 않음 (증분 실행에서 다시 만드는 작업 제외)
+    if os.path.exists(dest) and not job.get('overwrite'):
+        print(f"경고: 파일이 이미 존재합니다 - {dest}")
+        return result
+
+    planned = job.get('planned')
+    try:
+        if source_bytes is None and planned:
+            # 계획 파일의 결과를 쓰려면 원본 해시를 확인해야 하므로 스트리밍하지 않음
+            source_bytes = read_source(source)
+        if source_bytes is None:
+            digest = hashlib.sha256()
+            streamed = stream_replace_file(source, dest, replacements, result['rule_counts'], digest)
+            if streamed is not None:
+                result['copied'] = True
+                result['sha256'] = digest.hexdigest()
+                result['replaced'] = streamed
+                print(f"파일 복사 완료: {source} -> {dest}")
+                return result
+            source_bytes = read_source(source)
+
+        content_bytes = source_bytes
+        if planned and hashlib.sha256(source_bytes).hexdigest() != planned['source_sha256']:
+            print(f"경고: 미리보기 이후 원본이 변경되어 다시 치환합니다 - {source}")
+            planned = None
+        if planned:
+            try:
+                output = read_output(planned)
+            except ValueError as e:
+                print(f"경고: {str(e)} - 다시 치환합니다 {source}")
+                planned = None
+        if planned:
+            # 미리보기에서 계산한 결과를 그대로 사용 (인코딩 감지/정규식 치환 생략)
+            debug_print("미리보기 계획의 치환 결과 사용")
+            if output is not None:
+                content_bytes = output
+                result['replaced'] = True
+            result['rule_counts'] = list(planned['rule_counts'])
+        elif replacements:
+            memo_key = (hashlib.sha256(source_bytes).hexdigest(), rules_fingerprint(replacements))
+            memo = _output_memo.get(memo_key)
+            if memo is not None:
+                # 같은 원본 + 같은 치환목록은 앞 작업의 결과를 그대로 사용
+                debug_print("같은 원본과 치환목록의 치환 결과 재사용")
+                content_bytes, result['replaced'], rule_counts = memo
+                result['rule_counts'] = list(rule_counts)
+            else:
+                debug_print(f"치환 작업 시작: {dest}")
+                try:
+                    content_bytes, result['replaced'] = transform_content(
+                        source_bytes, replacements, result['rule_counts'], source_path=source)
+                    # 시간 초과로 건너뛴 규칙이 있으면 다음 작업에서 다시 치환
+                    if not compile_plan(replacements).timeouts:
+                        _output_memo.put(memo_key, (content_bytes, result['replaced'], list(result['rule_counts'])),
+                                         len(content_bytes))
+                except Exception as e:
+                    # 치환 실패 시에도 원본 복사는 수행 (기존 동작과 동일)
+                    debug_print(f"치환 작업 중 예외 발생: {str(e)}")
+                    content_bytes = source_bytes
+            debug_print("치환 작업 성공" if result['replaced'] else "치환 작업 실패 또는 변경사항 없음")
         else:
-            # 결과 요약 출력
-            f.write('\necho ===================================================================\n')
-            f.write('echo 작업 완료 요약:\n')
-            f.write('echo    성공: !success_count!개\n')
-            f.write('echo    실패: !fail_count!개\n')
-            f.write('echo ===================================================================\n')
-            
-            # Windows 탐색기 새로고침을 위한 명령
-            f.write('\necho.\n')
-            f.write('echo Windows 탐색기를 새로고침합니다...\n')
-            f.write('powershell -Command "$shell = New-Object -ComObject Shell.Application; $shell.Windows() | ForEach-Object { $_.Refresh() }"\n')
-            
-            # Everything 캐시 지우기 제안
-            f.write('\necho.\n')
-            f.write('echo 참고: Everything 검색 도구를 사용 중이라면 F5를 눌러 인덱스를 새로고침하세요.\n')
-        
-        f.write('\necho.\n')
-        f.write('pause\n')
-    
-    print(f"\n삭제 배치 파일이 생성되었습니다: {batch_path}")
-    print(f"삭제 대상 파일 수: {len(delete_files)}개")
-    if locked_files:
-        print(f"경고: {len(locked_files)}개의 파일이 다른 프로세스에 의해 사용 중입니다.")
-        print("     Everything, 안티바이러스 소프트웨어, 텍스트 에디터 등을 종료 후 배치 파일을 실행하세요.")
-
-def execute_replacements(yaml_path, log_path, summary_path):
-    """YAML에 정의된 복사 및 치환 작업을 실행하고 로그를 생성합니다."""
+            debug_print("치환 규칙 없음, 건너뜀")
+
+        result['sha256'] = hashlib.sha256(content_bytes).hexdigest()
+        write(dest, content_bytes, source)
+        result['copied'] = True
+        print(f"파일 복사 완료: {source} -> {dest}")
+    except Exception as e:
+        print(f"파일 복사 중 오류 발생: {str(e)}")
+        result['error'] = str(e)
+    return result
+
+def run_job(job):
+    """
+    작업 하나를 실행합니다. 프로세스 풀 작업자에서 호출됩니다.
+
+    Args:
+        job: collect_jobs로 만든 작업
+
+    Returns:
+        결과 딕셔너리
+    """
+    try:
+        if STREAM_THRESHOLD and os.path.getsize(job['source']) >= STREAM_THRESHOLD:
+            source_bytes = None
+        else:
+            source_bytes = read_source(job['source'])
+    except Exception as e:
+        print(f"파일 복사 중 오류 발생: {str(e)}")
+        return _skipped_result(job, str(e))
+    return process_job(job, source_bytes, write_file)
+
+def run_job_group(jobs):
+    """
+    원본과 치환목록이 같은 작업들을 한 작업자에서 차례로 실행합니다.
+    두 번째 작업부터는 원본 캐시와 치환 결과를 재사용합니다.
+
+    Args:
+        jobs: 같은 원본과 치환목록을 쓰는 작업 목록
+
+    Returns:
+        결과 딕셔너리 목록
+    """
+    return [run_job(job) for job in jobs]
+
+def _group_same_output(jobs):
+    """작업을 (원본 경로, 치환목록 지문) 단위로 묶습니다 (처음 나온 순서 유지)."""
+    groups = {}
+    for job in jobs:
+        key = (os.path.normcase(os.path.abspath(job['source'])), rules_fingerprint(job['replacements']))
+        groups.setdefault(key, []).append(job)
+    return list(groups.values())
+
+def _run_pool(executor, jobs):
+    """프로세스 풀로 작업을 실행하고 {작업 순번: 결과}를 반환합니다."""
+    return {result['order']: result
+            for results in executor.map(run_job_group, _group_same_output(jobs))
+            for result in results}
+
+def run_scheduled(jobs):
+    """
+    I/O 스케줄러로 작업을 실행합니다 (대상 디렉토리 순, 원본 미리 읽기, 쓰기 스레드).
+
+    Args:
+        jobs: 실행할 작업 목록
+
+    Returns:
+        {작업 순번: 결과}
+    """
+    results = {}
+    with IOScheduler() as scheduler:
+        for job, source_bytes, error in scheduler.prefetch(scheduler.schedule(jobs)):
+            if error is not None:
+                print(f"파일 복사 중 오류 발생: {str(error)}")
+                results[job['order']] = _skipped_result(job, str(error))
+                continue
+            results[job['order']] = process_job(job, source_bytes, scheduler.write)
+        write_errors = scheduler.close()
+
+    # 쓰기 스레드에서 실패한 작업은 복사 실패로 기록
+    for job in jobs:
+        error = write_errors.get(job['dest'])
+        if error is not None:
+            print(f"파일 복사 중 오류 발생: {error}")
+            results[job['order']].update({'copied': False, 'replaced': False, 'sha256': None,
+                                          'error': error})
+    return results
+
+def _init_worker(debug_mode, budget=None):
+    """프로세스 풀 작업자의 디버그 설정(과 규칙 시간 예산)을 부모 프로세스와 맞춥니다."""
+    global DEBUG_MODE
+    DEBUG_MODE = debug_mode
+    if budget is not None:
+        set_time_budget(*budget)
+
+def _worker_pool(workers):
+    """작업 실행용 프로세스 풀을 만듭니다."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(DEBUG_MODE, time_budget()))
+
+def _skipped_result(job, reason):
+    """실행하지 않은 작업의 결과를 만듭니다."""
+    return {'order': job['order'], 'copied': False, 'replaced': False,
+            'rule_counts': [], 'sha256': None, 'error': reason}
+
+def run_jobs(jobs, workers=1, unchanged=(), duplicates=None, executor=None):
+    """
+    작업 목록을 실행하고 결과를 작업 순서대로 반환합니다.
+
+    Args:
+        jobs: collect_jobs로 만든 작업 목록
+        workers: 동시에 실행할 프로세스 수 (1이면 현재 프로세스에서 I/O 스케줄러로 실행)
+        unchanged: 증분 실행에서 입력과 결과가 그대로여서 건너뛸 작업 순번 집합
+        duplicates: find_duplicate_destinations 결과 (None이면 jobs 안에서 계산)
+        executor: 묶음마다 다시 만들지 않고 재사용할 프로세스 풀
+
+    Yields:
+        (작업, 결과) - 항상 작업 순번 순서
+    """
+    if duplicates is None:
+        duplicates = find_duplicate_destinations(jobs)
+    runnable = [job for job in jobs
+                if job['source'] and job['dest'] and job['order'] not in duplicates
+                and job['order'] not in unchanged]
+
+    # 병렬 실행에서는 원본과 치환목록이 같은 작업을 한 작업자에 모아 결과를 재사용
+    if executor is not None and len(runnable) > 1:
+        results = _run_pool(executor, runnable)
+    elif workers > 1 and len(runnable) > 1:
+        with _worker_pool(workers) as executor:
+            results = _run_pool(executor, runnable)
+    else:
+        results = run_scheduled(runnable)
+
+    for job in jobs:
+        if not job['source'] or not job['dest']:
+            debug_print(f"{job['row_key']} / {job['file_type']}: 원본 또는 대상 파일 경로가 없음, 건너뜀")
+            continue
+        if job['order'] in duplicates:
+            print(f"경고: 다른 작업과 대상 파일이 같아 건너뜁니다 - {job['dest']}")
+            yield job, _skipped_result(job, "대상 파일 중복")
+        elif job['order'] in unchanged:
+            debug_print(f"변경 없음, 건너뜀: {job['dest']}")
+            yield job, dict(_skipped_result(job, None), unchanged=True)
+        else:
+            yield job, results[job['order']]
+
+def plan_incremental(jobs, state, duplicates=None):
+    """
+    증분 실행 대상 작업을 고릅니다.
+
+    원본 내용 해시와 치환목록 지문이 지난 실행과 같고 대상 파일도 그때 만든 그대로인
+    작업은 건너뛰고, 나머지 작업 중 대상 파일이 이미 있는 작업은 다시 만들도록 표시합니다.
+
+    Args:
+        jobs: collect_jobs로 만든 작업 목록
+        state: IncrementalState
+        duplicates: find_duplicate_destinations 결과 (None이면 jobs 안에서 계산)
+
+    Returns:
+        ({작업 순번: 입력 정보}, 건너뛸 작업 순번 집합)
+    """
+    inputs = {}
+    unchanged = set()
+    if duplicates is None:
+        duplicates = find_duplicate_destinations(jobs)
+    for job in jobs:
+        if not job['source'] or not job['dest'] or job['order'] in duplicates:
+            continue
+        try:
+            inputs[job['order']] = state.inputs(job['source'], job['dest'],
+                                                rules_fingerprint(job['replacements']))
+        except OSError:
+            # 원본이 없으면 실행 단계에서 오류로 기록됨
+            continue
+        if state.is_current(job['dest'], inputs[job['order']]):
+            unchanged.add(job['order'])
+        elif os.path.exists(job['dest']):
+            job['overwrite'] = True
+    return inputs, unchanged
+
+def attach_plan(jobs, entries):
+    """
+    미리보기 계획 파일의 결과를 작업에 연결합니다.
+
+    작업 키(경로, 치환목록 지문 등)가 같은 작업만 연결되며, 원본 해시는 실행 시 확인합니다.
+
+    Args:
+        jobs: collect_jobs로 만든 작업 목록
+        entries: load_plan(계획 파일 경로) 결과
+
+    Returns:
+        계획 결과를 사용할 작업 수
+    """
+    attached = 0
+    for job in jobs:
+        if not job['source'] or not job['dest'] or not job['replacements']:
+            continue
+        entry = entries.get(job_key(job))
+        if entry is not None:
+            job['planned'] = entry
+            attached += 1
+    return attached
+
+def execute_replacements(yaml_path, log_path, summary_path, workers=1, journal_dir=JOURNAL_DIR,
+                         incremental=False, plan_path=None):
+    """
+    YAML에 정의된 복사 및 치환 작업을 실행하고 로그를 생성합니다.
+
+    생성한 파일은 실행 ID별 저널에 기록되며 rollback_run(실행 ID)으로 되돌릴 수 있습니다.
+    증분 실행에서는 원본과 치환목록이 바뀐 작업만 다시 만들고, 덮어쓰는 대상 파일은
+    저널에 백업합니다.
+
+    Args:
+        yaml_path: 작업 YAML 파일 경로
+        log_path: 로그 파일 경로
+        summary_path: 요약 파일 경로
+        workers: 병렬 실행 프로세스 수 (--jobs N, 기본값 1 = 순차 실행)
+        journal_dir: 실행 저널 디렉토리
+        incremental: True이면 바뀌지 않은 작업을 건너뜀 (--incremental)
+        plan_path: 미리보기에서 저장한 계획 파일 (--plan) - 원본이 그대로인 작업은 저장된 결과 사용
+
+    Returns:
+        실행 ID (실행하지 않은 경우 None)
+    """
+    # YAML은 행 단위로 읽으며 JOB_BATCH_SIZE개 작업씩 실행 (전체를 메모리에 올리지 않음)
+    excel_rows = []
+    batches = iter_job_batches(iter_jobs(_tap_excel_rows(iter_yaml_rows(yaml_path), excel_rows)))
     try:
         debug_print(f"YAML 파일 읽기 시작: {yaml_path}")
-        with open(yaml_path, 'r', encoding='utf-8') as yf:
-            data = yaml.safe_load(yf)
-            debug_print(f"YAML 데이터 로드 완료: {len(data) if data else 0}개 항목")
+        batch = next(batches, None)
     except FileNotFoundError:
         print(f"YAML 파일을 찾을 수 없습니다: {yaml_path}")
         return
+    except ValueError as e:
+        print(f"YAML 작업 정의 오류: {str(e)}")
+        return
     except Exception as e:
         print(f"YAML 파일 읽기 중 오류 발생: {str(e)}")
         return
 
-    if not data:
+    if not batch:
         print("실행할 작업이 없습니다.")
         return
 
@@ -930,62 +1572,97 @@ def execute_replacements(yaml_path, log_path, summary_path):
     summary_data = []
     total_copies = 0
     total_replacements = 0
+    total_unchanged = 0
+    total_planned = 0
 
-    # 각 행 처리
-    for row_key, row_data in data.items():
-        debug_print(f"\n=== {row_key} 처리 시작 ===")
-        debug_print(f"행 데이터: {row_data.keys()}")
-        
-        # 각 파일 타입 처리 (송신파일경로, 수신파일경로 등)
-        for file_type, file_info in row_data.items():
-            debug_print(f"\n--- {file_type} 처리 ---")
-            source = file_info.get('원본파일')
-            dest = file_info.get('복사파일')
-            replacements = file_info.get('치환목록', [])
-            
-            debug_print(f"원본파일: {source}")
-            debug_print(f"복사파일: {dest}")
-            debug_print(f"치환규칙 수: {len(replacements)}")
-            
-            if not source or not dest:
-                debug_print("원본 또는 대상 파일 경로가 없음, 건너뜀")
-                continue
-            
-            if DEBUG_MODE and replacements:
-                debug_print("\n치환 규칙 목록:")
-                for idx, repl in enumerate(replacements, 1):
-                    debug_print(f"  {idx}. {repl.get('설명', '설명 없음')}")
-                    debug_print(f"     조건: {repl.get('조건', {})}")
-                    debug_print(f"     찾기: {repl.get('찾기', {})}")
-                    debug_print(f"     교체: {repl.get('교체', {})}")
-                
-            # 1. 파일 복사
-            debug_print(f"\n파일 복사 시도: {source} -> {dest}")
-            if copy_file_with_check(source, dest):
-                total_copies += 1
-                debug_print("파일 복사 성공")
-                
-                # 2. 치환 목록이 있는 경우 치환 수행
-                if replacements:
-                    debug_print(f"치환 작업 시작: {dest}")
-                    if apply_schema_replacements(dest, replacements):
+    if workers > 1:
+        print(f"병렬 실행: {workers}개 프로세스")
+    plan_entries = None
+    if plan_path:
+        try:
+            plan_entries = load_plan(plan_path)
+        except Exception as e:
+            print(f"계획 파일을 사용할 수 없어 전체 치환합니다: {str(e)}")
+
+    state = IncrementalState(journal_dir) if incremental else None
+    first_by_dest = {}
+    journal = RunJournal(journal_dir=journal_dir, yaml=os.path.abspath(yaml_path))
+    executor = _worker_pool(workers) if workers > 1 else None
+
+    # 결과는 병렬 실행 여부와 관계없이 행 순서대로 기록됨
+    with journal, open(log_path, 'a', encoding='utf-8') as lf:
+        try:
+            while batch:
+                duplicates = find_duplicate_destinations(batch, first_by_dest)
+                if plan_entries:
+                    total_planned += attach_plan(batch, plan_entries)
+                inputs = {}
+                unchanged = set()
+                if state is not None:
+                    inputs, unchanged = plan_incremental(batch, state, duplicates)
+                    total_unchanged += len(unchanged)
+
+                # 파일을 쓰기 전에 생성될 대상 파일을 저널에 기록 (중단되어도 되돌릴 수 있도록)
+                journal.plan_create(job['dest'] for job in batch if job['source'] and job['dest'])
+                for job in batch:
+                    if job.get('overwrite'):
+                        journal.backup(job['dest'])
+
+                for job, result in run_jobs(batch, workers, unchanged, duplicates, executor):
+                    if result['copied']:
+                        journal.record_created(job['dest'], result['sha256'])
+                        if state is not None and job['order'] in inputs:
+                            state.record(job['dest'], inputs[job['order']], result['sha256'])
+                    elif job['dest']:
+                        # 미리 create로 기록했지만 쓰지 않은 대상은 되돌리기 때 삭제하지 않음
+                        journal.record_skipped(job['dest'], result['error'])
+                    replacements = job['replacements']
+                    rule_counts = result['rule_counts']
+                    if result['copied']:
+                        total_copies += 1
+                    if result['replaced']:
                         total_replacements += 1
-                        debug_print("치환 작업 성공")
-                    else:
-                        debug_print("치환 작업 실패 또는 변경사항 없음")
-                else:
-                    debug_print("치환 규칙 없음, 건너뜀")
-                        
-            # 작업 결과 기록
-            summary = f"{file_type}: {source} -> {dest}"
-            if replacements:
-                summary += f" (치환: {len(replacements)}개 규칙)"
-            summary_data.append(summary)
-            debug_print(f"작업 결과: {summary}")
-            
-            # 로그 기록
-            with open(log_path, 'a', encoding='utf-8') as lf:
-                lf.write(f"[{datetime.datetime.now()}] {summary}\n")
+
+                    # 작업 결과 기록
+                    summary = f"{job['file_type']}: {job['source']} -> {job['dest']}"
+                    if replacements:
+                        summary += f" (치환: {len(replacements)}개 규칙"
+                        if rule_counts:
+                            summary += f", {sum(rule_counts)}건 치환"
+                        summary += ")"
+                    if result.get('unchanged'):
+                        summary += " [변경 없음]"
+                    if result['error']:
+                        summary += f" [오류: {result['error']}]"
+                    summary_data.append(summary)
+                    debug_print(f"작업 결과: {summary}")
+
+                    # 로그 기록 (규칙별 치환 건수 포함)
+                    lf.write(f"[{datetime.datetime.now()}] {summary}\n")
+                    for repl, count in zip(replacements, rule_counts):
+                        lf.write(f"    - {repl.get('설명', '설명 없음')}: {count}건\n")
+                    lf.flush()
+
+                try:
+                    batch = next(batches, None)
+                except Exception as e:
+                    # 이미 실행한 작업은 저널에 남아 있으므로 되돌릴 수 있음
+                    print(f"YAML 파일 읽기 중 오류 발생, 이후 작업은 실행하지 않습니다: {str(e)}")
+                    lf.write(f"[{datetime.datetime.now()}] [오류] YAML 읽기 중단: {str(e)}\n")
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if plan_entries:
+                close_plans()
+
+    if plan_entries:
+        print(f"계획 파일 사용: {total_planned}개 작업")
+    if incremental:
+        print(f"증분 실행: {total_unchanged}개 작업 변경 없음")
+
+    if state is not None:
+        state.save()
 
     # 요약 파일 생성
     debug_print(f"\n요약 파일 생성: {summary_path}")
@@ -995,14 +1672,12 @@ def execute_replacements(yaml_path, log_path, summary_path):
             sf.write(line + "\n")
         sf.write(f"\n총 복사 파일 수: {total_copies}")
         sf.write(f"\n총 치환 파일 수: {total_replacements}")
+        if incremental:
+            sf.write(f"\n변경 없이 건너뛴 파일 수: {total_unchanged}")
 
     # 엑셀 로그 파일 생성
     excel_path = os.path.splitext(log_path)[0] + '.xlsx'
-    generate_excel_log(data, excel_path)
-
-    # 삭제 배치 파일 생성
-    batch_path = os.path.splitext(log_path)[0] + '_delete.bat'
-    generate_delete_batch(data, batch_path)
+    write_excel_log(excel_rows, excel_path)
 
     debug_print("\n=== 전체 작업 완료 ===")
     debug_print(f"총 복사 파일 수: {total_copies}")
@@ -1011,29 +1686,85 @@ def execute_replacements(yaml_path, log_path, summary_path):
     print(f"\n작업이 완료되었습니다.")
     print(f"총 복사 파일 수: {total_copies}")
     print(f"총 치환 파일 수: {total_replacements}")
+    if incremental:
+        print(f"변경 없이 건너뛴 파일 수: {total_unchanged}")
+    print(f"실행 ID: {journal.run_id} (되돌리기: python string_replacer.py rollback {journal.run_id})")
+    return journal.run_id
+
+def rollback_run(run_id, journal_dir=JOURNAL_DIR, force=False):
+    """
+    실행 하나를 되돌리고 결과를 출력합니다.
+
+    Args:
+        run_id: 되돌릴 실행 ID
+        journal_dir: 실행 저널 디렉토리
+        force: True이면 실행 이후 내용이 바뀐 파일도 되돌림
+
+    Returns:
+        rollback 결과 딕셔너리 (저널이 없으면 None)
+    """
+    try:
+        result = rollback(run_id, journal_dir, force=force)
+    except FileNotFoundError:
+        print(f"실행 저널을 찾을 수 없습니다: {run_id}")
+        return None
+
+    for path, reason in result['skipped']:
+        print(f"건너뜀: {path} ({reason})")
+    for path, error in result['failed']:
+        print(f"실패: {path} ({error})")
+    for path in result['unverified']:
+        print(f"확인 없이 삭제: {path} (중단된 실행 - 쓰기 완료 기록 없음)")
+    print(f"\n되돌리기 완료: 삭제 {len(result['deleted'])}개, 복원 {len(result['restored'])}개, "
+          f"건너뜀 {len(result['skipped'])}개, 실패 {len(result['failed'])}개")
+    return result
+
+def print_runs(journal_dir=JOURNAL_DIR):
+    """되돌릴 수 있는 실행 목록을 출력합니다."""
+    runs = list_runs(journal_dir)
+    if not runs:
+        print("기록된 실행이 없습니다.")
+    for run in runs:
+        state = '되돌림' if run['rolled_back'] else ('완료' if run['finished'] else '중단됨')
+        print(f"{run['run_id']}  {run['time']}  파일 {run['files']}개  [{state}]  {run['yaml']}")
+
+# 엑셀 로그에 기록하는 파일 타입 (행마다 이 순서로 기록)
+EXCEL_LOG_FILE_TYPES = ['송신파일경로', '수신파일경로', '송신스키마파일명', '수신스키마파일명']
+
+def excel_log_rows(row_data):
+    """행 하나에서 엑셀 로그에 기록할 (파일 타입, 원본, 복사파일)을 만듭니다."""
+    return [(file_type, row_data[file_type].get('원본파일', ''), row_data[file_type].get('복사파일', ''))
+            for file_type in EXCEL_LOG_FILE_TYPES if file_type in row_data]
+
+def _tap_excel_rows(rows, excel_rows):
+    """행을 그대로 넘기면서 엑셀 로그 항목만 모아 둡니다."""
+    for row_key, row_data in rows:
+        if row_key != RULE_SETS_KEY:
+            excel_rows.extend(excel_log_rows(row_data))
+        yield row_key, row_data
 
 def generate_excel_log(data, excel_path):
     """YAML 실행 결과를 엑셀 파일로 생성합니다."""
-    # 엑셀 데이터를 저장할 리스트
-    excel_rows = []
-    
-    # 각 행 처리
-    for row_key, row_data in data.items():
-        # 파일 타입별 처리
-        file_types = ['송신파일경로', '수신파일경로', '송신스키마파일명', '수신스키마파일명']
-        
-        for file_type in file_types:
-            if file_type in row_data:
-                file_info = row_data[file_type]
-                excel_rows.append({
-                    '파일타입': file_type,
-                    '원본파일경로': file_info.get('원본파일', ''),
-                    '복사파일경로': file_info.get('복사파일', ''),
-                    '생성여부': 'O' if os.path.exists(file_info.get('복사파일', '')) else 'X'
-                })
-    
+    write_excel_log([entry for row_key, row_data in data.items() if row_key != RULE_SETS_KEY
+                     for entry in excel_log_rows(row_data)], excel_path)
+
+def write_excel_log(entries, excel_path):
+    """
+    (파일 타입, 원본, 복사파일) 목록을 생성 여부와 함께 엑셀 로그로 저장합니다.
+
+    Args:
+        entries: excel_log_rows로 만든 항목 목록
+        excel_path: 엑셀 파일 경로
+    """
+    excel_rows = [{
+        '파일타입': file_type,
+        '원본파일경로': source,
+        '복사파일경로': dest,
+        '생성여부': 'O' if os.path.exists(dest) else 'X'
+    } for file_type, source, dest in entries]
+
     # DataFrame 생성
-    df = pd.DataFrame(excel_rows)
+    df = pd.DataFrame(excel_rows, columns=['파일타입', '원본파일경로', '복사파일경로', '생성여부'])
     
     # 컬럼 순서 지정
     df = df[['파일타입', '원본파일경로', '복사파일경로', '생성여부']]
@@ -1088,12 +1819,48 @@ def generate_excel_log(data, excel_path):
     writer.close()
     print(f"\n엑셀 로그 파일이 생성되었습니다: {excel_path}")
 
+def parse_args(argv=None):
+    """명령행 인자를 해석합니다."""
+    parser = argparse.ArgumentParser(description='문자열 치환 도구')
+    parser.add_argument('command', nargs='?', choices=['rollback'],
+                        help='rollback <실행 ID>: 실행 결과 되돌리기 (ID 생략 시 실행 목록 출력)')
+    parser.add_argument('run_id', nargs='?', help='되돌릴 실행 ID')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='생성(1번)/미리보기(2번)/실행(3번) 시 병렬로 처리할 프로세스 수 (기본값: 1)')
+    parser.add_argument('--context', type=int, default=PREVIEW_CONTEXT,
+                        help=f'미리보기(2번) diff에서 변경 줄 앞뒤에 보여 줄 줄 수 (기본값: {PREVIEW_CONTEXT})')
+    parser.add_argument('--plan',
+                        help='미리보기(2번) 결과를 저장할 / 실행(3번) 시 재사용할 계획 파일 경로')
+    parser.add_argument('--incremental', action='store_true',
+                        help='실행(3번) 시 원본과 치환목록이 바뀐 작업만 다시 처리')
+    parser.add_argument('--journal-dir', default=JOURNAL_DIR,
+                        help=f'실행 저널 디렉토리 (기본값: {JOURNAL_DIR})')
+    parser.add_argument('--force', action='store_true',
+                        help='되돌리기 시 실행 이후 내용이 바뀐 파일도 되돌림')
+    parser.add_argument('--rule-timeout', type=float, default=RULE_TIME_BUDGET,
+                        help=f'역추적 위험 규칙 하나의 실행 시간 제한(초, 0이면 제한 없음, 기본값: {RULE_TIME_BUDGET})')
+    parser.add_argument('--file-timeout', type=float, default=FILE_TIME_BUDGET,
+                        help=f'파일 하나에서 역추적 위험 규칙들의 실행 시간 제한(초, 0이면 제한 없음, 기본값: {FILE_TIME_BUDGET})')
+    return parser.parse_args(argv)
+
 def main():
+    args = parse_args()
+    workers = max(1, args.jobs)
+    set_time_budget(args.rule_timeout or None, args.file_timeout or None)
+
+    if args.command == 'rollback':
+        if args.run_id:
+            rollback_run(args.run_id, args.journal_dir, args.force)
+        else:
+            print_runs(args.journal_dir)
+        return
+
     while True:
         print("\n=== 문자열 치환 도구 ===")
         print("1. YAML 생성 (엑셀 -> YAML)")
         print("2. 미리보기 (YAML 기반 diff 출력)")
         print("3. 실행 (파일 복사 및 치환)")
+        print("4. 되돌리기 (실행 ID 기준)")
         print("0. 종료")
         
         choice = input("\n원하는 작업을 선택하세요: ").strip()
@@ -1102,20 +1869,27 @@ def main():
             excel_path = input("엑셀 파일 경로를 입력하세요: ").strip()
             yaml_path = input("생성할 YAML 파일 경로를 입력하세요: ").strip()
             try:
-                count = generate_yaml_from_excel(excel_path, yaml_path)
+                count = generate_yaml_from_excel(excel_path, yaml_path, workers)
                 print(f"YAML 파일이 생성되었습니다. (총 {count}개 작업)")
             except Exception as e:
                 print(f"오류 발생: {str(e)}")
         
         elif choice == "2":
             yaml_path = input("YAML 파일 경로를 입력하세요: ").strip()
-            preview_diff(yaml_path)
+            preview_diff(yaml_path, workers, max(0, args.context), args.plan)
         
         elif choice == "3":
             yaml_path = input("YAML 파일 경로를 입력하세요: ").strip()
             log_path = input("로그 파일 경로를 입력하세요: ").strip()
             summary_path = input("요약 파일 경로를 입력하세요: ").strip()
-            execute_replacements(yaml_path, log_path, summary_path)
+            execute_replacements(yaml_path, log_path, summary_path, workers, args.journal_dir,
+                                 args.incremental, args.plan)
+        
+        elif choice == "4":
+            print_runs(args.journal_dir)
+            run_id = input("되돌릴 실행 ID를 입력하세요: ").strip()
+            if run_id:
+                rollback_run(run_id, args.journal_dir, args.force)
         
         elif choice == "0":
             print("프로그램을 종료합니다.")
@@ -0,0 +1,1727 @@
+"""
+문자열 치환 엔진
+
+YAML 치환목록(설명 / 찾기.정규식 / 교체.값)을 한 번만 컴파일하여 ReplacementPlan으로 만들고,
+같은 규칙을 공유하는 모든 파일에 재사용합니다.
+
+컴파일 시 각 정규식의 구조를 분석하여, 서로 겹치지 않고 앞 규칙의 교체 결과에
+뒤 규칙이 다시 걸릴 수 없는 연속된 규칙들을 하나의 단계(stage)로 묶습니다.
+단계 안의 규칙들은 파일을 한 번만 훑으면서 동시에 치환합니다.
+  - 고정 문자열 규칙만 있는 단계: Aho-Corasick 오토마톤 (pyahocorasick 설치 시)
+  - 그 외: 규칙별 그룹으로 감싼 결합 정규식 (lastindex로 규칙 판별)
+분석할 수 없는 규칙이나 앞 규칙의 결과에 영향을 받을 수 있는 규칙은 새 단계를 시작하므로
+결과와 규칙별 치환 수는 규칙을 하나씩 순서대로 적용한 것과 같습니다.
+
+또한 각 정규식이 매칭하려면 반드시 포함해야 하는 고정 문자열(필수 리터럴)을 미리 추출해 두고,
+파일에 그 문자열이 없으면 정규식 엔진을 호출하지 않고 규칙을 건너뜁니다.
+
+모든 규칙이 ASCII이면 파일을 디코딩하지 않고 bytes 그대로 치환할 수 있습니다 (apply_bytes).
+  - 파일 전체가 ASCII이면 인코딩과 관계없이 텍스트 모드와 결과가 같음
+  - 그 외에는 ASCII 바이트가 멀티바이트 문자의 일부가 될 수 없는 인코딩(UTF-8, EUC-KR 등)이고
+    규칙이 문자 단위 의미(., [^...] 한 글자, \\w/\\d, \\b, 대소문자 무시)에 의존하지 않을 때만 사용
+  - \\s는 파일에 유니코드 전용 공백(NBSP, 전각 공백 등)이 없을 때만 bytes와 같으므로 함께 검사
+
+매칭 최대 길이가 유한한 bytes 규칙은 스트리밍으로도 적용할 수 있습니다 (iter_stream).
+창(window) 단위로 치환하되, 창 끝에서 최대 매칭 길이 안에 시작하는 매칭은 확정하지 않고
+다음 창으로 넘겨(carry-over) 파일 전체를 메모리에 올리지 않고도 같은 결과를 얻습니다.
+
+YAML 최상위 rule_sets 항목에 공통 규칙 목록을 한 번만 정의하고, 치환목록에서는
+{규칙집합: ID} 항목으로 참조할 수 있습니다 (expand_rule_sets). 행을 하나씩 읽어 실행하는
+스트리밍 실행에서는 rule_sets가 참조하는 작업 행보다 먼저 와야 합니다. 규칙 하나의 컴파일/분석 결과는
+(설명, 정규식, 교체값) 단위로 캐시되므로 여러 계획이 공유하는 규칙은 한 번만 컴파일됩니다.
+
+찾기 항목에 요소(요소 경로)나 속성(속성 이름)을 지정하면 XML 범위 규칙이 됩니다.
+정규식은 파일 전체가 아니라 해당 요소의 텍스트나 속성 값 안에서만 검색되며,
+연속된 범위 규칙은 태그 위치만 따라가는 한 번의 스캔으로 해당 구간만 바꿔 씁니다.
+  예) 찾기: {정규식: "'LH'", 요소: "pd:activity/config/statement"}
+      찾기: {정규식: "Old\\.xsd", 요소: "xsd:import", 속성: "namespace"}
+
+컴파일할 때 무제한 반복 안에 다시 무제한 반복이 있는 정규식((a+)+ 등)은 역추적 위험으로 표시합니다.
+엑셀 값이 그대로 들어간 것으로 보이는 정규식(백슬래시와 문자 클래스가 없음)이 컴파일되지 않으면
+고정 문자열로 이스케이프하고, 위험 규칙은 정규식 의미 그대로 별도 작업자 프로세스에서
+시간 예산(RULE_TIME_BUDGET, FILE_TIME_BUDGET) 안에서만 실행합니다. 예산을 넘긴 규칙은
+작업자를 종료하고 건너뛰며 ReplacementPlan.timeouts로 알려 줍니다.
+"""
+
+import re
+import copy
+import time
+import atexit
+import codecs
+import hashlib
+import multiprocessing
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 정규식 파서 (Python 3.11부터 re._parser, 이전 버전은 sre_parse)
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# pyahocorasick 모듈 가져오기 시도 (설치되지 않았을 경우 결합 정규식 사용)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# 컴파일된 계획 캐시 크기 (규칙 목록 단위)
+PLAN_CACHE_SIZE = 256
+
+# 컴파일된 규칙 캐시 크기 (규칙 단위)
+RULE_CACHE_SIZE = 4096
+
+# 역추적 위험 규칙의 실행 시간 예산 (초, None이면 제한 없음)
+RULE_TIME_BUDGET = 30.0   # 규칙 하나
+FILE_TIME_BUDGET = 120.0  # 파일 하나에서 위험 규칙들이 쓰는 시간의 합
+
+# YAML 최상위 공통 규칙 목록 키와 치환목록 안의 참조 키
+RULE_SETS_KEY = 'rule_sets'
+RULE_SET_REF = '규칙집합'
+
+# 찾기 항목의 XML 범위 키 (요소 경로, 속성 이름)
+SCOPE_ELEMENT_KEY = '요소'
+SCOPE_ATTRIBUTE_KEY = '속성'
+
+# 구조 분석에 사용하는 정규식 opcode
+_LITERAL = sre_parse.LITERAL
+_NOT_LITERAL = sre_parse.NOT_LITERAL
+_ANY = sre_parse.ANY
+_IN = sre_parse.IN
+_RANGE = sre_parse.RANGE
+_NEGATE = sre_parse.NEGATE
+_CATEGORY = sre_parse.CATEGORY
+_SUBPATTERN = sre_parse.SUBPATTERN
+_BRANCH = sre_parse.BRANCH
+_AT = sre_parse.AT
+_REPEATS = tuple(op for op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+                               getattr(sre_parse, 'POSSESSIVE_REPEAT', None)) if op is not None)
+_ATOMIC_GROUP = getattr(sre_parse, 'ATOMIC_GROUP', None)
+
+_ASSERTS = (sre_parse.ASSERT, sre_parse.ASSERT_NOT)
+_MAXREPEAT = sre_parse.MAXREPEAT
+
+# ASCII 바이트가 멀티바이트 문자의 일부로 나타나지 않는 인코딩 (codecs 정규화 이름)
+# cp949는 두 번째 바이트가 ASCII 영문자 범위와 겹치므로 제외
+# utf-8-sig는 텍스트 모드에서 BOM이 제거되어 ^ 앵커 위치가 달라지므로 제외
+_ASCII_SAFE_ENCODINGS = ('utf-8', 'ascii', 'euc_kr', 'latin-1')
+_ASCII_SAFE_PREFIXES = ('iso8859-', 'cp125')
+
+# str 패턴의 \s는 bytes 패턴의 \s보다 넓음 (\x1c-\x1f, NBSP, 전각 공백 등)
+_BYTES_SPACES = ' \t\n\r\f\v'
+_SPACE_CATEGORIES = (sre_parse.CATEGORY_SPACE, sre_parse.CATEGORY_NOT_SPACE)
+
+# 인코딩 -> 해당 인코딩으로 표현된 '유니코드에서만 공백인 문자' 검색 패턴
+_unicode_space_patterns: Dict[str, 're.Pattern'] = {}
+_unicode_only_spaces: Optional[List[str]] = None
+
+# 스트리밍 모드에서 허용하지 않는 opcode (창 경계 밖의 문맥을 보는 앵커/전후방 탐색/역참조)
+_STREAM_UNSAFE_OPS = (_AT, sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS) + _ASSERTS
+
+# 주변 문자와 무관한 앵커만 허용 (\b, $ 등은 앞 규칙의 치환 결과에 따라 달라질 수 있음)
+_SAFE_ANCHORS = (sre_parse.AT_BEGINNING, sre_parse.AT_BEGINNING_STRING, sre_parse.AT_END_STRING)
+
+# 문자 클래스 안의 범주 -> 정규식 표기
+_CATEGORY_CLASSES = {
+    sre_parse.CATEGORY_DIGIT: r'\d',
+    sre_parse.CATEGORY_NOT_DIGIT: r'\D',
+    sre_parse.CATEGORY_SPACE: r'\s',
+    sre_parse.CATEGORY_NOT_SPACE: r'\S',
+    sre_parse.CATEGORY_WORD: r'\w',
+    sre_parse.CATEGORY_NOT_WORD: r'\W',
+}
+
+
+class _Unsupported(Exception):
+    """구조 분석을 지원하지 않는 정규식 (전후방 탐색, 역참조 등)"""
+
+
+class CharSet:
+    """정규식이 매칭할 수 있는 문자 집합 (보수적 근사)"""
+
+    def __init__(self, atoms: Optional[List[str]] = None, chars: Optional[Set[str]] = None,
+                 everything: bool = False):
+        """
+        CharSet 초기화
+
+        Args:
+            atoms: 한 문자에 매칭하는 정규식 조각 목록 (예: '\\x61', '[^"]', '\\s')
+            chars: 모든 조각이 고정 문자일 때 그 문자 집합 (아니면 None)
+            everything: 모든 문자를 포함하는지 여부
+        """
+        self.everything = everything
+        self.atoms = [] if everything else list(atoms or [])
+        self.chars = None if everything else chars
+        self._regex = None
+
+    @classmethod
+    def of_chars(cls, chars) -> 'CharSet':
+        """고정 문자들로 집합을 만듭니다."""
+        chars = set(chars)
+        return cls([_class_char(ord(c)) for c in sorted(chars)], chars=chars)
+
+    def union(self, other: 'CharSet') -> 'CharSet':
+        """두 집합의 합집합을 반환합니다."""
+        if self.everything or other.everything:
+            return CharSet(everything=True)
+        chars = None
+        if self.chars is not None and other.chars is not None:
+            chars = self.chars | other.chars
+        return CharSet(self.atoms + other.atoms, chars=chars)
+
+    def hits(self, text: str) -> bool:
+        """text의 문자 중 하나라도 집합에 속하는지 확인합니다."""
+        if not text:
+            return False
+        if self.everything:
+            return True
+        if not self.atoms:
+            return False
+        if self._regex is None:
+            self._regex = re.compile('|'.join(self.atoms))
+        return bool(self._regex.search(text))
+
+    def intersects(self, other: 'CharSet') -> bool:
+        """두 집합이 공통 문자를 가질 수 있는지 확인합니다 (판단 불가 시 True)."""
+        if self.chars is not None:
+            return other.hits(''.join(self.chars))
+        if other.chars is not None:
+            return self.hits(''.join(other.chars))
+        return bool(self.atoms or self.everything) and bool(other.atoms or other.everything)
+
+
+def _class_char(code: int) -> str:
+    """문자 코드를 문자 클래스 안팎에서 안전한 이스케이프 표기로 변환합니다."""
+    if code < 0x100:
+        return '\\x{:02x}'.format(code)
+    if code < 0x10000:
+        return '\\u{:04x}'.format(code)
+    return '\\U{:08x}'.format(code)
+
+
+def _item_charset(op, av) -> CharSet:
+    """문자 하나를 소비하는 opcode의 문자 집합을 반환합니다."""
+    if op == _LITERAL:
+        return CharSet.of_chars(chr(av))
+    if op == _NOT_LITERAL:
+        return CharSet(['[^' + _class_char(av) + ']'])
+    if op == _ANY:
+        return CharSet(everything=True)
+
+    # IN: 문자 클래스 재구성
+    negate = False
+    parts = []
+    for item_op, item_av in av:
+        if item_op == _NEGATE:
+            negate = True
+        elif item_op == _LITERAL:
+            parts.append(_class_char(item_av))
+        elif item_op == _RANGE:
+            parts.append(_class_char(item_av[0]) + '-' + _class_char(item_av[1]))
+        elif item_op == _CATEGORY and item_av in _CATEGORY_CLASSES:
+            parts.append(_CATEGORY_CLASSES[item_av])
+        else:
+            return CharSet(everything=True)
+    return CharSet(['[' + ('^' if negate else '') + ''.join(parts) + ']'])
+
+
+def _sub_items(op, av) -> Tuple[List, int]:
+    """그룹/반복/분기 opcode의 하위 패턴 목록과 최소 반복 수를 반환합니다."""
+    if op == _SUBPATTERN:
+        if av[1] or av[2]:
+            # (?i:...) 같은 범위 플래그
+            raise _Unsupported('scoped flags')
+        return [av[-1]], 1
+    if op in _REPEATS:
+        return [av[2]], av[0]
+    if op == _BRANCH:
+        return av[1], 1
+    if _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+        return [av], 1
+    raise _Unsupported(str(op))
+
+
+def _scan(parsed) -> Tuple[CharSet, CharSet, bool]:
+    """
+    파싱된 정규식을 훑어 문자 집합을 계산합니다.
+
+    Returns:
+        (첫 문자 집합, 매칭에 나타날 수 있는 전체 문자 집합, 빈 문자열 매칭 가능 여부)
+    """
+    first = CharSet(chars=set())
+    alphabet = CharSet(chars=set())
+    nullable = True
+    for op, av in parsed:
+        if op == _AT:
+            if av not in _SAFE_ANCHORS:
+                raise _Unsupported(str(av))
+            continue
+        if op in (_LITERAL, _NOT_LITERAL, _IN, _ANY):
+            item = _item_charset(op, av)
+            if nullable:
+                first = first.union(item)
+            alphabet = alphabet.union(item)
+            nullable = False
+            continue
+
+        subs, min_count = _sub_items(op, av)
+        item_nullable = op != _BRANCH
+        for sub in subs:
+            sub_first, sub_alphabet, sub_nullable = _scan(sub)
+            if nullable:
+                first = first.union(sub_first)
+            alphabet = alphabet.union(sub_alphabet)
+            if op == _BRANCH:
+                item_nullable = item_nullable or sub_nullable
+            else:
+                item_nullable = sub_nullable
+        if min_count == 0:
+            item_nullable = True
+        nullable = nullable and item_nullable
+    return first, alphabet, nullable
+
+
+def _required_literal(parsed) -> str:
+    """
+    매칭 결과에 반드시 연속으로 나타나는 고정 문자열 중 가장 긴 것을 추출합니다.
+
+    Args:
+        parsed: sre_parse로 파싱된 패턴
+
+    Returns:
+        필수 리터럴 (없으면 빈 문자열)
+    """
+    best = ''
+    run = []
+
+    def flush():
+        nonlocal best, run
+        text = ''.join(run)
+        if len(text) > len(best):
+            best = text
+        run = []
+
+    for op, av in parsed:
+        if op == _LITERAL:
+            run.append(chr(av))
+        elif op == _SUBPATTERN and not av[1] and not av[2]:
+            inner = _literal_text(av[-1])
+            if inner is not None:
+                # 리터럴만 있는 그룹은 앞뒤 리터럴과 이어짐
+                run.append(inner)
+                continue
+            flush()
+            inner_best = _required_literal(av[-1])
+            if len(inner_best) > len(best):
+                best = inner_best
+        elif op in _REPEATS and av[0] >= 1:
+            # 최소 1회 반복되는 부분의 필수 리터럴도 필수
+            flush()
+            inner_best = _required_literal(av[2])
+            if len(inner_best) > len(best):
+                best = inner_best
+        elif op == _AT:
+            # 폭 0 앵커는 문자열을 끊지 않음
+            continue
+        else:
+            flush()
+    flush()
+    return best
+
+
+def _in_categories_safe(items) -> bool:
+    """문자 클래스의 범주가 공백(\\s, \\S)뿐인지 확인합니다 (공백 차이는 파일 검사로 배제)."""
+    return all(av in _SPACE_CATEGORIES for op, av in items if op == _CATEGORY)
+
+
+def _is_single_char_wildcard(item) -> bool:
+    """., [^x], \\S처럼 임의의 비ASCII 문자 한 개와 매칭할 수 있는 항목인지 확인합니다."""
+    op, av = item
+    if op in (_ANY, _NOT_LITERAL):
+        return True
+    return (op == _IN and _in_categories_safe(av)
+            and any(sub_op == _NEGATE or sub_av == sre_parse.CATEGORY_NOT_SPACE
+                    for sub_op, sub_av in av))
+
+
+def unicode_space_pattern(encoding: str):
+    """
+    encoding으로 인코딩된 파일에서 str의 \\s에만 매칭되는 공백 문자를 찾는 bytes 패턴을 반환합니다.
+
+    Args:
+        encoding: ASCII 안전 인코딩 이름
+
+    Returns:
+        컴파일된 bytes 정규식
+    """
+    global _unicode_only_spaces
+    name = codecs.lookup(encoding).name
+    pattern = _unicode_space_patterns.get(name)
+    if pattern is None:
+        if _unicode_only_spaces is None:
+            _unicode_only_spaces = [chr(code) for code in range(0x110000)
+                                    if chr(code).isspace() and chr(code) not in _BYTES_SPACES]
+        encoded = set()
+        for char in _unicode_only_spaces:
+            try:
+                encoded.add(char.encode(name))
+            except UnicodeEncodeError:
+                continue
+        pattern = re.compile(b'|'.join(re.escape(value) for value in sorted(encoded)))
+        _unicode_space_patterns[name] = pattern
+    return pattern
+
+
+def _bytes_safe(parsed) -> bool:
+    """
+    bytes 패턴으로 바꿔도 ASCII 안전 인코딩의 파일에서 매칭 결과가 같은지 확인합니다.
+
+    비ASCII 문자는 bytes에서 여러 바이트이므로 한 글자짜리 와일드카드는
+    '최소 0~1회, 최대 무제한' 반복 안에서만 허용합니다.
+    """
+    for op, av in parsed:
+        if op == _LITERAL:
+            continue
+        if op == _IN:
+            if not _in_categories_safe(av) or _is_single_char_wildcard((op, av)):
+                return False
+        elif op == _AT:
+            if av in (sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY):
+                return False
+        elif op in _REPEATS:
+            min_count, max_count, body = av
+            if (max_count == _MAXREPEAT and min_count <= 1 and len(body) == 1
+                    and _is_single_char_wildcard(body[0])):
+                continue
+            if not _bytes_safe(body):
+                return False
+        elif op == _SUBPATTERN:
+            if av[1] or av[2] or not _bytes_safe(av[-1]):
+                return False
+        elif op == _BRANCH:
+            if not all(_bytes_safe(branch) for branch in av[1]):
+                return False
+        elif op in _ASSERTS:
+            if not _bytes_safe(av[1]):
+                return False
+        elif op == sre_parse.GROUPREF:
+            continue
+        elif _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            if not _bytes_safe(av):
+                return False
+        else:
+            return False
+    return True
+
+
+def is_ascii_safe_encoding(encoding: Optional[str]) -> bool:
+    """
+    ASCII 바이트가 항상 ASCII 문자 자신을 뜻하는 인코딩인지 확인합니다.
+
+    Args:
+        encoding: 인코딩 이름
+
+    Returns:
+        bytes 모드 치환이 가능한 인코딩이면 True
+    """
+    if not encoding:
+        return False
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    return name in _ASCII_SAFE_ENCODINGS or name.startswith(_ASCII_SAFE_PREFIXES)
+
+
+def _iter_ops(parsed) -> Iterator:
+    """파싱된 패턴의 모든 opcode를 하위 패턴까지 재귀적으로 돌려줍니다."""
+    for op, av in parsed:
+        yield op
+        if op == _SUBPATTERN:
+            subs = [av[-1]]
+        elif op in _REPEATS:
+            subs = [av[2]]
+        elif op == _BRANCH:
+            subs = av[1]
+        elif op in _ASSERTS:
+            subs = [av[1]]
+        elif op == sre_parse.GROUPREF_EXISTS:
+            subs = [sub for sub in av[1:] if sub is not None]
+        elif _ATOMIC_GROUP is not None and op == _ATOMIC_GROUP:
+            subs = [av]
+        else:
+            subs = []
+        for sub in subs:
+            yield from _iter_ops(sub)
+
+
+def _stream_width(pattern_text: str, pattern, replacement: str) -> Optional[int]:
+    """
+    스트리밍 모드에서 필요한 최대 매칭 길이를 계산합니다.
+
+    Returns:
+        최대 매칭 길이 (빈 매칭 가능, 무제한 반복, 앵커/전후방 탐색/역참조가 있거나
+        교체 문자열이 잘못된 경우 None - 메모리 모드로 처리)
+    """
+    try:
+        parsed = sre_parse.parse(pattern_text)
+        min_width, max_width = parsed.getwidth()
+        if min_width == 0 or max_width >= _MAXREPEAT:
+            return None
+        if any(op in _STREAM_UNSAFE_OPS for op in _iter_ops(parsed)):
+            return None
+        # 교체 문자열의 그룹 참조를 미리 검증 (스트리밍 도중 실패하지 않도록)
+        sre_parse.parse_template(replacement, pattern)
+        return max_width
+    except (re.error, RecursionError, OverflowError, TypeError, IndexError):
+        return None
+
+
+def _with_final(chunks: Iterable[bytes]) -> Iterator[Tuple[bytes, bool]]:
+    """조각마다 마지막 조각인지 여부를 함께 돌려줍니다."""
+    previous = None
+    for chunk in chunks:
+        if previous is not None:
+            yield previous, False
+        previous = chunk
+    if previous is not None:
+        yield previous, True
+
+
+def _stream_pass(chunks: Iterable[bytes], regex, handler, width: int) -> Iterator[bytes]:
+    """
+    정규식 하나를 창 단위로 적용합니다.
+
+    창 끝에서 width 바이트 이내에 시작하는 매칭은 다음 창에서 다시 검사하므로,
+    최대 매칭 길이가 width 이하인 패턴은 전체를 한 번에 치환한 것과 결과가 같습니다.
+
+    Args:
+        chunks: 입력 조각
+        regex: 컴파일된 bytes 정규식
+        handler: 매칭 객체를 받아 교체할 bytes를 반환하는 함수 (치환 수 집계 포함)
+        width: 최대 매칭 길이
+
+    Yields:
+        출력 조각
+    """
+    carry = b''
+    for chunk, final in _with_final(chunks):
+        buffer = carry + chunk if carry else chunk
+        limit = len(buffer) if final else len(buffer) - width
+        if limit <= 0:
+            carry = buffer
+            continue
+        pieces = []
+        cursor = 0
+        for match in regex.finditer(buffer):
+            if match.start() >= limit:
+                break
+            pieces.append(buffer[cursor:match.start()])
+            pieces.append(handler(match))
+            cursor = match.end()
+        cut = max(cursor, limit)
+        pieces.append(buffer[cursor:cut])
+        yield b''.join(pieces)
+        carry = buffer[cut:]
+    if carry:
+        yield carry
+
+
+def _literal_text(parsed) -> Optional[str]:
+    """패턴이 고정 문자열만 매칭하면 그 문자열을, 아니면 None을 반환합니다."""
+    chars = []
+    for op, av in parsed:
+        if op == _LITERAL:
+            chars.append(chr(av))
+        elif op == _SUBPATTERN and not av[1] and not av[2]:
+            inner = _literal_text(av[-1])
+            if inner is None:
+                return None
+            chars.append(inner)
+        else:
+            return None
+    return ''.join(chars)
+
+
+def _nested_repeat(parsed, inside: bool = False) -> bool:
+    """무제한 반복 안에 다시 무제한 반복이 있는지 확인합니다 (소유/원자 그룹 안은 제외)."""
+    for op, av in parsed:
+        if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            unbounded = av[1] == _MAXREPEAT
+            if unbounded and inside:
+                return True
+            if _nested_repeat(av[2], inside or unbounded):
+                return True
+        elif op == _SUBPATTERN:
+            if _nested_repeat(av[-1], inside):
+                return True
+        elif op == _BRANCH:
+            if any(_nested_repeat(branch, inside) for branch in av[1]):
+                return True
+        elif op in _ASSERTS:
+            if _nested_repeat(av[1], inside):
+                return True
+    return False
+
+
+def backtracking_risk(pattern_text: str) -> Optional[str]:
+    """
+    정규식이 입력에 따라 지수 시간 역추적을 할 수 있으면 그 이유를 반환합니다.
+
+    Args:
+        pattern_text: 정규식 문자열
+
+    Returns:
+        위험 설명 또는 None
+    """
+    try:
+        nested = _nested_repeat(sre_parse.parse(pattern_text))
+    except (re.error, RecursionError):
+        return None
+    return "중첩된 반복" if nested else None
+
+
+def _looks_literal(pattern_text: str) -> bool:
+    """엑셀 값이 이스케이프 없이 들어간 정규식으로 보이는지 확인합니다 (백슬래시, 문자 클래스 없음)."""
+    return '\\' not in pattern_text and '[' not in pattern_text
+
+
+class RuleTimeout(Exception):
+    """역추적 위험 규칙이 시간 예산을 넘김"""
+
+
+def _substitute(pattern, replacement, output, content, record_edits: bool):
+    """
+    규칙 하나를 적용합니다 (시간 제한 작업자에서도 같은 함수를 사용).
+
+    Args:
+        pattern: 컴파일된 정규식
+        replacement: 교체 문자열
+        output: 교체 결과가 항상 같으면 그 값 (아니면 None)
+        content: 치환할 내용
+        record_edits: True이면 치환 위치 목록을 함께 반환
+
+    Returns:
+        (치환된 내용, 치환 수, 치환 위치 목록 또는 None)
+    """
+    if not record_edits:
+        content, count = pattern.subn(replacement, content)
+        return content, count, None
+    edits = []
+    if output is None:
+        # 교체 문자열 검증 (잘못된 그룹 참조는 subn과 같이 re.error)
+        pattern.sub(replacement, content[:0])
+
+    def record(match):
+        replaced = output if output is not None else match.expand(replacement)
+        edits.append((match.start(), match.end(), len(replaced)))
+        return replaced
+
+    content = pattern.sub(record, content)
+    return content, len(edits), edits
+
+
+def _guard_worker(connection):
+    """시간 제한 작업자: 규칙 적용 요청을 받아 결과를 돌려줍니다."""
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        try:
+            result = ('ok', _substitute(*task))
+        except re.error as e:
+            result = ('error', str(e))
+        connection.send(result)
+
+
+class RuleGuard:
+    """
+    역추적 위험 규칙을 별도 작업자 프로세스에서 시간 예산을 두고 실행합니다.
+
+    정규식 엔진은 실행 중에 멈출 수 없으므로 예산을 넘기면 작업자 프로세스를 종료하고
+    다음 요청 때 새로 만듭니다. 작업자는 위험 규칙이 처음 실행될 때 만들어집니다.
+    """
+
+    def __init__(self, rule_budget: Optional[float], file_budget: Optional[float]):
+        """
+        Args:
+            rule_budget: 규칙 하나의 시간 예산 (초, None이면 제한 없음)
+            file_budget: 파일 하나에서 위험 규칙들이 쓰는 시간의 합 (초, None이면 제한 없음)
+        """
+        self.rule_budget = rule_budget
+        self.file_budget = file_budget
+        self.remaining = file_budget
+        # 현재 파일에서 시간 초과로 건너뛴 규칙 순번
+        self.timeouts: List[int] = []
+        self._process = None
+        self._connection = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rule_budget is not None or self.file_budget is not None
+
+    def begin_file(self):
+        """새 파일의 예산을 시작합니다."""
+        self.remaining = self.file_budget
+        self.timeouts = []
+
+    def _connect(self):
+        """작업자 연결을 반환합니다 (작업자를 만들 수 없으면 None)."""
+        if self._process is not None and self._process.is_alive():
+            return self._connection
+        self.close()
+        try:
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_guard_worker, args=(child,), daemon=True)
+            process.start()
+        except (AssertionError, OSError):
+            # 데몬 프로세스 안 등 자식 프로세스를 만들 수 없는 환경
+            return None
+        child.close()
+        self._process, self._connection = process, connection
+        return connection
+
+    def close(self):
+        """작업자를 종료합니다."""
+        if self._process is not None:
+            if self._process.is_alive():
+                self._process.kill()
+            self._process.join()
+            self._connection.close()
+        self._process = self._connection = None
+
+    def run(self, rule: 'CompiledRule', content, record_edits: bool):
+        """
+        예산 안에서 규칙을 적용합니다.
+
+        Returns:
+            _substitute와 같은 (치환된 내용, 치환 수, 치환 위치 목록)
+
+        Raises:
+            RuleTimeout: 예산을 넘겨 작업자를 종료한 경우
+            re.error: 교체 문자열 오류
+        """
+        budget = min(budget for budget in (self.rule_budget, self.remaining) if budget is not None)
+        task = (rule.pattern, rule.replacement, rule.output, content, record_edits)
+        connection = self._connect() if budget > 0 else None
+        if connection is None and budget > 0:
+            return _substitute(*task)
+
+        started = time.monotonic()
+        result = None
+        if connection is not None:
+            try:
+                connection.send(task)
+                if connection.poll(budget):
+                    result = connection.recv()
+            except (OSError, EOFError):
+                result = None
+        if self.remaining is not None:
+            self.remaining -= time.monotonic() - started
+        if result is None:
+            # 시간 초과 또는 작업자 비정상 종료: 작업자를 버리고 규칙은 건너뜀
+            self.close()
+            self.timeouts.append(rule.index)
+            raise RuleTimeout(rule.index)
+        status, value = result
+        if status == 'error':
+            raise re.error(value)
+        return value
+
+
+_guard = RuleGuard(RULE_TIME_BUDGET, FILE_TIME_BUDGET)
+atexit.register(_guard.close)
+
+
+def set_time_budget(rule_budget: Optional[float], file_budget: Optional[float]):
+    """
+    역추적 위험 규칙의 시간 예산을 설정합니다.
+
+    Args:
+        rule_budget: 규칙 하나의 시간 예산 (초, None이면 제한 없음)
+        file_budget: 파일 하나의 시간 예산 (초, None이면 제한 없음)
+    """
+    _guard.rule_budget = rule_budget
+    _guard.file_budget = file_budget
+    _guard.remaining = file_budget
+
+
+def time_budget() -> Tuple[Optional[float], Optional[float]]:
+    """현재 (규칙, 파일) 시간 예산을 반환합니다 (프로세스 풀 작업자 설정용)."""
+    return _guard.rule_budget, _guard.file_budget
+
+
+class EditMap:
+    """
+    원본 기준 변경 구간 목록 (미리보기 diff용)
+
+    구간은 (원본 시작, 원본 끝, 변경 후 길이)이며 서로 겹치지 않고 정렬되어 있습니다.
+    단계(또는 규칙)마다 그 단계 입력 기준의 치환 위치를 compose로 합치므로,
+    여러 단계를 거친 뒤에도 원본의 어느 부분이 최종 결과의 어느 부분이 되었는지 알 수 있습니다.
+    """
+
+    def __init__(self):
+        self.blocks = []
+
+    def __bool__(self) -> bool:
+        return bool(self.blocks)
+
+    def compose(self, edits: List[Tuple[int, int, int]]):
+        """
+        한 번의 치환 패스 결과를 합칩니다.
+
+        Args:
+            edits: 패스 입력 기준 (시작, 끝, 교체 문자열 길이) 목록 - 정렬, 비중첩
+        """
+        if not edits:
+            return
+        # 기존 구간을 현재 텍스트 기준 좌표로 변환: (시작, 끝, 원본 길이, 현재 길이)
+        intervals = []
+        shift = 0
+        for orig_start, orig_end, length in self.blocks:
+            intervals.append((orig_start + shift, orig_start + shift + length, orig_end - orig_start, length))
+            shift += length - (orig_end - orig_start)
+        intervals.extend((start, end, None, replaced) for start, end, replaced in edits)
+        intervals.sort(key=lambda interval: (interval[0], interval[1]))
+
+        blocks = []
+        shift = 0
+        group = None
+        for start, end, orig_length, length in intervals:
+            if group is not None and start <= group[1]:
+                group[1] = max(group[1], end)
+                group[2].append((start, end, orig_length, length))
+                continue
+            if group is not None:
+                shift = self._close(group, shift, blocks)
+            group = [start, end, [(start, end, orig_length, length)]]
+        if group is not None:
+            self._close(group, shift, blocks)
+        self.blocks = blocks
+
+    @staticmethod
+    def _close(group, shift, blocks) -> int:
+        """겹치는 구간 묶음을 원본 기준 구간 하나로 만들고 이후 위치의 좌표 차이를 반환합니다."""
+        start, end, members = group
+        # 기존 구간(원본 길이 있음)의 길이 변화가 묶음 뒤의 좌표 차이를 바꿈
+        after = shift + sum(length - orig_length for _, _, orig_length, length in members
+                            if orig_length is not None)
+        # 이번 패스의 치환은 묶음 안의 현재 길이를 바꿈
+        new_length = end - start + sum(length - (e - s) for s, e, orig_length, length in members
+                                       if orig_length is None)
+        blocks.append((start - shift, end - after, new_length))
+        return after
+
+    def ranges(self) -> Iterator[Tuple[int, int, int, int]]:
+        """(원본 시작, 원본 끝, 결과 시작, 결과 끝)을 순서대로 반환합니다."""
+        shift = 0
+        for orig_start, orig_end, length in self.blocks:
+            yield orig_start, orig_end, orig_start + shift, orig_start + shift + length
+            shift += length - (orig_end - orig_start)
+
+
+class CompiledRule:
+    """컴파일된 치환 규칙 하나"""
+
+    # XML 범위 규칙 여부 (ScopedRule에서 설정)
+    scope = None
+    restructures = False
+
+    def __init__(self, index: int, description: str, pattern_text: str, replacement: str):
+        """
+        CompiledRule 초기화
+
+        Args:
+            index: 치환목록 내 순번 (1부터 시작)
+            description: 규칙 설명
+            pattern_text: 찾을 정규식 문자열
+            replacement: 교체할 값 (re.sub 교체 문자열 형식)
+        """
+        self.index = index
+        self.description = description
+        self.pattern_text = pattern_text
+        self.replacement = replacement
+        self.error = None        # 컴파일 오류 (적용 중 오류는 ReplacementPlan.errors)
+        self.pattern = None
+
+        # 구조 분석 결과 (단일 패스 결합 가능 여부 판단용)
+        self.combinable = False
+        self.literal = None      # 항상 같은 문자열만 매칭하면 그 문자열
+        self.output = None       # 교체 결과가 항상 같으면 그 문자열
+        self.first = None        # 매칭 첫 문자 집합
+        self.alphabet = None     # 매칭 전체 문자 집합
+        self.required = ''       # 매칭에 반드시 포함되는 고정 문자열 (사전 필터용)
+        self.ascii = pattern_text.isascii() and replacement.isascii()
+        self.bytes_safe = False  # 비ASCII 파일에서도 bytes 모드 결과가 같은지
+        self.risk = None         # 역추적 위험 설명 (시간 제한 작업자에서 실행)
+        self.warning = None      # 컴파일 시 경고 (자동 이스케이프, 역추적 위험)
+
+        error = None
+        try:
+            self.pattern = re.compile(pattern_text)
+        except re.error as e:
+            error = e
+        if error and _looks_literal(pattern_text):
+            # 컴파일되지 않는 엑셀 값은 고정 문자열로 검색 (컴파일되는 정규식은 의미를 바꾸지 않음)
+            self.pattern_text = re.escape(pattern_text)
+            self.pattern = re.compile(self.pattern_text)
+            self.warning = f"고정 문자열로 이스케이프함 ({error}): {pattern_text}"
+            error = None
+        risk = None if error else backtracking_risk(self.pattern_text)
+        if error:
+            self.error = f"정규식 컴파일 오류: {str(error)}"
+            return
+        self._analyze()
+        if risk:
+            self.risk = risk
+            self.warning = f"역추적 위험 ({risk}) - 시간 제한 작업자에서 실행"
+            # 결합 단계에 넣지 않고 단독으로 실행
+            self.combinable = False
+
+    def _analyze(self):
+        """정규식 구조를 분석하여 필수 리터럴, 결합 가능 여부와 문자 집합을 계산합니다."""
+        try:
+            parsed = sre_parse.parse(self.pattern_text)
+        except (re.error, RecursionError):
+            return
+        if not self.pattern.flags & re.IGNORECASE:
+            try:
+                self.required = _required_literal(parsed)
+                self.bytes_safe = self.ascii and _bytes_safe(parsed)
+            except RecursionError:
+                self.required = ''
+
+        # 인라인 전역 플래그((?i), (?m) 등)가 있으면 결합 정규식에 넣을 수 없음
+        if self.pattern.flags & ~re.UNICODE:
+            return
+        try:
+            self.literal = _literal_text(parsed)
+            if self.literal is not None:
+                if not self.literal:
+                    return
+                # 고정 문자열 매칭이면 교체 결과도 항상 같음 (그룹 참조 포함)
+                self.output = self.pattern.match(self.literal).expand(self.replacement)
+                self.first = CharSet.of_chars(self.literal[0])
+                self.alphabet = CharSet.of_chars(self.literal)
+                self.combinable = True
+                return
+
+            # 그룹 참조나 이스케이프가 있는 교체 값은 결과를 미리 알 수 없어 단독 실행
+            if '\\' in self.replacement:
+                return
+            self.first, self.alphabet, nullable = _scan(parsed)
+            if nullable:
+                return
+            self.output = self.replacement
+            self.combinable = True
+        except (_Unsupported, re.error, RecursionError):
+            self.combinable = False
+
+    def may_match(self, content: str) -> bool:
+        """필수 리터럴 검사로 매칭 가능성이 있는지 빠르게 확인합니다."""
+        return self.pattern is not None and (not self.required or self.required in content)
+
+    def apply(self, content: str, edit_map: Optional[EditMap] = None,
+              errors: Optional[Dict[int, str]] = None) -> Tuple[str, int]:
+        """
+        규칙을 적용합니다. 필수 리터럴이 내용에 없으면 정규식을 실행하지 않습니다.
+
+        규칙 객체는 계획 캐시로 여러 파일이 공유하므로 적용 중 오류는 규칙에 저장하지 않고
+        errors에 기록합니다 (ReplacementPlan.errors).
+
+        Args:
+            content: 치환할 내용
+            edit_map: 전달하면 치환 위치가 기록됨 (미리보기용)
+            errors: 전달하면 적용 중 오류가 {규칙 순번: 메시지}로 기록됨
+
+        Returns:
+            (치환된 내용, 치환 수)
+        """
+        if not self.may_match(content):
+            return content, 0
+        record_edits = edit_map is not None
+        try:
+            if self.risk is not None and _guard.enabled:
+                content, count, edits = _guard.run(self, content, record_edits)
+            else:
+                content, count, edits = _substitute(self.pattern, self.replacement, self.output,
+                                                    content, record_edits)
+        except RuleTimeout:
+            # 시간 예산을 넘긴 규칙은 건너뜀 (ReplacementPlan.timeouts로 보고)
+            return content, 0
+        except re.error as e:
+            # 교체 문자열의 잘못된 그룹 참조 등
+            if errors is not None:
+                errors[self.index] = f"치환 중 오류 발생: {str(e)}"
+            return content, 0
+        if record_edits:
+            edit_map.compose(edits)
+        return content, count
+
+
+class _BytesRule(CompiledRule):
+    """ASCII 규칙의 bytes 버전 (CompiledRule의 apply/may_match를 그대로 사용)"""
+
+    def __init__(self, rule: CompiledRule):
+        self.base = rule
+        self.index = rule.index
+        self.description = rule.description
+        self.error = rule.error
+        self.risk = rule.risk
+        self.pattern_text = rule.pattern_text
+        self.pattern = None if rule.pattern is None else re.compile(
+            rule.pattern_text.encode('ascii'), rule.pattern.flags & ~re.UNICODE)
+        self.replacement = rule.replacement.encode('ascii')
+        self.required = rule.required.encode('ascii')
+        self.literal = None if rule.literal is None else rule.literal.encode('ascii')
+        self.output = None if rule.output is None else rule.output.encode('ascii')
+
+
+# XML 구조 토큰: 주석, CDATA, 처리 명령, 선언, 시작/끝 태그 (속성 값 안의 > 허용)
+_XML_TOKEN = re.compile(r'''
+    <!--.*?-->
+  | <!\[CDATA\[(?P<cdata>.*?)\]\]>
+  | <\?.*?\?>
+  | <!(?:[^>"']|"[^"]*"|'[^']*')*>
+  | <(?P<close>/)?(?P<name>[^\s/>!?]+)(?P<attrs>(?:[^>"']|"[^"]*"|'[^']*')*?)(?P<empty>/)?>
+''', re.S | re.X)
+
+# 시작 태그 안의 속성 (이름, 큰따옴표 값, 작은따옴표 값)
+_XML_ATTRIBUTE = re.compile(r'''([^\s=/>"']+)\s*=\s*(?:"([^"]*)"|'([^']*)')''')
+
+
+class XmlScope:
+    """
+    XML 범위 규칙의 적용 대상 (요소 경로와 속성 이름)
+
+    요소 경로는 '/'로 구분한 요소 이름이며 열린 요소 목록의 끝부분과 비교합니다
+    (예: 'pd:activity/config'). '/'로 시작하면 루트부터 일치해야 하고, '*'는 아무 요소나 뜻합니다.
+    속성 이름이 없으면 요소의 직접 텍스트(CDATA 포함)가, 있으면 그 속성 값이 대상입니다.
+    """
+
+    __slots__ = ('element', 'attribute', 'steps', 'absolute')
+
+    def __init__(self, element: Optional[str] = None, attribute: Optional[str] = None):
+        self.element = element or ''
+        self.attribute = attribute or None
+        self.absolute = self.element.startswith('/')
+        self.steps = tuple(step for step in self.element.split('/') if step)
+
+    def matches(self, stack: Tuple[str, ...], attribute: Optional[str]) -> bool:
+        """열린 요소 목록과 속성 이름(텍스트이면 None)이 범위에 해당하는지 확인합니다."""
+        if attribute != self.attribute:
+            return False
+        steps = self.steps
+        if len(stack) < len(steps) or (self.absolute and len(stack) != len(steps)):
+            return False
+        tail = stack[len(stack) - len(steps):]
+        return all(step == '*' or step == name for step, name in zip(steps, tail))
+
+
+def iter_xml_spans(content: str) -> Iterator[Tuple[int, int, Tuple[str, ...], Optional[str]]]:
+    """
+    XML 텍스트를 한 번 훑어 요소 텍스트와 속성 값의 위치를 문서 순서대로 반환합니다.
+
+    DOM을 만들지 않고 태그 위치만 따라가므로 원본의 나머지 부분은 그대로 유지한 채
+    해당 구간만 바꿔 쓸 수 있습니다. 닫히지 않은 태그 등 잘못된 구조는 관대하게 처리합니다.
+
+    Yields:
+        (시작, 끝, 열린 요소 목록, 속성 이름 - 텍스트이면 None)
+    """
+    stack: List[str] = []
+    cursor = 0
+    for token in _XML_TOKEN.finditer(content):
+        start = token.start()
+        if stack and start > cursor:
+            yield cursor, start, tuple(stack), None
+        cursor = token.end()
+        name = token.group('name')
+        if name is None:
+            if token.group('cdata') is not None and stack:
+                yield token.start('cdata'), token.end('cdata'), tuple(stack), None
+            continue
+        if token.group('close'):
+            # 짝이 맞는 요소까지 닫음 (없으면 무시)
+            if name in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(name):]
+            continue
+        stack.append(name)
+        path = tuple(stack)
+        offset = token.start('attrs')
+        for attribute in _XML_ATTRIBUTE.finditer(token.group('attrs')):
+            group = 2 if attribute.group(2) is not None else 3
+            yield (offset + attribute.start(group), offset + attribute.end(group),
+                   path, attribute.group(1))
+        if token.group('empty'):
+            stack.pop()
+
+
+class ScopedRule(CompiledRule):
+    """XML 요소 텍스트 또는 속성 값 안에서만 적용되는 규칙"""
+
+    def __init__(self, index: int, description: str, pattern_text: str, replacement: str,
+                 scope: XmlScope):
+        """
+        Args:
+            index: 치환목록 내 순번 (1부터 시작)
+            description: 규칙 설명
+            pattern_text: 찾을 정규식 문자열 (요소 텍스트/속성 값 하나를 전체 문자열로 보고 검색)
+            replacement: 교체할 값
+            scope: 적용 대상 XML 범위
+        """
+        super().__init__(index, description, pattern_text, replacement)
+        self.scope = scope
+        # 구조를 해석해야 하므로 결합 단계, bytes 모드, 스트리밍에는 넣지 않음
+        self.combinable = False
+        self.ascii = False
+        self.bytes_safe = False
+        # 교체 값(그룹 참조 포함)이 태그나 속성 경계를 만들 수 있으면 뒤 규칙은 구조를 다시 읽어야 함
+        boundaries = '"\'' if scope.attribute else '<>'
+        self.restructures = '\\' in replacement or any(char in replacement for char in boundaries)
+
+    def apply(self, content: str, edit_map: Optional[EditMap] = None,
+              errors: Optional[Dict[int, str]] = None) -> Tuple[str, int]:
+        """규칙 하나만 범위 안에 적용합니다."""
+        content, counts = _ScopedStage([self]).apply(content, edit_map, errors)
+        return content, counts[0]
+
+
+def _suffix_prefix_overlap(left: str, right: str) -> bool:
+    """left의 진접미사가 right의 접두사이거나 right를 접두사로 포함하는지 확인합니다."""
+    for k in range(1, len(left)):
+        tail = left[k:]
+        if right.startswith(tail) or tail.startswith(right):
+            return True
+    return False
+
+
+def _strings_touch(output: str, literal: str) -> bool:
+    """교체 결과 output이 들어간 자리에서 literal이 새로 생길 수 있는지 확인합니다."""
+    return (literal in output or output in literal
+            or _suffix_prefix_overlap(output, literal)
+            or _suffix_prefix_overlap(literal, output))
+
+
+def rules_conflict(earlier: CompiledRule, later: CompiledRule) -> bool:
+    """
+    두 규칙을 한 번의 스캔으로 동시에 적용하면 순차 적용과 결과가 달라질 수 있는지 판단합니다.
+
+    결합 스캔은 가장 왼쪽 매칭을 택하고 같은 위치에서는 앞 규칙을 우선하므로,
+    결과가 달라지는 경우는 다음 두 가지뿐입니다.
+      1. 뒤 규칙의 매칭이 앞 규칙 매칭보다 먼저 시작해서 겹치는 경우
+      2. 앞 규칙의 교체 결과(또는 그 경계)에 뒤 규칙이 새로 매칭되는 경우
+
+    Args:
+        earlier: 치환목록에서 앞에 있는 규칙
+        later: 치환목록에서 뒤에 있는 규칙
+
+    Returns:
+        충돌 가능성이 있으면 True (판단이 어려우면 True)
+    """
+    if not earlier.combinable or not later.combinable:
+        return True
+
+    # 1. 겹침: 앞 규칙 매칭의 첫 문자가 뒤 규칙 매칭의 두 번째 이후 문자가 될 수 있는가
+    if later.literal is not None:
+        if earlier.literal is not None:
+            if _suffix_prefix_overlap(later.literal, earlier.literal):
+                return True
+        elif earlier.first.hits(later.literal[1:]):
+            return True
+    elif earlier.first.intersects(later.alphabet):
+        return True
+
+    # 2. 앞 규칙의 교체 결과에 뒤 규칙이 새로 매칭될 수 있는가
+    return output_conflicts(earlier, later)
+
+
+def output_conflicts(earlier: CompiledRule, later: CompiledRule) -> bool:
+    """
+    앞 규칙의 교체 결과(또는 그 경계)에 뒤 규칙이 새로 매칭될 수 있는지 판단합니다.
+
+    rules_conflict의 두 번째 조건만 따로 봅니다. 원본에서의 매칭 위치가 이미 정해져 있고
+    교체 값만 바뀌는 경우(프로세스 템플릿)에는 이 조건만 확인하면 됩니다.
+
+    Args:
+        earlier: 치환목록에서 앞에 있는 규칙
+        later: 치환목록에서 뒤에 있는 규칙
+
+    Returns:
+        새 매칭 가능성이 있으면 True (판단이 어려우면 True)
+    """
+    if not earlier.combinable or not later.combinable:
+        return True
+    output = earlier.output
+    if not output:
+        # 삭제 규칙은 양옆 문자를 붙여 새 매칭을 만들 수 있음
+        return True
+    if later.literal is not None:
+        return _strings_touch(output, later.literal)
+    # 매칭이 교체 결과 안에서 시작하거나, 앞에서 시작해 교체 결과를 포함하는 경우
+    return later.first.hits(output) or later.alphabet.hits(output[0])
+
+
+class _Stage:
+    """한 번의 스캔으로 동시에 적용되는 규칙 묶음"""
+
+    def __init__(self, rules: List[CompiledRule], use_automaton: bool = True):
+        self.rules = rules
+        self.automaton = None
+        self.combined = None
+        self.group_rules = {}
+        if len(rules) > 1:
+            self._build(use_automaton)
+
+    @property
+    def kind(self) -> str:
+        """단계 실행 방식 (디버그 출력용)"""
+        if self.automaton is not None:
+            return 'aho-corasick'
+        if self.combined is not None:
+            return 'combined'
+        return 'sequential'
+
+    def _build(self, use_automaton: bool):
+        """결합 스캐너(Aho-Corasick 오토마톤 또는 결합 정규식)를 만듭니다."""
+        if use_automaton and HAS_AHOCORASICK and all(rule.literal is not None for rule in self.rules):
+            automaton = ahocorasick.Automaton()
+            for position, rule in enumerate(self.rules):
+                # 같은 문자열이 여러 규칙에 있으면 앞 규칙만 매칭됨 (순차 적용과 동일)
+                if rule.literal not in automaton:
+                    automaton.add_word(rule.literal, (position, len(rule.literal)))
+            automaton.make_automaton()
+            self.automaton = automaton
+            return
+
+        # 규칙의 원본 패턴(str 또는 bytes)을 규칙별 그룹으로 감싸 결합
+        source = self.rules[0].pattern.pattern
+        open_group, close_group, separator = ('(', ')', '|') if isinstance(source, str) else (b'(', b')', b'|')
+        parts = []
+        group_index = 1
+        for position, rule in enumerate(self.rules):
+            parts.append(open_group + rule.pattern.pattern + close_group)
+            self.group_rules[group_index] = position
+            group_index += 1 + rule.pattern.groups
+        try:
+            self.combined = re.compile(separator.join(parts))
+        except (re.error, OverflowError, AssertionError):
+            # 이름 있는 그룹 중복, 그룹 수 초과 등 - 순차 적용으로 대체
+            self.combined = None
+
+    def apply(self, content: str, edit_map: Optional[EditMap] = None,
+              errors: Optional[Dict[int, str]] = None) -> Tuple[str, List[int]]:
+        """단계를 적용하고 (치환된 내용, 규칙별 치환 수)를 반환합니다. 적용 중 오류는 errors에 기록됩니다."""
+        if self.automaton is not None:
+            return self._apply_automaton(content, edit_map)
+        if self.combined is not None:
+            return self._apply_combined(content, edit_map, errors)
+        counts = []
+        for rule in self.rules:
+            content, count = rule.apply(content, edit_map, errors)
+            counts.append(count)
+        return content, counts
+
+    def _apply_combined(self, content: str, edit_map: Optional[EditMap] = None,
+                        errors: Optional[Dict[int, str]] = None) -> Tuple[str, List[int]]:
+        counts = [0] * len(self.rules)
+        candidates = [position for position, rule in enumerate(self.rules) if rule.may_match(content)]
+        if not candidates:
+            return content, counts
+        if len(candidates) == 1:
+            # 매칭 가능한 규칙이 하나뿐이면 결합 정규식 대신 해당 규칙만 실행
+            position = candidates[0]
+            content, counts[position] = self.rules[position].apply(content, edit_map, errors)
+            return content, counts
+
+        outputs = [rule.output for rule in self.rules]
+        group_rules = self.group_rules
+        edits = [] if edit_map is not None else None
+
+        def dispatch(match):
+            position = group_rules[match.lastindex]
+            counts[position] += 1
+            if edits is not None:
+                edits.append((match.start(), match.end(), len(outputs[position])))
+            return outputs[position]
+
+        content = self.combined.sub(dispatch, content)
+        if edit_map is not None:
+            edit_map.compose(edits)
+        return content, counts
+
+    def _apply_automaton(self, content: str, edit_map: Optional[EditMap] = None) -> Tuple[str, List[int]]:
+        counts = [0] * len(self.rules)
+        # 겹치는 후보를 (시작 위치, 규칙 순서)로 정렬한 뒤 왼쪽부터 겹치지 않게 선택
+        candidates = sorted((end - length + 1, position, end + 1)
+                            for end, (position, length) in self.automaton.iter(content))
+        pieces = []
+        edits = []
+        cursor = 0
+        for start, position, end in candidates:
+            if start < cursor:
+                continue
+            pieces.append(content[cursor:start])
+            pieces.append(self.rules[position].output)
+            counts[position] += 1
+            edits.append((start, end, len(self.rules[position].output)))
+            cursor = end
+        if not pieces:
+            return content, counts
+        pieces.append(content[cursor:])
+        if edit_map is not None:
+            edit_map.compose(edits)
+        return ''.join(pieces), counts
+
+
+def _changed_span(start: int, old: str, new: str) -> Tuple[int, int, int]:
+    """구간 치환 전후에서 실제로 달라진 부분만 (시작, 끝, 교체 길이)로 반환합니다."""
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return start + prefix, start + len(old) - suffix, len(new) - prefix - suffix
+
+
+class _ScopedStage:
+    """XML 구조를 한 번 훑으면서 연속된 범위 규칙을 해당 구간에만 적용하는 단계"""
+
+    kind = 'xml-scoped'
+
+    def __init__(self, rules: List[ScopedRule]):
+        self.rules = rules
+
+    def apply(self, content: str, edit_map: Optional[EditMap] = None,
+              errors: Optional[Dict[int, str]] = None) -> Tuple[str, List[int]]:
+        """단계를 적용하고 (치환된 내용, 규칙별 치환 수)를 반환합니다. 적용 중 오류는 errors에 기록됩니다."""
+        counts = [0] * len(self.rules)
+        active = [(position, rule) for position, rule in enumerate(self.rules) if rule.may_match(content)]
+        if not active:
+            return content, counts
+
+        # (열린 요소 목록, 속성 이름) -> 적용할 규칙 (같은 위치의 구간이 많으므로 기억해 둠)
+        targets_by_path = {}
+        pieces = []
+        edits = []
+        cursor = 0
+        for start, end, stack, attribute in iter_xml_spans(content):
+            key = (stack, attribute)
+            targets = targets_by_path.get(key)
+            if targets is None:
+                targets = targets_by_path[key] = [(position, rule) for position, rule in active
+                                                  if rule.scope.matches(stack, attribute)]
+            if not targets:
+                continue
+            old = new = content[start:end]
+            for position, rule in targets:
+                # 구간 하나에는 일반 규칙과 같이 적용 (역추적 위험 규칙의 시간 제한 포함)
+                new, count = CompiledRule.apply(rule, new, errors=errors)
+                counts[position] += count
+            if new != old:
+                pieces.append(content[cursor:start])
+                pieces.append(new)
+                cursor = end
+                edits.append(_changed_span(start, old, new))
+        if not pieces:
+            return content, counts
+        pieces.append(content[cursor:])
+        if edit_map is not None:
+            edit_map.compose(edits)
+        return ''.join(pieces), counts
+
+
+def build_stages(rules: List[CompiledRule]) -> List[_Stage]:
+    """
+    규칙 목록을 순서를 유지한 채 단일 패스 단계들로 나눕니다.
+    연속된 XML 범위 규칙은 구조를 한 번만 훑는 단계 하나로 묶습니다.
+
+    Args:
+        rules: 컴파일된 규칙 목록
+
+    Returns:
+        단계 목록
+    """
+    stages = []
+    current = []
+
+    def flush():
+        stages.append(_ScopedStage(current) if current[0].scope is not None else _Stage(current))
+
+    for rule in rules:
+        if rule.pattern is None:
+            # 컴파일 오류 규칙은 건너뜀 (치환 수 0)
+            continue
+        if current:
+            if (rule.scope is None) != (current[-1].scope is None):
+                split = True
+            elif rule.scope is not None:
+                # 범위 규칙끼리는 앞 규칙이 구조를 바꿀 수 있을 때만 구조를 다시 읽음
+                split = current[-1].restructures
+            else:
+                split = any(rules_conflict(earlier, rule) for earlier in current)
+            if split:
+                flush()
+                current = []
+        current.append(rule)
+    if current:
+        flush()
+    return stages
+
+
+class ReplacementPlan:
+    """치환목록 하나를 컴파일한 실행 계획"""
+
+    def __init__(self, replacements: List[Dict]):
+        """
+        ReplacementPlan 초기화
+
+        Args:
+            replacements: YAML 치환목록
+        """
+        self.fingerprint = rules_fingerprint(replacements)
+        self.rules = []
+        for idx, repl in enumerate(replacements or [], 1):
+            pattern_text, replacement = _rule_texts(repl)
+            self.rules.append(compile_rule(idx, repl.get('설명', '설명 없음'),
+                                           pattern_text, replacement, _rule_scope(repl)))
+        self.stages = build_stages(self.rules)
+        self.ascii_rules = all(rule.ascii for rule in self.rules)
+        self.bytes_safe = self.ascii_rules and all(rule.bytes_safe for rule in self.rules
+                                                   if rule.pattern is not None)
+        # 역추적 위험 규칙이 있으면 파일마다 시간 예산을 새로 시작
+        self.guarded = any(rule.risk for rule in self.rules)
+        self._bytes_rules = None
+        self._bytes_stages = None
+        self._stream_widths = None
+        # 마지막 apply의 적용 중 오류와 시간 초과 규칙 (계획마다 따로 보관)
+        self._errors: Dict[int, str] = {}
+        self._timeouts: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def can_apply_bytes(self, data: bytes, encoding: Optional[str] = None) -> bool:
+        """
+        bytes 모드로 적용해도 텍스트 모드와 결과가 같은지 확인합니다.
+
+        Args:
+            data: 파일 내용
+            encoding: 파일 인코딩 (파일이 ASCII가 아닐 때만 필요)
+
+        Returns:
+            apply_bytes를 사용할 수 있으면 True
+        """
+        if not self.ascii_rules:
+            return False
+        if data.isascii():
+            encoding = 'ascii'
+        elif not (self.bytes_safe and is_ascii_safe_encoding(encoding)):
+            return False
+        # str의 \\s에만 매칭되는 공백 문자가 있으면 결과가 달라질 수 있음
+        return not unicode_space_pattern(encoding).search(data)
+
+    def apply_bytes(self, data: bytes) -> Tuple[bytes, List[int]]:
+        """
+        디코딩 없이 bytes에 모든 규칙을 적용합니다 (can_apply_bytes가 True일 때만 사용).
+
+        Args:
+            data: 파일 내용
+
+        Returns:
+            (치환된 내용, 규칙별 치환 수 목록)
+        """
+        self._build_bytes_stages()
+        self._begin_apply()
+        counts = [0] * len(self.rules)
+        for stage in self._bytes_stages:
+            data, stage_counts = stage.apply(data, None, self._errors)
+            for rule, count in zip(stage.rules, stage_counts):
+                counts[rule.index - 1] = count
+        self._end_apply()
+        return data, counts
+
+    def apply(self, content: str, edit_map: Optional[EditMap] = None) -> Tuple[str, List[int]]:
+        """
+        모든 규칙을 적용합니다. 결과는 규칙을 하나씩 순서대로 적용한 것과 같습니다.
+
+        Args:
+            content: 치환할 내용
+            edit_map: 전달하면 원본 기준 변경 구간이 기록됨 (미리보기 diff용)
+
+        Returns:
+            (치환된 내용, 규칙별 치환 수 목록)
+        """
+        self._begin_apply()
+        counts = [0] * len(self.rules)
+        for stage in self.stages:
+            content, stage_counts = stage.apply(content, edit_map, self._errors)
+            for rule, count in zip(stage.rules, stage_counts):
+                counts[rule.index - 1] = count
+        self._end_apply()
+        return content, counts
+
+    def _begin_apply(self):
+        """파일 하나의 적용을 시작합니다 (이 계획의 오류 기록과 시간 예산 초기화)."""
+        self._errors = {}
+        self._timeouts = []
+        if self.guarded:
+            _guard.begin_file()
+
+    def _end_apply(self):
+        """시간 초과 기록을 이 계획에 옮겨 둡니다 (다른 계획의 apply가 덮어쓰지 않도록)."""
+        if self.guarded:
+            self._timeouts = list(_guard.timeouts)
+
+    @property
+    def timeouts(self) -> List[int]:
+        """이 계획의 마지막 apply/apply_bytes에서 시간 예산을 넘겨 건너뛴 규칙 순번 목록"""
+        return list(self._timeouts)
+
+    @property
+    def errors(self) -> Dict[int, str]:
+        """
+        이 계획의 마지막 apply/apply_bytes에서 규칙 적용 중 발생한 오류 (규칙 순번 -> 메시지).
+
+        컴파일 오류는 CompiledRule.error에 있으며 여기에는 포함되지 않습니다.
+        """
+        return dict(self._errors)
+
+    def _build_bytes_stages(self):
+        """bytes 모드 단계를 만듭니다 (처음 사용할 때 한 번)."""
+        if self._bytes_stages is None:
+            # 단계 구성은 텍스트 모드와 같고, 결합 스캐너만 bytes 패턴으로 다시 만듦
+            self._bytes_rules = [_BytesRule(rule) for rule in self.rules]
+            self._bytes_stages = [
+                _Stage([self._bytes_rules[rule.index - 1] for rule in stage.rules], use_automaton=False)
+                for stage in self.stages
+            ]
+
+    @property
+    def streamable(self) -> bool:
+        """모든 규칙을 스트리밍(창 단위 bytes 치환)으로 적용할 수 있는지 여부"""
+        if self._stream_widths is None:
+            widths = {}
+            if self.bytes_safe and not self.guarded:
+                for rule in self.rules:
+                    if rule.pattern is None:
+                        continue
+                    width = _stream_width(rule.pattern_text, rule.pattern, rule.replacement)
+                    if width is None:
+                        widths = None
+                        break
+                    widths[rule.index] = width
+            else:
+                widths = None
+            self._stream_widths = widths if widths is not None else False
+        return self._stream_widths is not False
+
+    def iter_stream(self, chunks: Iterable[bytes], counts: List[int],
+                    changed: Optional[List[bool]] = None) -> Iterator[bytes]:
+        """
+        입력 조각에 모든 규칙을 스트리밍으로 적용합니다 (streamable이 True일 때만 사용).
+
+        단계마다 창 단위 치환기를 연결하므로 메모리 사용량은 창 크기 + 최대 매칭 길이 수준입니다.
+        파일 인코딩의 bytes 모드 적합성은 호출하는 쪽에서 확인해야 합니다.
+
+        Args:
+            chunks: 입력 조각 (예: mmap한 원본의 창)
+            counts: 규칙별 치환 수가 누적될 리스트 (규칙 수만큼 0으로 초기화된 것)
+            changed: 전달하면 내용이 실제로 바뀐 경우 [True]로 설정됨
+
+        Yields:
+            출력 조각
+        """
+        if not self.streamable:
+            raise ValueError("스트리밍으로 적용할 수 없는 치환목록입니다")
+        self._build_bytes_stages()
+        widths = self._stream_widths
+        if changed is not None and not changed:
+            changed.append(False)
+
+        def mark_changed(match, output):
+            if changed is not None and not changed[0] and output != match.group(0):
+                changed[0] = True
+            return output
+
+        stream = chunks
+        for stage in self._bytes_stages:
+            if stage.combined is not None:
+                outputs = [rule.output for rule in stage.rules]
+                indices = [rule.index - 1 for rule in stage.rules]
+                group_rules = stage.group_rules
+
+                def combined_handler(match, outputs=outputs, indices=indices, group_rules=group_rules):
+                    position = group_rules[match.lastindex]
+                    counts[indices[position]] += 1
+                    return mark_changed(match, outputs[position])
+
+                width = max(widths[rule.index] for rule in stage.rules)
+                stream = _stream_pass(stream, stage.combined, combined_handler, width)
+                continue
+
+            for rule in stage.rules:
+                if rule.pattern is None:
+                    continue
+
+                def rule_handler(match, rule=rule):
+                    counts[rule.index - 1] += 1
+                    return mark_changed(match, match.expand(rule.replacement))
+
+                stream = _stream_pass(stream, rule.pattern, rule_handler, widths[rule.index])
+        return stream
+
+    def apply_sequential(self, content: str) -> Tuple[str, List[int]]:
+        """단계 결합 없이 규칙을 하나씩 순서대로 적용합니다 (검증용)."""
+        self._begin_apply()
+        counts = []
+        for rule in self.rules:
+            content, count = rule.apply(content, errors=self._errors)
+            counts.append(count)
+        self._end_apply()
+        return content, counts
+
+
+def _rule_texts(repl: Dict) -> Tuple[str, str]:
+    """치환 규칙 딕셔너리에서 (정규식, 교체값) 문자열을 꺼냅니다."""
+    pattern_text = repl['찾기']['정규식']
+    replacement = repl['교체']['값']
+    # 엑셀에서 읽은 숫자 값 등이 그대로 들어온 경우 문자열로 변환
+    return str(pattern_text), str(replacement)
+
+
+def _rule_scope(repl: Dict) -> Optional[Tuple[str, Optional[str]]]:
+    """치환 규칙의 XML 범위 (요소 경로, 속성 이름)를 꺼냅니다. 범위가 없으면 None."""
+    find = repl['찾기']
+    element = find.get(SCOPE_ELEMENT_KEY)
+    attribute = find.get(SCOPE_ATTRIBUTE_KEY)
+    if not element and not attribute:
+        return None
+    return str(element or ''), (str(attribute) if attribute else None)
+
+
+def expand_rule_sets(replacements: Optional[List[Dict]], rule_sets: Optional[Dict],
+                     streaming: bool = False) -> List[Dict]:
+    """
+    치환목록의 {규칙집합: ID} 참조를 rule_sets에 정의된 규칙 목록으로 펼칩니다.
+
+    참조는 그 자리에 규칙집합의 규칙들이 순서대로 들어간 것과 같습니다.
+    참조가 없는 치환목록은 그대로 반환합니다.
+
+    Args:
+        replacements: YAML 치환목록 (규칙 또는 참조 항목)
+        rule_sets: YAML 최상위 rule_sets 항목 ({ID: 치환목록})
+        streaming: 행을 하나씩 읽는 중이면 True (지금까지 읽은 rule_sets만 있음 - 오류 메시지에 안내 추가)
+
+    Returns:
+        규칙만 있는 치환목록
+
+    Raises:
+        ValueError: 정의되지 않은 규칙집합을 참조한 경우
+    """
+    replacements = replacements or []
+    if not any(RULE_SET_REF in repl for repl in replacements):
+        return replacements
+    expanded = []
+    for repl in replacements:
+        if RULE_SET_REF not in repl:
+            expanded.append(repl)
+            continue
+        set_id = repl[RULE_SET_REF]
+        if not rule_sets or set_id not in rule_sets:
+            hint = f" ({RULE_SETS_KEY}는 작업 행보다 먼저 정의해야 합니다)" if streaming else ""
+            raise ValueError(f"정의되지 않은 규칙집합입니다: {set_id}{hint}")
+        expanded.extend(rule_sets[set_id] or [])
+    return expanded
+
+
+def rules_fingerprint(replacements: Optional[List[Dict]]) -> str:
+    """
+    치환목록의 지문(해시)을 계산합니다. 같은 규칙 목록은 같은 지문을 가집니다.
+
+    Args:
+        replacements: YAML 치환목록
+
+    Returns:
+        SHA-256 16진 문자열
+    """
+    digest = hashlib.sha256()
+    for repl in replacements or []:
+        pattern_text, replacement = _rule_texts(repl)
+        digest.update(str(repl.get('설명', '')).encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(pattern_text.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(replacement.encode('utf-8'))
+        scope = _rule_scope(repl)
+        if scope is not None:
+            # 범위가 없는 규칙의 지문은 이전과 같게 유지
+            digest.update(b'\x02' + '\x00'.join((scope[0], scope[1] or '')).encode('utf-8'))
+        digest.update(b'\x01')
+    return digest.hexdigest()
+
+
+# (설명, 정규식, 교체값, XML 범위) -> 컴파일된 규칙 (LRU)
+_rule_cache: 'OrderedDict[Tuple, CompiledRule]' = OrderedDict()
+
+
+def compile_rule(index: int, description: str, pattern_text: str, replacement: str,
+                 scope: Optional[Tuple[str, Optional[str]]] = None) -> CompiledRule:
+    """
+    규칙 하나를 컴파일합니다. 같은 규칙은 캐시된 분석 결과를 복사해 순번만 바꿉니다.
+
+    Args:
+        index: 치환목록 내 순번 (1부터 시작)
+        description: 규칙 설명
+        pattern_text: 찾을 정규식 문자열
+        replacement: 교체할 값
+        scope: XML 범위 (요소 경로, 속성 이름) - 지정하면 ScopedRule
+
+    Returns:
+        CompiledRule
+    """
+    key = (description, pattern_text, replacement, scope)
+    cached = _rule_cache.get(key)
+    if cached is None:
+        if scope is None:
+            cached = CompiledRule(index, description, pattern_text, replacement)
+        else:
+            cached = ScopedRule(index, description, pattern_text, replacement, XmlScope(*scope))
+        _rule_cache[key] = cached
+        if len(_rule_cache) > RULE_CACHE_SIZE:
+            _rule_cache.popitem(last=False)
+    else:
+        _rule_cache.move_to_end(key)
+    rule = copy.copy(cached)
+    rule.index = index
+    return rule
+
+
+# 지문 -> 컴파일된 계획 (LRU)
+_plan_cache: 'OrderedDict[str, ReplacementPlan]' = OrderedDict()
+
+
+def compile_plan(replacements: Optional[List[Dict]]) -> ReplacementPlan:
+    """
+    치환목록을 컴파일합니다. 같은 규칙 목록은 캐시된 계획을 재사용합니다.
+
+    Args:
+        replacements: YAML 치환목록
+
+    Returns:
+        ReplacementPlan
+    """
+    fingerprint = rules_fingerprint(replacements)
+    plan = _plan_cache.get(fingerprint)
+    if plan is not None:
+        _plan_cache.move_to_end(fingerprint)
+        return plan
+
+    plan = ReplacementPlan(replacements or [])
+    _plan_cache[fingerprint] = plan
+    if len(_plan_cache) > PLAN_CACHE_SIZE:
+        _plan_cache.popitem(last=False)
+    return plan
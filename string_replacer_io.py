@@ -0,0 +1,508 @@
+"""
+문자열 치환 도구 I/O 스케줄러
+
+execute_replacements는 대부분의 시간을 디스크(특히 네트워크 공유 폴더) 대기에 사용합니다.
+IOScheduler는 다음 방식으로 CPU 작업(치환)과 디스크 작업을 겹쳐서 실행합니다.
+  - 작업을 대상 디렉토리 순으로 정렬하여 디렉토리별 os.makedirs를 한 번만 호출
+  - 백그라운드 스레드가 다음 작업들의 원본 파일을 미리 읽어 둠 (read-ahead)
+  - 치환된 결과는 쓰기 큐에 넣고 별도 쓰기 스레드가 저장
+
+대상 파일은 같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체하므로
+중간에 실패하더라도 반쯤 쓰이거나 반쯤 치환된 대상 파일이 남지 않습니다.
+
+인코딩 감지는 BOM -> XML 선언(encoding=) -> 엄격한 UTF-8 디코딩 순으로 확인하고,
+모두 실패한 경우에만 앞부분 표본에 대해 chardet을 실행합니다.
+결과는 (경로, 크기, 수정시각) 기준으로 캐시합니다.
+
+STREAM_THRESHOLD 이상인 대용량 파일은 미리 읽지 않고 mmap으로 열어 창 단위로 치환하며
+결과를 임시 파일에 조금씩 씁니다 (stream_write).
+
+하나의 원본(PROD 프로세스)을 여러 작업이 복사하는 경우가 많으므로, 읽은 원본 내용은
+(경로, 크기, 수정시각) 기준으로 SOURCE_CACHE_BYTES 안에서 보관해 다시 읽지 않습니다 (read_source).
+"""
+
+import os
+import re
+import mmap
+import codecs
+import queue
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from string_replacer_engine import is_ascii_safe_encoding, unicode_space_pattern
+
+# chardet 모듈 가져오기 시도 (설치되지 않았을 경우 utf-8로 가정)
+try:
+    import chardet
+    HAS_CHARDET = True
+except ImportError:
+    HAS_CHARDET = False
+
+# 미리 읽어 둘 원본 파일 수
+PREFETCH_DEPTH = 8
+
+# 쓰기 큐에 대기할 수 있는 최대 파일 수 (메모리 사용량 제한)
+WRITE_QUEUE_SIZE = 16
+
+# 스레드 종료 신호
+_STOP = object()
+
+# chardet에 넘길 표본 크기 (대용량 파일 전체를 분석하지 않음)
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# 이 크기 이상인 원본은 스트리밍으로 처리 (환경변수로 변경 가능)
+STREAM_THRESHOLD = int(os.environ.get('STRING_REPLACER_STREAM_THRESHOLD', 16 * 1024 * 1024))
+
+# 스트리밍 창 크기
+STREAM_WINDOW = 1024 * 1024
+
+# 읽은 원본 내용을 보관할 최대 크기 (LRU - 상한의 1/4보다 큰 파일은 보관하지 않음)
+SOURCE_CACHE_BYTES = 64 * 1024 * 1024
+
+# 비ASCII 바이트 검색
+_NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+# 인코딩 캐시 최대 항목 수
+ENCODING_CACHE_SIZE = 4096
+
+# BOM -> 인코딩 (UTF-32 BOM이 UTF-16 BOM으로 시작하므로 먼저 검사)
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# <?xml version="1.0" encoding="UTF-8"?> 선언
+_XML_ENCODING = re.compile(rb'\A\s*<\?xml[^>]*?\sencoding\s*=\s*["\']([A-Za-z][A-Za-z0-9._-]*)["\']')
+
+
+def _decodes(raw: bytes, encoding: str) -> bool:
+    """raw가 encoding으로 오류 없이 디코딩되는지 확인합니다."""
+    try:
+        raw.decode(encoding)
+        return True
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+
+def sniff_encoding(raw: bytes) -> Optional[str]:
+    """
+    파일 내용의 인코딩을 빠르게 감지합니다.
+
+    Args:
+        raw: 파일 내용
+
+    Returns:
+        인코딩 이름 (감지 실패 시 None)
+    """
+    for bom, encoding in _BOMS:
+        if raw.startswith(bom):
+            return encoding
+
+    match = _XML_ENCODING.match(raw[:1024])
+    if match:
+        declared = match.group(1).decode('ascii')
+        try:
+            declared = codecs.lookup(declared).name
+        except LookupError:
+            declared = None
+        if declared and _decodes(raw, declared):
+            return declared
+
+    if _decodes(raw, 'utf-8'):
+        return 'utf-8'
+
+    if HAS_CHARDET:
+        return chardet.detect(raw[:ENCODING_SAMPLE_SIZE])['encoding']
+    return None
+
+
+# (절대경로, 크기, 수정시각) -> 인코딩
+_encoding_cache: 'OrderedDict[Tuple[str, int, int], Optional[str]]' = OrderedDict()
+
+
+def detect_file_encoding(path: str, raw: Optional[bytes] = None) -> Optional[str]:
+    """
+    파일 인코딩을 감지합니다. 같은 파일(경로, 크기, 수정시각, 아이노드, 변경시각)은
+    다시 감지하지 않습니다.
+
+    Args:
+        path: 파일 경로
+        raw: 이미 읽어 둔 파일 내용 (None이면 필요할 때 읽음)
+
+    Returns:
+        인코딩 이름 (감지 실패 시 None)
+    """
+    try:
+        stat = os.stat(path)
+        key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns,
+               stat.st_ino, stat.st_ctime_ns)
+    except OSError:
+        key = None
+
+    if key is not None and key in _encoding_cache:
+        _encoding_cache.move_to_end(key)
+        return _encoding_cache[key]
+
+    if raw is None:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    encoding = sniff_encoding(raw)
+
+    if key is not None:
+        _encoding_cache[key] = encoding
+        if len(_encoding_cache) > ENCODING_CACHE_SIZE:
+            _encoding_cache.popitem(last=False)
+    return encoding
+
+
+class BoundedCache:
+    """전체 크기(bytes)로 제한한 LRU 캐시 (읽기 스레드와 함께 쓰므로 잠금 사용)"""
+
+    def __init__(self, max_bytes: int):
+        """
+        Args:
+            max_bytes: 보관할 값들의 크기 합 상한 (항목 하나는 1/4까지만 보관)
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._items: 'OrderedDict[object, Tuple[object, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        """값을 반환합니다 (없으면 None)."""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value, size: int):
+        """
+        값을 보관합니다. 상한을 넘으면 오래 쓰지 않은 값부터 버립니다.
+
+        Args:
+            key: 키
+            value: 값
+            size: 값의 크기 (bytes)
+        """
+        if size > self.max_bytes // 4:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._items[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self.size -= dropped
+
+    def clear(self):
+        """모든 값을 버립니다."""
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+
+# (정규화한 절대경로, 크기, 수정시각, 아이노드, 변경시각) -> 원본 내용
+_source_cache = BoundedCache(SOURCE_CACHE_BYTES)
+
+
+def read_source(path: str) -> bytes:
+    """
+    원본 파일 내용을 읽습니다. 같은 파일(경로, 크기, 수정시각, 아이노드, 변경시각)은
+    다시 읽지 않습니다. 변경시각은 os.utime으로 되돌릴 수 없으므로 같은 크기로 고쳐 쓰고
+    수정시각을 복원한 파일도 다시 읽습니다.
+
+    Args:
+        path: 원본 파일 경로
+
+    Returns:
+        파일 내용
+
+    Raises:
+        OSError: 파일을 읽을 수 없는 경우
+    """
+    stat = os.stat(path)
+    key = (os.path.normcase(os.path.abspath(path)), stat.st_size, stat.st_mtime_ns,
+           stat.st_ino, stat.st_ctime_ns)
+    data = _source_cache.get(key)
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+        _source_cache.put(key, data, len(data))
+    return data
+
+
+def write_file(path: str, data: bytes, source: Optional[str] = None):
+    """
+    대상 디렉토리를 만들고 파일을 원자적으로 씁니다.
+
+    Args:
+        path: 대상 파일 경로
+        data: 쓸 내용
+        source: 권한/수정시각을 가져올 원본 파일 경로 (shutil.copy2와 같은 메타데이터 유지)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    atomic_write(path, data, source)
+
+
+def stream_write(path: str, chunks: Iterable[bytes], source: Optional[str] = None):
+    """
+    조각을 임시 파일에 차례로 쓴 뒤 대상 파일로 교체합니다 (대용량 스트리밍 출력용).
+
+    Args:
+        path: 대상 파일 경로
+        chunks: 쓸 내용 조각
+        source: 권한/수정시각을 가져올 원본 파일 경로
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        if source:
+            shutil.copystat(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def mmap_chunks(mapped, window: int = STREAM_WINDOW) -> Iterator[bytes]:
+    """mmap된 파일을 창 크기 단위의 bytes 조각으로 돌려줍니다."""
+    for offset in range(0, len(mapped), window):
+        yield mapped[offset:offset + window]
+
+
+def open_mmap(path: str):
+    """
+    파일을 읽기 전용 mmap으로 엽니다. 빈 파일은 mmap할 수 없으므로 b''를 반환합니다.
+
+    Returns:
+        mmap 객체 또는 b'' (with 문으로 사용 가능하도록 호출자가 닫아야 함)
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def bytes_mode_encoding(mapped) -> Optional[str]:
+    """
+    파일 전체를 메모리에 올리지 않고 bytes 모드 치환에 안전한 인코딩인지 확인합니다.
+
+    ASCII 파일이거나, XML 선언의 인코딩(없으면 UTF-8)으로 오류 없이 디코딩되는
+    ASCII 안전 인코딩이면서 유니코드 전용 공백 문자가 없어야 합니다.
+
+    Args:
+        mapped: mmap 객체 또는 bytes
+
+    Returns:
+        인코딩 이름 (bytes 모드를 사용할 수 없으면 None)
+    """
+    if not _NON_ASCII.search(mapped):
+        encoding = 'ascii'
+    else:
+        head = bytes(mapped[:1024])
+        if any(head.startswith(bom) for bom, _ in _BOMS):
+            return None
+        match = _XML_ENCODING.match(head)
+        encoding = match.group(1).decode('ascii') if match else 'utf-8'
+        if not is_ascii_safe_encoding(encoding):
+            return None
+        # 선언된 인코딩으로 실제 디코딩되는지 창 단위로 확인 (결과는 보관하지 않음)
+        decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+        try:
+            for chunk in mmap_chunks(mapped):
+                decoder.decode(chunk)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return None
+    if unicode_space_pattern(encoding).search(mapped):
+        return None
+    return encoding
+
+
+def atomic_write(path: str, data: bytes, source: Optional[str] = None, keep_times: bool = True):
+    """
+    같은 디렉토리의 임시 파일에 쓴 뒤 os.replace로 교체합니다.
+
+    Args:
+        path: 대상 파일 경로 (디렉토리는 이미 있어야 함)
+        data: 쓸 내용
+        source: 권한/수정시각을 가져올 원본 파일 경로
+        keep_times: False이면 권한 비트만 가져옴 (제자리 수정 시)
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.',
+                                    suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if source and keep_times:
+            # copy2와 같이 원본의 권한 비트와 접근/수정 시각을 유지
+            shutil.copystat(source, tmp_path)
+        elif source:
+            shutil.copymode(source, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class IOScheduler:
+    """원본 미리 읽기와 대상 쓰기를 백그라운드 스레드로 처리하는 스케줄러"""
+
+    def __init__(self, prefetch_depth: int = PREFETCH_DEPTH, write_queue_size: int = WRITE_QUEUE_SIZE,
+                 stream_threshold: int = STREAM_THRESHOLD):
+        """
+        IOScheduler 초기화
+
+        Args:
+            prefetch_depth: 미리 읽어 둘 원본 파일 수
+            write_queue_size: 쓰기 큐 크기
+            stream_threshold: 이 크기 이상인 원본은 미리 읽지 않음 (0이면 모두 읽음)
+        """
+        self.prefetch_depth = prefetch_depth
+        self.stream_threshold = stream_threshold
+        self.errors: Dict[str, str] = {}
+        self._created_dirs = set()
+        self._writes = queue.Queue(maxsize=write_queue_size)
+        self._writer = threading.Thread(target=self._write_loop, name='string-replacer-writer', daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    @staticmethod
+    def schedule(jobs: List[Dict]) -> List[Dict]:
+        """
+        작업을 대상 디렉토리 순으로 정렬합니다 (같은 디렉토리 안에서는 원래 순서 유지).
+
+        Args:
+            jobs: 'source', 'dest', 'order' 키를 가진 작업 목록
+
+        Returns:
+            정렬된 작업 목록
+        """
+        return sorted(jobs, key=lambda job: (os.path.dirname(os.path.abspath(job['dest'])), job['order']))
+
+    def ensure_directory(self, path: str):
+        """대상 파일의 디렉토리를 만듭니다. 디렉토리마다 한 번만 호출됩니다."""
+        directory = os.path.dirname(os.path.abspath(path))
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def prefetch(self, jobs: List[Dict]) -> Iterator[Tuple[Dict, Optional[bytes], Optional[Exception]]]:
+        """
+        원본 파일을 백그라운드 스레드에서 미리 읽으면서 작업을 순서대로 돌려줍니다.
+
+        Args:
+            jobs: 작업 목록 (schedule로 정렬된 순서 권장)
+
+        Yields:
+            (작업, 원본 내용, 읽기 오류) - 읽기에 실패하면 내용은 None,
+            stream_threshold 이상인 파일은 내용과 오류가 모두 None
+        """
+        loaded = queue.Queue(maxsize=max(1, self.prefetch_depth))
+        stop = threading.Event()
+
+        def read_loop():
+            for job in jobs:
+                if stop.is_set():
+                    break
+                try:
+                    if self.stream_threshold and os.path.getsize(job['source']) >= self.stream_threshold:
+                        # 대용량 파일은 미리 읽지 않음 (처리 시 mmap 스트리밍)
+                        item = (job, None, None)
+                    else:
+                        item = (job, read_source(job['source']), None)
+                except Exception as e:
+                    item = (job, None, e)
+                loaded.put(item)
+            loaded.put(_STOP)
+
+        reader = threading.Thread(target=read_loop, name='string-replacer-reader', daemon=True)
+        reader.start()
+        try:
+            while True:
+                item = loaded.get()
+                if item is _STOP:
+                    break
+                yield item
+        finally:
+            # 소비자가 중간에 멈춘 경우 읽기 스레드가 큐에서 막히지 않도록 비움
+            stop.set()
+            while reader.is_alive():
+                try:
+                    loaded.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            reader.join()
+
+    def write(self, path: str, data: bytes, source: Optional[str] = None):
+        """
+        쓰기 큐에 파일 쓰기를 추가합니다. 실패한 쓰기는 close 후 errors에 기록됩니다.
+
+        Args:
+            path: 대상 파일 경로
+            data: 쓸 내용
+            source: 권한/수정시각을 가져올 원본 파일 경로
+        """
+        if self._closed:
+            raise RuntimeError("이미 종료된 IOScheduler입니다")
+        self.ensure_directory(path)
+        self._writes.put((path, data, source))
+
+    def close(self) -> Dict[str, str]:
+        """
+        대기 중인 쓰기를 모두 끝내고 쓰기 스레드를 종료합니다.
+
+        Returns:
+            {실패한 대상 파일 경로: 오류 메시지}
+        """
+        if not self._closed:
+            self._closed = True
+            self._writes.put(_STOP)
+            self._writer.join()
+        return self.errors
+
+    def _write_loop(self):
+        """쓰기 스레드: 큐의 파일을 순서대로 저장합니다."""
+        while True:
+            item = self._writes.get()
+            if item is _STOP:
+                break
+            path, data, source = item
+            try:
+                # 디렉토리는 write에서 ensure_directory로 이미 생성됨
+                atomic_write(path, data, source)
+            except Exception as e:
+                self.errors[path] = str(e)
@@ -0,0 +1,447 @@
+"""
+문자열 치환 도구 실행 저널 및 되돌리기
+
+execute_replacements는 실행마다 실행 ID를 만들고, 그 실행이 만든 파일과 덮어쓴 원본을
+추가 전용(append-only) JSON Lines 저널에 기록합니다.
+  - create: 실행 전에 존재하지 않던 대상 파일 (파일을 쓰기 전에 기록)
+  - mkdir: 실행 전에 존재하지 않던 대상 디렉토리
+  - done: 대상 파일 쓰기 완료 및 결과 내용의 SHA-256
+  - skip: create로 기록했지만 이번 실행에서 쓰지 않은 대상 파일 (원본 없음, 오류 등)
+  - overwrite: 덮어쓰기 전 원본의 SHA-256과 백업 경로
+
+rollback(실행 ID)은 저널을 읽어 생성된 파일을 동시에 삭제하고 덮어쓴 원본을 백업에서
+복원합니다. 배치 파일이나 셸을 거치지 않으므로 Linux/Windows에서 모두 동작하며,
+실행 이후에 내용이 바뀐 파일은 force=True가 아니면 건드리지 않습니다.
+done 기록이 없는 파일은 이번 실행이 쓰지 않은 것이므로 삭제하지 않습니다. 단, 실행이 정상 종료되지
+않은 경우(end 기록이 없거나 중단됨)에는 쓰는 도중 중단되었을 수 있으므로 확인 없이 삭제하고
+'unverified'로 따로 알려 줍니다.
+
+IncrementalState는 증분 실행(--incremental)을 위해 대상 파일별로
+(원본 내용 해시 + 치환목록 지문)과 만들어진 대상 파일의 해시를 저장합니다.
+다시 실행할 때 입력과 기존 대상 파일이 그대로인 작업은 건너뜁니다.
+"""
+
+import os
+import json
+import stat
+import shutil
+import hashlib
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from string_replacer_io import atomic_write
+
+# 저널 디렉토리 (환경 변수로 변경 가능)
+JOURNAL_DIR = os.environ.get('STRING_REPLACER_JOURNAL_DIR', 'replace_journal')
+
+# 되돌리기 시 동시에 삭제/복원할 스레드 수 (디스크 대기 위주이므로 CPU 수보다 많게)
+ROLLBACK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# 해시 계산 시 한 번에 읽을 크기
+_HASH_BLOCK = 1024 * 1024
+
+# 증분 실행 상태 파일 이름 (저널 디렉토리 안)
+STATE_FILE = 'incremental_state.json'
+
+
+def new_run_id() -> str:
+    """시각 기반 실행 ID를 만듭니다 (예: 20240315-142501-a1b2c3)."""
+    return datetime.datetime.now().strftime('%Y%m%d-%H%M%S-') + os.urandom(3).hex()
+
+
+def file_sha256(path: str) -> str:
+    """파일 내용의 SHA-256 (16진수)을 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def journal_path(run_id: str, journal_dir: str = JOURNAL_DIR) -> str:
+    """실행 ID의 저널 파일 경로"""
+    return os.path.join(journal_dir, run_id + '.jsonl')
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+def _normalize(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class RunJournal:
+    """
+    한 번의 실행에 대한 추가 전용 저널
+
+    파일을 만들거나 덮어쓰기 전에 기록하고 fsync하므로, 실행이 중간에 중단되어도
+    그때까지 만든 파일은 모두 되돌릴 수 있습니다.
+    """
+
+    def __init__(self, run_id: Optional[str] = None, journal_dir: str = JOURNAL_DIR,
+                 **meta):
+        """
+        Args:
+            run_id: 실행 ID (None이면 새로 생성)
+            journal_dir: 저널 디렉토리
+            meta: begin 기록에 함께 저장할 정보 (예: yaml 경로)
+        """
+        self.run_id = run_id or new_run_id()
+        self.journal_dir = journal_dir
+        self.path = journal_path(self.run_id, journal_dir)
+        self.backup_dir = os.path.join(journal_dir, self.run_id)
+        self._planned = set()
+        self._done = set()
+        self._backed_up = set()
+        self.created = 0
+        self.overwritten = 0
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._append({'op': 'begin', 'run_id': self.run_id, 'time': _now(), **meta}, sync=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(aborted=exc_type is not None)
+
+    def _append(self, record: Dict, sync: bool = False):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+
+    def plan_create(self, paths: Iterable[str]):
+        """
+        실행 전에 존재하지 않는 대상 파일과 디렉토리를 기록합니다 (쓰기 전에 호출).
+
+        Args:
+            paths: 이번 실행에서 만들 수 있는 대상 파일 경로 목록
+        """
+        missing_dirs = {}
+        for path in paths:
+            key = _normalize(path)
+            if key in self._planned or os.path.exists(path):
+                continue
+            self._planned.add(key)
+            self._append({'op': 'create', 'path': os.path.abspath(path)})
+
+            directory = os.path.dirname(os.path.abspath(path))
+            while directory not in missing_dirs and not os.path.isdir(directory):
+                missing_dirs[directory] = True
+                parent = os.path.dirname(directory)
+                if parent == directory:
+                    break
+                directory = parent
+        for directory in missing_dirs:
+            self._append({'op': 'mkdir', 'path': directory})
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record_created(self, path: str, sha256: Optional[str]):
+        """대상 파일 쓰기 완료를 결과 내용의 해시와 함께 기록합니다."""
+        self.created += 1
+        self._done.add(_normalize(path))
+        self._append({'op': 'done', 'path': os.path.abspath(path), 'sha256': sha256})
+
+    def record_skipped(self, path: str, reason: Optional[str] = None):
+        """
+        create로 기록했지만 쓰지 않은 대상 파일을 기록합니다 (되돌리기 때 삭제하지 않음).
+
+        Args:
+            path: 대상 파일 경로
+            reason: 쓰지 않은 이유 (오류 메시지 등)
+        """
+        key = _normalize(path)
+        if key not in self._planned or key in self._done:
+            return
+        self._append({'op': 'skip', 'path': os.path.abspath(path), 'reason': reason})
+
+    def backup(self, path: str):
+        """
+        덮어쓰기 전에 원본을 백업하고 기록합니다 (같은 실행에서 경로당 한 번).
+
+        Args:
+            path: 덮어쓸 기존 파일 경로
+        """
+        key = _normalize(path)
+        if key in self._backed_up or key in self._planned or not os.path.exists(path):
+            return
+        self._backed_up.add(key)
+        os.makedirs(self.backup_dir, exist_ok=True)
+        backup_path = os.path.join(self.backup_dir, f'{len(self._backed_up):06d}_' + os.path.basename(path))
+        shutil.copy2(path, backup_path)
+        self.overwritten += 1
+        self._append({'op': 'overwrite', 'path': os.path.abspath(path),
+                      'sha256': file_sha256(backup_path), 'backup': os.path.abspath(backup_path)},
+                     sync=True)
+
+    def close(self, aborted: bool = False):
+        """
+        end 기록을 남기고 저널을 닫습니다.
+
+        Args:
+            aborted: 예외로 중단된 실행이면 True (되돌리기 때 중단된 실행으로 취급)
+        """
+        if self._file.closed:
+            return
+        record = {'op': 'end', 'time': _now(), 'created': self.created, 'overwritten': self.overwritten}
+        if aborted:
+            record['aborted'] = True
+        self._append(record, sync=True)
+        self._file.close()
+
+
+def read_journal(run_id: str, journal_dir: str = JOURNAL_DIR) -> List[Dict]:
+    """
+    저널 기록을 읽습니다. 중단된 실행의 마지막 줄이 잘려 있으면 무시합니다.
+
+    Raises:
+        FileNotFoundError: 실행 ID의 저널이 없는 경우
+    """
+    records = []
+    with open(journal_path(run_id, journal_dir), encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def list_runs(journal_dir: str = JOURNAL_DIR) -> List[Dict]:
+    """
+    저널이 남아 있는 실행 목록을 최근 순으로 반환합니다.
+
+    Returns:
+        [{'run_id', 'time', 'yaml', 'files', 'finished', 'rolled_back'}]
+    """
+    if not os.path.isdir(journal_dir):
+        return []
+    runs = []
+    for name in os.listdir(journal_dir):
+        if not name.endswith('.jsonl'):
+            continue
+        records = read_journal(name[:-len('.jsonl')], journal_dir)
+        if not records:
+            continue
+        ops = [record.get('op') for record in records]
+        runs.append({
+            'run_id': records[0].get('run_id', name[:-len('.jsonl')]),
+            'time': records[0].get('time', ''),
+            'yaml': records[0].get('yaml', ''),
+            'files': ops.count('create') + ops.count('overwrite'),
+            'finished': 'end' in ops,
+            'rolled_back': 'rollback' in ops
+        })
+    runs.sort(key=lambda run: run['run_id'], reverse=True)
+    return runs
+
+
+def _remove(path: str):
+    """파일을 삭제합니다. 읽기 전용 속성(Windows)이면 해제 후 다시 시도합니다."""
+    try:
+        os.remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        os.remove(path)
+
+
+def _matches(path: str, sha256: Optional[str]) -> bool:
+    """sha256이 None이면 확인하지 않음 (백업 복원, 중단된 실행의 미완료 파일)"""
+    return sha256 is None or file_sha256(path) == sha256
+
+
+def _undo(action: Tuple, force: bool) -> Tuple[str, str, Optional[str]]:
+    """
+    되돌리기 작업 하나를 실행합니다.
+
+    Returns:
+        (경로, 결과 - deleted/restored/skipped/failed, 사유)
+    """
+    kind, path, expected, backup = action
+    try:
+        if not os.path.exists(path):
+            if kind == 'delete':
+                return path, 'skipped', '이미 존재하지 않음'
+        elif not force and not _matches(path, expected):
+            return path, 'skipped', '실행 이후 내용이 변경됨'
+
+        if kind == 'delete':
+            _remove(path)
+            return path, 'deleted', None
+
+        with open(backup, 'rb') as f:
+            data = f.read()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and not os.access(path, os.W_OK):
+            os.chmod(path, stat.S_IWRITE | stat.S_IREAD)
+        atomic_write(path, data, backup)
+        return path, 'restored', None
+    except Exception as e:
+        return path, 'failed', str(e)
+
+
+def rollback(run_id: str, journal_dir: str = JOURNAL_DIR, workers: int = ROLLBACK_WORKERS,
+             force: bool = False) -> Dict[str, List]:
+    """
+    실행 하나를 되돌립니다. 생성된 파일은 삭제하고 덮어쓴 원본은 백업에서 복원합니다.
+
+    Args:
+        run_id: 되돌릴 실행 ID
+        journal_dir: 저널 디렉토리
+        workers: 동시에 삭제/복원할 스레드 수
+        force: True이면 실행 이후 내용이 바뀐 파일도 되돌림
+
+    Returns:
+        {'deleted': [경로], 'restored': [경로], 'skipped': [(경로, 사유)], 'failed': [(경로, 오류)],
+         'unverified': [쓰기 완료 기록 없이 삭제한 경로 (중단된 실행)]}
+
+    Raises:
+        FileNotFoundError: 실행 ID의 저널이 없는 경우
+    """
+    records = read_journal(run_id, journal_dir)
+
+    created = {}
+    written = set()
+    not_written = {}
+    overwritten = {}
+    directories = []
+    finished = False
+    for record in records:
+        op = record.get('op')
+        if op == 'create':
+            created.setdefault(record['path'], None)
+        elif op == 'done' and record['path'] in created:
+            created[record['path']] = record.get('sha256')
+            written.add(record['path'])
+        elif op == 'done' and record['path'] in overwritten:
+            overwritten[record['path']][0] = record.get('sha256')
+        elif op == 'skip':
+            not_written.setdefault(record['path'], record.get('reason'))
+        elif op == 'overwrite':
+            overwritten.setdefault(record['path'], [None, record['backup']])
+        elif op == 'mkdir':
+            directories.append(record['path'])
+        elif op == 'end':
+            finished = not record.get('aborted')
+
+    result = {'deleted': [], 'restored': [], 'skipped': [], 'failed': [], 'unverified': []}
+    actions = []
+    for path, sha256 in created.items():
+        if path in written:
+            actions.append(('delete', path, sha256, None))
+        elif path in not_written or finished:
+            # 이번 실행이 쓰지 않은 파일 (다른 프로그램이 나중에 만들었을 수 있음)
+            reason = not_written.get(path)
+            result['skipped'].append((path, '이번 실행에서 쓰지 않음' + (f': {reason}' if reason else '')))
+        else:
+            # 중단된 실행: 쓰는 도중 중단되어 완료 기록이 없을 수 있음
+            actions.append(('delete', path, None, None))
+            if os.path.exists(path):
+                result['unverified'].append(path)
+    actions += [('restore', path, sha256, backup) for path, (sha256, backup) in overwritten.items()]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for path, outcome, reason in executor.map(lambda action: _undo(action, force), actions):
+            result[outcome].append(path if reason is None else (path, reason))
+
+    # 이번 실행이 만든 디렉토리는 비어 있을 때만 안쪽부터 제거
+    for directory in sorted(directories, key=len, reverse=True):
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+    with open(journal_path(run_id, journal_dir), 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'op': 'rollback', 'time': _now(), 'force': force,
+                            **{key: len(value) for key, value in result.items()}},
+                           ensure_ascii=False) + '\n')
+    return result
+
+
+# 저장된 해시를 재사용해도 되는지 판단하는 stat 항목
+_STAT_KEYS = ('path', 'size', 'mtime_ns', 'ino', 'ctime_ns')
+
+
+def _stat_info(path: str, st: os.stat_result) -> Dict:
+    """stat 결과에서 _STAT_KEYS 항목을 뽑습니다."""
+    return {'path': os.path.abspath(path), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+            'ino': st.st_ino, 'ctime_ns': st.st_ctime_ns}
+
+
+def _file_info(path: str, cached: Optional[Dict] = None) -> Dict:
+    """
+    파일의 (경로, 크기, 수정시각, 아이노드, 변경시각, SHA-256)을 반환합니다.
+
+    cached의 경로/크기/수정시각/아이노드/변경시각이 모두 같으면 파일을 읽지 않고
+    저장된 해시를 사용합니다. 변경시각(ctime)은 os.utime으로 되돌릴 수 없으므로
+    같은 크기로 고쳐 쓴 뒤 수정시각을 복원한 파일도 다시 읽습니다.
+    """
+    st = os.stat(path)
+    info = _stat_info(path, st)
+    if cached and all(cached.get(key) == info[key] for key in _STAT_KEYS):
+        info['sha256'] = cached.get('sha256')
+    else:
+        info['sha256'] = file_sha256(path)
+    return info
+
+
+class IncrementalState:
+    """
+    증분 실행 상태 (대상 파일 -> 입력 키, 원본 정보, 대상 파일 정보)
+
+    입력 키는 원본 경로, 원본 내용 해시, 치환목록 지문으로 만듭니다.
+    원본은 매번 내용을 읽어 해시하고, 대상 파일만 stat 정보가 모두 그대로일 때
+    저장된 해시를 사용합니다.
+    """
+
+    def __init__(self, journal_dir: str = JOURNAL_DIR):
+        self.path = os.path.join(journal_dir, STATE_FILE)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def inputs(self, source: str, dest: str, fingerprint: str) -> Dict:
+        """
+        작업의 입력 키와 원본 정보를 계산합니다.
+
+        Args:
+            source: 원본 파일 경로
+            dest: 대상 파일 경로
+            fingerprint: 치환목록 지문 (rules_fingerprint)
+
+        Returns:
+            {'key': 입력 키, 'source': 원본 정보}
+        """
+        # 원본은 stat 정보를 믿지 않고 항상 내용을 해시함
+        source_info = _file_info(source)
+        key = hashlib.sha256('\0'.join([source_info['path'], source_info['sha256'], fingerprint])
+                             .encode('utf-8')).hexdigest()
+        return {'key': key, 'source': source_info}
+
+    def is_current(self, dest: str, inputs: Dict) -> bool:
+        """입력 키가 같고 대상 파일이 마지막 실행 결과 그대로이면 True"""
+        entry = self.entries.get(_normalize(dest))
+        if not entry or entry.get('key') != inputs['key'] or not os.path.exists(dest):
+            return False
+        return _file_info(dest, entry.get('dest'))['sha256'] == entry['dest'].get('sha256')
+
+    def record(self, dest: str, inputs: Dict, sha256: Optional[str]):
+        """실행 결과를 기록합니다 (대상 파일 쓰기가 끝난 뒤 호출)."""
+        # 쓰면서 계산한 해시가 있으면 대상 파일을 다시 읽지 않음
+        written = None
+        if sha256:
+            written = dict(_stat_info(dest, os.stat(dest)), sha256=sha256)
+        dest_info = _file_info(dest, written)
+        self.entries[_normalize(dest)] = {'key': inputs['key'], 'source': inputs['source'],
+                                          'dest': dest_info}
+
+    def save(self):
+        """상태 파일을 원자적으로 저장합니다."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        atomic_write(self.path, json.dumps(self.entries, ensure_ascii=False).encode('utf-8'))
@@ -0,0 +1,181 @@
+"""
+문자열 치환 도구 계획 파일 (미리보기 -> 실행 재사용)
+
+미리보기(메뉴 2)에서 --plan 경로를 지정하면 작업별로 다음 내용을 zip 계획 파일에 저장합니다.
+  - 작업 키: 행 키, 파일 타입, 원본/대상 경로, 치환목록 지문
+  - 원본 내용의 SHA-256
+  - 치환 결과 (zlib 압축, 변경이 없으면 저장하지 않고 원본을 그대로 복사)
+  - 규칙별 치환 수
+
+실행(메뉴 3)에 같은 계획 파일을 지정하면 원본 해시가 그대로인 작업은 인코딩 감지와
+정규식 치환을 다시 하지 않고 저장된 결과를 씁니다. 원본이나 치환목록이 바뀐 작업은
+평소처럼 다시 치환합니다.
+
+실행 중 읽는 계획 파일은 load_plan 시점의 파일(수정 시각, 크기)과 같을 때만 사용하며,
+열어 둔 파일은 실행이 끝나면 close_plans로 닫습니다 (대화형 메뉴에서 미리보기로 계획 파일을
+다시 만들어도 이전 내용을 읽지 않도록).
+"""
+
+import os
+import json
+import zlib
+import hashlib
+import zipfile
+import datetime
+from typing import Dict, Optional
+from string_replacer_engine import rules_fingerprint
+
+# 계획 파일 형식 버전
+PLAN_VERSION = 1
+
+_MANIFEST = 'manifest.json'
+
+# 프로세스별로 열어 둔 계획 파일 (경로 -> ((수정 시각, 크기), ZipFile))
+_open_plans = {}
+
+
+def _file_stamp(path: str):
+    """파일이 바뀌었는지 확인하기 위한 (수정 시각, 크기)"""
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def job_key(job: Dict) -> str:
+    """
+    작업 키를 계산합니다. 행, 파일 타입, 경로, 치환목록 중 하나라도 바뀌면 다른 키가 됩니다.
+
+    Args:
+        job: collect_jobs로 만든 작업
+
+    Returns:
+        SHA-256 16진 문자열
+    """
+    parts = [str(job['row_key']), str(job['file_type']),
+             os.path.abspath(job['source'] or ''), os.path.abspath(job['dest'] or ''),
+             rules_fingerprint(job['replacements'])]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def compress_output(data: bytes) -> bytes:
+    """치환 결과를 압축합니다 (미리보기 작업자에서 호출)."""
+    return zlib.compress(data, 6)
+
+
+class PlanWriter:
+    """미리보기 결과를 계획 파일로 저장합니다."""
+
+    def __init__(self, path: str, yaml_path: str):
+        """
+        Args:
+            path: 계획 파일 경로
+            yaml_path: 계획을 만든 YAML 경로 (기록용)
+        """
+        self.path = path
+        self.yaml_path = os.path.abspath(yaml_path)
+        self.entries = {}
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._tmp_path = path + '.tmp'
+        # 결과는 작업자가 이미 zlib으로 압축했으므로 zip에는 그대로 저장
+        self._zip = zipfile.ZipFile(self._tmp_path, 'w', zipfile.ZIP_STORED)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._zip.close()
+            os.remove(self._tmp_path)
+
+    def add(self, job: Dict, source_sha256: str, compressed: Optional[bytes], rule_counts):
+        """
+        작업 하나의 미리보기 결과를 추가합니다.
+
+        Args:
+            job: collect_jobs로 만든 작업
+            source_sha256: 원본 내용 해시
+            compressed: compress_output으로 압축한 치환 결과 (변경이 없으면 None)
+            rule_counts: 규칙별 치환 수
+        """
+        member = None
+        if compressed is not None:
+            member = f"outputs/{len(self.entries):06d}.z"
+            self._zip.writestr(member, compressed)
+        self.entries[job_key(job)] = {'order': job['order'], 'source_sha256': source_sha256,
+                                      'member': member, 'rule_counts': list(rule_counts)}
+
+    def close(self):
+        """목록(manifest)을 쓰고 계획 파일을 완성합니다."""
+        manifest = {'version': PLAN_VERSION, 'yaml': self.yaml_path,
+                    'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                    'jobs': self.entries}
+        self._zip.writestr(_MANIFEST, json.dumps(manifest, ensure_ascii=False))
+        self._zip.close()
+        # 열어 둔 이전 계획 파일이 있으면 닫아야 교체할 수 있음 (Windows)
+        close_plans(self.path)
+        os.replace(self._tmp_path, self.path)
+
+
+def load_plan(path: str) -> Dict[str, Dict]:
+    """
+    계획 파일의 작업 목록을 읽습니다.
+
+    Args:
+        path: 계획 파일 경로
+
+    Returns:
+        {작업 키: {'source_sha256', 'member', 'rule_counts', 'plan', 'plan_stamp'}}
+
+    Raises:
+        ValueError: 계획 파일 형식 버전이 다른 경우
+    """
+    plan_path = os.path.abspath(path)
+    close_plans(plan_path)
+    stamp = _file_stamp(plan_path)
+    with zipfile.ZipFile(plan_path) as archive:
+        manifest = json.loads(archive.read(_MANIFEST).decode('utf-8'))
+    if manifest.get('version') != PLAN_VERSION:
+        raise ValueError(f"지원하지 않는 계획 파일 버전입니다: {manifest.get('version')}")
+    return {key: dict(entry, plan=plan_path, plan_stamp=stamp) for key, entry in manifest['jobs'].items()}
+
+
+def read_output(entry: Dict) -> Optional[bytes]:
+    """
+    계획에 저장된 치환 결과를 읽습니다. 변경이 없는 작업이면 None을 반환합니다.
+
+    Args:
+        entry: load_plan이 반환한 작업 항목
+
+    Raises:
+        ValueError: load_plan 이후 계획 파일이 바뀐 경우 (목록과 결과의 짝이 맞지 않음)
+    """
+    if not entry.get('member'):
+        return None
+    path, stamp = entry['plan'], entry.get('plan_stamp')
+    opened = _open_plans.get(path)
+    if opened is None or opened[0] != stamp:
+        close_plans(path)
+        archive = zipfile.ZipFile(path)
+        # 열기 전에 바뀌었을 수 있으므로 연 파일의 상태로 확인
+        current = os.fstat(archive.fp.fileno())
+        if [current.st_mtime_ns, current.st_size] != stamp:
+            archive.close()
+            raise ValueError(f"미리보기 이후 계획 파일이 바뀌었습니다: {path}")
+        opened = _open_plans[path] = (stamp, archive)
+    return zlib.decompress(opened[1].read(entry['member']))
+
+
+def close_plans(path: Optional[str] = None):
+    """
+    열어 둔 계획 파일을 닫습니다 (실행이 끝날 때, 계획 파일을 교체하기 전에 호출).
+
+    Args:
+        path: 닫을 계획 파일 경로 (None이면 모두)
+    """
+    paths = list(_open_plans) if path is None else [os.path.abspath(path)]
+    for plan_path in paths:
+        opened = _open_plans.pop(plan_path, None)
+        if opened is not None:
+            opened[1].close()
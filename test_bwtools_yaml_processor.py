@@ -132,6 +132,26 @@ class TestYAMLProcessor(unittest.TestCase):
                 self.assertIn('복사파일', row_data[file_type])
                 self.assertIn('치환목록', row_data[file_type])
     
+    def test_system_rules_shared_via_rule_sets(self):
+        """시스템 치환 규칙은 rule_sets에 파일 타입별로 한 번만 기록되고 참조됨"""
+        df = pd.read_csv(self.test_csv_path)
+        yaml_data = self.processor._create_yaml_structure(df)
+        
+        rule_sets = yaml_data['rule_sets']
+        for file_type, file_info in yaml_data['row_1'].items():
+            self.assertEqual(file_info['치환목록'][0], {'규칙집합': f'system_{file_type}'})
+            self.assertEqual(len(rule_sets[f'system_{file_type}']), 4)
+    
+    def test_parallel_yaml_structure_matches_sequential(self):
+        """프로세스 풀로 만든 YAML 구조가 순차 생성과 같음 (행 순서 포함)"""
+        df = pd.read_csv(self.test_csv_path)
+        expected = self.processor._create_yaml_structure(df)
+        result = self.processor._create_yaml_structure(df, workers=2)
+        
+        self.assertEqual(result, expected)
+        self.assertEqual(list(result), list(expected))
+        self.assertEqual(list(result['rule_sets']), list(expected['rule_sets']))
+    
     def test_execute_replacements_without_files(self):
         """파일이 없을 때 치환 실행 테스트"""
         # YAML 생성
@@ -155,6 +175,27 @@ class TestYAMLProcessor(unittest.TestCase):
             log_content = f.read()
             self.assertIn('실패', log_content)
     
+    def test_rule_sets_after_rows(self):
+        """rule_sets가 작업 행 뒤에 있으면 스트리밍 실행은 파일을 만들기 전에 중단"""
+        df = pd.read_csv(self.test_csv_path)
+        yaml_data = self.processor._create_yaml_structure(df)
+        rule_sets = yaml_data.pop('rule_sets')
+        yaml_data['rule_sets'] = rule_sets
+        with open(self.test_yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(yaml_data, f, allow_unicode=True, sort_keys=False)
+        
+        self.assertFalse(self.processor.execute_replacements(
+            self.test_yaml_path, self.test_log_path, self.test_result_path
+        ))
+        self.assertEqual(self.processor.log_entries, [])
+        self.assertFalse(os.path.exists(self.test_log_path))
+        
+        # 전체를 읽은 데이터는 위치와 관계없이 참조를 펼침
+        self.processor.yaml_data = yaml_data
+        self.assertEqual(self.processor._execute_all_replacements(), 1)
+        self.assertEqual(len(self.processor.log_entries), 4)
+        self.assertTrue(all(entry['replacements'] >= 4 for entry in self.processor.log_entries))
+    
     def test_save_log_file(self):
         """로그 파일 저장 테스트"""
         # 테스트 로그 엔트리 추가
@@ -0,0 +1,72 @@
+"""
+Excel 읽기 캐시 단위 테스트
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+from excel_cache import ExcelCache, CACHE_SUFFIXES
+
+class TestExcelCache(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.work_dir, 'cache')
+        self.excel_path = os.path.join(self.work_dir, 'input.xlsx')
+        self.cache = ExcelCache(self.cache_dir)
+        self._create_test_excel({'송신파일경로': ['a.process', 'b.process'],
+                                 'Event_ID': ['EVT_001', None]})
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _create_test_excel(self, data):
+        """테스트용 엑셀 파일 생성"""
+        pd.DataFrame(data).to_excel(self.excel_path, index=False)
+
+    def _cache_files(self):
+        """캐시 디렉토리의 캐시 파일 목록"""
+        return [name for name in os.listdir(self.cache_dir) if name.endswith(CACHE_SUFFIXES)]
+
+    def test_repeat_read_uses_cache(self):
+        """두 번째 읽기는 엑셀을 다시 파싱하지 않음"""
+        first = self.cache.read_excel(self.excel_path, engine='openpyxl')
+        with mock.patch('excel_cache.pd.read_excel') as read_excel:
+            second = self.cache.read_excel(self.excel_path, engine='openpyxl')
+            read_excel.assert_not_called()
+
+        pd.testing.assert_frame_equal(first, second)
+        self.assertTrue(pd.isna(second['Event_ID'][1]))
+        self.assertEqual(self.cache.misses, 1)
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(len(self._cache_files()), 1)
+
+    def test_modified_file_is_reparsed(self):
+        """파일 내용이 바뀌면 캐시를 사용하지 않음"""
+        self.cache.read_excel(self.excel_path)
+        self._create_test_excel({'송신파일경로': ['c.process']})
+
+        df = self.cache.read_excel(self.excel_path)
+        self.assertEqual(df['송신파일경로'].tolist(), ['c.process'])
+        self.assertEqual(self.cache.misses, 2)
+
+    def test_lru_eviction(self):
+        """캐시 크기 상한을 넘으면 오래된 항목이 삭제됨"""
+        self.cache.read_excel(self.excel_path)
+        entry_size = os.path.getsize(os.path.join(self.cache_dir, self._cache_files()[0]))
+
+        small_cache = ExcelCache(self.cache_dir, max_bytes=entry_size)
+        small_cache.read_excel(self.excel_path, sheet_name=0)
+        self.assertEqual(len(self._cache_files()), 1)
+
+    def test_missing_file_raises(self):
+        """존재하지 않는 파일은 pandas 오류를 그대로 전달"""
+        with self.assertRaises(FileNotFoundError):
+            self.cache.read_excel(os.path.join(self.work_dir, 'missing.xlsx'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+"""
+2행 구조 엑셀 행 쌍 읽기 단위 테스트
+"""
+
+import unittest
+import pickle
+import pandas as pd
+from excel_row_pairs import RowPairs
+
+
+class TestRowPairs(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.df = pd.DataFrame({
+            '송신파일생성여부': [1.0, None, 1.0, None, 1.0],
+            'Group ID': ['G1', 'G2', 'G3', 'G4', 'G5'],
+            'Event_ID': [10, 11, 12, 13, 14],
+            '수신\n업무명': ['RCV', 'RCV', None, 'OLD', 'X'],
+        })
+        self.pairs = RowPairs(self.df)
+
+    def test_values_match_series(self):
+        """행 값 조회 결과가 df.iloc 행(Series)과 같음"""
+        self.assertEqual(len(self.pairs), 2)
+        for pair in self.pairs:
+            for row, position in ((pair.base, pair.base_index), (pair.match, pair.base_index + 1)):
+                series = self.df.iloc[position]
+                for column in self.df.columns:
+                    self.assertIn(column, row)
+                    if pd.isna(series[column]):
+                        self.assertTrue(pd.isna(row[column]))
+                    else:
+                        self.assertEqual(row[column], series[column])
+                        self.assertEqual(row.get(column), series.get(column))
+        row = self.pairs.get(1).base
+        self.assertIsNone(row.get('없는 컬럼'))
+        self.assertEqual(row.get('없는 컬럼', ''), '')
+        self.assertNotIn('없는 컬럼', row)
+        with self.assertRaises(KeyError):
+            row['없는 컬럼']
+
+    def test_lookup_by_serial(self):
+        """일련번호(숫자 또는 문자열)로 행 쌍 조회, 홀수 마지막 행은 따로 보관"""
+        self.assertEqual(self.pairs.get('2').match['Group ID'], 'G4')
+        self.assertEqual(self.pairs.get(1).serial, 1)
+        self.assertIsNone(self.pairs.get(3))
+        self.assertIsNone(self.pairs.get(0))
+        self.assertEqual(self.pairs.unmatched['Group ID'], 'G5')
+        with self.assertRaises(ValueError):
+            self.pairs.get('abc')
+
+    def test_pickle_round_trip(self):
+        """프로세스 풀 작업자로 넘길 수 있도록 pickle 가능"""
+        pair = pickle.loads(pickle.dumps(self.pairs.get(1)))
+        self.assertEqual(pair.base.to_dict(), self.pairs.get(1).base.to_dict())
+        self.assertEqual((pair.serial, pair.match['Event_ID']), (1, 11))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,8 @@ import openpyxl
 from openpyxl.worksheet.worksheet import Worksheet
 import pandas as pd
 import datetime
+from excel_cache import read_excel_cached
+from excel_row_pairs import RowPairs
 
 
 class InterfaceExcelReader:
@@ -2518,9 +2520,12 @@ class ProcessFileMapper:
         """
         self.replacer_excel_path = replacer_excel_path
         self.df = None
+        # 일련번호 -> 행 쌍 (엑셀을 한 번에 행 쌍 레코드로 변환해 두고 바로 조회)
+        self.row_pairs = None
         if os.path.exists(replacer_excel_path):
             try:
-                self.df = pd.read_excel(replacer_excel_path, engine='openpyxl')
+                self.df = read_excel_cached(replacer_excel_path, engine='openpyxl')
+                self.row_pairs = RowPairs(self.df)
             except Exception as e:
                 print(f"Warning: ProcessFileMapper - 엑셀 파일 로드 실패: {str(e)}")
     
@@ -2556,12 +2561,13 @@ class ProcessFileMapper:
             print(f"계산된 row_index: {row_index}")
             print(f"DataFrame 크기: {len(self.df)}")
             
-            if row_index * 2 + 1 >= len(self.df):
+            pair = self.row_pairs.get(serial_number)
+            if pair is None:
                 print(f"행 인덱스 초과: {row_index * 2 + 1} >= {len(self.df)}")
                 return {}
             
-            normal_row = self.df.iloc[row_index * 2]     # 기본행
-            match_row = self.df.iloc[row_index * 2 + 1]  # 매칭행
+            normal_row = pair.base   # 기본행
+            match_row = pair.match   # 매칭행
             
             print(f"기본행 인덱스: {row_index * 2}")
             print(f"매칭행 인덱스: {row_index * 2 + 1}")
@@ -2944,9 +2950,23 @@ else:
         except Exception as e:
             print(f"예상치 못한 오류: {e}")
     
-    # 테스트 실행
-    test_interface_reader()
-    usage_example()
+    # 테스트 실행에서 만든 엑셀 캐시는 저장소의 .excel_cache가 아닌 임시 디렉토리에 저장
+    # (EXCEL_CACHE_DIR 환경변수를 지정한 경우 그대로 사용)
+    import shutil
+    import tempfile
+    import excel_cache
+    temp_cache_dir = None
+    if 'EXCEL_CACHE_DIR' not in os.environ:
+        temp_cache_dir = tempfile.mkdtemp(prefix='iflist_excel_cache_')
+        excel_cache.CACHE_DIR = temp_cache_dir
     
-    # 새로운 BW Process 파서 테스트 실행
-    test_bw_process_parser()
\ No newline at end of file
+    try:
+        # 테스트 실행
+        test_interface_reader()
+        usage_example()
+        
+        # 새로운 BW Process 파서 테스트 실행
+        test_bw_process_parser()
+    finally:
+        if temp_cache_dir:
+            shutil.rmtree(temp_cache_dir, ignore_errors=True)
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+프로세스 파일 namespace 색인 단위 테스트
+"""
+
+import unittest
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
+import namespace_index
+from namespace_index import NamespaceIndex
+
+
+def search_namespace(path, base_name):
+    """색인 이전의 파일 전체 정규식 검색 (비교 기준)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    for attribute in ('namespace', 'xmlns:pfx3'):
+        match = re.search(f'{attribute}\\s*=\\s*"([^"]*{base_name}[^"]*)"', content)
+        if match:
+            return match.group(1)
+    return None
+
+
+class TestNamespaceIndex(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.process = self._write('a.process', (
+            '<pd:ProcessDefinition xmlns:pfx3="http://www.tibco.com/schemas/BB/SharedResources/Recv.xsd">\n'
+            '<xsd:import namespace="http://www.tibco.com/schemas/BB/SharedResources/Send.xsd"/>\n'
+            '<xsd:import namespace = "http://www.tibco.com/ns/no_namespace_schema_location/Old.xsd"/>\n'))
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, name, content):
+        path = os.path.join(self.work_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_lookup_matches_file_search(self):
+        """색인 조회 결과가 파일 전체 정규식 검색과 같음"""
+        index = NamespaceIndex().build([self.process])
+        for base_name in ('Send', 'Recv', 'Old', 'Missing', 'S.nd', 'SharedResources'):
+            self.assertEqual(index.lookup(self.process, base_name),
+                             search_namespace(self.process, base_name), base_name)
+        self.assertTrue(index.has_no_namespace(self.process, 'Old'))
+        self.assertFalse(index.has_no_namespace(self.process, 'Send'))
+
+    def test_each_file_read_once(self):
+        """여러 행에서 같은 파일을 참조해도 파일은 한 번만 읽음"""
+        other = self._write('b.process', '<xsd:import namespace="urn:Other"/>')
+        with mock.patch('namespace_index.scan_file', wraps=namespace_index.scan_file) as scan:
+            index = NamespaceIndex().build([self.process, other, self.process, float('nan'), None])
+            for _ in range(3):
+                index.lookup(self.process, 'Send')
+                index.lookup(other, 'Other')
+        self.assertEqual(scan.call_count, 2)
+        self.assertEqual(index.lookup(other, 'Other'), 'urn:Other')
+
+    def test_unreadable_file_returns_none(self):
+        """UTF-8로 읽을 수 없거나 없는 파일은 None"""
+        path = os.path.join(self.work_dir, 'bad.process')
+        with open(path, 'wb') as f:
+            f.write(b'namespace="\xff\xfeSend"')
+        index = NamespaceIndex()
+        self.assertIsNone(index.lookup(path, 'Send'))
+        self.assertIsNotNone(index.error(path))
+        self.assertIsNone(index.lookup(os.path.join(self.work_dir, 'none.process'), 'Send'))
+
+if __name__ == '__main__':
+    unittest.main()
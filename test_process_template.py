@@ -0,0 +1,77 @@
+"""
+프로세스 파일 템플릿 단위 테스트
+"""
+
+import unittest
+from unittest import mock
+import process_template
+import string_replacer
+from process_template import TemplateCache, compile_template
+from string_replacer_engine import ReplacementPlan
+
+SOURCE = (
+    '<pd:ProcessDefinition>\n'
+    '<pd:name>Processes/OLD_IF_001.process</pd:name>\n'
+    '<IFID>OLD_IF_001</IFID><Event_ID>EV_OLD</Event_ID>\n'
+    '<xsd:import namespace="http://www.tibco.com/schemas/OLD/Send.xsd" schemaLocation="/OLD/Send.xsd"/>\n'
+    '</pd:ProcessDefinition>\n'
+)
+
+
+def make_plan(values):
+    """원본 행 값으로 찾고 기본행 값으로 바꾸는 계획 (찾기는 항상 같음)"""
+    patterns = ['OLD_IF_001', 'EV_OLD', r'/OLD/', 'Send']
+    return ReplacementPlan([{'설명': f'규칙 {i}', '찾기': {'정규식': pattern}, '교체': {'값': value}}
+                            for i, (pattern, value) in enumerate(zip(patterns, values), 1)])
+
+
+class TestProcessTemplate(unittest.TestCase):
+    def test_render_matches_regex(self):
+        """같은 템플릿을 다른 교체 값으로 채운 결과가 정규식 치환과 같음"""
+        template = compile_template(SOURCE.encode('utf-8'), SOURCE, 'utf-8', make_plan(['A'] * 4))
+        self.assertIsNotNone(template)
+        for values in (['NEW_IF_777', 'EV_NEW', '/NEW/', 'Recv'], ['신규_IF', 'EV', '/', '']):
+            plan = make_plan(values)
+            self.assertTrue(template.usable(plan))
+            expected, counts = plan.apply_sequential(SOURCE)
+            self.assertEqual(template.render(plan), expected.encode('utf-8'))
+            self.assertEqual(template.counts, counts)
+
+    def test_conflicting_value_not_usable(self):
+        """교체 값이 뒤 규칙에 걸리거나 역참조를 쓰면 템플릿을 쓰지 않음"""
+        template = compile_template(SOURCE.encode('utf-8'), SOURCE, 'utf-8', make_plan(['A'] * 4))
+        self.assertFalse(template.usable(make_plan(['IF_Send', 'EV', '/N/', 'Recv'])))
+        self.assertFalse(template.usable(make_plan([r'\g<0>_2', 'EV', '/N/', 'Recv'])))
+        # 뒤 규칙의 매칭이 앞 규칙의 교체 자리에 걸치면 템플릿을 만들지 않음
+        plan = ReplacementPlan([{'설명': '1', '찾기': {'정규식': 'OLD'}, '교체': {'값': 'X'}},
+                                {'설명': '2', '찾기': {'정규식': '/.+?/'}, '교체': {'값': '/'}}])
+        self.assertIsNone(compile_template(SOURCE.encode('utf-8'), SOURCE, 'utf-8', plan))
+
+    def test_transform_content_uses_template_from_second_job(self):
+        """같은 원본이 두 번째로 나올 때 템플릿을 만들고, 원본이 바뀌면 쓰지 않음"""
+        source = SOURCE.encode('utf-8')
+        jobs = [[{'설명': '1', '찾기': {'정규식': 'OLD_IF_001'}, '교체': {'값': f'NEW_IF_{n}'}},
+                 {'설명': '2', '찾기': {'정규식': 'Send'}, '교체': {'값': 'Recv'}}] for n in range(4)]
+        with mock.patch.object(string_replacer, '_process_templates', TemplateCache()), \
+                mock.patch.object(string_replacer, 'DEBUG_MODE', False), \
+                mock.patch('string_replacer.compile_template', wraps=compile_template) as compile_mock, \
+                mock.patch.object(process_template.ProcessTemplate, 'render',
+                                  autospec=True, side_effect=process_template.ProcessTemplate.render) as render:
+            for n, replacements in enumerate(jobs):
+                counts = []
+                output, changed = string_replacer.transform_content(source, replacements, counts,
+                                                                     source_path='a.process')
+                self.assertTrue(changed)
+                self.assertEqual(output, SOURCE.replace('OLD_IF_001', f'NEW_IF_{n}')
+                                 .replace('Send', 'Recv').encode('utf-8'))
+                self.assertEqual(counts, [2, 2])
+            self.assertEqual(compile_mock.call_count, 1)
+            self.assertEqual(render.call_count, 3)
+
+            changed_source = source.replace(b'OLD_IF_001', b'OLD_IF_002')
+            output, _ = string_replacer.transform_content(changed_source, jobs[0], source_path='a.process')
+            self.assertEqual(output, changed_source.replace(b'Send', b'Recv'))
+            self.assertEqual(render.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,455 @@
+"""
+string_replacer 실행(복사 및 치환) 단위 테스트
+"""
+
+import unittest
+import os
+import re
+import shutil
+import tempfile
+import io
+import yaml
+import pandas as pd
+from contextlib import redirect_stdout
+from unittest import mock
+import excel_cache
+import yaml_cache
+import string_replacer
+from string_replacer_io import mmap_chunks
+from string_replacer_engine import EditMap, compile_plan
+
+
+def make_rule(pattern, value, description='테스트 규칙'):
+    """YAML 치환목록 형식의 규칙 생성"""
+    return {'설명': description, '찾기': {'정규식': pattern}, '교체': {'값': value}}
+
+
+def isolate_caches(test):
+    """YAML/엑셀 파싱 캐시를 테스트별 임시 디렉토리로 바꿈 (저장소의 캐시 디렉토리에 쓰지 않음)"""
+    cache_dir = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+    for patcher in (
+        mock.patch.object(yaml_cache, '_default_cache', yaml_cache.YamlCache(os.path.join(cache_dir, 'yaml'))),
+        mock.patch.object(excel_cache, '_default_cache', excel_cache.ExcelCache(os.path.join(cache_dir, 'excel')))
+    ):
+        patcher.start()
+        test.addCleanup(patcher.stop)
+
+
+class TestExecuteReplacements(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        isolate_caches(self)
+        self.work_dir = tempfile.mkdtemp()
+        self._debug_mode = string_replacer.DEBUG_MODE
+        string_replacer.DEBUG_MODE = False
+
+        data = {}
+        for i in range(1, 5):
+            source = self._write(f'src/p{i}.process', f'<pd:name>LHMES_MGR {i}</pd:name>')
+            data[f'{i}번째 행'] = {
+                '송신파일경로': {
+                    '원본파일': source,
+                    '복사파일': os.path.join(self.work_dir, 'out', f'p{i}.process'),
+                    '치환목록': [make_rule('LHMES_MGR', 'LYMES_MGR')]
+                }
+            }
+        # 1번째 행과 같은 대상 파일을 쓰는 작업
+        data['5번째 행'] = {
+            '수신파일경로': {
+                '원본파일': data['2번째 행']['송신파일경로']['원본파일'],
+                '복사파일': data['1번째 행']['송신파일경로']['복사파일'],
+                '치환목록': []
+            }
+        }
+        self.yaml_path = os.path.join(self.work_dir, 'jobs.yaml')
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+    def tearDown(self):
+        """테스트 정리"""
+        string_replacer.DEBUG_MODE = self._debug_mode
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, relative_path, content):
+        """작업 디렉토리에 파일 생성"""
+        path = os.path.join(self.work_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def _run(self, workers, plan_path=None):
+        """작업 실행 후 (타임스탬프를 제외한 로그, 요약) 반환"""
+        shutil.rmtree(os.path.join(self.work_dir, 'out'), ignore_errors=True)
+        log_path = os.path.join(self.work_dir, f'log{workers}.txt')
+        summary_path = os.path.join(self.work_dir, f'summary{workers}.txt')
+        string_replacer.execute_replacements(self.yaml_path, log_path, summary_path, workers,
+                                             os.path.join(self.work_dir, 'journal'), plan_path=plan_path)
+        with open(log_path, encoding='utf-8') as f:
+            log = re.sub(r'^\[[^\]]*\] ', '', f.read(), flags=re.M)
+        with open(summary_path, encoding='utf-8') as f:
+            return log, f.read()
+
+    def test_parallel_matches_sequential(self):
+        """병렬 실행 결과가 순차 실행과 같은 순서로 기록됨"""
+        sequential = self._run(1)
+        parallel = self._run(3)
+        self.assertEqual(sequential, parallel)
+
+        with open(os.path.join(self.work_dir, 'out', 'p3.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<pd:name>LYMES_MGR 3</pd:name>')
+        self.assertIn('총 복사 파일 수: 4', parallel[1])
+
+    def test_same_source_and_rules_transformed_once(self):
+        """원본과 치환목록이 같은 작업은 한 번만 치환하고 결과를 각 대상에 씀"""
+        with open(self.yaml_path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        source = data['1번째 행']['송신파일경로']['원본파일']
+        for i in (6, 7):
+            data[f'{i}번째 행'] = {'송신파일경로': {
+                '원본파일': source,
+                '복사파일': os.path.join(self.work_dir, 'out', f'q{i}.process'),
+                '치환목록': [make_rule('LHMES_MGR', 'LYMES_MGR')]
+            }}
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+        with mock.patch.object(string_replacer, '_output_memo',
+                               string_replacer.BoundedCache(string_replacer.OUTPUT_MEMO_BYTES)), \
+                mock.patch.object(string_replacer, 'transform_content',
+                                  wraps=string_replacer.transform_content) as transform:
+            sequential = self._run(1)
+        self.assertEqual(transform.call_count, 4)
+        self.assertEqual(sequential, self._run(2))
+        # 결과를 재사용한 작업도 규칙별 치환 수가 로그에 기록됨
+        self.assertEqual(sequential[0].count('테스트 규칙: 1건'), 6)
+        for name in ('p1', 'q6', 'q7'):
+            with open(os.path.join(self.work_dir, 'out', f'{name}.process'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), '<pd:name>LYMES_MGR 1</pd:name>')
+
+    def test_rollback_removes_created_files(self):
+        """실행 ID로 되돌리면 이번 실행이 만든 파일만 삭제됨"""
+        journal_dir = os.path.join(self.work_dir, 'journal')
+        run_id = string_replacer.execute_replacements(
+            self.yaml_path, os.path.join(self.work_dir, 'log.txt'),
+            os.path.join(self.work_dir, 'summary.txt'), 1, journal_dir)
+        self.assertEqual(len(os.listdir(os.path.join(self.work_dir, 'out'))), 4)
+
+        result = string_replacer.rollback_run(run_id, journal_dir)
+        self.assertEqual(len(result['deleted']), 4)
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir, 'out')))
+        self.assertTrue(os.path.exists(os.path.join(self.work_dir, 'src', 'p1.process')))
+
+    def test_incremental_skips_unchanged_jobs(self):
+        """증분 실행은 원본이나 대상 파일이 바뀐 작업만 다시 처리"""
+        journal_dir = os.path.join(self.work_dir, 'journal')
+
+        def run():
+            summary_path = os.path.join(self.work_dir, 'summary.txt')
+            run_id = string_replacer.execute_replacements(
+                self.yaml_path, os.path.join(self.work_dir, 'log.txt'), summary_path, 1,
+                journal_dir, incremental=True)
+            with open(summary_path, encoding='utf-8') as f:
+                return run_id, f.read()
+
+        _, summary = run()
+        self.assertIn('총 복사 파일 수: 4', summary)
+        _, summary = run()
+        self.assertIn('총 복사 파일 수: 0', summary)
+        self.assertIn('변경 없이 건너뛴 파일 수: 4', summary)
+
+        # 같은 크기로 고쳐 쓰고 수정시각을 되돌린 원본도 다시 처리
+        source = os.path.join(self.work_dir, 'src', 'p1.process')
+        st = os.stat(source)
+        self._write('src/p1.process', '<pd:name>LHMES_MGR 9</pd:name>')
+        os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns))
+        _, summary = run()
+        self.assertIn('총 복사 파일 수: 1', summary)
+        with open(os.path.join(self.work_dir, 'out', 'p1.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<pd:name>LYMES_MGR 9</pd:name>')
+
+        self._write('src/p2.process', '<pd:name>LHMES_MGR changed</pd:name>')
+        self._write('out/p3.process', 'edited')
+        run_id, summary = run()
+        self.assertIn('총 복사 파일 수: 2', summary)
+        self.assertIn('변경 없이 건너뛴 파일 수: 2', summary)
+        with open(os.path.join(self.work_dir, 'out', 'p2.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<pd:name>LYMES_MGR changed</pd:name>')
+        with open(os.path.join(self.work_dir, 'out', 'p3.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<pd:name>LYMES_MGR 3</pd:name>')
+
+        # 덮어쓴 대상 파일은 되돌리기로 복원됨
+        self.assertEqual(len(string_replacer.rollback_run(run_id, journal_dir)['restored']), 2)
+        with open(os.path.join(self.work_dir, 'out', 'p3.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'edited')
+
+    def test_execute_reuses_preview_plan(self):
+        """미리보기 계획 파일이 있으면 원본이 그대로인 작업은 다시 치환하지 않음"""
+        plan_path = os.path.join(self.work_dir, 'plan.zip')
+        with redirect_stdout(io.StringIO()):
+            string_replacer.preview_diff(self.yaml_path, plan_path=plan_path)
+        self._write('src/p2.process', '<pd:name>LHMES_MGR changed</pd:name>')
+
+        with mock.patch.object(string_replacer, 'transform_content',
+                               wraps=string_replacer.transform_content) as transform:
+            _, summary = self._run(1, plan_path=plan_path)
+        # 원본이 바뀐 p2만 다시 치환
+        self.assertEqual(transform.call_count, 1)
+        self.assertIn('(치환: 1개 규칙, 1건 치환)', summary)
+        for name, text in (('p1', '1'), ('p2', 'changed'), ('p4', '4')):
+            with open(os.path.join(self.work_dir, 'out', f'{name}.process'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), f'<pd:name>LYMES_MGR {text}</pd:name>')
+
+    def test_replaced_plan_not_read_from_stale_handle(self):
+        """같은 프로세스에서 계획 파일을 다시 만들면 실행은 새 계획의 결과를 사용"""
+        plan_path = os.path.join(self.work_dir, 'plan.zip')
+        for text in ('first', 'second'):
+            self._write('src/p1.process', f'<pd:name>LHMES_MGR {text}</pd:name>')
+            with redirect_stdout(io.StringIO()):
+                string_replacer.preview_diff(self.yaml_path, plan_path=plan_path)
+            self._run(1, plan_path=plan_path)
+            with open(os.path.join(self.work_dir, 'out', 'p1.process'), encoding='utf-8') as f:
+                self.assertEqual(f.read(), f'<pd:name>LYMES_MGR {text}</pd:name>')
+
+        # load_plan 이후 계획 파일이 바뀌면 결과를 읽지 않음
+        entries = string_replacer.load_plan(plan_path)
+        entry = next(entry for entry in entries.values() if entry['member'])
+        with redirect_stdout(io.StringIO()):
+            string_replacer.preview_diff(self.yaml_path, plan_path=plan_path)
+        os.utime(plan_path, ns=(0, 0))
+        with self.assertRaises(ValueError):
+            string_replacer.read_output(entry)
+
+    def test_small_batches_match_single_batch(self):
+        """YAML을 작은 묶음으로 나눠 실행해도 결과와 중복 처리가 같음"""
+        expected = self._run(2)
+        with mock.patch.object(string_replacer, 'JOB_BATCH_SIZE', 2):
+            self.assertEqual(self._run(2), expected)
+            self.assertEqual(self._run(1), expected)
+
+    def test_rule_set_references_expanded(self):
+        """rule_sets 참조는 그 자리에 규칙집합의 규칙을 넣은 것과 같이 실행됨"""
+        expected = self._run(1)
+        with open(self.yaml_path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        shared = {'MGR': [make_rule('LHMES_MGR', 'LYMES_MGR')]}
+        for row_data in data.values():
+            for file_info in row_data.values():
+                if file_info['치환목록']:
+                    file_info['치환목록'] = [{'규칙집합': 'MGR'}]
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(dict(rule_sets=shared, **data), f, allow_unicode=True, sort_keys=False)
+        self.assertEqual(self._run(1), expected)
+
+        jobs = string_replacer.collect_jobs(dict(rule_sets=shared, **data))
+        self.assertEqual(len(jobs), 5)
+        self.assertIs(jobs[0]['replacements'][0], jobs[1]['replacements'][0])
+
+    def test_rule_sets_after_rows(self):
+        """전체를 읽는 미리보기는 rule_sets 위치와 관계없이 펼치고, 스트리밍 실행은 참조하는 행에서 중단"""
+        with open(self.yaml_path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        for row_data in data.values():
+            for file_info in row_data.values():
+                file_info['치환목록'] = [{'규칙집합': 'MGR'}]
+        data['rule_sets'] = {'MGR': [make_rule('LHMES_MGR', 'LYMES_MGR')]}
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+        self.assertEqual(len(string_replacer.collect_jobs(data)), 5)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(string_replacer.preview_diff(self.yaml_path), 5)
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            self.assertIsNone(string_replacer.execute_replacements(
+                self.yaml_path, os.path.join(self.work_dir, 'log.txt'),
+                os.path.join(self.work_dir, 'summary.txt'), 1, os.path.join(self.work_dir, 'journal')))
+        self.assertIn('rule_sets는 작업 행보다 먼저 정의해야 합니다', stdout.getvalue())
+        self.assertFalse(os.path.exists(os.path.join(self.work_dir, 'out')))
+        with self.assertRaises(ValueError):
+            list(string_replacer.iter_jobs(data.items()))
+        # 참조하지 않는 행 뒤에 있는 rule_sets는 이후 행에서 사용할 수 있음
+        rows = [('0번째 행', {'송신파일경로': {'원본파일': 'a', '복사파일': 'b', '치환목록': []}})]
+        rows += [('rule_sets', data['rule_sets'])] + [(key, data[key]) for key in data if key != 'rule_sets']
+        self.assertEqual(len(list(string_replacer.iter_jobs(rows))), 6)
+
+    def test_duplicate_destination_written_once(self):
+        """같은 대상 파일을 쓰는 두 번째 작업은 실행하지 않음"""
+        _, summary = self._run(2)
+        self.assertIn('[오류: 대상 파일 중복]', summary)
+        with open(os.path.join(self.work_dir, 'out', 'p1.process'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), '<pd:name>LYMES_MGR 1</pd:name>')
+
+
+class TestPreviewDiff(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        isolate_caches(self)
+
+    def test_span_diff_matches_difflib(self):
+        """치환 위치로 만든 hunk가 전체 파일 difflib 결과와 같음"""
+        original = ''.join(f'<a name="n{i}">{"LHMES_MGR" if i % 7 == 0 else "plain"} {i}</a>\n'
+                           for i in range(60))
+        plan = compile_plan([make_rule('LHMES_MGR', 'LYMES_MGR'),
+                             make_rule(r'(<a name="n1)(\d)">', r'\1\2\n">')])
+        edit_map = EditMap()
+        modified, _ = plan.apply(original, edit_map)
+        for context in (0, 1, 3):
+            self.assertEqual(string_replacer.compute_diff(original, modified, 'a', 'b', edit_map, context),
+                             string_replacer.compute_diff(original, modified, 'a', 'b', None, context))
+
+    def test_span_diff_aligns_hunks_to_edits(self):
+        """치환 위치로 만든 hunk는 difflib과 정렬이 달라도 치환된 줄 단위로 나옴"""
+        cases = [
+            # difflib은 '-ab' 뒤 '+b'를 다음 줄과 맞춰 두 hunk로 나눔
+            ([make_rule('a', '')], 'ab\nb\n', {
+                0: ['@@ -1 +1 @@\n', '-ab\n', '+b\n'],
+                1: ['@@ -1,2 +1,2 @@\n', '-ab\n', '+b\n', ' b\n']}),
+            # 한 줄을 사이에 둔 두 치환: 추가된 빈 줄을 앞 치환에 붙임
+            ([make_rule('c', 'b\n'), make_rule('x\n', 'q')], 'b\nb\nc\n\nx\n', {
+                0: ['@@ -3 +3,2 @@\n', '-c\n', '+b\n', '+\n', '@@ -5 +6 @@\n', '-x\n', '+q\n'],
+                1: ['@@ -2,4 +2,5 @@\n', ' b\n', '-c\n', '+b\n', '+\n', ' \n', '-x\n', '+q\n']}),
+        ]
+        for rules, original, expected in cases:
+            edit_map = EditMap()
+            modified, _ = compile_plan(rules).apply(original, edit_map)
+            for context, hunks in expected.items():
+                self.assertEqual(string_replacer.compute_diff(original, modified, 'a', 'b', edit_map, context),
+                                 ['--- a\n', '+++ b\n'] + hunks)
+
+    def test_parallel_preview_in_job_order(self):
+        """병렬 미리보기 출력이 순차 미리보기와 같은 순서로 나옴"""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        data = {}
+        for i in range(1, 6):
+            source = os.path.join(work_dir, f'p{i}.process')
+            with open(source, 'w', encoding='utf-8') as f:
+                f.write(f'<pd:name>LHMES_MGR {i}</pd:name>\n<b/>\n')
+            data[f'{i}번째 행'] = {'송신파일경로': {
+                '원본파일': source, '복사파일': os.path.join(work_dir, 'out', f'p{i}.process'),
+                '치환목록': [make_rule('LHMES_MGR', 'LYMES_MGR')]}}
+        yaml_path = os.path.join(work_dir, 'jobs.yaml')
+        with open(yaml_path, 'w', encoding='utf-8') as f:
+            yaml.dump(data, f, allow_unicode=True, sort_keys=False)
+
+        outputs = []
+        for workers in (1, 3):
+            buffer = io.StringIO()
+            with redirect_stdout(buffer), mock.patch.object(string_replacer, 'DEBUG_MODE', False):
+                self.assertEqual(string_replacer.preview_diff(yaml_path, workers), 5)
+            outputs.append(buffer.getvalue())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertLess(outputs[0].index('LYMES_MGR 1'), outputs[0].index('LYMES_MGR 5'))
+        self.assertFalse(os.path.exists(os.path.join(work_dir, 'out')))
+
+
+class TestGenerateYaml(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        isolate_caches(self)
+        self.work_dir = tempfile.mkdtemp()
+        self.excel_path = os.path.join(self.work_dir, 'pairs.xlsx')
+        self.yaml_path = os.path.join(self.work_dir, 'jobs.yaml')
+        rows = []
+        for i in range(3):
+            normal = {'송신파일생성여부': 1.0, '송신파일경로': f'C:\\BwProject\\BB\\Processes\\N\\n{i}.process',
+                      '송신스키마파일명': f'C:\\BwProject\\BB\\SharedResources\\S{i}.xsd',
+                      'Group ID': 'G1', 'Event_ID': f'E{i}', '송신\n업무명': 'SND', '수신\n업무명': 'RCV'}
+            match = dict(normal, 송신파일생성여부=None, 송신파일경로=f'm{i}.process', **{'Group ID': 'G2'})
+            rows += [normal, match]
+        pd.DataFrame(rows).to_excel(self.excel_path, index=False)
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _generate(self, workers=1):
+        with redirect_stdout(io.StringIO()) as output:
+            count = string_replacer.generate_yaml_from_excel(self.excel_path, self.yaml_path, workers)
+        self.output = output.getvalue()
+        return count
+
+    def test_blocks_written_in_row_order(self):
+        """행 쌍마다 블록을 이어 써서 한 번에 dump한 결과와 같은 YAML 생성"""
+        self.assertEqual(self._generate(), 3)
+        with open(self.yaml_path, encoding='utf-8') as f:
+            data = yaml.safe_load(f)
+        self.assertEqual(list(data), ['rule_sets', '1번째 행', '2번째 행', '3번째 행'])
+        entry = data['2번째 행']['송신파일경로']
+        # 고정 규칙은 rule_sets 참조로만 기록됨
+        self.assertIn({'규칙집합': string_replacer.FIXED_RULE_SET_ID}, entry['치환목록'])
+        self.assertEqual(data['rule_sets'][string_replacer.FIXED_RULE_SET_ID],
+                         string_replacer.FIXED_REPLACEMENTS)
+        self.assertEqual((entry['원본파일'], entry['복사파일']),
+                         ('m1.process', 'C:\\TBwProject\\BB\\Processes\\N\\n1.process'))
+        self.assertIn({'설명': 'IFID 치환', '찾기': {'정규식': 'G2\\.E1'}, '교체': {'값': 'G1.E1'}},
+                      entry['치환목록'])
+
+    def test_parallel_generation_matches_sequential(self):
+        """프로세스 풀로 만든 YAML과 화면 출력이 순차 생성과 같은 행 순서"""
+        self._generate()
+        with open(self.yaml_path, encoding='utf-8') as f:
+            expected = f.read()
+        expected_output = self.output
+        self.assertEqual(self._generate(workers=2), 3)
+        with open(self.yaml_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), expected)
+        self.assertEqual(self.output.replace("병렬 생성: 2개 프로세스\n", ''), expected_output)
+
+    def test_interrupted_generation_leaves_valid_yaml(self):
+        """생성 도중 실패해도 그때까지 쓴 블록은 올바른 YAML로 남음"""
+        build = string_replacer.build_row_block
+
+        def fail_on_third(row_number, *args):
+            if row_number == 3:
+                raise RuntimeError('중단')
+            return build(row_number, *args)
+
+        with mock.patch.object(string_replacer, 'build_row_block', fail_on_third):
+            with self.assertRaises(RuntimeError):
+                self._generate()
+        with open(self.yaml_path, encoding='utf-8') as f:
+            self.assertEqual(list(yaml.safe_load(f)), ['rule_sets', '1번째 행', '2번째 행'])
+
+
+class TestStreamReplaceFile(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.work_dir, 'big.process')
+        self.dest = os.path.join(self.work_dir, 'out', 'big.process')
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write_source(self, text):
+        with open(self.source, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+    def test_streamed_output_matches_transform(self):
+        """mmap 스트리밍 결과가 메모리 치환 결과와 같음"""
+        self._write_source('<?xml version="1.0" encoding="UTF-8"?>\n' + '<a>업무 LHMES_MGR</a>\n' * 100)
+        replacements = [make_rule('LHMES_MGR', 'LYMES_MGR')]
+        counts = []
+        with mock.patch('string_replacer.mmap_chunks', lambda mapped: mmap_chunks(mapped, 7)):
+            self.assertTrue(string_replacer.stream_replace_file(self.source, self.dest, replacements, counts))
+
+        with open(self.source, 'rb') as f:
+            expected, _ = string_replacer.transform_content(f.read(), replacements)
+        with open(self.dest, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+        self.assertEqual(counts, [100])
+
+    def test_unbounded_rule_uses_memory_mode(self):
+        """무제한 매칭 규칙은 스트리밍하지 않음"""
+        self._write_source('namespace="OLD"')
+        result = string_replacer.stream_replace_file(self.source, self.dest,
+                                                     [make_rule('namespace="[^"]*"', 'x')])
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(self.dest))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,369 @@
+"""
+문자열 치환 엔진 단위 테스트
+"""
+
+import unittest
+import random
+from unittest import mock
+import string_replacer_engine
+from string_replacer_engine import (
+    EditMap, ReplacementPlan, compile_plan, expand_rule_sets, rules_fingerprint, set_time_budget, time_budget
+)
+
+
+def make_rule(pattern, value, description='테스트 규칙', element=None, attribute=None):
+    """YAML 치환목록 형식의 규칙 생성 (element/attribute를 주면 XML 범위 규칙)"""
+    find = {'정규식': pattern}
+    if element:
+        find['요소'] = element
+    if attribute:
+        find['속성'] = attribute
+    return {'설명': description, '찾기': find, '교체': {'값': value}}
+
+
+class TestReplacementPlan(unittest.TestCase):
+    def test_apply_counts_matches(self):
+        """규칙별 치환 수가 함께 반환됨"""
+        plan = ReplacementPlan([
+            make_rule('LHMES_MGR', 'LYMES_MGR'),
+            make_rule("'LH'", "'LY'"),
+            make_rule('VOMES_MGR', 'LZMES_MGR')
+        ])
+        content, counts = plan.apply("LHMES_MGR 'LH' LHMES_MGR")
+        self.assertEqual(content, "LYMES_MGR 'LY' LYMES_MGR")
+        self.assertEqual(counts, [2, 1, 0])
+
+    def test_rules_applied_in_order(self):
+        """앞 규칙의 결과에 뒤 규칙이 적용됨 (순차 적용 의미 유지)"""
+        plan = ReplacementPlan([
+            make_rule(r'G1\.E1', 'G2.E1'),
+            make_rule('E1', 'E2')
+        ])
+        content, counts = plan.apply('G1.E1')
+        self.assertEqual(content, 'G2.E2')
+        self.assertEqual(counts, [1, 1])
+
+    def test_group_reference_in_replacement(self):
+        """교체 값의 그룹 참조 지원"""
+        plan = ReplacementPlan([
+            make_rule(r'([">\s])([Cc]heck\s+)RTS_GM2(["<\s])', r'\1\2RTS_GM 2\3')
+        ])
+        content, counts = plan.apply('<pd:to>Check RTS_GM2</pd:to>')
+        self.assertEqual(content, '<pd:to>Check RTS_GM 2</pd:to>')
+        self.assertEqual(counts, [1])
+
+    def test_invalid_pattern_is_skipped(self):
+        """컴파일할 수 없는 규칙은 건너뛰고 오류를 기록"""
+        plan = ReplacementPlan([
+            make_rule('(\\d', 'x'),
+            make_rule('abc', 'def')
+        ])
+        content, counts = plan.apply('abc')
+        self.assertEqual(content, 'def')
+        self.assertEqual(counts, [0, 1])
+        self.assertIsNotNone(plan.rules[0].error)
+
+    def test_apply_errors_reset_per_apply(self):
+        """적용 중 오류는 계획의 errors로 해당 apply에만 보고되고 공유 규칙에는 남지 않음"""
+        plan = compile_plan([make_rule('(LH)', r'\2'), make_rule('abc', 'def')])
+        self.assertEqual(plan.apply('LH abc'), ('LH def', [0, 1]))
+        self.assertEqual(list(plan.errors), [1])
+        self.assertIsNone(plan.rules[0].error)
+
+        self.assertEqual(plan.apply_bytes(b'abc'), (b'def', [0, 1]))
+        self.assertEqual(plan.errors, {})
+        plan.apply_bytes(b'LH')
+        self.assertEqual(list(plan.errors), [1])
+
+        # 다른 계획의 apply는 이 계획의 오류 기록을 바꾸지 않음
+        other = compile_plan([make_rule('(EV)', r'\3')])
+        other.apply('EV')
+        self.assertEqual(list(plan.errors), [1])
+        plan.apply('abc')
+        self.assertEqual(plan.errors, {})
+        self.assertEqual(list(other.errors), [1])
+
+    def test_compile_plan_is_cached(self):
+        """같은 치환목록은 같은 계획 객체를 재사용"""
+        rules = [make_rule('LH', 'LY')]
+        self.assertIs(compile_plan(rules), compile_plan([dict(r) for r in rules]))
+        self.assertNotEqual(rules_fingerprint(rules), rules_fingerprint([make_rule('LH', 'LZ')]))
+
+    def test_rule_set_reference_expanded_in_place(self):
+        """규칙집합 참조는 그 위치에 규칙집합의 규칙으로 펼쳐짐"""
+        rule_sets = {'MGR': [make_rule('LHMES_MGR', 'LYMES_MGR'), make_rule('VOMES_MGR', 'LZMES_MGR')]}
+        first, last = make_rule('a', 'b'), make_rule('c', 'd')
+        expanded = expand_rule_sets([first, {'규칙집합': 'MGR'}, last], rule_sets)
+        self.assertEqual(expanded, [first] + rule_sets['MGR'] + [last])
+        with self.assertRaises(ValueError):
+            expand_rule_sets([{'규칙집합': 'NONE'}], rule_sets)
+
+    def test_shared_rules_compiled_once(self):
+        """여러 계획이 공유하는 규칙은 한 번만 컴파일됨"""
+        shared = make_rule('SHARED_ONCE', 'x')
+        with mock.patch.object(string_replacer_engine, 'CompiledRule',
+                               wraps=string_replacer_engine.CompiledRule) as compiled:
+            first = ReplacementPlan([shared, make_rule('a1', 'b')])
+            second = ReplacementPlan([make_rule('a2', 'b'), shared])
+        self.assertEqual(compiled.call_count, 3)
+        self.assertEqual((first.rules[0].index, second.rules[1].index), (1, 2))
+        self.assertEqual(second.apply('SHARED_ONCE a2')[1], [1, 1])
+
+
+class TestSinglePassStages(unittest.TestCase):
+    def test_independent_rules_share_stage(self):
+        """서로 영향이 없는 규칙들은 한 단계로 묶임"""
+        plan = ReplacementPlan([
+            make_rule('<pd:name>Processes/[^<]*</pd:name>', '<pd:name>Processes/b.process</pd:name>'),
+            make_rule('LHMES_MGR', 'LYMES_MGR'),
+            make_rule("'LH'", "'LY'"),
+            make_rule('VOMES_MGR', 'LZMES_MGR')
+        ])
+        self.assertEqual(len(plan.stages), 1)
+        content, counts = plan.apply("<pd:name>Processes/a.process</pd:name> LHMES_MGR 'LH'")
+        self.assertEqual(content, "<pd:name>Processes/b.process</pd:name> LYMES_MGR 'LY'")
+        self.assertEqual(counts, [1, 1, 1, 0])
+
+    def test_dependent_rules_split_stages(self):
+        """앞 규칙의 결과에 걸리거나 겹치는 규칙은 다음 단계로 분리됨"""
+        plan = ReplacementPlan([
+            make_rule(r'G1\.E1', 'G2.E1'),
+            make_rule('E1', 'E2'),
+            make_rule('RTS_GM2', 'RTS_GM 2'),
+            make_rule('RTS_GM', 'RTS_GM2')
+        ])
+        self.assertEqual(len(plan.stages), 3)
+        text = 'G1.E1 RTS_GM2 RTS_GM'
+        self.assertEqual(plan.apply(text), plan.apply_sequential(text))
+
+    def test_automaton_matches_regex_path(self):
+        """Aho-Corasick 경로와 결합 정규식 경로의 결과가 같음"""
+        rules = [make_rule('abc', 'X'), make_rule('bcd', 'Y'), make_rule('cd', 'Z'), make_rule('abc', 'W')]
+        text = 'abcd bcd cd abc'
+        expected = ReplacementPlan(rules).apply_sequential(text)
+        original = string_replacer_engine.HAS_AHOCORASICK
+        try:
+            for has_automaton in (original, False):
+                string_replacer_engine.HAS_AHOCORASICK = has_automaton
+                self.assertEqual(ReplacementPlan(rules).apply(text), expected)
+        finally:
+            string_replacer_engine.HAS_AHOCORASICK = original
+
+    def test_random_rule_sets_match_sequential(self):
+        """임의의 규칙 조합에서 단계 적용 결과가 순차 적용과 같음"""
+        rng = random.Random(0)
+        patterns = ['a', 'ab', 'abc', 'ca', 'a+', '[ab]c', 'b.', '"a"', '[^<]+', 'a|bc',
+                    '(a)(b)', r'\bab', 'a$', '(?i)a', 'ab?c']
+        values = ['x', '', 'ab', 'ba', 'c', r'\1', '<']
+        for _ in range(2000):
+            plan = ReplacementPlan([make_rule(rng.choice(patterns), rng.choice(values))
+                                    for _ in range(rng.randint(1, 5))])
+            text = ''.join(rng.choice('abc.<>" ') for _ in range(rng.randint(0, 16)))
+            self.assertEqual(plan.apply(text), plan.apply_sequential(text))
+
+class TestXmlScopedRules(unittest.TestCase):
+    PROCESS = (
+        '<pd:ProcessDefinition xmlns:pd="http://xmlns.tibco.com/bw/process/2003">\n'
+        '<pd:name>Processes/LH/a.process</pd:name>\n'
+        '<!-- \'LH\' 주석 -->\n'
+        '<pd:activity name="Check LH">\n'
+        '<config><statement><![CDATA[select \'LH\' from t]]></statement>\n'
+        '<xpath select="concat(&quot;G1&quot;, \'LH\')"/></config>\n'
+        '<xsd:import namespace="http://www.tibco.com/schemas/LH/A.xsd"/>\n'
+        '</pd:activity>\n'
+        '</pd:ProcessDefinition>\n')
+
+    def test_rules_apply_only_inside_scope(self):
+        """범위 규칙은 지정한 요소 텍스트/속성 값만 바꾸고 나머지는 그대로 둠"""
+        plan = ReplacementPlan([
+            make_rule("'LH'", "'LY'", element='config/statement'),
+            make_rule('&quot;G1&quot;', '&quot;G2&quot;', element='xpath', attribute='select'),
+            make_rule('/LH/', '/LY/', element='xsd:import', attribute='namespace'),
+            make_rule('Processes/LH/', 'Processes/LY/', element='/pd:ProcessDefinition/pd:name')
+        ])
+        # 연속된 범위 규칙은 구조를 한 번만 훑는 단계 하나로 묶임
+        self.assertEqual([stage.kind for stage in plan.stages], ['xml-scoped'])
+        content, counts = plan.apply(self.PROCESS)
+        expected = (self.PROCESS
+                    .replace("select 'LH' from", "select 'LY' from")
+                    .replace('&quot;G1&quot;', '&quot;G2&quot;')
+                    .replace('schemas/LH/', 'schemas/LY/')
+                    .replace('Processes/LH/', 'Processes/LY/'))
+        self.assertEqual(content, expected)
+        self.assertEqual(counts, [1, 1, 1, 1])
+        self.assertEqual((content, counts), plan.apply_sequential(self.PROCESS))
+
+    def test_scoped_rules_match_sequential(self):
+        """구조를 바꿀 수 있는 교체 값을 포함해도 단계 적용 결과와 변경 위치가 순차 적용과 같음"""
+        rng = random.Random(1)
+        scopes = [('a', None), ('b', None), ('a/b', None), ('/a', None), ('*', 'n'), ('b', 'n'), (None, 'm')]
+        values = ['x', '', "'q'", '"', '<c>', r'\g<0>\g<0>']
+        texts = ['ab', 'x', ' ', 'a"b']
+        for _ in range(500):
+            rules = [make_rule(rng.choice(['a', 'b+', '^x', 'a$']), rng.choice(values), 'r',
+                               *rng.choice(scopes)) for _ in range(rng.randint(1, 4))]
+            document = ''.join(rng.choice([
+                '<a n="{}">'.format(rng.choice(texts).replace('"', '')), '</a>',
+                '<b m=\'{}\'/>'.format(rng.choice(texts)), '<b>', '</b>',
+                '<![CDATA[a<b]]>', rng.choice(texts)]) for _ in range(8))
+            plan = ReplacementPlan(rules)
+            edit_map = string_replacer_engine.EditMap()
+            self.assertEqual(plan.apply(document, edit_map), plan.apply_sequential(document))
+            # 변경 구간 밖의 내용은 원본과 같음
+            content = plan.apply(document)[0]
+            orig_cursor = new_cursor = 0
+            for orig_start, orig_end, new_start, new_end in edit_map.ranges():
+                self.assertEqual(content[new_cursor:new_start], document[orig_cursor:orig_start])
+                orig_cursor, new_cursor = orig_end, new_end
+            self.assertEqual(content[new_cursor:], document[orig_cursor:])
+
+    def test_scope_changes_fingerprint_and_disables_bytes_mode(self):
+        """범위가 다르면 다른 규칙이고, 범위 규칙이 있는 계획은 텍스트 모드로 실행"""
+        unscoped = [make_rule('LH', 'LY')]
+        scoped = [make_rule('LH', 'LY', element='pd:name')]
+        self.assertNotEqual(rules_fingerprint(unscoped), rules_fingerprint(scoped))
+        self.assertNotEqual(rules_fingerprint(scoped),
+                            rules_fingerprint([make_rule('LH', 'LY', element='pd:name', attribute='n')]))
+        plan = compile_plan(scoped)
+        self.assertFalse(plan.can_apply_bytes(b'<pd:name>LH</pd:name>'))
+        self.assertFalse(plan.streamable)
+        self.assertEqual(plan.apply('LH <pd:name>LH</pd:name>'), ('LH <pd:name>LY</pd:name>', [1]))
+
+
+class TestLiteralPrefilter(unittest.TestCase):
+    def test_required_literal_extracted(self):
+        """정규식에서 가장 긴 필수 리터럴을 추출"""
+        plan = ReplacementPlan([
+            make_rule(r'namespace\s*=\s*"[^"]*OLD_BASE[^"]*"', 'x'),
+            make_rule(r'(<pd:activity\s+name="Check )', 'x'),
+            make_rule(r'(?:ab|cd)+', 'x'),
+            make_rule(r'(?i)LHMES', 'x')
+        ])
+        self.assertEqual([rule.required for rule in plan.rules],
+                         ['namespace', '<pd:activity', '', ''])
+
+    def test_rule_skipped_without_literal(self):
+        """필수 리터럴이 없으면 정규식을 실행하지 않음"""
+        plan = ReplacementPlan([make_rule(r'namespace\s*=\s*"[^"]*OLD_BASE[^"]*"', 'ns')])
+        rule = plan.rules[0]
+        rule.pattern = mock.Mock(wraps=rule.pattern)
+
+        self.assertEqual(plan.apply('<pd:name>a</pd:name>'), ('<pd:name>a</pd:name>', [0]))
+        rule.pattern.subn.assert_not_called()
+        self.assertEqual(plan.apply('namespace = "OLD_BASE"'), ('ns', [1]))
+        rule.pattern.subn.assert_called_once()
+
+
+class TestBytesMode(unittest.TestCase):
+    def test_ascii_rules_on_utf8_file(self):
+        """ASCII 규칙은 UTF-8 파일을 디코딩 없이 치환하고 결과가 텍스트 모드와 같음"""
+        plan = ReplacementPlan([
+            make_rule(r'namespace\s*=\s*"[^"]*OLD_BASE[^"]*"', 'namespace="NEW"'),
+            make_rule("'LH'", "'LY'"),
+            make_rule(r'(<pd:name>)Processes/[^<]*(</pd:name>)', r'\1Processes/b.process\2')
+        ])
+        text = "<pd:name>Processes/업무/a.process</pd:name> namespace = \"한글OLD_BASE\" 'LH'"
+        data = text.encode('utf-8')
+
+        self.assertTrue(plan.can_apply_bytes(data, 'utf-8'))
+        new_data, counts = plan.apply_bytes(data)
+        expected, expected_counts = plan.apply(text)
+        self.assertEqual(new_data.decode('utf-8'), expected)
+        self.assertEqual(counts, expected_counts)
+        self.assertEqual(counts, [1, 1, 1])
+
+    def test_fallback_to_text_mode(self):
+        """비ASCII 규칙, 문자 단위 패턴, cp949 파일은 bytes 모드를 사용하지 않음"""
+        data = '업무명 LH'.encode('utf-8')
+        self.assertFalse(ReplacementPlan([make_rule('업무명', 'x')]).can_apply_bytes(data, 'utf-8'))
+        self.assertFalse(ReplacementPlan([make_rule('L.', 'x')]).can_apply_bytes(data, 'utf-8'))
+        self.assertFalse(ReplacementPlan([make_rule('LH', 'x')]).can_apply_bytes(
+            '업무명 LH'.encode('cp949'), 'cp949'))
+        # ASCII 파일은 문자 단위 패턴이어도 bytes 모드 가능
+        self.assertTrue(ReplacementPlan([make_rule('L.', 'x')]).can_apply_bytes(b'LH', None))
+
+
+class TestStreaming(unittest.TestCase):
+    def test_stream_matches_in_memory(self):
+        """작은 창으로 나눠 스트리밍해도 한 번에 치환한 결과와 같음"""
+        plan = ReplacementPlan([
+            make_rule('LHMES_MGR', 'LYMES_MGR'),
+            make_rule(r"'LH'", "'LY'"),
+            make_rule(r'(G1)\.E1', r'\1.E2'),
+            make_rule('E2', 'E3')
+        ])
+        self.assertTrue(plan.streamable)
+        data = ("<a>LHMES_MGR 'LH' G1.E1</a>\n" * 50).encode('utf-8')
+        for window in (1, 5, 64):
+            counts = [0] * len(plan)
+            changed = []
+            chunks = (data[i:i + window] for i in range(0, len(data), window))
+            output = b''.join(plan.iter_stream(chunks, counts, changed))
+            self.assertEqual((output, counts), plan.apply_bytes(data))
+            self.assertEqual(changed, [True])
+        self.assertEqual(counts, [50, 50, 50, 50])
+
+    def test_unbounded_rules_not_streamable(self):
+        """매칭 길이가 무제한이거나 앵커/전후방 탐색이 있는 규칙은 메모리 모드"""
+        self.assertFalse(ReplacementPlan([make_rule('namespace="[^"]*"', 'x')]).streamable)
+        self.assertFalse(ReplacementPlan([make_rule('(?<=a)b', 'x')]).streamable)
+        self.assertFalse(ReplacementPlan([make_rule('업무명', 'x')]).streamable)
+        self.assertTrue(ReplacementPlan([make_rule('a{1,3}b', 'x')]).streamable)
+
+
+class TestBacktrackingGuard(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.addCleanup(set_time_budget, *time_budget())
+
+    def test_literal_looking_patterns_escaped(self):
+        """컴파일되지 않는 엑셀 값만 고정 문자열로 검색하고, 위험해도 유효한 정규식은 그대로 사용"""
+        plan = ReplacementPlan([
+            make_rule('&quot;TASK(1&quot;', '&quot;NEW&quot;'),
+            make_rule('EV(A+)+B', 'EV_NEW'),
+            make_rule('EV.001', 'EV.002')
+        ])
+        content = '&quot;TASK(1&quot; EV(A+)+B EVAAB EVX001'
+        self.assertEqual(plan.apply(content), ('&quot;NEW&quot; EV(A+)+B EV_NEW EV.002', [1, 1, 1]))
+        self.assertIn('이스케이프', plan.rules[0].warning)
+        self.assertEqual([rule.risk for rule in plan.rules], [None, '중첩된 반복', None])
+        self.assertIsNone(plan.rules[2].warning)
+
+        # 중첩 반복이 있는 유효한 정규식은 정규식 의미대로 치환 (시간 제한 작업자에서 실행)
+        for pattern, text in (('(ab+)+c', 'xabbabc'), ('(.*)+x', 'aax'), ('Check (.+)+ done', 'Check a b done')):
+            plan = ReplacementPlan([make_rule(pattern, 'R')])
+            self.assertEqual(plan.apply(text)[1], [1], pattern)
+
+    def test_nested_repeat_runs_in_guard(self):
+        """중첩 반복 규칙은 단독 단계로 작업자에서 실행되고 결과는 순차 적용과 같음"""
+        plan = ReplacementPlan([make_rule(r'(\w+\s?)+=', 'key='), make_rule('LH', 'LY')])
+        self.assertEqual(plan.rules[0].risk, '중첩된 반복')
+        self.assertFalse(plan.rules[0].combinable)
+        self.assertFalse(plan.streamable)
+        self.assertIsNone(ReplacementPlan([make_rule(r'namespace\s*=\s*"[^"]*"', 'x')]).rules[0].risk)
+
+        content = 'name LH = 1\nab cd= LH'
+        edit_map = EditMap()
+        self.assertEqual(plan.apply(content, edit_map), plan.apply_sequential(content))
+        self.assertTrue(edit_map)
+        self.assertEqual(plan.timeouts, [])
+
+    def test_timed_out_rule_is_skipped(self):
+        """예산을 넘긴 규칙은 건너뛰고 나머지 규칙은 적용, 파일 예산을 다 쓰면 이후 위험 규칙도 건너뜀"""
+        set_time_budget(0.5, 0.5)
+        plan = ReplacementPlan([
+            make_rule(r'(\w+\s?)+$', 'x'),
+            make_rule('LH', 'LY'),
+            make_rule(r'(\d+\s?)+$', 'y'),
+        ])
+        content = 'LH ' + 'a' * 40 + '!'
+        started = string_replacer_engine.time.monotonic()
+        self.assertEqual(plan.apply(content), ('LY ' + 'a' * 40 + '!', [0, 1, 0]))
+        self.assertEqual(plan.timeouts, [1, 3])
+        self.assertLess(string_replacer_engine.time.monotonic() - started, 5)
+        # 다음 파일은 예산을 새로 시작
+        self.assertEqual(plan.apply('LH 12 34'), ('x', [1, 0, 0]))
+        self.assertEqual(plan.timeouts, [])
+
+if __name__ == '__main__':
+    unittest.main()
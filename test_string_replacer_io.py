@@ -0,0 +1,190 @@
+"""
+문자열 치환 도구 I/O 스케줄러 단위 테스트
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import string_replacer_io
+from string_replacer_io import (
+    BoundedCache, IOScheduler, atomic_write, write_file, detect_file_encoding, read_source, sniff_encoding
+)
+
+
+class TestIOScheduler(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _job(self, order, name, dest_dir):
+        """원본 파일을 만들고 작업 딕셔너리 반환"""
+        source = os.path.join(self.work_dir, f'{name}.src')
+        with open(source, 'wb') as f:
+            f.write(name.encode('ascii'))
+        return {'order': order, 'source': source,
+                'dest': os.path.join(self.work_dir, dest_dir, f'{name}.out')}
+
+    def test_schedule_groups_by_directory(self):
+        """대상 디렉토리 순으로 정렬하고 같은 디렉토리 안에서는 원래 순서 유지"""
+        jobs = [self._job(0, 'a', 'y'), self._job(1, 'b', 'x'), self._job(2, 'c', 'y')]
+        ordered = IOScheduler.schedule(jobs)
+        self.assertEqual([job['order'] for job in ordered], [1, 0, 2])
+
+    def test_prefetch_and_write(self):
+        """미리 읽은 내용을 순서대로 돌려주고 쓰기 큐의 파일이 모두 저장됨"""
+        jobs = [self._job(i, name, 'out') for i, name in enumerate(['a', 'b', 'c'])]
+        jobs.append({'order': 3, 'source': os.path.join(self.work_dir, 'missing'),
+                     'dest': os.path.join(self.work_dir, 'out', 'd.out')})
+
+        with mock.patch('string_replacer_io.os.makedirs', wraps=os.makedirs) as makedirs:
+            with IOScheduler(prefetch_depth=1) as scheduler:
+                seen = []
+                for job, data, error in scheduler.prefetch(jobs):
+                    seen.append((job['order'], data, error is not None))
+                    if data is not None:
+                        scheduler.write(job['dest'], data.upper())
+                errors = scheduler.close()
+            # 같은 디렉토리는 한 번만 생성
+            self.assertEqual(makedirs.call_count, 1)
+
+        self.assertEqual(seen, [(0, b'a', False), (1, b'b', False), (2, b'c', False), (3, None, True)])
+        self.assertEqual(errors, {})
+        with open(jobs[1]['dest'], 'rb') as f:
+            self.assertEqual(f.read(), b'B')
+
+    def test_write_error_is_reported(self):
+        """쓰기 스레드의 실패는 close 결과로 전달됨"""
+        blocker = os.path.join(self.work_dir, 'blocker')
+        with open(blocker, 'w') as f:
+            f.write('file')
+        with IOScheduler() as scheduler:
+            scheduler._created_dirs.add(blocker)
+            scheduler.write(os.path.join(blocker, 'a.out'), b'a')
+            errors = scheduler.close()
+        self.assertIn(os.path.join(blocker, 'a.out'), errors)
+
+
+class TestAtomicWrite(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.work_dir, 'source.process')
+        with open(self.source, 'wb') as f:
+            f.write(b'LHMES_MGR')
+        os.chmod(self.source, 0o640)
+        os.utime(self.source, (1000000000, 1000000000))
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_metadata_preserved(self):
+        """copy2와 같이 원본의 권한과 수정시각 유지"""
+        dest = os.path.join(self.work_dir, 'out', 'dest.process')
+        write_file(dest, b'LYMES_MGR', self.source)
+
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), b'LYMES_MGR')
+        self.assertEqual(os.stat(dest).st_mtime, 1000000000)
+        self.assertEqual(os.stat(dest).st_mode & 0o777, 0o640)
+        self.assertEqual(os.listdir(os.path.dirname(dest)), ['dest.process'])
+
+    def test_failed_write_leaves_target_untouched(self):
+        """쓰기 도중 실패하면 기존 대상 파일과 임시 파일이 남지 않음"""
+        dest = os.path.join(self.work_dir, 'dest.process')
+        with open(dest, 'wb') as f:
+            f.write(b'old')
+        with mock.patch('string_replacer_io.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                atomic_write(dest, b'new', self.source)
+
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), b'old')
+        self.assertEqual(sorted(os.listdir(self.work_dir)), ['dest.process', 'source.process'])
+
+
+class TestEncodingDetection(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_sniff_without_chardet(self):
+        """BOM, XML 선언, UTF-8은 chardet 없이 판별"""
+        with mock.patch('string_replacer_io.chardet') as chardet:
+            self.assertEqual(sniff_encoding(b'\xef\xbb\xbf<a/>'), 'utf-8-sig')
+            self.assertEqual(sniff_encoding('<?xml version="1.0" encoding="EUC-KR"?><a>한글</a>'.encode('euc-kr')),
+                             'euc_kr')
+            self.assertEqual(sniff_encoding('<a>업무명</a>'.encode('utf-8')), 'utf-8')
+            chardet.detect.assert_not_called()
+
+    def test_chardet_runs_on_bounded_sample(self):
+        """UTF-8이 아닌 파일만 앞부분 표본으로 chardet 실행"""
+        raw = '<a>업무명</a>'.encode('cp949') * 20000
+        with mock.patch('string_replacer_io.chardet') as chardet:
+            chardet.detect.return_value = {'encoding': 'CP949'}
+            self.assertEqual(sniff_encoding(raw), 'CP949')
+            sample = chardet.detect.call_args[0][0]
+        self.assertEqual(len(sample), string_replacer_io.ENCODING_SAMPLE_SIZE)
+
+    def test_detection_cached_by_file_state(self):
+        """같은 파일은 다시 감지하지 않고, 파일이 바뀌면 다시 감지"""
+        path = os.path.join(self.work_dir, 'a.process')
+        with open(path, 'wb') as f:
+            f.write(b'<a>LH</a>')
+        self.assertEqual(detect_file_encoding(path), 'utf-8')
+        with mock.patch('string_replacer_io.sniff_encoding') as sniff:
+            self.assertEqual(detect_file_encoding(path), 'utf-8')
+            sniff.assert_not_called()
+
+        with open(path, 'wb') as f:
+            f.write(b'\xef\xbb\xbf<a>LH</a>')
+        self.assertEqual(detect_file_encoding(path), 'utf-8-sig')
+
+
+class TestSourceCache(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def test_source_read_once_by_file_state(self):
+        """같은 원본은 다시 읽지 않고, 파일이 바뀌면 다시 읽음"""
+        path = os.path.join(self.work_dir, 'a.process')
+        with open(path, 'wb') as f:
+            f.write(b'<a>LH</a>')
+        with mock.patch.object(string_replacer_io, '_source_cache', BoundedCache(1024)):
+            self.assertEqual(read_source(path), b'<a>LH</a>')
+            with mock.patch('builtins.open', side_effect=AssertionError('다시 읽음')):
+                self.assertEqual(read_source(path), b'<a>LH</a>')
+            with open(path, 'wb') as f:
+                f.write(b'<a>LHMES</a>')
+            self.assertEqual(read_source(path), b'<a>LHMES</a>')
+
+    def test_bounded_cache_evicts_oldest(self):
+        """크기 합이 상한을 넘으면 오래 쓰지 않은 값부터 버리고, 너무 큰 값은 보관하지 않음"""
+        cache = BoundedCache(100)
+        for key in 'abcd':
+            cache.put(key, key * 25, 25)
+        cache.get('a')
+        cache.put('e', 'e' * 25, 25)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'a' * 25)
+        self.assertEqual((len(cache), cache.size), (4, 100))
+        cache.put('big', 'x' * 26, 26)
+        self.assertIsNone(cache.get('big'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+문자열 치환 도구 실행 저널 및 되돌리기 단위 테스트
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from string_replacer_journal import RunJournal, file_sha256, list_runs, read_journal, rollback
+
+
+class TestRunJournal(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.journal_dir = os.path.join(self.work_dir, 'journal')
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _path(self, relative_path):
+        return os.path.join(self.work_dir, relative_path)
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    def _read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_rollback_deletes_created_and_restores_overwritten(self):
+        """생성된 파일과 디렉토리는 삭제하고 덮어쓴 원본은 복원"""
+        existing = self._path('keep.process')
+        self._write(existing, b'original')
+        created = [self._path('out/a/1.process'), self._path('out/a/2.process')]
+
+        with RunJournal(journal_dir=self.journal_dir, yaml='jobs.yaml') as journal:
+            journal.plan_create(created + [existing])
+            for path in created:
+                self._write(path, b'new')
+                journal.record_created(path, file_sha256(path))
+            journal.backup(existing)
+            self._write(existing, b'changed')
+
+        result = rollback(journal.run_id, self.journal_dir, workers=4)
+        self.assertEqual(sorted(result['deleted']), sorted(created))
+        self.assertEqual(result['restored'], [existing])
+        self.assertEqual(self._read(existing), b'original')
+        self.assertFalse(os.path.exists(self._path('out')))
+
+        run = list_runs(self.journal_dir)[0]
+        self.assertEqual((run['run_id'], run['files'], run['finished'], run['rolled_back']),
+                         (journal.run_id, 3, True, True))
+
+    def test_modified_file_kept_unless_forced(self):
+        """실행 이후 사용자가 수정한 파일은 force 없이는 삭제하지 않음"""
+        path = self._path('out/a.process')
+        with RunJournal(journal_dir=self.journal_dir) as journal:
+            journal.plan_create([path])
+            self._write(path, b'new')
+            journal.record_created(path, file_sha256(path))
+        self._write(path, b'edited by user')
+
+        result = rollback(journal.run_id, self.journal_dir)
+        self.assertEqual(result['skipped'], [(path, '실행 이후 내용이 변경됨')])
+        self.assertTrue(os.path.exists(path))
+
+        result = rollback(journal.run_id, self.journal_dir, force=True)
+        self.assertEqual(result['deleted'], [path])
+        self.assertFalse(os.path.exists(path))
+
+    def test_interrupted_run_can_be_rolled_back(self):
+        """쓰기 완료 기록 전에 중단된 실행도 미리 기록된 파일을 되돌림"""
+        path = self._path('out/a.process')
+        journal = RunJournal(journal_dir=self.journal_dir)
+        journal.plan_create([path])
+        self._write(path, b'partial run')
+        journal._file.close()
+        with open(journal.path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "do')
+
+        self.assertEqual([record['op'] for record in read_journal(journal.run_id, self.journal_dir)],
+                         ['begin', 'create', 'mkdir'])
+        self.assertFalse(list_runs(self.journal_dir)[0]['finished'])
+        result = rollback(journal.run_id, self.journal_dir)
+        self.assertEqual(result['deleted'], [path])
+        self.assertEqual(result['unverified'], [path])
+        self.assertFalse(os.path.exists(path))
+
+    def test_unwritten_destination_never_deleted(self):
+        """create로 기록했지만 쓰지 않은 파일은 나중에 다른 곳에서 만들어져도 삭제하지 않음"""
+        skipped, missing = self._path('out/skip.process'), self._path('out/missing.process')
+        with RunJournal(journal_dir=self.journal_dir) as journal:
+            journal.plan_create([skipped, missing])
+            journal.record_skipped(skipped, '원본 파일 없음')
+        self._write(skipped, b'made by someone else')
+        self._write(missing, b'made by someone else')
+
+        result = rollback(journal.run_id, self.journal_dir)
+        self.assertEqual(result['deleted'], [])
+        self.assertEqual(sorted(path for path, _ in result['skipped']), sorted([skipped, missing]))
+        self.assertTrue(os.path.exists(skipped) and os.path.exists(missing))
+
+        # 예외로 중단된 실행이라도 쓰지 않았다고 기록된 파일은 삭제하지 않음
+        os.remove(skipped)
+        with self.assertRaises(RuntimeError), RunJournal(journal_dir=self.journal_dir) as journal:
+            journal.plan_create([skipped])
+            journal.record_skipped(skipped, None)
+            self._write(skipped, b'made by someone else')
+            raise RuntimeError('중단')
+        self.assertEqual(read_journal(journal.run_id, self.journal_dir)[-1].get('aborted'), True)
+        self.assertEqual(rollback(journal.run_id, self.journal_dir)['deleted'], [])
+        self.assertTrue(os.path.exists(skipped))
+
+if __name__ == '__main__':
+    unittest.main()
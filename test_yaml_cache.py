@@ -0,0 +1,96 @@
+"""
+YAML 읽기 캐시 단위 테스트
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import yaml
+import yaml_cache
+from yaml_cache import YamlCache, CACHE_SUFFIX
+
+class TestYamlCache(unittest.TestCase):
+    def setUp(self):
+        """테스트 설정"""
+        self.work_dir = tempfile.mkdtemp()
+        self.cache = YamlCache(os.path.join(self.work_dir, 'cache'))
+        self.yaml_path = os.path.join(self.work_dir, 'jobs.yaml')
+        rules = [{'설명': 'MGR 치환', '찾기': {'정규식': 'LHMES_MGR'}, '교체': {'값': 'LYMES_MGR'}}]
+        self.data = {f'{i}번째 행': {'송신파일경로': {'원본파일': f'src/p{i}.process',
+                                                   '복사파일': f'out/p{i}.process',
+                                                   '치환목록': [dict(rule) for rule in rules]}}
+                     for i in range(1, 4)}
+        self._write(self.data)
+
+    def tearDown(self):
+        """테스트 정리"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def _write(self, data):
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            yaml_cache.dump(data, f, allow_unicode=True, sort_keys=False)
+
+    def test_repeat_load_skips_parsing(self):
+        """두 번째 읽기는 YAML을 다시 파싱하지 않음"""
+        first = self.cache.load(self.yaml_path)
+        with mock.patch('yaml_cache.safe_load') as safe_load:
+            second = self.cache.load(self.yaml_path)
+            safe_load.assert_not_called()
+
+        self.assertEqual(first, self.data)
+        self.assertEqual(second, self.data)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        # 같은 치환목록은 하나의 객체로 공유됨
+        rule_lists = {id(row['송신파일경로']['치환목록']) for row in second.values()}
+        self.assertEqual(len(rule_lists), 1)
+
+    def test_modified_file_is_reparsed(self):
+        """파일 내용이 바뀌면 캐시를 사용하지 않음"""
+        self.cache.load(self.yaml_path)
+        self._write({'1번째 행': {}})
+        self.assertEqual(self.cache.load(self.yaml_path), {'1번째 행': {}})
+        self.assertEqual(self.cache.misses, 2)
+        self.assertEqual(len([name for name in os.listdir(self.cache.cache_dir)
+                              if name.endswith(CACHE_SUFFIX)]), 2)
+
+    def test_dump_matches_pure_python(self):
+        """C 덤퍼 출력이 기존 yaml.dump 출력과 같음"""
+        self.assertEqual(yaml_cache.dump(self.data, allow_unicode=True, sort_keys=False),
+                         yaml.dump(self.data, allow_unicode=True, sort_keys=False))
+
+    def test_iter_rows_streams_without_full_load(self):
+        """캐시가 없으면 전체를 파싱하지 않고 행을 하나씩 읽음"""
+        with mock.patch('yaml_cache.safe_load') as safe_load:
+            rows = yaml_cache.iter_yaml_rows(self.yaml_path, self.cache)
+            self.assertEqual(next(rows), ('1번째 행', self.data['1번째 행']))
+            self.assertEqual(dict(rows), {key: self.data[key] for key in ('2번째 행', '3번째 행')})
+            safe_load.assert_not_called()
+
+        # 캐시가 있으면 캐시에서 읽음
+        self.cache.load(self.yaml_path)
+        self.assertEqual(dict(yaml_cache.iter_yaml_rows(self.yaml_path, self.cache)), self.data)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_iter_sequence_yields_list_items(self):
+        """최상위 키의 리스트를 원소 단위로 읽음"""
+        files = [{'source': f's{i}', 'destination': f'd{i}'} for i in range(3)]
+        self._write({'meta': {'count': 3}, 'files': files})
+        self.assertEqual(list(yaml_cache.iter_yaml_sequence(self.yaml_path, 'files', self.cache)), files)
+        self.assertEqual(list(yaml_cache.iter_yaml_sequence(self.yaml_path, 'none', self.cache)), [])
+
+    def test_duplicate_keys_rejected(self):
+        """최상위 키가 중복되면 스트리밍과 캐시 생성 모두 오류 (스트리밍은 중복 전까지 행을 넘김)"""
+        with open(self.yaml_path, 'w', encoding='utf-8') as f:
+            f.write('row_1: first\nrow_2: second\nrow_1: last\n')
+        rows = yaml_cache.iter_yaml_rows(self.yaml_path, self.cache)
+        self.assertEqual([next(rows), next(rows)], [('row_1', 'first'), ('row_2', 'second')])
+        with self.assertRaises(yaml.YAMLError):
+            next(rows)
+        with self.assertRaises(yaml.YAMLError):
+            self.cache.load(self.yaml_path)
+        self.assertIsNone(self.cache.lookup(self.yaml_path))
+
+if __name__ == '__main__':
+    unittest.main()
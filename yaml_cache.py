@@ -0,0 +1,432 @@
+"""
+YAML 읽기/쓰기 가속 및 파싱 결과 캐시
+
+string_replacer와 bwtools의 작업 YAML은 행마다 같은 치환목록이 반복되어 수십 MB까지 커지며,
+순수 Python yaml.safe_load / yaml.dump가 미리보기와 실행 시작 시간의 대부분을 차지합니다.
+
+  - libyaml이 있으면 CSafeLoader / CSafeDumper를 사용합니다.
+  - 파싱한 결과를 캐시 디렉토리에 pickle로 저장해 두고, 같은 내용(SHA-256)의 YAML은
+    다음부터 YAML 파싱 없이 바로 로드합니다.
+  - 캐시에 저장할 때 내용이 같은 치환목록(딕셔너리 리스트)을 하나의 객체로 합치므로
+    캐시 파일에는 규칙 집합별로 한 번만 저장되고, 로드한 작업들은 같은 규칙 객체를 공유합니다.
+
+캐시 디렉토리 전체 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다.
+
+실행(메뉴 3)은 iter_yaml_rows / iter_yaml_sequence로 최상위 항목을 하나씩 읽습니다.
+캐시가 없으면 파서 이벤트에서 항목 하나씩 노드를 만들어 바로 넘기므로 전체 구조를
+메모리에 올리지 않고, 파일을 다 읽기 전에 첫 작업부터 실행할 수 있습니다.
+"""
+
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import yaml
+from yaml.composer import Composer
+from yaml.constructor import SafeConstructor
+from yaml.parser import Parser
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+from yaml.scanner import Scanner
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# libyaml(C 확장)이 있으면 C 로더/덤퍼 사용
+SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+# 스트리밍 읽기용 파서 (libyaml이 있으면 C 파서)
+_PARSER_BASES = (yaml.cyaml.CParser,) if HAS_LIBYAML else (Reader, Scanner, Parser)
+
+# 스트리밍 읽기 시 한 번에 읽는 크기
+STREAM_BLOCK = 1024 * 1024
+
+# 캐시 디렉토리 및 크기 상한 (환경변수로 변경 가능)
+CACHE_DIR = os.environ.get(
+    'YAML_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.yaml_cache')
+)
+CACHE_MAX_BYTES = int(os.environ.get('YAML_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# 캐시 형식 버전 (저장 형식이 바뀌면 올림)
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.yaml.pkl'
+
+
+def safe_load(stream) -> Any:
+    """yaml.safe_load와 같으며 libyaml이 있으면 C 로더를 사용합니다."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def _load_unique_top_level(raw: bytes) -> Any:
+    """safe_load와 같지만 최상위 키가 중복되면 마지막 값을 쓰지 않고 yaml.YAMLError를 발생시킵니다."""
+    loader = SafeLoader(raw)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None
+        if isinstance(node, yaml.MappingNode):
+            seen = set()
+            for key_node, _ in node.value:
+                key = loader.construct_object(key_node, deep=True)
+                if key in seen:
+                    raise yaml.YAMLError(f"최상위 키가 중복되었습니다: {key}")
+                seen.add(key)
+        return loader.construct_document(node)
+    finally:
+        loader.dispose()
+
+
+def dump(data: Any, stream=None, **kwargs) -> Optional[str]:
+    """
+    yaml.dump와 같은 인자를 받으며 libyaml이 있으면 C 덤퍼를 사용합니다.
+
+    Safe 덤퍼로 표현할 수 없는 값(str 하위 클래스 등)이 있으면 기존 yaml.dump 기본 덤퍼로 씁니다.
+    파일에는 전체 내용을 만든 뒤 한 번에 쓰므로 실패 시 반쯤 쓰인 YAML이 남지 않습니다.
+    """
+    try:
+        text = yaml.dump(data, Dumper=SafeDumper, **kwargs)
+    except yaml.representer.RepresenterError:
+        text = yaml.dump(data, **kwargs)
+    if stream is None:
+        return text
+    stream.write(text)
+    return None
+
+
+def intern_rule_lists(data: Any, table: Optional[Dict[str, List]] = None) -> Any:
+    """
+    내용이 같은 딕셔너리 리스트(치환목록 등)를 하나의 객체로 합칩니다.
+
+    Args:
+        data: YAML에서 읽은 데이터
+        table: (내용 키 -> 리스트) 표 - 재귀 호출용
+
+    Returns:
+        같은 구조의 데이터 (같은 내용의 리스트는 같은 객체)
+    """
+    if table is None:
+        table = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            data[key] = intern_rule_lists(value, table)
+        return data
+    if isinstance(data, list):
+        items = [intern_rule_lists(item, table) for item in data]
+        if items and all(isinstance(item, dict) for item in items):
+            content_key = json.dumps(items, sort_keys=True, ensure_ascii=False, default=str)
+            return table.setdefault(content_key, items)
+        data[:] = items
+        return data
+    return data
+
+
+class _StreamLoader(*_PARSER_BASES, Composer, SafeConstructor, Resolver):
+    """파서 이벤트에서 노드를 직접 만들어 최상위 항목 단위로 읽는 로더"""
+
+    def __init__(self, stream):
+        if HAS_LIBYAML:
+            yaml.cyaml.CParser.__init__(self, stream)
+        else:
+            Reader.__init__(self, stream)
+            Scanner.__init__(self)
+            Parser.__init__(self)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def construct(self, node) -> Any:
+        """노드 하나를 Python 객체로 만들고 생성 기록은 비웁니다 (항목별 메모리 해제)."""
+        try:
+            return self.construct_object(node, deep=True)
+        finally:
+            self.constructed_objects = {}
+            self.recursive_objects = {}
+
+    def top_level_keys(self) -> Iterator[Any]:
+        """
+        최상위 매핑의 키 노드를 하나씩 넘깁니다.
+
+        값은 다음 키를 받기 전에 호출한 쪽에서 읽어야 합니다 (시퀀스는 원소 단위로 읽을 수 있도록).
+        """
+        self.get_event()  # StreamStart
+        if self.check_event(yaml.StreamEndEvent):
+            return
+        self.get_event()  # DocumentStart
+        if not self.check_event(yaml.MappingStartEvent):
+            # 빈 문서(null)는 항목 없음으로 처리
+            if self.construct(self.compose_node(None, None)) is None:
+                return
+            raise yaml.YAMLError("YAML 최상위가 매핑이 아닙니다.")
+        self.get_event()
+        while not self.check_event(yaml.MappingEndEvent):
+            yield self.compose_node(None, None)
+
+    def iter_sequence_items(self) -> Iterator[Any]:
+        """현재 위치의 시퀀스 값을 항목 하나씩 만들어 넘깁니다 (시퀀스가 아니면 값 전체)."""
+        if not self.check_event(yaml.SequenceStartEvent):
+            value = self.construct(self.compose_node(None, None))
+            if value:
+                yield from value
+            return
+        self.get_event()
+        while not self.check_event(yaml.SequenceEndEvent):
+            yield self.construct(self.compose_node(None, None))
+        self.get_event()
+
+
+def iter_yaml_rows(yaml_path: str, cache: Optional['YamlCache'] = None) -> Iterator[Tuple[Any, Any]]:
+    """
+    YAML 최상위 매핑의 (키, 값)을 파일 순서대로 하나씩 넘깁니다.
+
+    같은 내용의 파싱 캐시가 있으면 캐시에서 읽고, 없으면 파일을 처음부터 스트리밍으로 읽어
+    항목 하나를 만들 때마다 넘깁니다 (이 경우 캐시는 만들지 않음).
+    최상위 키가 중복되면 캐시 유무와 관계없이 yaml.YAMLError를 발생시킵니다 (스트리밍에서는
+    중복 키를 만난 시점에, 캐시를 만드는 YamlCache.load에서는 파싱할 때).
+
+    Args:
+        yaml_path: YAML 파일 경로
+        cache: 확인할 YamlCache (기본값: 모듈 기본 캐시)
+
+    Yields:
+        (최상위 키, 값)
+
+    Raises:
+        FileNotFoundError: 파일이 없는 경우
+        yaml.YAMLError: YAML 형식 오류, 최상위가 매핑이 아니거나 최상위 키가 중복된 경우
+    """
+    cached = (cache or get_default_cache()).lookup(yaml_path)
+    if cached is not None:
+        if not isinstance(cached, dict):
+            raise yaml.YAMLError("YAML 최상위가 매핑이 아닙니다.")
+        yield from cached.items()
+        return
+
+    with open(yaml_path, 'rb') as stream:
+        loader = _StreamLoader(stream)
+        seen = set()
+        try:
+            for key_node in loader.top_level_keys():
+                key = loader.construct(key_node)
+                if key in seen:
+                    raise yaml.YAMLError(f"최상위 키가 중복되었습니다: {key}")
+                seen.add(key)
+                yield key, loader.construct(loader.compose_node(None, None))
+        finally:
+            loader.dispose()
+
+
+def iter_yaml_sequence(yaml_path: str, key: str,
+                       cache: Optional['YamlCache'] = None) -> Iterator[Any]:
+    """
+    YAML 최상위 매핑에서 key 항목의 리스트를 원소 하나씩 넘깁니다 (예: iflist의 files).
+
+    Args:
+        yaml_path: YAML 파일 경로
+        key: 리스트가 들어 있는 최상위 키
+        cache: 확인할 YamlCache (기본값: 모듈 기본 캐시)
+
+    Yields:
+        리스트 원소
+    """
+    cached = (cache or get_default_cache()).lookup(yaml_path)
+    if cached is not None:
+        if isinstance(cached, dict):
+            yield from cached.get(key) or []
+        return
+
+    with open(yaml_path, 'rb') as stream:
+        loader = _StreamLoader(stream)
+        try:
+            for key_node in loader.top_level_keys():
+                if loader.construct(key_node) == key:
+                    yield from loader.iter_sequence_items()
+                else:
+                    # 다른 항목은 노드만 읽고 버림
+                    loader.compose_node(None, None)
+        finally:
+            loader.dispose()
+
+
+class YamlCache:
+    """파싱된 YAML 데이터를 디스크에 캐시하는 클래스"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = CACHE_MAX_BYTES):
+        """
+        YamlCache 초기화
+
+        Args:
+            cache_dir: 캐시 디렉토리 (기본값: CACHE_DIR)
+            max_bytes: 캐시 디렉토리 최대 크기 (바이트)
+        """
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(raw: bytes) -> str:
+        """YAML 내용 해시 + 캐시 형식 + PyYAML 버전으로 캐시 키를 만듭니다."""
+        return YamlCache._finish_key(hashlib.sha256(raw))
+
+    @staticmethod
+    def _finish_key(digest) -> str:
+        """내용 해시에 캐시 형식과 PyYAML 버전을 더해 키를 완성합니다."""
+        digest.update(f'|{CACHE_VERSION}|{yaml.__version__}'.encode('ascii'))
+        return digest.hexdigest()
+
+    def load(self, yaml_path: str) -> Any:
+        """
+        YAML 파일을 읽습니다. 같은 내용을 이미 파싱한 적이 있으면 캐시에서 로드합니다.
+
+        Args:
+            yaml_path: YAML 파일 경로
+
+        Returns:
+            파싱된 데이터
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+            yaml.YAMLError: YAML 형식 오류
+        """
+        with open(yaml_path, 'rb') as f:
+            raw = f.read()
+        key = self.cache_key(raw)
+
+        cached = self._load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        data = intern_rule_lists(_load_unique_top_level(raw))
+        self._store(key, data)
+        return data
+
+    def lookup(self, yaml_path: str) -> Optional[Any]:
+        """
+        YAML 파일 내용의 파싱 캐시가 있으면 반환합니다. 없으면 파싱하지 않고 None을 반환합니다.
+
+        파일은 블록 단위로 해시하므로 전체 내용을 메모리에 올리지 않습니다.
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+        """
+        digest = hashlib.sha256()
+        with open(yaml_path, 'rb') as f:
+            for block in iter(lambda: f.read(STREAM_BLOCK), b''):
+                digest.update(block)
+        cached = self._load(self._finish_key(digest))
+        if cached is not None:
+            self.hits += 1
+        return cached
+
+    def clear(self):
+        """캐시 디렉토리의 모든 캐시 파일을 삭제합니다."""
+        for path, _, _ in self._list_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+
+    def _load(self, key: str) -> Optional[Any]:
+        """캐시 항목을 로드합니다. 없거나 손상된 경우 None을 반환합니다."""
+        path = self._entry_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            # LRU 갱신을 위해 사용 시각 기록
+            os.utime(path, None)
+            return data
+        except Exception:
+            # 손상된 캐시는 삭제하고 다시 파싱
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _store(self, key: str, data: Any):
+        """파싱 결과를 캐시에 저장합니다. 저장 실패는 무시합니다."""
+        if data is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _list_entries(self) -> List[Tuple[str, int, float]]:
+        """캐시 항목 목록 (경로, 크기, 마지막 사용 시각)을 반환합니다."""
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return entries
+        for name in names:
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        """캐시 크기가 상한을 넘으면 가장 오래 사용되지 않은 항목부터 삭제합니다."""
+        entries = self._list_entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.max_bytes:
+                break
+
+
+# 모듈 기본 캐시 인스턴스
+_default_cache: Optional[YamlCache] = None
+
+
+def get_default_cache() -> YamlCache:
+    """모듈 기본 YamlCache 인스턴스를 반환합니다."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = YamlCache()
+    return _default_cache
+
+
+def load_yaml_cached(yaml_path: str) -> Any:
+    """
+    YAML 파일을 캐시를 거쳐 읽습니다 (yaml.safe_load와 같은 결과).
+
+    Args:
+        yaml_path: YAML 파일 경로
+
+    Returns:
+        파싱된 데이터
+    """
+    return get_default_cache().load(yaml_path)